@@ -0,0 +1,428 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Read-only HTTP API over storage.
+
+Serves the objects the web_static pages display as JSON, with nothing but
+the standard library:
+
+    GET /api/v1/status                  {"status": "OK"}
+    GET /api/v1/stats                   the number of objects of each class
+    GET /api/v1/<Class>                 every object of a class
+    GET /api/v1/<Class>/<id>            one object
+    GET /api/v1/places?city_id=<id>     the places of a City, by name
+    GET /api/v1/autocomplete?q=<prefix>[&limit=<n>][&class=State|City]
+                                        the States and Cities whose name
+                                        starts with the prefix
+
+Classes are named either as in the console (`Place`) or as lowercase plural
+resources (`places`). Query parameters filter collections on field values;
+places filtered by city_id or state_id are read from the listings index.
+The fields listed in PRIVATE_FIELDS, such as the passwords of Users, are
+never served, nor can collections be filtered on them.
+
+Every response carries an ETag derived from the `updated_at` of the objects
+it holds, suffixed with "-gzip" for compressed bodies, and conditional
+requests are answered with 304 Not Modified.
+Bodies are gzip-compressed for clients accepting it, connections are kept
+alive (HTTP/1.1), and rendered responses are kept in a small LRU cache. The
+cache listens to storage like any other index, so every write to a class,
+in this process or in the file by another one, drops its cached responses.
+
+With --workers, a master loads storage once and forks that many workers
+accepting on the same socket, sharing the objects it loaded (see
+models.engine.prefork). Sending SIGUSR1 to the master prints their memory.
+
+usage:
+------
+python3 -m api.v1.app [--host <host>] [--port <port>] [--workers <n>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import socket
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+from models.engine.indexes import StorageIndex
+from models.engine.keys import split_key
+from models.engine.prefork import Prefork
+from models.engine.registry import classes
+
+PREFIX = "/api/v1/"
+CACHE_SIZE = 256
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 256
+AUTOCOMPLETE_LIMIT = 10
+# The fields of each class left out of every response
+PRIVATE_FIELDS = {"User": ("password",)}
+
+_WORD_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+class ResponseCache(StorageIndex):
+    """
+    The rendered responses of the API, dropped as storage changes.
+
+    Every entry is filed under the classes it was rendered from: a write to
+    an object of a class drops the entries of that class.
+
+    Attributes_:
+        size (int): The most responses kept.
+    """
+
+    def __init__(self, size=CACHE_SIZE):
+        """
+        Initialize an empty cache.
+
+        Args_:
+            size (int): The most responses kept.
+        """
+        self.size = size
+        self.__entries = OrderedDict()
+
+    def get(self, request):
+        """
+        Return the cached response of a request, or None.
+
+        Args_:
+            request (tuple): The (path, sorted query) of the request.
+
+        Returns_:
+            dict: The cached response.
+        """
+        entry = self.__entries.get(request)
+        if entry is not None:
+            self.__entries.move_to_end(request)
+
+        return entry
+
+    def put(self, request, entry):
+        """
+        Cache the response of a request.
+
+        Args_:
+            request (tuple): The (path, sorted query) of the request.
+            entry (dict): The response; its "classes" are the class names it
+                was rendered from, or None if it depends on every class.
+        """
+        self.__entries[request] = entry
+        self.__entries.move_to_end(request)
+        while len(self.__entries) > self.size:
+            self.__entries.popitem(last=False)
+
+    def on_set(self, key, old, new):
+        """Drop the responses rendered from the class of the object."""
+        self.__invalidate(split_key(key)[0])
+
+    def on_delete(self, key, old):
+        """Drop the responses rendered from the class of the object."""
+        self.__invalidate(split_key(key)[0])
+
+    def on_clear(self):
+        """Drop every response."""
+        self.__entries.clear()
+
+    def __len__(self):
+        """Return the number of cached responses."""
+        return len(self.__entries)
+
+    def __invalidate(self, cls_name):
+        """Drop the responses depending on a class."""
+        for request in [request for request, entry in self.__entries.items()
+                        if entry["classes"] is None or
+                        cls_name in entry["classes"]]:
+            del self.__entries[request]
+
+
+class ApiServer(ThreadingHTTPServer):
+    """
+    A threaded HTTP server answering API requests from storage.
+
+    Attributes_:
+        storage: The storage engine, `models.storage` by default.
+        cache (ResponseCache): The rendered responses.
+        lock (threading.Lock): Serializes the access to storage, which is
+            not thread-safe.
+        resources (dict): Maps the plural resource names to class names.
+        quiet (bool): Whether requests are not logged.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, storage=None, cache_size=CACHE_SIZE,
+                 quiet=False, sock=None):
+        """
+        Bind the server and start listening to storage.
+
+        Args_:
+            address (tuple): The (host, port) to listen on.
+            storage (optional): The storage engine to serve.
+            cache_size (int): The most responses kept in the cache.
+            quiet (bool): Do not log requests.
+            sock (socket.socket, optional): A listening socket to accept on
+                instead of binding `address`.
+        """
+        if storage is None:
+            from models import storage
+
+        self.storage = storage
+        self.cache = ResponseCache(cache_size)
+        self.lock = threading.Lock()
+        self.quiet = quiet
+        self.resources = {_plural(name): name for name in classes.names()}
+        super().__init__(address, ApiHandler,
+                         bind_and_activate=sock is None)
+        if sock is not None:
+            self.socket.close()
+            self.socket = sock
+            self.server_address = sock.getsockname()
+        storage.register_index(self.cache)
+
+    def server_close(self):
+        """Stop listening to storage and close the socket."""
+        self.storage.unregister_index(self.cache)
+        super().server_close()
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Handles the requests of one connection to the API."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "HBNB-API/" + __version__
+    # Headers and body are written separately: without TCP_NODELAY, every
+    # keep-alive response would wait for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Answer a GET request."""
+        self.__respond(body=True)
+
+    def do_HEAD(self):
+        """Answer a HEAD request like a GET one, without the body."""
+        self.__respond(body=False)
+
+    def __refuse(self):
+        """Answer a request that would write: the API is read-only."""
+        # Drain the body so that the next request on the connection parses
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.__send(HTTPStatus.METHOD_NOT_ALLOWED,
+                    _json({"error": "Method not allowed"}),
+                    headers={"Allow": "GET, HEAD"})
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = __refuse
+
+    def log_message(self, format, *args):
+        """Log a request unless the server is quiet."""
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def __respond(self, body):
+        """Answer a request from the cache, or render and cache it."""
+        url = urlsplit(self.path)
+        request = (url.path.rstrip("/"),
+                   tuple(sorted(parse_qsl(url.query))))
+        server = self.server
+
+        with server.lock:
+            # One stat picks up writes made to the file by other processes
+            server.storage.refresh()
+            entry = server.cache.get(request)
+            if entry is None:
+                entry = self.__render(*request)
+                if entry["status"] == HTTPStatus.OK:
+                    server.cache.put(request, entry)
+
+        if entry["status"] != HTTPStatus.OK:
+            self.__send(entry["status"], entry["body"], body=body)
+            return
+
+        data = entry["body"]
+        compress = (len(data) >= GZIP_MIN_SIZE and
+                    "gzip" in self.headers.get("Accept-Encoding", ""))
+        # Each encoding is a representation of its own, with its own tag
+        etag = entry["etag"][:-1] + '-gzip"' if compress else entry["etag"]
+        headers = {"ETag": etag, "Cache-Control": "no-cache",
+                   "Vary": "Accept-Encoding"}
+        if etag in _etags(self.headers.get("If-None-Match")):
+            self.__send(HTTPStatus.NOT_MODIFIED, b"", headers=headers,
+                        body=False)
+            return
+
+        if compress:
+            if entry.get("gzip") is None:
+                entry["gzip"] = gzip.compress(data, compresslevel=6)
+            data = entry["gzip"]
+            headers["Content-Encoding"] = "gzip"
+
+        self.__send(HTTPStatus.OK, data, headers=headers, body=body)
+
+    def __render(self, path, query):
+        """Render the response of a request; the storage lock is held."""
+        if not path.startswith(PREFIX):
+            return _error(HTTPStatus.NOT_FOUND)
+
+        parts = path[len(PREFIX):].split("/")
+        storage = self.server.storage
+
+        if parts == ["status"] and not query:
+            return _entry({"status": "OK"}, [], classes=())
+
+        if parts == ["stats"] and not query:
+            names = self.server.resources.values()
+            return _entry({name: storage.count(name) for name in names}, [],
+                          classes=None)
+
+        if parts == ["autocomplete"]:
+            return self.__autocomplete(dict(query))
+
+        name = self.server.resources.get(parts[0], parts[0])
+        if name not in classes or len(parts) > 2:
+            return _error(HTTPStatus.NOT_FOUND)
+
+        if len(parts) == 2:
+            obj = storage.get(name, parts[1])
+            if obj is None or query:
+                return _error(HTTPStatus.NOT_FOUND)
+            value = _public(obj.to_dict())
+            return _entry(value, [value], classes=(name,))
+
+        filters = dict(query)
+        if name == "Place" and len(filters) == 1 and (
+                filters.keys() & {"city_id", "state_id"}):
+            field, obj_id = filters.popitem()
+            location = "City" if field == "city_id" else "State"
+            ids = storage.index("listings").members(location, obj_id)
+            values = [_public(storage.get(name, place_id).to_dict())
+                      for place_id in ids]
+            # A City moving to another State changes the state_id listings
+            return _entry(values, values, classes=(name, "City"))
+
+        values = [value for value in map(_public, (
+                      value for _, value in storage.items(name)))
+                  if all(str(value.get(field)) == text
+                         for field, text in filters.items())]
+        return _entry(values, values, classes=(name,))
+
+    def __autocomplete(self, query):
+        """Render the completions of a location name being typed."""
+        cls = query.pop("class", None)
+        prefix = query.pop("q", "")
+        limit = query.pop("limit", str(AUTOCOMPLETE_LIMIT))
+        if (query or not prefix.strip() or not limit.isdigit() or
+                int(limit) < 1 or cls not in (None, "State", "City")):
+            return _error(HTTPStatus.BAD_REQUEST)
+
+        locations = self.server.storage.autocomplete(prefix, int(limit), cls)
+        # A renamed State changes the completions of its Cities
+        return _entry(locations, [], classes=("State", "City"))
+
+    def __send(self, status, data, headers=None, body=True):
+        """Send a response, keeping the connection open."""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.end_headers()
+        if body and status != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(data)
+
+
+def _entry(payload, values, classes):
+    """Build a cacheable response from a payload and the objects in it."""
+    data = _json(payload)
+    digest = hashlib.sha1(data if not values else "\n".join(
+        f"{value.get('__class__')}.{value.get('id')}|"
+        f"{value.get('updated_at')}" for value in values).encode())
+
+    return {"status": HTTPStatus.OK, "body": data, "classes": classes,
+            "etag": f'"{digest.hexdigest()[:20]}"'}
+
+
+def _public(value):
+    """Return a stored dictionary without its private fields."""
+    private = PRIVATE_FIELDS.get(value.get("__class__"), ())
+    if not any(field in value for field in private):
+        return value
+
+    return {field: item for field, item in value.items()
+            if field not in private}
+
+
+def _error(status):
+    """Build an error response."""
+    return {"status": status, "body": _json({"error": status.phrase})}
+
+
+def _json(payload):
+    """Encode a payload as compact JSON bytes."""
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _etags(header):
+    """Return the entity tags of an If-None-Match header."""
+    if not header:
+        return ()
+
+    return [tag.strip().removeprefix("W/") for tag in header.split(",")]
+
+
+def _plural(name):
+    """Return the resource name of a class: `City` is `cities`."""
+    name = _WORD_BOUNDARY.sub("_", name).lower()
+
+    return name[:-1] + "ies" if name.endswith("y") else name + "s"
+
+
+def main():
+    """Serve the API until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve the HBNB read API.")
+    parser.add_argument("--host", default=os.getenv("HBNB_API_HOST",
+                                                    "127.0.0.1"))
+    parser.add_argument("--port", type=int,
+                        default=int(os.getenv("HBNB_API_PORT", "5000")))
+    parser.add_argument("--quiet", action="store_true",
+                        help="do not log requests")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="fork this many workers")
+    args = parser.parse_args()
+
+    print(f"Serving on http://{args.host}:{args.port}{PREFIX}", flush=True)
+    if args.workers:
+        sock = socket.create_server((args.host, args.port), backlog=1024)
+        Prefork(lambda: serve((args.host, args.port), args.quiet, sock),
+                args.workers).run()
+        return
+
+    serve((args.host, args.port), args.quiet)
+
+
+def serve(address, quiet=False, sock=None):
+    """
+    Serve the API until interrupted.
+
+    Args_:
+        address (tuple): The (host, port) to listen on.
+        quiet (bool): Do not log requests.
+        sock (socket.socket, optional): A listening socket to accept on.
+    """
+    with ApiServer(address, quiet=quiet, sock=sock) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
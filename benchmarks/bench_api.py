@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Load test of the read API.
+
+Runs concurrent keep-alive clients against the API and reports the request
+rate and latency percentiles. Without --url, an API server is started in
+this process over `models.storage`, seeded with --seed places in memory
+(nothing is saved).
+
+usage:
+------
+python3 -m benchmarks.bench_api [--url <root url>] [-c <clients>]
+                                [-n <requests per client>] [--seed <places>]
+                                [--path <path>]... [--gzip] [--conditional]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+def seed(storage, count):
+    """Create `count` places spread over ten cities, in memory only."""
+    from models.city import City
+    from models.place import Place
+    from models.state import State
+
+    state = State()
+    state.name = "California"
+    storage.new(state)
+    cities = []
+    for number in range(10):
+        city = City()
+        city.name, city.state_id = f"City {number}", state.id
+        storage.new(city)
+        cities.append(city)
+    for number in range(count):
+        place = Place()
+        place.name = f"Place {number}"
+        place.city_id = cities[number % len(cities)].id
+        storage.new(place)
+
+    return [f"/api/v1/places/{place.id}", "/api/v1/cities",
+            f"/api/v1/places?city_id={cities[0].id}", "/api/v1/stats"]
+
+
+def client(base, paths, count, headers, conditional, results):
+    """Send `count` requests over one connection, recording latencies."""
+    url = urlsplit(base)
+    connection = http.client.HTTPConnection(url.hostname, url.port)
+    etags = {}
+    latencies = []
+    statuses = Counter()
+
+    for number in range(count):
+        path = paths[number % len(paths)]
+        request_headers = dict(headers)
+        if conditional and path in etags:
+            request_headers["If-None-Match"] = etags[path]
+
+        start = time.perf_counter()
+        connection.request("GET", path, headers=request_headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+
+        statuses[response.status] += 1
+        if response.getheader("ETag"):
+            etags[path] = response.getheader("ETag")
+
+    connection.close()
+    results.append((latencies, statuses))
+
+
+def main():
+    """Run the load test and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--url", help="root URL of a running server")
+    parser.add_argument("-c", type=int, default=8,
+                        help="number of concurrent clients (default: 8)")
+    parser.add_argument("-n", type=int, default=2000,
+                        help="requests per client (default: 2000)")
+    parser.add_argument("--seed", type=int, default=1000,
+                        help="places created in memory (default: 1000)")
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="path to request, repeatable")
+    parser.add_argument("--gzip", action="store_true",
+                        help="accept gzip-compressed responses")
+    parser.add_argument("--conditional", action="store_true",
+                        help="revalidate with If-None-Match")
+    args = parser.parse_args()
+
+    server = None
+    paths = args.paths
+    base = args.url
+    if base is None:
+        from api.v1.app import ApiServer
+        from models import storage
+
+        seeded = seed(storage, args.seed)
+        paths = paths or seeded
+        server = ApiServer(("127.0.0.1", 0), storage, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = "http://127.0.0.1:{}".format(server.server_address[1])
+    paths = paths or ["/api/v1/status"]
+
+    headers = {"Accept-Encoding": "gzip"} if args.gzip else {}
+    results = []
+    threads = [threading.Thread(target=client, args=(
+        base, paths, args.n, headers, args.conditional, results))
+        for _ in range(args.c)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    latencies = sorted(latency for latencies, _ in results
+                       for latency in latencies)
+    statuses = sum((statuses for _, statuses in results), Counter())
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{len(latencies)} requests, {args.c} clients, "
+          f"{elapsed:.2f} s: {len(latencies) / elapsed:.0f} req/s")
+    print(f"latency p50 {percentiles[49] * 1000:.2f} ms, "
+          f"p99 {percentiles[98] * 1000:.2f} ms, "
+          f"max {latencies[-1] * 1000:.2f} ms")
+    print("status " + ", ".join(f"{status}: {number}" for status, number
+                                in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
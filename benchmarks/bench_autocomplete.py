@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of location autocomplete.
+
+Fills storage with States and Cities, then times completing prefixes of
+their names with FileStorage.autocomplete, served by the Autocomplete
+index, against scanning every State and City and folding its name.
+
+usage:
+------
+python3 -m benchmarks.bench_autocomplete [-n <number of cities>]
+                                         [-q <queries>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import os
+import random
+import shutil
+import string
+import tempfile
+import time
+from models import storage
+from models.city import City
+from models.engine.autocomplete import fold
+from models.state import State
+
+ACCENTED = "àéèêíóôúüçñ"
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def word():
+    """Return a random capitalized word, sometimes accented."""
+    letters = random.choices(string.ascii_lowercase + ACCENTED,
+                             k=random.randint(3, 9))
+    return "".join(letters).capitalize()
+
+
+def scan(prefix, limit=10):
+    """Return the names of the locations starting with a prefix, by scan."""
+    prefix = fold(prefix)
+    found = []
+    for cls in (State, City):
+        for _, value in storage.items(cls):
+            if fold(value["name"]).startswith(prefix):
+                found.append(value["name"])
+    return sorted(found, key=fold)[:limit]
+
+
+def main():
+    """Run the benchmark in a temporary directory and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=100000,
+                        help="number of cities (default: 100000)")
+    parser.add_argument("-q", "--queries", type=int, default=1000,
+                        help="number of queries (default: 1000)")
+    args = parser.parse_args()
+
+    # Storage files are relative to the working directory
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        states = [State(name=f"{word()} {word()}") for _ in range(50)]
+        timed(f"create 50 states and {args.n} cities", lambda: [
+            City(name=" ".join(word() for _ in range(random.randint(1, 3))),
+                 state_id=random.choice(states).id)
+            for _ in range(args.n)])
+        prefixes = [fold(word())[:random.randint(1, 4)]
+                    for _ in range(args.queries)]
+
+        _, indexed = timed(f"{args.queries} completions with the index",
+                           lambda: [storage.autocomplete(prefix)
+                                    for prefix in prefixes])
+        expected, scanned = timed("1 completion by scan", scan, prefixes[0])
+        found = [location["name"]
+                 for location in storage.autocomplete(prefixes[0])
+                 if fold(location["name"]).startswith(fold(prefixes[0]))]
+        assert [fold(name) for name in found] == [
+            fold(name) for name in expected][:len(found)]
+        print(f"{'per completion, index':<44} "
+              f"{indexed / args.queries * 1e6:10.1f} us")
+        print(f"{'per completion, scan':<44} {scanned * 1e6:10.1f} us")
+        print(f"{'completions per second, index':<44} "
+              f"{args.queries / indexed:10.0f}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of snapshot and delta backups.
+
+Fills storage with places, takes a snapshot, updates and destroys a
+fraction of them and takes a delta, and reports the time and size of each.
+The delta is taken again once the timeline has been rebuilt, when the
+objects destroyed are found by comparing keys.
+
+usage:
+------
+python3 -m benchmarks.bench_backup [-n <number of places>] [--churn <ratio>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from models import storage
+from models.engine import backup
+from models.place import Place
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def main():
+    """Run the benchmark in a temporary directory and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=100000,
+                        help="number of places (default: 100000)")
+    parser.add_argument("--churn", type=float, default=0.001,
+                        help="fraction of places updated (default: 0.001)")
+    args = parser.parse_args()
+
+    # Storage files are relative to the working directory
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        places, _ = timed(f"create {args.n} places", lambda: [
+            Place(name=f"Place {i}", description="A quiet place " * 20,
+                  price_by_night=i % 300) for i in range(args.n)])
+        timed("save", storage.save)
+        print(f"{'file.json':<44} {os.path.getsize('file.json'):10d} B")
+
+        entry, _ = timed("snapshot backup", backup.backup, storage)
+        print(f"{entry['file']:<44} {entry['bytes']:10d} B")
+
+        churn = random.sample(places, max(2, int(args.n * args.churn)))
+        for place in churn[::2]:
+            place.price_by_night += 1
+            place.save()
+        for place in churn[1::2]:
+            storage.delete(place)
+        storage.save()
+        entry, _ = timed(f"delta backup ({args.churn:.2%} churn)",
+                         backup.backup, storage)
+        print(f"{entry['file']:<44} {entry['bytes']:10d} B")
+
+        # The sidecars are older than the file: the timeline is rebuilt
+        storage.reload()
+        for place in churn[::2]:
+            place.price_by_night += 1
+            place.save()
+        storage.delete(places[0] if places[0] not in churn else places[-1])
+        storage.save()
+        entry, _ = timed("delta backup, timeline rebuilt",
+                         backup.backup, storage)
+        print(f"{entry['file']:<44} {entry['bytes']:10d} B")
+
+        timed("restore to the delta", backup.restore, storage,
+              entry["until"])
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
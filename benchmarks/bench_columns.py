@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of scans over the shared memory columns of places.
+
+Fills storage with places and publishes their columns, then times the same
+aggregate (the mean price of the places for four guests or more) over the
+stored dictionaries, the typed memoryviews and, if it is installed, NumPy.
+Finally attaches a number of reader processes to the columns and reports
+the memory each of them holds privately.
+
+usage:
+------
+python3 -m benchmarks.bench_columns [-n <number of places>] [-r <readers>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+from models import storage
+from models.engine.columns import ColumnPublisher, ColumnReader
+from models.engine.prefork import memory
+from models.place import Place
+
+SEGMENT = f"hbnb-bench-{os.getpid()}"
+
+READER = """
+import json, sys
+from models.engine.columns import ColumnReader
+from models.engine.prefork import memory
+
+reader = ColumnReader(sys.argv[1])
+guests, prices = reader.column("max_guest"), reader.column("price_by_night")
+float(prices[guests >= 4].mean())
+print(json.dumps(memory()), flush=True)
+sys.stdin.readline()
+"""
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def scan_objects():
+    """Return the mean price for four guests or more, from storage."""
+    prices = [value["price_by_night"] for _, value in storage.items(Place)
+              if value["max_guest"] >= 4]
+    return sum(prices) / len(prices)
+
+
+def scan_memoryviews(reader):
+    """Return the mean price for four guests or more, from memoryviews."""
+    with patch.dict(sys.modules, {"numpy": None}):
+        guests = reader.column("max_guest")
+        prices = reader.column("price_by_night")
+    selected = [price for guest, price in zip(guests, prices) if guest >= 4]
+    guests.release()
+    prices.release()
+    return sum(selected) / len(selected)
+
+
+def scan_numpy(reader):
+    """Return the mean price for four guests or more, from NumPy."""
+    guests = reader.column("max_guest")
+    prices = reader.column("price_by_night")
+    return float(prices[guests >= 4].mean())
+
+
+def main():
+    """Run the benchmark in a temporary directory and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=100000,
+                        help="number of places (default: 100000)")
+    parser.add_argument("-r", "--readers", type=int, default=10,
+                        help="number of reader processes (default: 10)")
+    args = parser.parse_args()
+
+    # Storage files are relative to the working directory
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    publisher = None
+    try:
+        timed(f"create {args.n} places", lambda: [
+            Place(name=f"Place {i}", max_guest=random.randint(1, 8),
+                  price_by_night=random.randint(20, 500),
+                  latitude=random.uniform(-90, 90),
+                  longitude=random.uniform(-180, 180))
+            for i in range(args.n)])
+        publisher = ColumnPublisher(SEGMENT)
+        timed("publish the columns", publisher.publish)
+        reader = ColumnReader(SEGMENT)
+
+        expected, _ = timed("scan the stored dictionaries", scan_objects)
+        result, _ = timed("scan the memoryviews", scan_memoryviews, reader)
+        assert abs(result - expected) < 1e-6
+        try:
+            import numpy
+        except ModuleNotFoundError:
+            print("NumPy is not installed: no NumPy scan, and no readers")
+            return
+        result, _ = timed("scan NumPy views", scan_numpy, reader)
+        assert abs(result - expected) < 1e-6
+        reader.close()
+
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        processes = [subprocess.Popen(
+            [sys.executable, "-c", READER, SEGMENT], stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, text=True, env=env)
+            for _ in range(args.readers)]
+        usages = [json.loads(process.stdout.readline())
+                  for process in processes]
+        for process in processes:
+            process.communicate("\n")
+
+        size = os.path.getsize(f"/dev/shm/{SEGMENT}.{publisher.generation}")
+        rss = sum(usage["rss"] for usage in usages) / len(usages)
+        private = sum(usage["private"] for usage in usages) / len(usages)
+        print(f"{'shared column block':<44} {size / 2 ** 20:10.1f} MB")
+        print(f"{'writer process rss':<44} "
+              f"{memory()['rss'] / 2 ** 20:10.1f} MB")
+        print(f"{f'{args.readers} readers, mean rss':<44} "
+              f"{rss / 2 ** 20:10.1f} MB")
+        print(f"{f'{args.readers} readers, mean private':<44} "
+              f"{private / 2 ** 20:10.1f} MB")
+    finally:
+        if publisher is not None:
+            publisher.close()
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
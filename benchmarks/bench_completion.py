@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of tab completion in the console.
+
+Fills storage with places, then times completing class names, attribute
+names and ids as readline would ask HBNBCommand to, the ids being read from
+the id index rather than from `storage.all()`. The first completion of an
+id also sorts the ids created, and is timed apart.
+
+usage:
+------
+python3 -m benchmarks.bench_completion [-n <number of places>]
+                                       [-c <completions>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from console import HBNBCommand
+from models.place import Place
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def complete(console, line):
+    """Complete the end of a line the way readline asks cmd to."""
+    begidx = max(line.rfind(" "), line.rfind("-")) + 1
+    text = line[begidx:]
+    command = console.parseline(line)[0]
+    return getattr(console, f"complete_{command}")(text, line, begidx,
+                                                   len(line))
+
+
+def main():
+    """Run the benchmark in a temporary directory and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=1000000,
+                        help="number of places (default: 1000000)")
+    parser.add_argument("-c", "--completions", type=int, default=1000,
+                        help="number of completions per kind "
+                        "(default: 1000)")
+    args = parser.parse_args()
+
+    # Storage files are relative to the working directory
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        places, _ = timed(f"create {args.n} places", lambda: [
+            Place().id for _ in range(args.n)])
+        console = HBNBCommand()
+        timed("first id completion, sorting every id", complete, console,
+              "show Place ")
+
+        ids = random.sample(places, args.completions)
+        kinds = [("class names", ["show P"] * args.completions),
+                 ("attribute names",
+                  [f"update Place {obj_id} pr" for obj_id in ids]),
+                 ("ids, 1-4 characters", [
+                     f"show Place {obj_id[:random.randint(1, 4)]}"
+                     for obj_id in ids]),
+                 ("ids past their first '-'",
+                  [f"show Place {obj_id[:12]}" for obj_id in ids])]
+        for label, lines in kinds:
+            _, elapsed = timed(f"{args.completions} completions of {label}",
+                               lambda: [complete(console, line)
+                                        for line in lines])
+            print(f"{'':<10}{elapsed / args.completions * 1000:.3f} ms "
+                  "per completion")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the console server.
+
+Starts console_server.py on a Unix socket in a temporary directory, creates
+some places, then has concurrent clients pipeline `show` and `count`
+commands, and reports the commands served per second.
+
+usage:
+------
+python3 -m benchmarks.bench_console_server [-n <commands per client>]
+    [-c <clients>] [-d <pipeline depth>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from console_client import ConsoleClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_client(path, lines, depth, results):
+    """Send lines in pipelined batches and record the elapsed time."""
+    client = ConsoleClient(path)
+    start = time.perf_counter()
+    for position in range(0, len(lines), depth):
+        client.pipeline(lines[position:position + depth])
+    results.append(time.perf_counter() - start)
+    client.close()
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=50000,
+                        help="commands per client (default: 50000)")
+    parser.add_argument("-c", type=int, default=4,
+                        help="concurrent clients (default: 4)")
+    parser.add_argument("-d", type=int, default=64,
+                        help="pipeline depth (default: 64)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "hbnb.sock")
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "console_server.py"),
+         "--socket", path], cwd=workdir, stdout=subprocess.DEVNULL,
+        env=dict(os.environ, PYTHONPATH=ROOT))
+    try:
+        while not os.path.exists(path):
+            time.sleep(0.05)
+        client = ConsoleClient(path)
+        ids = [client.execute("create Place").strip() for _ in range(100)]
+        client.close()
+
+        lines = [f"show Place {ids[i % len(ids)]}" if i % 2
+                 else "Place.count()" for i in range(args.n)]
+        results = []
+        threads = [threading.Thread(target=run_client,
+                                    args=(path, lines, args.d, results))
+                   for _ in range(args.c)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        total = args.n * args.c
+        print(f"{total} commands from {args.c} clients, pipeline depth "
+              f"{args.d}: {elapsed:.2f} s, {total / elapsed:,.0f} commands/s")
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
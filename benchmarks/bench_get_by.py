@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of user lookups by email.
+
+Fills storage with users, then times looking them up by email with
+FileStorage.get_by, served by the unique index on User.email, against a
+scan comparing the email of every user.
+
+usage:
+------
+python3 -m benchmarks.bench_get_by [-n <number of users>] [-l <lookups>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from models import storage
+from models.user import User
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def scan(email):
+    """Return the user with an email, comparing every user."""
+    email = email.casefold()
+    for _, value in storage.items(User):
+        if value["email"].casefold() == email:
+            return User(**value)
+    return None
+
+
+def main():
+    """Run the benchmark in a temporary directory and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=100000,
+                        help="number of users (default: 100000)")
+    parser.add_argument("-l", "--lookups", type=int, default=100,
+                        help="number of lookups (default: 100)")
+    args = parser.parse_args()
+
+    # Storage files are relative to the working directory
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        timed(f"create {args.n} users", lambda: [
+            User(email=f"user{i}@mail.com", first_name=f"User {i}")
+            for i in range(args.n)])
+        emails = [f"USER{random.randrange(args.n)}@mail.com"
+                  for _ in range(args.lookups)]
+
+        found, indexed = timed(
+            f"{args.lookups} lookups with the unique index",
+            lambda: [storage.get_by(User, email=email) for email in emails])
+        expected, scanned = timed(
+            f"{args.lookups} lookups by scan",
+            lambda: [scan(email) for email in emails])
+        assert [user.id for user in found] == [user.id for user in expected]
+        print(f"{'per lookup, unique index':<44} "
+              f"{indexed / args.lookups * 1e6:10.1f} us")
+        print(f"{'per lookup, scan':<44} "
+              f"{scanned / args.lookups * 1e6:10.1f} us")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of abbreviated id resolution.
+
+Fills storage with places, then times resolving short id prefixes with
+FileStorage.resolve, served by the sorted IdIndex, against comparing the
+start of every key of storage. Also times the reload, which sorts the ids
+read, the first search after it, and the minimal_unique_prefix report.
+
+usage:
+------
+python3 -m benchmarks.bench_ids [-n <number of places>] [-l <lookups>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.engine.ids import IdIndex
+from models.place import Place
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def scan(prefix):
+    """Return the ids of the places starting with a prefix, from keys."""
+    return [key.split(".", 1)[1] for key, _ in storage.items(Place)
+            if key.split(".", 1)[1].startswith(prefix)]
+
+
+def main():
+    """Run the benchmark in a temporary directory and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=1000000,
+                        help="number of places (default: 1000000)")
+    parser.add_argument("-l", "--lookups", type=int, default=1000,
+                        help="number of lookups (default: 1000)")
+    args = parser.parse_args()
+
+    # Storage files are relative to the working directory
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        places, _ = timed(f"create {args.n} places", lambda: [
+            Place().id for _ in range(args.n)])
+        index = FileStorage.index(IdIndex)
+        storage.save()
+        timed("reload, sorting the ids read", storage.reload)
+        timed("first search after the reload", index.count, "Place", "0")
+        lengths, _ = timed("minimal_unique_prefix report",
+                           storage.minimal_unique_prefix, Place)
+        length = lengths["Place"]
+        prefixes = [obj_id[:length] for obj_id in
+                    random.sample(places, args.lookups)]
+
+        _, indexed = timed(f"resolve {args.lookups} {length}-char prefixes",
+                           lambda: [storage.resolve(Place, prefix)
+                                    for prefix in prefixes])
+        found, scanned = timed("resolve 1 prefix by scanning keys",
+                               scan, prefixes[0])
+        assert found == [storage.resolve(Place, prefixes[0])]
+        print(f"{'per lookup, sorted index':<44} "
+              f"{indexed / args.lookups * 1e6:10.1f} us")
+        print(f"{'per lookup, scan':<44} {scanned * 1e6:10.1f} us")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
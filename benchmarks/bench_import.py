@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the time `import models` takes.
+
+Runs `python -X importtime -c "import models"` in fresh processes, in a
+directory without a file.json and in one holding a large one, and reports
+the time the import of models took. The file is not read on import, nor are
+the modules of the indexes, of the parallel scans and of the followers
+imported: the benchmark fails if any of those is.
+
+usage:
+------
+python3 -m benchmarks.bench_import [-n <number of objects>] [-r <runs>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Modules imported on first use only
+DEFERRED = ("models.engine.autocomplete", "models.engine.changes",
+            "models.engine.ids", "models.engine.listings",
+            "models.engine.reviews", "models.engine.search",
+            "models.engine.surrogates", "models.engine.timeline",
+            "models.engine.unique", "pkgutil", "multiprocessing",
+            "concurrent.futures", "ctypes", "socket", "threading")
+
+
+def import_models(workdir):
+    """Import models in a fresh process and return its import times.
+
+    Returns_:
+        dict: The cumulative microseconds of every module imported.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    env.pop("HBNB_STORAGE_MODE", None)
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import models"],
+        cwd=workdir, env=env, check=True, capture_output=True,
+        text=True).stderr
+
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    """Time the import with and without a large file and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=200000,
+                        help="number of objects in file.json "
+                             "(default: 200000)")
+    parser.add_argument("-r", "--runs", type=int, default=20,
+                        help="number of imports timed (default: 20)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        empty = os.path.join(workdir, "empty")
+        full = os.path.join(workdir, "full")
+        os.mkdir(empty)
+        os.mkdir(full)
+        with open(os.path.join(full, "file.json"), "w") as outfile:
+            json.dump({f"Place.{i}": {"__class__": "Place", "id": str(i),
+                                      "name": f"Place {i}"}
+                       for i in range(args.n)}, outfile)
+
+        imported = set()
+        for label, directory in (("without file.json", empty),
+                                 (f"with {args.n} objects", full)):
+            runs = []
+            for _ in range(args.runs):
+                times = import_models(directory)
+                runs.append(times["models"] / 1000)
+                imported.update(times)
+            print(f"{'import models, ' + label:<44} "
+                  f"{statistics.median(runs):10.1f} ms median, "
+                  f"{min(runs):.1f} ms best")
+    finally:
+        shutil.rmtree(workdir)
+
+    eager = [name for name in DEFERRED if name in imported]
+    if eager:
+        sys.exit(f"imported by 'import models': {', '.join(eager)}")
+    print(f"{'modules deferred to first use':<44} {len(DEFERRED):10d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of key-heavy storage operations.
+
+Compares the string handling the storage engine used to do (`key.split(".")`
+class filtering, `uuid.uuid4()` per object, plain dicts) with the
+class-grouped ObjectMap and batched id generator, and shows what interning
+every key built, rather than only the keys the ObjectMap stores, would cost.
+
+usage:
+------
+python3 -m benchmarks.bench_keys [-n <number of keys>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import sys
+import time
+import uuid
+from models.engine.keys import make_key, new_id
+from models.engine.object_map import ObjectMap
+
+CLASSES = ("BaseModel", "User", "Place", "State", "City", "Amenity",
+           "Review")
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def old_ids(count):
+    """Generate ids one uuid.uuid4() call at a time."""
+    return [str(uuid.uuid4()) for _ in range(count)]
+
+
+def new_ids(count):
+    """Generate ids through the batched generator."""
+    return [new_id() for _ in range(count)]
+
+
+def interned_keys(pairs):
+    """Build keys interned on every call."""
+    return [sys.intern(f"{cls}.{obj_id}") for cls, obj_id in pairs]
+
+
+def new_keys(pairs):
+    """Build keys through make_key."""
+    return [make_key(cls, obj_id) for cls, obj_id in pairs]
+
+
+def lookups(objects, pairs):
+    """Look every pair up by its key."""
+    return [objects[make_key(cls, obj_id)] for cls, obj_id in pairs]
+
+
+def old_filter(objects, cls_name):
+    """Filter a plain dict by class by splitting every key."""
+    return [key for key in objects if key.split(".")[0] == cls_name]
+
+
+def new_filter(objects, cls_name):
+    """Filter an ObjectMap by class through its class index."""
+    return list(objects.keys_of(cls_name))
+
+
+def main():
+    """Run every comparison and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=200000,
+                        help="number of keys (default: 200000)")
+    count = parser.parse_args().n
+
+    print(f"--- {count} keys ---")
+    ids, before = timed("ids: uuid.uuid4()", old_ids, count)
+    _, after = timed("ids: batched os.urandom", new_ids, count)
+    print(f"{'':<44} {before / after:9.1f}x")
+
+    pairs = [(CLASSES[i % len(CLASSES)], obj_id)
+             for i, obj_id in enumerate(ids)]
+    _, before = timed("keys: sys.intern on every call", interned_keys,
+                      pairs)
+    keys, after = timed("keys: make_key", new_keys, pairs)
+    print(f"{'':<44} {before / after:9.1f}x")
+
+    plain_map, before = timed("insert: dict", dict.fromkeys, keys, 0)
+    object_map, after = timed("insert: ObjectMap (interned once)",
+                              ObjectMap, plain_map)
+    print(f"{'':<44} {before / after:9.2f}x")
+
+    _, before = timed("lookup: dict", lookups, plain_map, pairs)
+    _, after = timed("lookup: ObjectMap", lookups, object_map, pairs)
+    print(f"{'':<44} {before / after:9.2f}x")
+
+    _, before = timed("filter 7 classes: key.split('.')",
+                      lambda: [old_filter(plain_map, c) for c in CLASSES])
+    _, after = timed("filter 7 classes: ObjectMap.keys_of",
+                     lambda: [new_filter(object_map, c) for c in CLASSES])
+    print(f"{'':<44} {before / after:9.1f}x")
+
+    _, before = timed("count 7 classes: startswith", lambda: [
+        sum(1 for key in plain_map if key.startswith(f"{c}."))
+        for c in CLASSES])
+    _, after = timed("count 7 classes: ObjectMap.count",
+                     lambda: [object_map.count(c) for c in CLASSES])
+    print(f"{'':<44} {before / max(after, 1e-9):9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
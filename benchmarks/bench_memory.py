@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the memory held by the full-text index over Review texts.
+
+Measures with tracemalloc the posting lists of the SearchIndex, referring to
+the reviews by their Surrogates numbers in arrays, against the same
+postings kept in dictionaries keyed by review id, as the index did before:
+once built from the reviews, and once read back from its JSON sidecar.
+
+usage:
+------
+python3 -m benchmarks.bench_memory [-n <number of reviews>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import gc
+import json
+import tracemalloc
+from benchmarks.bench_search import reviews
+from models.engine.keys import split_key
+from models.engine.search import SearchIndex, tokenize
+from models.engine.surrogates import Surrogates
+
+
+def measured(label, func, *args):
+    """Run func once and print the memory still held by what it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<44} {size / 2 ** 20:10.1f} MiB")
+    return result, size
+
+
+def keyed(objects):
+    """Build postings keyed by review id, as the index used to."""
+    postings = {}
+    docs = {}
+    for key, value in objects.items():
+        _, obj_id = split_key(key)
+        terms = tokenize(value["text"])
+        frequencies = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term, frequency in frequencies.items():
+            postings.setdefault(term, {})[obj_id] = frequency
+        docs[obj_id] = (len(terms), tuple(frequencies))
+    return postings, docs
+
+
+def keyed_load(text):
+    """Read back postings keyed by review id from their JSON form."""
+    state = json.loads(text)
+    terms = {}
+    for term, posting in state["postings"].items():
+        for obj_id in posting:
+            terms.setdefault(obj_id, []).append(term)
+    return state["postings"], {obj_id: (length, tuple(terms[obj_id]))
+                               for obj_id, length in state["lengths"].items()}
+
+
+def numbered(objects):
+    """Build the SearchIndex on the Surrogates numbers of the reviews."""
+    surrogates = Surrogates()
+    index = SearchIndex(surrogates)
+    for key, value in objects.items():
+        surrogates.on_set(key, None, value)
+        index.on_set(key, None, value)
+    return surrogates, index
+
+
+def numbers_load(text):
+    """Read back the Surrogates numbers."""
+    surrogates = Surrogates()
+    surrogates.load(json.loads(text))
+    return surrogates
+
+
+def numbered_load(texts):
+    """Read back the Surrogates numbers and the SearchIndex."""
+    surrogates = numbers_load(texts[0])
+    index = SearchIndex(surrogates)
+    index.load(json.loads(texts[1]))
+    return surrogates, index
+
+
+def main():
+    """Measure both layouts and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=200000,
+                        help="number of reviews (default: 200000)")
+    count = parser.parse_args().n
+
+    print(f"--- {count} reviews ---")
+    objects = reviews(count)
+
+    (postings, docs), built = measured("keyed by id, built", keyed, objects)
+    text = json.dumps({"postings": postings, "lengths": {
+        obj_id: doc[0] for obj_id, doc in docs.items()}})
+    del postings, docs
+    _, loaded = measured("keyed by id, read back", keyed_load, text)
+    del text, _
+
+    (surrogates, index), numbers_built = measured(
+        "numbered, built", numbered, objects)
+    texts = (json.dumps(surrogates.dump()), json.dumps(index.dump()))
+    del surrogates, index
+    _, numbers_loaded = measured("numbered, read back", numbered_load, texts)
+    del _
+    measured("  of which the numbers", numbers_load, texts[0])
+
+    print(f"built:     {built / numbers_built:.1f}x less memory")
+    print(f"read back: {loaded / numbers_loaded:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of prefork workers against independent worker processes.
+
+Saves a dataset of places, then starts a number of workers two ways: as
+independent processes each loading the file, and forked from a master that
+loaded it once (see models.engine.prefork). Every worker answers the same
+random reads, then reports its memory; the benchmark prints the time until
+every worker was ready and the memory of each.
+
+usage:
+------
+python3 -m benchmarks.bench_prefork [-n <number of places>] [-w <workers>]
+                                    [-q <queries per worker>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from models import storage
+from models.engine.prefork import Prefork, memory
+from models.place import Place
+
+WORKER = """
+import json, random, sys
+from models import storage
+from models.engine.prefork import memory
+
+storage.count()
+random.seed(int(sys.argv[2]))
+ids = [key.split(".", 1)[1] for key, _ in storage.items("Place")]
+for obj_id in random.sample(ids, min(int(sys.argv[1]), len(ids))):
+    storage.get("Place", obj_id).to_dict()
+print(json.dumps(memory()), flush=True)
+sys.stdin.readline()
+"""
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def independent(workers, queries):
+    """Start independent workers; return their processes and memory."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    processes = [subprocess.Popen(
+        [sys.executable, "-c", WORKER, str(queries), str(seed)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, env=env)
+        for seed in range(workers)]
+
+    return processes, [json.loads(process.stdout.readline())
+                       for process in processes]
+
+
+def preforked(workers, queries):
+    """Start prefork workers; return their master and memory."""
+    read_fd, write_fd = os.pipe()
+
+    def serve():
+        """Answer the reads, report memory and wait to be terminated."""
+        random.seed(os.getpid())
+        for obj_id in random.sample(ids, min(queries, len(ids))):
+            storage.get("Place", obj_id).to_dict()
+        os.write(write_fd, json.dumps(memory()).encode() + b"\n")
+        time.sleep(600)
+
+    # The master loads the file once, for every worker; listing the ids
+    # there keeps the workers from touching every object
+    storage.reload()
+    ids = [key.split(".", 1)[1] for key, _ in storage.items("Place")]
+    master = Prefork(serve, workers)
+    master.start()
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as infile:
+        usages = [json.loads(infile.readline()) for _ in range(workers)]
+
+    return master, usages
+
+
+def print_usages(label, usages):
+    """Print the memory of every worker and the totals."""
+    print(f"{label}: {'rss':>8} {'shared':>8} {'private':>8} {'pss':>8} MB")
+    for usage in usages:
+        print(" " * len(label) + "  " + " ".join(
+            f"{usage[field] / 2 ** 20:8.1f}"
+            for field in ("rss", "shared", "private", "pss")))
+    print(" " * len(label) + "  total private "
+          f"{sum(usage['private'] for usage in usages) / 2 ** 20:8.1f} MB, "
+          f"total pss {sum(usage['pss'] for usage in usages) / 2 ** 20:8.1f}"
+          " MB")
+
+
+def main():
+    """Run the benchmark in a temporary directory and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=100000,
+                        help="number of places (default: 100000)")
+    parser.add_argument("-w", "--workers", type=int, default=4,
+                        help="number of workers (default: 4)")
+    parser.add_argument("-q", "--queries", type=int, default=1000,
+                        help="reads per worker (default: 1000)")
+    args = parser.parse_args()
+    if memory() is None:
+        sys.exit("memory usage is only known on Linux")
+
+    # Storage files are relative to the working directory
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        timed(f"create {args.n} places", lambda: [
+            Place(name=f"Place {i}", description="A quiet place " * 20,
+                  price_by_night=i % 300) for i in range(args.n)])
+        storage.save()
+
+        (processes, usages), _ = timed(
+            f"start {args.workers} independent workers", independent,
+            args.workers, args.queries)
+        for process in processes:
+            process.communicate("\n")
+        print_usages("independent", usages)
+
+        (master, usages), _ = timed(
+            f"start {args.workers} prefork workers", preforked,
+            args.workers, args.queries)
+        master.stop()
+        print_usages("prefork    ", usages)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of parallel scans against the core count.
+
+Fills storage with places and reviews, then times two full scans with
+FileStorage.scan for every number of workers: the reviews whose text
+contains a word, and the places under a price in 500 cities. Prints each
+time and its speedup over the scan in one process.
+
+usage:
+------
+python3 -m benchmarks.bench_scan [-n <number of objects>]
+                                 [-w <workers> [<workers> ...]]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from models import storage
+from models.engine.query import Where
+from models.place import Place
+from models.review import Review
+
+WORDS = ("quiet clean cosy bright spacious noisy central friendly warm "
+         "lovely modern rustic charming tidy airy sunny").split()
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def main():
+    """Run the benchmark in a temporary directory and print a summary."""
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=200000,
+                        help="number of places and of reviews "
+                        "(default: 200000)")
+    parser.add_argument("-w", "--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, cores}),
+                        help="numbers of workers (default: 1 2 4 and the "
+                        "core count)")
+    args = parser.parse_args()
+
+    # Storage files are relative to the working directory
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        cities = [f"city-{i}" for i in range(5000)]
+        timed(f"create {args.n} places and reviews", lambda: [
+            (Place(name=f"Place {i}", city_id=random.choice(cities),
+                   price_by_night=random.randint(20, 500)),
+             Review(text=" ".join(random.choices(WORDS, k=30)) +
+                    (" hidden gem" if i % 1000 == 0 else "")))
+            for i in range(args.n)])
+
+        scans = [("reviews containing 'hidden gem'", Review,
+                  Where("text", "contains", "hidden gem")),
+                 ("places under 100 in 500 cities", Place,
+                  Where("price_by_night", "<", 100) &
+                  Where("city_id", "in", random.sample(cities, 500)))]
+        print(f"{cores} cores")
+        for label, cls, query in scans:
+            serial = None
+            for workers in args.workers:
+                found, elapsed = timed(f"{label}, {workers} workers",
+                                       storage.scan, cls, query, workers)
+                serial = serial or elapsed
+                print(f"{'':<10}{len(found)} found, "
+                      f"speedup {serial / elapsed:.2f}x")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of full-text search over Review texts.
+
+Compares loading every review and substring-matching its text in Python with
+a ranked query on the SearchIndex kept in sync with storage.
+
+usage:
+------
+python3 -m benchmarks.bench_search [-n <number of reviews>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import itertools
+import random
+import time
+from models.engine.keys import make_key, new_id
+from models.engine.object_map import ObjectMap
+from models.engine.search import SearchIndex
+
+WORDS = ("great clean quiet noisy host beach view cozy small spacious "
+         "kitchen bed shower wifi parking location friendly dirty "
+         "downtown walk station garden pool breakfast balcony").split()
+# Filler words make up the rest of a Zipf-distributed vocabulary, as in
+# real text where most words are rare
+VOCABULARY = WORDS + [f"word{rank}" for rank in range(20000)]
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+QUERIES = ("quiet beach", "great host friendly", "clean", "wifi parking",
+           "noisy downtown station")
+
+
+def timed(label, func, *args):
+    """Run func once and print how long it took."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def reviews(count):
+    """Generate the stored dictionaries of random reviews."""
+    rng = random.Random(0)
+    weights = list(itertools.accumulate(WEIGHTS))
+    objects = {}
+    for _ in range(count):
+        obj_id = new_id()
+        objects[make_key("Review", obj_id)] = {
+            "__class__": "Review", "id": obj_id,
+            "text": " ".join(rng.choices(VOCABULARY, cum_weights=weights,
+                                         k=rng.randint(5, 30)))}
+    return objects
+
+
+def scan(objects, query):
+    """Find the reviews containing every query word by substring matching."""
+    words = query.split()
+    return [key for key, value in objects.items()
+            if all(word in value["text"].lower() for word in words)]
+
+
+def main():
+    """Run every comparison and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-n", type=int, default=1000000,
+                        help="number of reviews (default: 1000000)")
+    count = parser.parse_args().n
+
+    print(f"--- {count} reviews ---")
+    data, _ = timed("generate reviews", reviews, count)
+    index = SearchIndex()
+    objects, _ = timed("ObjectMap build + index", lambda: ObjectMap(
+        data, listeners=[index]))
+
+    for query in QUERIES:
+        _, before = timed(f"scan: {query!r}", scan, objects, query)
+        _, after = timed(f"search: {query!r}", index.search, "Review",
+                         query)
+        print(f"{'':<44} {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,32 +15,48 @@ __version__ = "1.1"
 
 import ast
 import cmd
+import cProfile
+import pstats
+import re
 import shlex
 import json
-from models.base_model import BaseModel
-from models.user import User
-from models.place import Place
-from models.state import State
-from models.city import City
-from models.amenity import Amenity
-from models.review import Review
+import sys
+import tracemalloc
 from models import storage
+from models.engine import backup
+from models.engine.registry import classes
+from models.engine.search import FIELDS
+from models.engine.timeline import timestamp
 
-# Dictionary mapping class names to their respective class objects
-class_models = {
-    'BaseModel': BaseModel,
-    'User': User,
-    'Place': Place,
-    'State': State,
-    'City': City,
-    'Amenity': Amenity,
-    'Review': Review
-}
+# Mapping of class names to their respective class objects, shared with the
+# storage engine and filled as model modules are imported
+class_models = classes
+
+# The most ids offered when completing one
+COMPLETIONS = 50
+# The methods of the `<class name>.<method>(...)` syntax, as completed
+METHODS = ("all()", "count()", "show(", "destroy(", "update(")
+# What each argument of the methods taking arguments is, when completed
+ARGUMENTS = {"show": ("id",), "destroy": ("id",),
+             "update": ("id", "attribute")}
+# A `<class name>.<method>(<arguments>` line being typed
+_CALL = re.compile(r"\s*(\w+)\.(\w+)\((.*)$")
+
+
+def _attributes(cls):
+    """Return the attribute names annotated on a class and its bases."""
+    names = {}
+    for klass in reversed(cls.__mro__):
+        names.update(dict.fromkeys(getattr(klass, "__annotations__", {})))
+
+    return list(names)
 
 
 class HBNBCommand(cmd.Cmd):
     """Command interpreter for HBNB."""
     prompt = '(hbnb) '
+    # Whether `profile -o` may write files, which served consoles refuse
+    dumps_profiles = True
 
     def do_quit(self, line):
         """Quit command to exit the program
@@ -75,8 +91,8 @@ class HBNBCommand(cmd.Cmd):
 
         # Create a new instance
         my_model = class_models[cls]()
-        my_model.save()
-        print(my_model.id)
+        if self.__save(my_model):
+            print(my_model.id)
 
     def do_show(self, line):
         """Show an object by class name and ID.
@@ -84,6 +100,8 @@ class HBNBCommand(cmd.Cmd):
         usage:
         ------
         show <class name> <instance id>
+
+        The id may be abbreviated to any prefix unique within the class.
         """
         args = line.split()
         if len(args) < 1:
@@ -100,15 +118,12 @@ class HBNBCommand(cmd.Cmd):
             return
 
         id = args[1].strip('\'" ')
-        key = f"{cls}.{id}"
-
-        data = storage.all()
+        obj = self.__get(cls, id)
 
-        if key not in data:
-            print("** no instance found **")
+        if obj is None:
             return
 
-        print(data[key])
+        print(obj)
 
     def do_destroy(self, line):
         """Show an object by class name and ID.
@@ -116,6 +131,8 @@ class HBNBCommand(cmd.Cmd):
         usage:
         ------
         destroy <class name> <instance id>
+
+        The id may be abbreviated to any prefix unique within the class.
         """
         args = line.split()
         if len(args) < 1:
@@ -132,17 +149,12 @@ class HBNBCommand(cmd.Cmd):
             return
 
         id = args[1].strip('\'" ')
-        key = f"{cls}.{id}"
-
-        data = storage.all()
+        obj = self.__get(cls, id)
 
-        if key not in data:
-            print("** no instance found **")
+        if obj is None:
             return
 
-        del storage._FileStorage__objects[key]
-
-        storage.save()
+        self.__delete(obj)
 
     def do_all(self, line):
         """Display all instances of a class or all instances if no class is
@@ -160,18 +172,262 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
             return
 
-        storage.reload()
+        data = [str({key: value}) for key, value in storage.items(cls)]
+
+        print(data)
+
+    def do_prefixes(self, line):
+        """Display how many leading characters of an id are enough to
+        tell the instances of each class apart in show, destroy and update.
+
+        usage:
+        ------
+        prefixes [<class name>]
+        """
+        cls = line.strip() or None
+        if cls is not None and cls not in class_models:
+            print("** class doesn't exist **")
+            return
+
+        for name, length in storage.minimal_unique_prefix(cls).items():
+            print(f"{name}: {length}")
+
+    def do_listing(self, line):
+        """Display one page of the places of a City or State, sorted by name.
+
+        usage:
+        ------
+        listing <City|State> <id> [<page number>]
+        """
+        args = line.split()
+        if len(args) < 1:
+            print("** class name missing **")
+            return
+
+        cls = args[0].strip('\'" ')
+        if cls not in class_models:
+            print("** class doesn't exist **")
+            return
+
+        if cls not in ("City", "State"):
+            print("** listings exist only for City and State **")
+            return
+
+        if len(args) < 2:
+            print("** instance id missing **")
+            return
+
+        id = args[1].strip('\'" ')
+        if storage.get(cls, id) is None:
+            print("** no instance found **")
+            return
+
+        try:
+            number = int(args[2]) if len(args) > 2 else 1
+        except ValueError:
+            number = 0
+        if number < 1:
+            print("** invalid page number **")
+            return
+
+        places, pages = storage.listing(cls, id, number - 1)
+
+        print([str(place) for place in places])
+        print(f"page {number} of {pages}")
+
+    def do_search(self, line):
+        """Display the keys of the objects best matching search terms.
+
+        usage:
+        ------
+        search <class name> "<terms>" [<number of results>]
+        """
+        try:
+            args = shlex.split(line)
+        except ValueError:
+            args = line.split()
+
+        if len(args) < 1:
+            print("** class name missing **")
+            return
+
+        cls = args[0]
+        if cls not in class_models:
+            print("** class doesn't exist **")
+            return
+
+        if cls not in FIELDS:
+            print("** class is not searchable **")
+            return
+
+        if len(args) < 2 or not args[1].strip():
+            print("** search terms missing **")
+            return
+
+        try:
+            limit = int(args[2]) if len(args) > 2 else 10
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            print("** invalid number of results **")
+            return
+
+        print([key for key, _ in storage.search(cls, args[1], limit)])
+
+    def do_autocomplete(self, line):
+        """Display the States and Cities whose name, or a word of it, starts
+        with a prefix, in any case and with or without accents.
+
+        usage:
+        ------
+        autocomplete [State|City] "<prefix>" [<number of results>]
+        """
+        try:
+            args = shlex.split(line)
+        except ValueError:
+            args = line.split()
+
+        cls = None
+        if args and args[0] in ("State", "City"):
+            cls = args.pop(0)
+
+        if not args or not args[0].strip():
+            print("** prefix missing **")
+            return
+
+        try:
+            limit = int(args[1]) if len(args) > 1 else 10
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            print("** invalid number of results **")
+            return
+
+        for location in storage.autocomplete(args[0], limit, cls):
+            state = location.get("state")
+            print(f"[{location['__class__']}] ({location['id']}) "
+                  f"{location['name']}" + ("" if state is None
+                                           else f", {state}"))
+
+    def do_since(self, line):
+        """Display the instances updated after a time, oldest change first.
+
+        usage:
+        ------
+        since <ISO 8601 time> [<class name>]
+        """
+        args = line.split()
+        if len(args) < 1:
+            print("** time missing **")
+            return
+
+        cls = args[1].strip('\'" ') if len(args) > 1 else None
+        if cls is not None and cls not in class_models:
+            print("** class doesn't exist **")
+            return
+
+        try:
+            objects = list(storage.changed_since(args[0].strip('\'" '), cls))
+        except ValueError:
+            print("** invalid time **")
+            return
+
+        print([str(obj) for obj in objects])
+
+    def do_replication(self, line):
+        """Display how far behind its primary this follower is.
+
+        usage:
+        ------
+        replication
+        """
+        status = storage.replication()
+        if status is None:
+            print("** storage is not a follower **")
+            return
+
+        print(f"sequence: {status['sequence']}")
+        print(f"lag: {status['lag'] * 1000:.1f} ms")
+        print(f"pending: {status['pending']} bytes")
+        print(f"mode: {status['mode']}")
+
+    def do_backup(self, line):
+        """Back storage up, as a snapshot or as a delta of the last backup.
+
+        usage:
+        ------
+        backup [full]
+        """
+        args = line.split()
+        if args and args[0] != "full":
+            print("** usage: backup [full] **")
+            return
+
+        entry = backup.backup(storage, full=bool(args))
+
+        print(f"{entry['kind']} {entry['file']}: {entry['objects']} "
+              f"objects, {entry['deleted']} deleted, {entry['bytes']} bytes")
+
+    def do_restore(self, line):
+        """Bring storage back to its state at a given time.
+
+        usage:
+        ------
+        restore <ISO 8601 time>
+        """
+        args = line.split()
+        if len(args) < 1:
+            print("** time missing **")
+            return
+
+        try:
+            ts = timestamp(args[0].strip('\'" '))
+        except ValueError:
+            print("** invalid time **")
+            return
+
+        try:
+            count = backup.restore(storage, ts)
+        except ValueError:
+            print("** no backup before that time **")
+            return
+        except PermissionError as error:
+            print(f"** {error} **")
+            return
+
+        print(f"{count} objects restored")
 
-        loaded_dict = storage._FileStorage__objects.copy()
+    def do_bgsave(self, line):
+        """Save storage from a forked child while the console carries on.
 
-        if cls is not None:
-            data = [str({obj: key}) for obj,
-                    key in loaded_dict.items() if obj.split('.')[0] == cls]
+        usage:
+        ------
+        bgsave
+        """
+        try:
+            started = storage.bgsave()
+        except PermissionError as error:
+            print(f"** {error} **")
+            return
+
+        if started:
+            print("Background saving started")
         else:
-            data = [str({obj: key}) for obj,
-                    key in loaded_dict.items()]
+            print("** background save already in progress **")
 
-        print(data)
+    def do_info(self, line):
+        """Display the state of the storage engine and of background saves.
+
+        usage:
+        ------
+        info
+        """
+        for key, value in storage.info().items():
+            if key.endswith("_cow_bytes") and value is not None:
+                value = f"{value / 1024:.1f} kB"
+            elif key.endswith("_duration") and value is not None:
+                value = f"{value * 1000:.1f} ms"
+            print(f"{key}: {value}")
 
     def do_update(self, line):
         """Update an object's attribute.
@@ -179,6 +435,8 @@ class HBNBCommand(cmd.Cmd):
         Usage:
         ------
         update <class name> <id> <attribute name> "<attribute value>"
+
+        The id may be abbreviated to any prefix unique within the class.
         """
         args = shlex.split(line)[:4]
 
@@ -204,18 +462,15 @@ class HBNBCommand(cmd.Cmd):
             return
 
         id = args[1].strip('\'" ')
-        key = f"{cls}.{id}"
         attr_name = args[2].strip('\'" ')
         attr_value = args[3].strip('\'" ')  # Remove quotes
 
-        data = storage.all()
+        obj = self.__get(cls, id)
 
-        if key not in data:
-            print("** no instance found **")
+        if obj is None:
             return
 
         # Update the attribute
-        obj = data[key]
         try:
             # Convert to appropriate type if possible
             attr_value = json.loads(attr_value)
@@ -225,7 +480,234 @@ class HBNBCommand(cmd.Cmd):
         finally:
             setattr(obj, attr_name, attr_value)
 
-            obj.save()  # Save the updated object
+            self.__save(obj)  # Save the updated object
+
+    def do_profile(self, line):
+        """Run any console command under cProfile and tracemalloc.
+
+        Prints the top functions by cumulative time, the peak traced memory
+        and the top allocation sites of the wrapped command.
+
+        usage:
+        ------
+        profile [-n <top N>] [-o <file.prof>] <command line>
+        """
+        top = 10
+        dump_path = None
+        command = line.strip()
+        while command.startswith(("-n", "-o")):
+            # Options are consumed off the raw line so that quoting inside
+            # the wrapped command is passed through untouched
+            parts = command.split(None, 2)
+            if len(parts) < 2:
+                print("** option value missing **")
+                return
+
+            option, value = parts[0], parts[1]
+            command = parts[2] if len(parts) > 2 else ""
+
+            if option == "-n":
+                if not value.isdigit() or int(value) < 1:
+                    print("** invalid number of entries **")
+                    return
+                top = int(value)
+            elif option == "-o":
+                if not self.dumps_profiles:
+                    print("** profile files are not written here **")
+                    return
+                dump_path = value
+            else:
+                print(f"** unknown option {option} **")
+                return
+
+        if not command:
+            print("** command missing **")
+            return
+
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(self.onecmd, command)
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if not was_tracing:
+                tracemalloc.stop()
+
+        print(f"--- cProfile: top {top} by cumulative time ---")
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats(
+            pstats.SortKey.CUMULATIVE).print_stats(top)
+
+        print(f"--- tracemalloc: peak {peak / 1024:.1f} KiB ---")
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        for stat in snapshot.statistics("lineno")[:top]:
+            print(stat)
+
+        if dump_path is not None:
+            try:
+                profiler.dump_stats(dump_path)
+            except OSError as error:
+                print(f"** cannot write {dump_path}: {error.strerror} **")
+                return
+            print(f"--- profile written to {dump_path} ---")
+
+    def completenames(self, text, *ignored):
+        """Complete command names, and class names and their methods for
+        the `<class name>.<method>(...)` syntax.
+        """
+        cls, dot, method = text.partition(".")
+        if not dot:
+            return super().completenames(text, *ignored) + [
+                f"{name}." for name in class_models.names()
+                if name.startswith(text)]
+
+        if cls not in class_models:
+            return []
+
+        methods = METHODS + tuple(f"find_by_{name}(" for name in
+                                  _attributes(class_models[cls]))
+        return [f"{cls}.{name}" for name in methods
+                if name.startswith(method)]
+
+    def completedefault(self, text, line, begidx, endidx):
+        """Complete the ids and attribute names passed to the methods of
+        the `<class name>.<method>(...)` syntax.
+        """
+        match = _CALL.match(line[:endidx])
+        if match is None:
+            return []
+
+        cls, method, args = match.groups()
+        fields = ARGUMENTS.get(method, ())
+        args = args.split(",")
+        if len(args) > len(fields):
+            return []
+
+        return self.__complete_field(fields[len(args) - 1], cls, args[-1],
+                                     text)
+
+    def complete_create(self, text, line, begidx, endidx):
+        """Complete the class name of create, all and prefixes."""
+        return self.__complete(text, line, endidx, "class")
+
+    complete_all = complete_prefixes = complete_create
+
+    def complete_show(self, text, line, begidx, endidx):
+        """Complete the class name and the id of show and destroy."""
+        return self.__complete(text, line, endidx, "class", "id")
+
+    complete_destroy = complete_show
+
+    def complete_update(self, text, line, begidx, endidx):
+        """Complete the class name, id and attribute name of update."""
+        return self.__complete(text, line, endidx, "class", "id",
+                               "attribute")
+
+    def complete_listing(self, text, line, begidx, endidx):
+        """Complete the class name and the id of listing."""
+        return self.__complete(text, line, endidx, ("City", "State"), "id")
+
+    def complete_search(self, text, line, begidx, endidx):
+        """Complete the class name of search."""
+        return self.__complete(text, line, endidx, tuple(FIELDS))
+
+    def complete_autocomplete(self, text, line, begidx, endidx):
+        """Complete the class name of autocomplete."""
+        return self.__complete(text, line, endidx, ("City", "State"))
+
+    def complete_since(self, text, line, begidx, endidx):
+        """Complete the class name of since."""
+        return self.__complete(text, line, endidx, None, "class")
+
+    @classmethod
+    def __complete(cls, text, line, endidx, *fields):
+        """Complete the argument being typed, from what each argument of a
+        command is: "class", "id", "attribute", the choices or None.
+        """
+        word = re.search(r"\S*$", line[:endidx]).group()
+        args = line[:endidx - len(word)].split()[1:]
+        if len(args) >= len(fields):
+            return []
+
+        return cls.__complete_field(fields[len(args)],
+                                    args[0] if args else None, word, text)
+
+    @staticmethod
+    def __complete_field(field, cls, word, text):
+        """Complete a class name, id or attribute name being typed.
+
+        Args_:
+            field (str or tuple): "class", "id" or "attribute", the choices
+                or None.
+            cls (str): The class name the ids and attributes are of.
+            word (str): The argument typed so far.
+            text (str): The end of it that readline replaces, which is
+                shorter when the argument holds a delimiter such as "-".
+
+        Returns_:
+            list: The completions of `text`.
+        """
+        prefix = word.lstrip(" {\"'")
+        start = max(len(prefix) - len(text), 0)
+
+        if isinstance(field, tuple):
+            names = field
+        elif field == "class":
+            names = class_models.names()
+        elif field is None or cls not in class_models:
+            return []
+        elif field == "id":
+            # Read from the id index, without instantiating any object
+            names = storage.ids(cls, prefix, COMPLETIONS)
+        else:
+            names = _attributes(class_models[cls])
+
+        return [name[start:] for name in names if name.startswith(prefix)]
+
+    @staticmethod
+    def __get(cls, obj_id):
+        """Return an object by its id or a unique prefix of it, or print
+        why there is none.
+        """
+        try:
+            return storage.get(cls, storage.resolve(cls, obj_id))
+        except KeyError:
+            print("** no instance found **")
+        except ValueError as error:
+            print(f"** {error} **")
+
+        return None
+
+    @staticmethod
+    def __save(obj):
+        """Save an object, or print why storage refused it.
+
+        Returns_:
+            bool: Whether the object was saved.
+        """
+        try:
+            obj.save()
+        except (ValueError, PermissionError) as error:
+            print(f"** {error} **")
+            return False
+
+        return True
+
+    @staticmethod
+    def __delete(obj):
+        """Destroy an object, or print why storage refused it."""
+        try:
+            storage.delete(obj)
+            storage.save()
+        except PermissionError as error:
+            print(f"** {error} **")
 
     def default(self, line):
         """Handle unrecognized commands, including custom syntax for class
@@ -244,15 +726,12 @@ class HBNBCommand(cmd.Cmd):
 
         method = method.strip()
 
-        data = storage.all()
-
         if cls not in class_models:
             print("** class doesn't exist **")
             return
 
         if method == "all()":
-            cls_instances = [obj for key,
-                             obj in data.items() if key.startswith(f"{cls}.")]
+            cls_instances = list(storage.all(cls).values())
 
             print("[", end="")
             for index, obj in enumerate(cls_instances):
@@ -263,8 +742,7 @@ class HBNBCommand(cmd.Cmd):
             print("]")
 
         elif method == "count()":
-            count = sum(1 for key in data if key.startswith(f"{cls}."))
-            print(count)
+            print(storage.count(cls))
 
         elif method.startswith("show(") and method.endswith(")"):
             # Extract ID from `show(<id>)`
@@ -273,13 +751,28 @@ class HBNBCommand(cmd.Cmd):
                 print("** instance id missing **")
                 return
 
-            key = f"{cls}.{obj_id}"
+            obj = self.__get(cls, obj_id)
 
-            if key not in data:
+            if obj is None:
+                return
+
+            print(obj)
+
+        elif method.startswith("find_by_") and method.endswith(")"):
+            # Extract the field and value from `find_by_<field>(<value>)`
+            field, _, value = method[8:-1].partition("(")
+            value = value.strip('\'" ')
+            if not field or not value:
+                print("** value missing **")
+                return
+
+            obj = storage.get_by(cls, **{field: value})
+
+            if obj is None:
                 print("** no instance found **")
                 return
 
-            print(data[key])
+            print(obj)
 
         elif method.startswith("destroy(") and method.endswith(")"):
             # Extract ID from `destroy(<id>)`
@@ -288,17 +781,12 @@ class HBNBCommand(cmd.Cmd):
                 print("** instance id missing **")
                 return
 
-            key = f"{cls}.{obj_id}"
-
-            data = storage.all()
+            obj = self.__get(cls, obj_id)
 
-            if key not in data:
-                print("** no instance found **")
+            if obj is None:
                 return
 
-            del storage._FileStorage__objects[key]
-
-            storage.save()  # Save changes to file
+            self.__delete(obj)
 
         elif method.startswith("update(") and method.endswith(")"):
             if any(char in method[7:-1] for char in "{}"):
@@ -320,15 +808,12 @@ class HBNBCommand(cmd.Cmd):
 
                     obj_id = obj_id.strip('\'" ')
 
-                    key = f"{cls}.{obj_id}"
-                    data = storage.all()
+                    obj = self.__get(cls, obj_id)
 
-                    if key not in data:
-                        print("** no instance found **")
+                    if obj is None:
                         return
 
                     # Update the attribute
-                    obj = data[key]
 
                     # Handle dictionary representation
                     try:
@@ -343,7 +828,7 @@ class HBNBCommand(cmd.Cmd):
                         for attr_name, attr_value in attr_dict.items():
                             setattr(obj, attr_name, attr_value)
 
-                        obj.save()  # Save the updated object
+                        self.__save(obj)  # Save the updated object
                         return
                 else:
                     print("** value missing **")
@@ -355,15 +840,12 @@ class HBNBCommand(cmd.Cmd):
             attr_name = attr_name.strip('\'" ')
             attr_value = attr_value.strip('\'" ')  # Remove quotes
 
-            key = f"{cls}.{obj_id}"
-            data = storage.all()
+            obj = self.__get(cls, obj_id)
 
-            if key not in data:
-                print("** no instance found **")
+            if obj is None:
                 return
 
             # Update the attribute
-            obj = data[key]
             try:
                 # Convert to appropriate type if possible
                 attr_value = json.loads(attr_value)
@@ -372,7 +854,7 @@ class HBNBCommand(cmd.Cmd):
 
             finally:
                 setattr(obj, attr_name, attr_value)
-                obj.save()  # Save the updated object
+                self.__save(obj)  # Save the updated object
 
         else:
             print("*** Unknown syntax:", line)
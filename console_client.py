@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Console client module: a thin client of console_server.py.
+
+Interactive use shows the usual `(hbnb) ` prompt and sends every line typed
+to the server. Commands given on the command line, or piped on standard
+input, are sent all at once and their replies read as they come back.
+
+usage:
+------
+python3 console_client.py [--socket <path> | --host <host> --port <port>]
+                          [<command> ...]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import socket
+import sys
+
+SOCKET = "hbnb.sock"
+
+
+class ConsoleClient:
+    """
+    A connection to a console server.
+
+    Attributes_:
+        sock (socket.socket): The connected socket.
+    """
+
+    def __init__(self, path=SOCKET, host=None, port=None):
+        """
+        Connect to a server.
+
+        Args_:
+            path (str): The Unix socket of the server, if no host is given.
+            host (str, optional): The TCP host of the server.
+            port (int, optional): The TCP port of the server.
+        """
+        if host is not None:
+            self.sock = socket.create_connection((host, port))
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(path)
+        self.__file = self.sock.makefile("rb")
+
+    def execute(self, line):
+        """
+        Run one command on the server.
+
+        Args_:
+            line (str): The command line.
+
+        Returns_:
+            str: What the command printed.
+        """
+        return self.pipeline([line])[0]
+
+    def pipeline(self, lines):
+        """
+        Run many commands, sending them all before reading the replies.
+
+        Args_:
+            lines (list): The command lines.
+
+        Returns_:
+            list: What each command printed, in order.
+        """
+        self.sock.sendall("".join(line.replace("\n", " ") + "\n"
+                                  for line in lines).encode())
+
+        return [self.__reply() for _ in lines]
+
+    def close(self):
+        """Close the connection."""
+        self.__file.close()
+        self.sock.close()
+
+    def __reply(self):
+        """Read one reply."""
+        header = self.__file.readline()
+        if not header:
+            raise ConnectionError("the server closed the connection")
+
+        return self.__file.read(int(header)).decode()
+
+
+def main():
+    """Send commands to a server from the command line or interactively."""
+    parser = argparse.ArgumentParser(
+        description="Run HBNB console commands on a console server.")
+    parser.add_argument("--socket", default=SOCKET,
+                        help=f"Unix socket path (default: {SOCKET})")
+    parser.add_argument("--host", default=None,
+                        help="TCP host, instead of a Unix socket")
+    parser.add_argument("--port", type=int, default=5001,
+                        help="TCP port (default: 5001)")
+    parser.add_argument("command", nargs="*",
+                        help="commands to run, one per argument")
+    args = parser.parse_args()
+
+    client = ConsoleClient(args.socket, args.host, args.port)
+    try:
+        if args.command or not sys.stdin.isatty():
+            lines = args.command or [line.rstrip("\n") for line in sys.stdin]
+            # Nothing is answered after the connection is closed
+            for position, line in enumerate(lines):
+                if line.strip() in ("quit", "EOF"):
+                    lines = lines[:position + 1]
+                    break
+            for output in client.pipeline(lines):
+                sys.stdout.write(output)
+            return
+
+        while True:
+            try:
+                line = input("(hbnb) ")
+            except EOFError:
+                print()
+                line = "EOF"
+            try:
+                sys.stdout.write(client.execute(line))
+            except ConnectionError:
+                return
+            if line.strip() in ("quit", "EOF"):
+                return
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
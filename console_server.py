@@ -0,0 +1,284 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Console server module: the HBNBCommand language for many clients at once.
+
+Serves the commands of console.py over a local Unix or TCP socket to any
+number of concurrent clients (see console_client.py), from one process
+holding one in-memory storage. Commands run one at a time on the asyncio
+event loop, so writes are serialized without locks, and their output is
+sent back to the client that issued them.
+
+Storage is saved in background mode (see FileStorage.bgsave): a write forks
+a child to rewrite the file, so no command ever waits behind disk I/O. The
+server owns the file in exclusive mode: reads do not check it for changes.
+
+With --workers, a master loads storage once and forks that many read-only
+workers accepting on the same socket (see models.engine.prefork); they
+answer reads from the objects they share with the master, and see the
+writes of another process through the file, or through its changelog with
+--changelog. Sending SIGUSR1 to the master prints their memory.
+
+With --columns, the numeric fields of places are published to shared
+memory for analytics processes (see models.engine.columns), at most once a
+second and only when places changed.
+
+Protocol: a client sends commands as lines of UTF-8 text and may send many
+before reading any reply. Each command is answered, in order, with its
+output length in bytes on a line of its own followed by the output:
+
+    -> show State 1f0a...\\n
+    <- 63\\n[State] (1f0a...) {...}\\n
+
+`quit` or `EOF` closes the connection.
+
+usage:
+------
+python3 console_server.py [--socket <path> | --host <host> --port <port>]
+                          [--workers <n> [--changelog <path>]]
+                          [--columns [<segment>]]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import asyncio
+import io
+import os
+import socket
+import sys
+import time
+from console import HBNBCommand
+from models import storage
+from models.engine.columns import SEGMENT, ColumnPublisher
+from models.engine.prefork import Prefork
+
+SOCKET = "hbnb.sock"
+# Seconds between checks for a finished background save
+REAP_INTERVAL = 0.1
+# Least seconds between two publications of the columns of places
+PUBLISH_INTERVAL = 1.0
+# Lines longer than this close the connection
+MAX_LINE = 1 << 20
+
+
+class CommandProtocol(asyncio.Protocol):
+    """
+    Runs the commands received on one connection and sends their output.
+
+    Every complete line received in one read is run before replying, and
+    the replies are sent in a single write, so pipelining clients are
+    served with one system call per batch rather than per command.
+    """
+
+    def __init__(self, server):
+        """
+        Initialize a connection.
+
+        Args_:
+            server (ConsoleServer): The server the connection belongs to.
+        """
+        self.server = server
+        self.transport = None
+        self.buffer = b""
+
+    def connection_made(self, transport):
+        """Remember the transport of a new client."""
+        self.transport = transport
+        self.server.clients += 1
+
+    def connection_lost(self, exc):
+        """Forget a client."""
+        self.server.clients -= 1
+
+    def data_received(self, data):
+        """Run every complete command line received so far."""
+        self.buffer += data
+        lines = self.buffer.split(b"\n")
+        self.buffer = lines.pop()
+        if len(self.buffer) > MAX_LINE:
+            self.transport.close()
+            return
+
+        replies = []
+        for line in lines:
+            output, done = self.server.execute(
+                line.decode("utf-8", "replace").rstrip("\r"))
+            replies.append(b"%d\n%s" % (len(output), output))
+            if done:
+                self.transport.write(b"".join(replies))
+                self.transport.close()
+                return
+
+        self.transport.write(b"".join(replies))
+
+
+class ConsoleServer:
+    """
+    Serves HBNBCommand to many clients from one shared storage.
+
+    Attributes_:
+        clients (int): The number of connected clients.
+        commands (int): The number of commands run.
+        columns (ColumnPublisher): Publishes the columns of places, or None.
+    """
+
+    def __init__(self, columns=None):
+        """
+        Initialize the interpreter shared by every client.
+
+        Args_:
+            columns (ColumnPublisher, optional): Publishes the columns of
+                places to shared memory as they change.
+        """
+        self.clients = 0
+        self.commands = 0
+        self.columns = columns
+        self.__output = io.StringIO()
+        self.__console = HBNBCommand(stdout=self.__output)
+        # Clients must not write files wherever the server can
+        self.__console.dumps_profiles = False
+        storage.background = True
+        storage.exclusive = not storage.read_only
+
+    def execute(self, line):
+        """
+        Run one command line and capture what it prints.
+
+        Args_:
+            line (str): The command line.
+
+        Returns_:
+            tuple: (the output as UTF-8 bytes, whether the client quit).
+        """
+        self.commands += 1
+        output = self.__output
+        output.seek(0)
+        output.truncate()
+
+        stdout, sys.stdout = sys.stdout, output
+        try:
+            done = self.__console.onecmd(line)
+        except Exception as error:
+            print(f"** {type(error).__name__}: {error} **")
+            done = False
+        finally:
+            sys.stdout = stdout
+
+        return output.getvalue().encode(), bool(done)
+
+    async def serve(self, path=None, host=None, port=None, sock=None):
+        """
+        Serve clients until cancelled.
+
+        Args_:
+            path (str, optional): The Unix socket to listen on.
+            host (str, optional): The TCP host to listen on, if no path.
+            port (int, optional): The TCP port to listen on, if no path.
+            sock (socket.socket, optional): A listening socket to accept
+                on instead.
+        """
+        loop = asyncio.get_running_loop()
+        if sock is not None:
+            create = (loop.create_unix_server
+                      if sock.family == socket.AF_UNIX else loop.create_server)
+            server = await create(lambda: CommandProtocol(self), sock=sock)
+        elif path is not None:
+            if os.path.exists(path):
+                os.remove(path)
+            server = await loop.create_unix_server(
+                lambda: CommandProtocol(self), path)
+        else:
+            server = await loop.create_server(
+                lambda: CommandProtocol(self), host, port)
+
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.__reap())
+
+    async def __reap(self):
+        """
+        Collect finished background saves even when no command runs, and
+        publish the columns of places.
+        """
+        published = 0.0
+        while True:
+            await asyncio.sleep(REAP_INTERVAL)
+            storage.refresh()
+            if (self.columns is not None and
+                    time.monotonic() - published >= PUBLISH_INTERVAL):
+                if self.columns.publish():
+                    published = time.monotonic()
+
+
+def listen(path=None, host=None, port=None):
+    """
+    Open a listening socket to share between workers.
+
+    Args_:
+        path (str, optional): The Unix socket to listen on.
+        host (str, optional): The TCP host to listen on, if no path.
+        port (int, optional): The TCP port to listen on, if no path.
+
+    Returns_:
+        socket.socket: The listening socket.
+    """
+    if path is None:
+        return socket.create_server((host, port), backlog=1024)
+
+    if os.path.exists(path):
+        os.remove(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.listen(1024)
+
+    return sock
+
+
+def main():
+    """Serve the console until interrupted."""
+    parser = argparse.ArgumentParser(
+        description="Serve the HBNB console to many clients.")
+    parser.add_argument("--socket", default=None,
+                        help=f"Unix socket path (default: {SOCKET})")
+    parser.add_argument("--host", default=None,
+                        help="TCP host, instead of a Unix socket")
+    parser.add_argument("--port", type=int, default=5001,
+                        help="TCP port (default: 5001)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="fork this many read-only workers")
+    parser.add_argument("--changelog", default=None,
+                        help="with --workers, the changelog to follow")
+    parser.add_argument("--columns", nargs="?", const=SEGMENT, default=None,
+                        help="publish the columns of places to this shared "
+                        f"memory segment (default: {SEGMENT})")
+    args = parser.parse_args()
+
+    path = None if args.host else (args.socket or SOCKET)
+    print(f"Serving the console on {path or f'{args.host}:{args.port}'}",
+          flush=True)
+    try:
+        if args.workers:
+            if args.changelog:
+                storage.follow(args.changelog)
+            sock = listen(path, args.host, args.port)
+            Prefork(lambda: asyncio.run(ConsoleServer().serve(sock=sock)),
+                    args.workers).run()
+        else:
+            columns = ColumnPublisher(args.columns) if args.columns else None
+            try:
+                asyncio.run(ConsoleServer(columns).serve(
+                    path, args.host, args.port))
+            finally:
+                if columns is not None:
+                    columns.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,46 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
-"""Initialize a storage object on import."""
-import models.engine.file_storage as fs
+"""Initialize a storage object on import.
 
-storage = fs.FileStorage()
+The storage file is not read here: the engine loads it on first access so
+that importing `models` stays cheap whatever the size of the dataset.
 
-storage.reload()
+Setting HBNB_STORAGE_MODE=lru selects LRUFileStorage, which keeps only a key
+index resident and caches at most HBNB_LRU_MAX_OBJECTS instances (and, if
+set, HBNB_LRU_MAX_BYTES bytes of them).
+
+Setting HBNB_CHANGELOG appends every storage mutation to that JSON-lines
+file, and HBNB_CHANGES_SOCKET streams them to the clients of that Unix
+socket (see models.engine.changes). With HBNB_STORAGE_MODE=follower the
+process is instead a read-only replica applying the HBNB_CHANGELOG of its
+primary (see models.engine.replica). Setting HBNB_BGSAVE=1 writes the file
+from a forked child on every save (see FileStorage.bgsave).
+"""
+import os
+
+if os.getenv("HBNB_STORAGE_MODE") == "lru":
+    from models.engine.lru_storage import LRUFileStorage
+
+    max_bytes = os.getenv("HBNB_LRU_MAX_BYTES")
+    storage = LRUFileStorage(
+        max_objects=int(os.getenv("HBNB_LRU_MAX_OBJECTS", "10000")),
+        max_bytes=int(max_bytes) if max_bytes else None)
+else:
+    import models.engine.file_storage as fs
+
+    storage = fs.FileStorage()
+
+if os.getenv("HBNB_BGSAVE") == "1":
+    storage.background = True
+
+if os.getenv("HBNB_STORAGE_MODE") == "follower":
+    storage.follow(os.environ["HBNB_CHANGELOG"])
+elif os.getenv("HBNB_CHANGELOG"):
+    from models.engine.changes import ChangelogWriter
+
+    storage.subscribe(ChangelogWriter(os.getenv("HBNB_CHANGELOG")))
+
+if os.getenv("HBNB_CHANGES_SOCKET"):
+    from models.engine.changes import SocketPublisher
+
+    storage.subscribe(SocketPublisher(os.getenv("HBNB_CHANGES_SOCKET")))
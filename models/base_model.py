@@ -1,9 +1,11 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
 """BaseModel module defines abstract class managing other models objects."""
-import uuid
+import json
 from datetime import datetime
 from models import storage
+from models.engine.keys import new_id
+from models.engine.registry import classes
 
 __author__ = "Albert Mwanza"
 __license__ = "MIT"
@@ -23,9 +25,24 @@ class BaseModel:
     Methods_:
         save: Updates the instance's updated_at attribute and saves it.
         to_dict: Returns a dictionary representation of the instance.
+        to_json: Returns the JSON text of the dictionary representation.
         __str__: Returns a string representation of the instance.
+
+    Note_:
+        The dict, str and JSON forms are cached per instance and dropped
+        whenever an attribute is set or deleted. Mutating a container
+        attribute in place (e.g. ``place.amenity_ids.append(...)``) is not
+        seen by the cache until the next ``save()``.
     """
 
+    # The cache lives in a slot so that it never shows up in __dict__
+    __slots__ = ("__dict__", "__weakref__", "__cache")
+
+    def __init_subclass__(cls, **kwargs):
+        """Register every model class with the class registry."""
+        super().__init_subclass__(**kwargs)
+        classes.register(cls)
+
     def __init__(self, *args, **kwargs):
         """
         Initialize a new BaseModel instance.
@@ -43,7 +60,7 @@ class BaseModel:
 
             **kwargs: Keyword arguments used to set instance attributes.
         """
-        self.id: str = str(uuid.uuid4())
+        self.id: str = new_id()
         self.created_at = datetime.now()
         self.updated_at = self.created_at
 
@@ -57,6 +74,45 @@ class BaseModel:
 
         storage.new(self)
 
+    def __setattr__(self, name, value):
+        """Set an attribute and drop the cached serialized forms."""
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_BaseModel__cache", None)
+
+    def __delattr__(self, name):
+        """Delete an attribute and drop the cached serialized forms."""
+        object.__delattr__(self, name)
+        object.__setattr__(self, "_BaseModel__cache", None)
+
+    def _serialized(self):
+        """
+        Return the cached serialized forms of the instance.
+
+        The cache is a list ``[dict, str, json]``; the dict is built eagerly
+        and the str and JSON forms are filled in on first use. A new list is
+        created after every attribute change, so holders of an old list
+        (such as the storage engine) keep a consistent view of the instance
+        as it was when they got it.
+
+        Returns_:
+            list: The cached ``[dict, str, json]`` forms of the instance.
+        """
+        cache = getattr(self, "_BaseModel__cache", None)
+
+        if cache is None:
+            return_dict = {"__class__": type(self).__name__}
+
+            for key, value in self.__dict__.items():
+                if key in ("created_at", "updated_at"):
+                    return_dict[key] = value.isoformat()
+                else:
+                    return_dict[key] = value
+
+            cache = [return_dict, None, None]
+            object.__setattr__(self, "_BaseModel__cache", cache)
+
+        return cache
+
     def save(self):
         """
         Update the 'updated_at' attribute of the instance and saves it.
@@ -73,12 +129,7 @@ class BaseModel:
         """
         self.updated_at = datetime.now()
 
-        key = f"{type(self).__name__}.{self.id}"
-
-        if key in storage._FileStorage__objects:
-            storage._FileStorage__objects[key].update(self.to_dict())
-        else:
-            storage._FileStorage__objects[key] = self.to_dict()
+        storage._FileStorage__store(self)
 
         storage.save()
 
@@ -95,15 +146,22 @@ class BaseModel:
                   class name and the attributes (with 'created_at' and
                                                  'updated_at' in ISO format).
         """
-        return_dict = {"__class__": type(self).__name__}
+        return dict(self._serialized()[0])
+
+    def to_json(self):
+        """
+        Return the JSON text of the dictionary representation.
+
+        Returns_:
+            str: ``json.dumps(self.to_dict())``, cached until the next
+                 attribute change.
+        """
+        cache = self._serialized()
 
-        for key, value in self.__dict__.copy().items():
-            if key in ("created_at", "updated_at"):
-                return_dict[key] = value.isoformat()
-            else:
-                return_dict[key] = value
+        if cache[2] is None:
+            cache[2] = json.dumps(cache[0])
 
-        return return_dict
+        return cache[2]
 
     def __str__(self):
         """
@@ -115,7 +173,15 @@ class BaseModel:
         Returns_:
             str: A string representation of the instance.
         """
-        return f"[{type(self).__name__}] ({self.id}) {self.__dict__}"
+        cache = self._serialized()
+
+        if cache[1] is None:
+            cache[1] = f"[{type(self).__name__}] ({self.id}) {self.__dict__}"
+
+        return cache[1]
+
+
+classes.register(BaseModel)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Autocomplete module: prefix search over the names of States and Cities.
+
+The "States / Cities" popover of the web pages completes a location as it
+is typed, and is the most frequent query of all. The Autocomplete index
+keeps the names of every State and City, folded (case-folded, stripped of
+accents and of extra spaces, so that "sao" finds "São Paulo"), in sorted
+lists: the names starting with a prefix are found with a binary search and
+read in order, never looking at the other names.
+
+A name is found from the start of any of its words: "york" finds "New York"
+too, after the names starting with "york". Every City is returned with the
+id and name of its State.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from models.engine.indexes import StorageIndex
+from models.engine.keys import make_key, split_key
+
+LIMIT = 10
+# The classes whose names are completed
+CLASSES = ("State", "City")
+
+_WORD = re.compile(r"\w+")
+# Sorts after the rest of any name starting with a prefix
+_LAST = "\U0010ffff"
+
+
+def fold(text):
+    """
+    Return a name in the form the autocomplete index compares.
+
+    Args_:
+        text (str): The name.
+
+    Returns_:
+        str: The name case-folded, stripped of accents and with its words
+        separated by single spaces.
+    """
+    text = unicodedata.normalize("NFKD", str(text).casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+
+    return " ".join(text.split())
+
+
+def _later_words(name):
+    """Return the ends of a folded name starting at its second word on."""
+    return [name[word.start():] for word in list(_WORD.finditer(name))[1:]]
+
+
+class Autocomplete(StorageIndex):
+    """
+    The folded names of States and Cities, sorted for prefix searches.
+    """
+
+    name = "autocomplete"
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.on_clear()
+
+    def on_clear(self):
+        """Drop every name."""
+        # key -> (name, state id of a City or None)
+        self.__locations = {}
+        # sorted [(folded name, key)]
+        self.__names = []
+        # sorted [(folded name from its second word on, key)]
+        self.__words = []
+
+    def on_set(self, key, old, new):
+        """Index the name of a location created, or move a renamed one."""
+        if new.get("__class__") not in CLASSES:
+            return
+
+        location = (str(new.get("name", "")),
+                    new.get("state_id") if new["__class__"] == "City"
+                    else None)
+        if self.__locations.get(key) != location:
+            self.__remove(key)
+            self.__add(key, location)
+
+    def on_delete(self, key, old):
+        """Forget the name of a destroyed location."""
+        self.__remove(key)
+
+    def complete(self, prefix, limit=LIMIT, cls_name=None):
+        """
+        Return the locations whose name, or a word of it, starts with a
+        prefix.
+
+        Args_:
+            prefix (str): The start of the name, in any case and with or
+                without accents.
+            limit (int): The most locations returned.
+            cls_name (str, optional): Only "State" or only "City".
+
+        Returns_:
+            list: Dictionaries of the "__class__", "id" and "name" of the
+            locations, plus the "state_id" and "state" name of Cities; the
+            names starting with the prefix first, each group sorted by
+            name.
+        """
+        # A space typed last ends a word: "new " does not find "Newark"
+        prefix = fold(prefix) + (" " if prefix[-1:].isspace() else "")
+        found = []
+        seen = set()
+
+        for entries in (self.__names, self.__words):
+            position = bisect_left(entries, (prefix,))
+            end = bisect_left(entries, (prefix + _LAST,))
+            while position < end and len(found) < limit:
+                key = entries[position][1]
+                position += 1
+                if key in seen or (cls_name is not None and
+                                   not key.startswith(cls_name + ".")):
+                    continue
+                seen.add(key)
+                found.append(self.__describe(key))
+
+        return found
+
+    def dump(self):
+        """Return the names and States of the locations as JSON data."""
+        return self.__locations
+
+    def load(self, state):
+        """Restore the locations returned by `dump`."""
+        self.on_clear()
+        for key, location in state.items():
+            self.__locations[key] = location = tuple(location)
+            name = fold(location[0])
+            self.__names.append((name, key))
+            self.__words.extend((words, key)
+                                for words in _later_words(name))
+        self.__names.sort()
+        self.__words.sort()
+
+    def __describe(self, key):
+        """Return a location as returned by `complete`."""
+        cls_name, obj_id = split_key(key)
+        name, state_id = self.__locations[key]
+        location = {"__class__": cls_name, "id": obj_id, "name": name}
+        if cls_name == "City":
+            state = self.__locations.get(make_key("State", state_id))
+            location["state_id"] = state_id
+            location["state"] = None if state is None else state[0]
+
+        return location
+
+    def __add(self, key, location):
+        """Index a location."""
+        self.__locations[key] = location
+        name = fold(location[0])
+        insort(self.__names, (name, key))
+        for words in _later_words(name):
+            insort(self.__words, (words, key))
+
+    def __remove(self, key):
+        """Stop indexing a location, if it is indexed."""
+        location = self.__locations.pop(key, None)
+        if location is None:
+            return
+
+        name = fold(location[0])
+        self.__discard(self.__names, (name, key))
+        for words in _later_words(name):
+            self.__discard(self.__words, (words, key))
+
+    @staticmethod
+    def __discard(entries, entry):
+        """Remove an entry from a sorted list."""
+        position = bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
@@ -0,0 +1,307 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Backup module: compressed snapshots, delta chains and point-in-time restore.
+
+A backup directory holds gzip-compressed full snapshots of storage and, after
+each snapshot, a chain of deltas. A delta holds only the objects updated
+since the previous backup, read in `updated_at` order from the storage
+engine's timeline index, and the keys of the objects destroyed since, which
+the timeline remembers too, so its cost follows the churn rather than the
+size of the dataset. Should the timeline have been rebuilt since the last
+backup, the keys stored are compared instead with the keys of the snapshot
+and of the deltas after it, without reading any stored value. A new
+snapshot starts a new chain once the deltas outgrow half of the last one.
+
+`restore` rebuilds the state at any time after the first snapshot: the last
+snapshot taken by then, then the deltas up to that time, keeping from the
+delta that spans it only the objects updated by then. An object updated
+several times between two backups is only known in its last version; going
+back to a time in between restores its version from the backup before.
+
+Restored objects keep the `updated_at` of their old version, which no delta
+would read as an update: the backup following a restore is always a
+snapshot.
+
+usage:
+------
+python3 -m models.engine.backup backup [-d <directory>] [--full]
+python3 -m models.engine.backup restore <ISO 8601 time> [-d <directory>]
+python3 -m models.engine.backup list [-d <directory>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import gzip
+import json
+import os
+from datetime import datetime
+from models.engine.keys import key_of, split_key
+from models.engine.registry import classes
+from models.engine.timeline import timestamp
+
+DIRECTORY = "backups"
+MANIFEST = "manifest.json"
+# The keys stored at the last snapshot, to find the objects destroyed since
+# when the timeline cannot tell
+KEYS = "keys.json.gz"
+# A snapshot is taken once the deltas of a chain outgrow this fraction of it
+CHAIN_RATIO = 0.5
+COMPRESS_LEVEL = 6
+
+
+def read_manifest(directory=DIRECTORY):
+    """
+    Return the backups of a directory.
+
+    Args_:
+        directory (str): The backup directory.
+
+    Returns_:
+        list: One dictionary per backup, oldest first, with its "file",
+        "kind" ("snapshot" or "delta"), "since" and "until" times, and its
+        number of "objects", of "deleted" keys and of "bytes".
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST)) as infile:
+            return json.load(infile)["backups"]
+    except FileNotFoundError:
+        return []
+
+
+def backup(storage, directory=DIRECTORY, full=False):
+    """
+    Back storage up as a snapshot or as a delta of the last backup.
+
+    Args_:
+        storage (FileStorage): The storage engine.
+        directory (str): The backup directory, created if needed.
+        full (bool): Take a snapshot even if a delta would do, as is done
+            after a restore.
+
+    Returns_:
+        dict: The manifest entry of the new backup.
+    """
+    os.makedirs(directory, exist_ok=True)
+    backups = read_manifest(directory)
+    until = timestamp(datetime.now())
+    chain = []
+    for entry in backups:
+        chain = [entry] if entry["kind"] == "snapshot" else chain + [entry]
+
+    keys = []
+    if full or _restored(directory) or not chain or sum(
+            entry["bytes"] for entry in chain[1:]) > (
+                CHAIN_RATIO * chain[0]["bytes"]):
+        entry = {"kind": "snapshot", "since": None, "until": until,
+                 "deleted": 0}
+        entry["file"] = f"snapshot-{until.replace(':', '')}.json.gz"
+        path = os.path.join(directory, entry["file"])
+        with gzip.open(path, "wt", compresslevel=COMPRESS_LEVEL) as outfile:
+            outfile.write("{")
+            for key, value in storage.items():
+                outfile.write(f"{', ' if keys else ''}{json.dumps(key)}: "
+                              f"{json.dumps(value)}")
+                keys.append(key)
+            outfile.write("}")
+        with gzip.open(os.path.join(directory, KEYS), "wt",
+                       compresslevel=1) as outfile:
+            json.dump(keys, outfile)
+    else:
+        since = backups[-1]["until"]
+        entry = {"kind": "delta", "since": since, "until": until}
+        entry["file"] = f"delta-{until.replace(':', '')}.json.gz"
+        objects = {key_of(obj): obj.to_dict()
+                   for obj in storage.changed_since(since)}
+        deleted = storage.destroyed_since(since)
+        if deleted is None:
+            deleted = _known_keys(directory, chain).difference(
+                storage.keys())
+        deleted = sorted(deleted)
+        entry["deleted"] = len(deleted)
+        path = os.path.join(directory, entry["file"])
+        with gzip.open(path, "wt", compresslevel=COMPRESS_LEVEL) as outfile:
+            json.dump({"since": since, "until": until, "objects": objects,
+                       "deleted": deleted}, outfile)
+
+    entry["objects"] = len(keys) if entry["kind"] == "snapshot" else len(
+        objects)
+    entry["bytes"] = os.path.getsize(path)
+
+    _write_manifest(directory, backups + [entry])
+    storage.index("timeline").forget_destroyed(until)
+
+    return entry
+
+
+def state_at(ts, directory=DIRECTORY):
+    """
+    Return the stored dictionaries of every object as of a given time.
+
+    Args_:
+        ts (datetime or str): The time, or its ISO 8601 form.
+        directory (str): The backup directory.
+
+    Returns_:
+        dict: The "<class name>.<id>" -> dict map at that time.
+
+    Raises_:
+        ValueError: If `ts` is not an ISO 8601 time, or if no snapshot was
+            taken by then.
+    """
+    ts = timestamp(ts)
+    backups = read_manifest(directory)
+    start = None
+    for position, entry in enumerate(backups):
+        if entry["kind"] == "snapshot" and entry["until"] <= ts:
+            start = position
+    if start is None:
+        raise ValueError(f"no snapshot was taken by {ts}")
+
+    with gzip.open(os.path.join(directory, backups[start]["file"]),
+                   "rt") as infile:
+        objects = json.load(infile)
+
+    for entry in backups[start + 1:]:
+        if entry["kind"] == "snapshot" or entry["since"] >= ts:
+            break
+        with gzip.open(os.path.join(directory, entry["file"]),
+                       "rt") as infile:
+            delta = json.load(infile)
+        for key, value in delta["objects"].items():
+            if str(value.get("updated_at", "")) <= ts:
+                objects[key] = value
+        if entry["until"] <= ts:
+            for key in delta["deleted"]:
+                objects.pop(key, None)
+
+    return objects
+
+
+def restore(storage, ts, directory=DIRECTORY):
+    """
+    Bring storage back to its state at a given time, and save it.
+
+    Objects are restored through their classes and destroyed through
+    storage, so indexes and change subscribers see a restore as ordinary
+    writes.
+
+    Args_:
+        storage (FileStorage): The storage engine.
+        ts (datetime or str): The time, or its ISO 8601 form.
+        directory (str): The backup directory.
+
+    Returns_:
+        int: The number of objects restored.
+
+    Raises_:
+        ValueError: If `ts` is not an ISO 8601 time, or if no snapshot was
+            taken by then.
+    """
+    objects = state_at(ts, directory)
+
+    for key in [key for key in storage.keys() if key not in objects]:
+        storage.delete(storage.get(*split_key(key)))
+    for key, value in objects.items():
+        # Instantiating from a dictionary stores the object
+        classes[value["__class__"]](**value)
+    storage.save()
+    _write_manifest(directory, read_manifest(directory),
+                    restored=timestamp(datetime.now()))
+
+    return len(objects)
+
+
+def _known_keys(directory, chain):
+    """Return the keys stored at the last backup of a chain.
+
+    Args_:
+        directory (str): The backup directory.
+        chain (list): The manifest entries of the last snapshot and of the
+            deltas after it.
+
+    Returns_:
+        set: The keys of the snapshot, with those of the objects the deltas
+        saved and without those they destroyed.
+    """
+    try:
+        with gzip.open(os.path.join(directory, KEYS), "rt") as infile:
+            keys = set(json.load(infile))
+    except FileNotFoundError:
+        keys = set()
+
+    for entry in chain[1:]:
+        with gzip.open(os.path.join(directory, entry["file"]),
+                       "rt") as infile:
+            delta = json.load(infile)
+        keys.update(delta["objects"])
+        keys.difference_update(delta["deleted"])
+
+    return keys
+
+
+def _restored(directory):
+    """Tell whether storage was restored since the last backup."""
+    try:
+        with open(os.path.join(directory, MANIFEST)) as infile:
+            return json.load(infile).get("restored") is not None
+    except FileNotFoundError:
+        return False
+
+
+def _write_manifest(directory, backups, restored=None):
+    """Replace the manifest of a directory atomically.
+
+    Args_:
+        directory (str): The backup directory.
+        backups (list): The manifest entries.
+        restored (str, optional): The time of a restore made since the last
+            backup, which the next one must take a snapshot after.
+    """
+    path = os.path.join(directory, MANIFEST)
+    manifest = {"backups": backups}
+    if restored is not None:
+        manifest["restored"] = restored
+    with open(path + ".tmp", "w") as outfile:
+        json.dump(manifest, outfile, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def main():
+    """Run the command given on the command line."""
+    from models import storage
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("command", choices=("backup", "restore", "list"))
+    parser.add_argument("time", nargs="?",
+                        help="the ISO 8601 time to restore")
+    parser.add_argument("-d", "--directory", default=DIRECTORY,
+                        help=f"backup directory (default: {DIRECTORY})")
+    parser.add_argument("--full", action="store_true",
+                        help="take a snapshot even if a delta would do")
+    args = parser.parse_args()
+
+    if args.command == "backup":
+        entry = backup(storage, args.directory, args.full)
+        print(f"{entry['kind']} {entry['file']}: {entry['objects']} "
+              f"objects, {entry['deleted']} deleted, {entry['bytes']} bytes")
+    elif args.command == "restore":
+        if args.time is None:
+            parser.error("restore needs a time")
+        try:
+            count = restore(storage, args.time, args.directory)
+        except ValueError as error:
+            parser.error(str(error))
+        print(f"{count} objects restored as of {args.time}")
+    else:
+        for entry in read_manifest(args.directory):
+            print(f"{entry['until']} {entry['kind']:<8} {entry['file']}: "
+                  f"{entry['objects']} objects, {entry['deleted']} deleted, "
+                  f"{entry['bytes']} bytes")
+
+
+if __name__ == "__main__":
+    main()
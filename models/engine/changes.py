@@ -0,0 +1,330 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Changes module: a publish/subscribe stream of storage mutations.
+
+The ChangeFeed index turns every object created, updated or destroyed in
+storage into an event:
+
+    {"seq": 42, "op": "update", "class": "Place", "id": "...",
+     "changes": {"name": "Loft", "updated_at": "..."}, "removed": [],
+     "time": 1735891200.5}
+
+"seq" numbers are strictly increasing, "changes" holds the fields whose
+values changed (every field for "new") and "removed" the fields that no
+longer exist. Objects read from disk on load are not changes and emit none.
+
+Recording an event only appends it to a buffer: a background thread hands
+the buffered events in batches to the subscribers, so a slow subscriber
+never delays `BaseModel.save()`. A subscriber is any callable taking a list
+of events; ChangelogWriter appends them to a JSON-lines file that can be
+tailed, and SocketPublisher streams them to the clients of a Unix socket.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import atexit
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from models.engine.indexes import StorageIndex
+from models.engine.keys import split_key
+
+# Seconds the dispatcher waits for more events before delivering a batch
+INTERVAL = 0.05
+# The most events delivered to subscribers at once
+BATCH_SIZE = 1000
+
+
+def last_sequence(path):
+    """
+    Return the sequence number of the last event of a changelog.
+
+    Args_:
+        path (str): The path of the changelog.
+
+    Returns_:
+        int: The sequence number, 0 if the changelog is missing or empty.
+    """
+    try:
+        with open(path, "rb") as infile:
+            infile.seek(0, os.SEEK_END)
+            position = infile.tell()
+            block = b""
+            # Read backwards until a complete last line is found
+            while position > 0 and block.count(b"\n") < 2:
+                step = min(position, 4096)
+                position -= step
+                infile.seek(position)
+                block = infile.read(step) + block
+    except OSError:
+        return 0
+
+    for line in reversed(block.splitlines()):
+        try:
+            return json.loads(line)["seq"]
+        except (ValueError, KeyError):
+            continue
+
+    return 0
+
+
+class ChangeFeed(StorageIndex):
+    """
+    Records storage mutations as events and delivers them to subscribers.
+
+    Attributes_:
+        sequence (int): The sequence number of the last event recorded.
+    """
+
+    name = "changes"
+    replays = False
+
+    def __init__(self, interval=INTERVAL):
+        """
+        Initialize a feed without subscribers.
+
+        Args_:
+            interval (float): Seconds the dispatcher waits for more events
+                before delivering a batch.
+        """
+        self.interval = interval
+        self.sequence = 0
+        self.__subscribers = []
+        self.__pending = []
+        self.__lock = threading.Lock()
+        self.__ready = threading.Condition(self.__lock)
+        # Held while a batch is being delivered, so batches stay in order
+        self.__delivering = threading.Lock()
+        self.__thread = None
+
+    def on_set(self, key, old, new):
+        """Record an object created or updated."""
+        # Instances built by reads are stored again unchanged
+        if old == new:
+            return
+
+        changes = {field: value for field, value in new.items()
+                   if old is None or field not in old or old[field] != value}
+        removed = [] if old is None else [field for field in old
+                                          if field not in new]
+        if changes or removed:
+            self.__record(key, "new" if old is None else "update", changes,
+                          removed)
+
+    def on_delete(self, key, old):
+        """Record an object destroyed."""
+        self.__record(key, "destroy", {}, [])
+
+    def subscribe(self, subscriber):
+        """
+        Deliver the events recorded from now on to a subscriber.
+
+        A subscriber with a `sequence` attribute, such as a ChangelogWriter,
+        has already seen events up to that number: the feed carries on from
+        there so that sequence numbers never go back.
+
+        Args_:
+            subscriber (callable): Called with each batch of events, a list
+                of dictionaries, from the dispatcher thread.
+
+        Returns_:
+            callable: The subscriber.
+        """
+        with self.__lock:
+            self.sequence = max(self.sequence,
+                                getattr(subscriber, "sequence", 0))
+            self.__subscribers.append(subscriber)
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self.__dispatch, name="hbnb-changes", daemon=True)
+                self.__thread.start()
+                atexit.register(self.flush)
+
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """
+        Stop delivering events to a subscriber.
+
+        Args_:
+            subscriber (callable): A subscriber passed to `subscribe`.
+        """
+        with self.__lock:
+            if subscriber in self.__subscribers:
+                self.__subscribers.remove(subscriber)
+
+    def flush(self):
+        """Deliver every event recorded so far before returning."""
+        with self.__delivering:
+            while True:
+                with self.__lock:
+                    batch = self.__take()
+                if not batch:
+                    return
+                self.__deliver(batch)
+
+    def dump(self):
+        """Return the sequence number as JSON-serializable data."""
+        return {"sequence": self.sequence}
+
+    def load(self, state):
+        """Carry on from the sequence number returned by `dump`."""
+        self.sequence = max(self.sequence, state["sequence"])
+
+    def __record(self, key, op, changes, removed):
+        """Number an event and buffer it for the subscribers."""
+        cls_name, obj_id = split_key(key)
+
+        with self.__lock:
+            self.sequence += 1
+            if not self.__subscribers:
+                return
+            self.__pending.append({
+                "seq": self.sequence, "op": op, "class": cls_name,
+                "id": obj_id, "changes": changes, "removed": removed,
+                "time": time.time()})
+            if len(self.__pending) == 1:
+                self.__ready.notify()
+
+    def __take(self):
+        """Return the next batch of buffered events; call under the lock."""
+        batch = self.__pending[:BATCH_SIZE]
+        del self.__pending[:BATCH_SIZE]
+
+        return batch
+
+    def __dispatch(self):
+        """Deliver the buffered events in batches, forever."""
+        while True:
+            with self.__lock:
+                while not self.__pending:
+                    self.__ready.wait()
+            # Let a burst of writes accumulate into one batch
+            time.sleep(self.interval)
+            self.flush()
+
+    def __deliver(self, batch):
+        """Hand a batch to every subscriber, dropping those that fail."""
+        with self.__lock:
+            subscribers = list(self.__subscribers)
+
+        for subscriber in subscribers:
+            try:
+                subscriber(batch)
+            except Exception as error:
+                print(f"** change subscriber {subscriber!r} dropped: "
+                      f"{error} **", file=sys.stderr)
+                self.unsubscribe(subscriber)
+
+
+class ChangelogWriter:
+    """
+    Appends events to a JSON-lines changelog, one event per line.
+
+    Attributes_:
+        path (str): The path of the changelog.
+        sequence (int): The sequence number of the last event written.
+    """
+
+    def __init__(self, path):
+        """
+        Open a changelog, carrying on after the events it already holds.
+
+        Args_:
+            path (str): The path of the changelog.
+        """
+        self.path = path
+        self.sequence = last_sequence(path)
+        self.__file = open(path, "a")
+
+    def __call__(self, events):
+        """Append a batch of events and flush it to the file."""
+        self.__file.write("".join(json.dumps(event) + "\n"
+                                  for event in events))
+        self.__file.flush()
+        self.sequence = events[-1]["seq"]
+
+    def close(self):
+        """Close the changelog."""
+        self.__file.close()
+
+
+class SocketPublisher:
+    """
+    Streams events as JSON lines to every client of a Unix socket.
+
+    A client that cannot keep up within `timeout` seconds is disconnected
+    rather than holding up the others.
+
+    Attributes_:
+        path (str): The path of the socket.
+        timeout (float): Seconds a client has to accept a batch.
+    """
+
+    def __init__(self, path, timeout=1.0):
+        """
+        Listen on a Unix socket, replacing a stale socket file.
+
+        Args_:
+            path (str): The path of the socket.
+            timeout (float): Seconds a client has to accept a batch.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.__clients = []
+        self.__lock = threading.Lock()
+
+        if os.path.exists(path):
+            os.remove(path)
+        self.__server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__server.bind(path)
+        self.__server.listen()
+        threading.Thread(target=self.__accept, name="hbnb-changes-socket",
+                         daemon=True).start()
+
+    def __call__(self, events):
+        """Send a batch of events to every connected client."""
+        data = "".join(json.dumps(event) + "\n" for event in events).encode()
+
+        with self.__lock:
+            clients = list(self.__clients)
+
+        for client in clients:
+            try:
+                client.sendall(data)
+            except OSError:
+                self.__drop(client)
+
+    def close(self):
+        """Disconnect every client and remove the socket."""
+        self.__server.close()
+        with self.__lock:
+            clients, self.__clients = self.__clients, []
+        for client in clients:
+            client.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __accept(self):
+        """Accept clients until the socket is closed."""
+        while True:
+            try:
+                client, _ = self.__server.accept()
+            except OSError:
+                return
+            client.settimeout(self.timeout)
+            with self.__lock:
+                self.__clients.append(client)
+
+    def __drop(self, client):
+        """Disconnect a client."""
+        with self.__lock:
+            if client in self.__clients:
+                self.__clients.remove(client)
+        client.close()
@@ -0,0 +1,477 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Columns module: the numeric fields of places in shared memory.
+
+Analytics scanning prices, capacities or coordinates need neither the
+object graph nor a copy of it per process. A ColumnPublisher, in the
+process owning storage, exports every numeric field of Place (those
+annotated `int` or `float`) as one contiguous column each, along with the
+table of place ids, into a block of `multiprocessing.shared_memory`. Any
+number of ColumnReader processes attach to it without copying anything and
+read the columns as NumPy arrays, or as typed memoryviews when NumPy is not
+installed: ten readers share one copy of the columns.
+
+Every publication writes a new block, "<segment>.<generation>", and then
+bumps the generation in the small control block "<segment>". A reader keeps
+the block it attached to until it calls `refresh`, so the data it reads is
+never swapped from under it; the writer unlinks an old block as soon as it
+is superseded, and the memory is freed once its last reader lets it go.
+
+Integer fields hold 0 and float fields NaN where a place has no number, or
+one out of range.
+
+usage:
+------
+python3 -m models.engine.columns [--segment <name>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import json
+import struct
+import time
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from models.engine.indexes import StorageIndex
+from models.engine.keys import split_key
+
+SEGMENT = "hbnb-places"
+# The control block: a magic number and the generation last published
+CONTROL = struct.Struct("<8sQ")
+MAGIC = b"HBNBCOL1"
+# The array type codes of the column types
+TYPECODES = {int: "q", float: "d"}
+# Times a reader retries a generation unlinked while it attached to it
+ATTACH_RETRIES = 10
+
+# The blocks created by the publishers of this process
+_owned = set()
+
+
+def columns_of(cls):
+    """
+    Return the numeric fields of a model class.
+
+    Args_:
+        cls (type): The model class.
+
+    Returns_:
+        dict: Maps each field annotated `int` or `float` to its array type
+        code, in the order of the annotations.
+    """
+    fields = {}
+    for klass in reversed(cls.__mro__):
+        for field, kind in getattr(klass, "__annotations__", {}).items():
+            if kind in TYPECODES:
+                fields[field] = TYPECODES[kind]
+
+    return fields
+
+
+def _number(value, typecode):
+    """Return a stored value as a column number, 0 or NaN if it is none."""
+    try:
+        if typecode == "d":
+            return float(value)
+        try:
+            number = int(value)
+        except ValueError:
+            number = int(float(value))
+        if -2 ** 63 <= number < 2 ** 63:
+            return number
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    return 0 if typecode == "q" else float("nan")
+
+
+class _Block(shared_memory.SharedMemory):
+    """A shared memory block attached to by a reader."""
+
+    def __del__(self):
+        """Close the block, unless views of it outlive it."""
+        try:
+            self.close()
+        except BufferError:
+            pass  # the mapping is released with the last view
+
+
+def _attach(name):
+    """Attach to a shared memory block owned by another process."""
+    block = _Block(name)
+    # Attaching registers the block with this process's resource tracker,
+    # which would unlink it when this process exits
+    if block._name not in _owned:
+        resource_tracker.unregister(block._name, "shared_memory")
+
+    return block
+
+
+def _align(offset):
+    """Round an offset up to the next multiple of 8."""
+    return (offset + 7) & ~7
+
+
+class ColumnPublisher(StorageIndex):
+    """
+    Publishes the numeric columns of places to shared memory.
+
+    The publisher listens to storage like an index, so that `publish` only
+    writes a new generation when places changed.
+
+    Attributes_:
+        segment (str): The name of the control block.
+        cls (str): The model class exported, "Place".
+        columns (dict): Maps the fields exported to their type codes.
+        generation (int): The generation last published, 0 before any.
+        changed (bool): Whether places changed since.
+    """
+
+    def __init__(self, segment=SEGMENT, storage=None):
+        """
+        Create the control block and start listening to storage.
+
+        Args_:
+            segment (str): The name of the control block.
+            storage (optional): The storage engine, `models.storage` by
+                default.
+        """
+        if storage is None:
+            from models import storage
+        from models.place import Place
+
+        self.segment = segment
+        self.storage = storage
+        self.cls = Place.__name__
+        self.columns = columns_of(Place)
+        self.generation = 0
+        self.changed = True
+        self.__block = None
+        try:
+            self.__control = shared_memory.SharedMemory(
+                segment, create=True, size=CONTROL.size)
+        except FileExistsError:
+            # Left over by a publisher that died: carry on its generations
+            self.__control = _attach(segment)
+            resource_tracker.register(self.__control._name, "shared_memory")
+            magic, generation = CONTROL.unpack_from(self.__control.buf)
+            if magic == MAGIC:
+                self.generation = generation
+        _owned.add(self.__control._name)
+        CONTROL.pack_into(self.__control.buf, 0, MAGIC, self.generation)
+        storage.register_index(self)
+
+    def on_set(self, key, old, new):
+        """Note that a place changed."""
+        if split_key(key)[0] == self.cls:
+            self.changed = True
+
+    def on_delete(self, key, old):
+        """Note that a place was deleted."""
+        if split_key(key)[0] == self.cls:
+            self.changed = True
+
+    def on_clear(self):
+        """Note that every place was removed."""
+        self.changed = True
+
+    def publish(self, force=False):
+        """
+        Write the columns as a new generation, if places changed.
+
+        Args_:
+            force (bool): Publish even if no place changed.
+
+        Returns_:
+            bool: Whether a new generation was published.
+        """
+        if not (self.changed or force):
+            return False
+
+        self.changed = False
+        keys, values = [], []
+        for key, value in self.storage.items(self.cls):
+            keys.append(key)
+            values.append(value)
+        ids = [split_key(key)[1] for key in keys]
+
+        # Built a column at a time, in C unless a value is not a number of
+        # the column's type
+        columns = {}
+        for field, typecode in self.columns.items():
+            numbers = [value.get(field, 0) for value in values]
+            try:
+                columns[field] = array(typecode, numbers)
+            except (TypeError, OverflowError):
+                columns[field] = array(typecode, [
+                    _number(number, typecode) for number in numbers])
+
+        blob = "".join(ids).encode()
+        offsets = array("q", [0])
+        for obj_id in ids:
+            offsets.append(offsets[-1] + len(obj_id.encode()))
+
+        # Arrays are laid out after the header, at offsets relative to its
+        # end, each aligned for its type
+        header = {"class": self.cls, "count": len(ids), "time": time.time(),
+                  "arrays": {}}
+        size = 0
+        for field, data in [*columns.items(), ("offsets", offsets),
+                            ("ids", blob)]:
+            typecode = getattr(data, "typecode", "B")
+            header["arrays"][field] = [typecode, size, len(data)]
+            size = _align(size + len(memoryview(data).cast("B")))
+        text = json.dumps(header).encode()
+        start = _align(8 + len(text))
+
+        generation = self.generation + 1
+        block = shared_memory.SharedMemory(f"{self.segment}.{generation}",
+                                           create=True, size=start + size)
+        _owned.add(block._name)
+        struct.pack_into("<Q", block.buf, 0, len(text))
+        block.buf[8:8 + len(text)] = text
+        for field, data in [*columns.items(), ("offsets", offsets),
+                            ("ids", blob)]:
+            raw = memoryview(data).cast("B")
+            offset = start + header["arrays"][field][1]
+            block.buf[offset:offset + len(raw)] = raw
+
+        # Readers find the new generation only once it is complete
+        CONTROL.pack_into(self.__control.buf, 0, MAGIC, generation)
+        self.generation = generation
+        self.__retire(block)
+
+        return True
+
+    def close(self, unlink=True):
+        """
+        Stop listening to storage and release the blocks.
+
+        Args_:
+            unlink (bool): Remove the blocks; readers attached keep theirs.
+        """
+        self.storage.unregister_index(self)
+        for block in (self.__block, self.__control):
+            if block is not None:
+                block.close()
+                if unlink:
+                    block.unlink()
+                    _owned.discard(block._name)
+        self.__block = self.__control = None
+
+    def __retire(self, block):
+        """Make a block the current one, unlinking the one it replaces."""
+        if self.__block is not None:
+            self.__block.close()
+            self.__block.unlink()
+            _owned.discard(self.__block._name)
+        self.__block = block
+
+
+class ColumnReader:
+    """
+    Reads the columns published by a ColumnPublisher, without copying them.
+
+    Attributes_:
+        segment (str): The name of the control block.
+        generation (int): The generation read, 0 if none was published.
+        count (int): The number of places in it.
+        published (float): When it was published, as a Unix time.
+    """
+
+    def __init__(self, segment=SEGMENT):
+        """
+        Attach to the generation last published.
+
+        Args_:
+            segment (str): The name of the control block.
+
+        Raises_:
+            FileNotFoundError: If no publisher created that block.
+        """
+        self.segment = segment
+        self.generation = 0
+        self.count = 0
+        self.published = None
+        self.__control = _attach(segment)
+        self.__block = None
+        self.__arrays = {}
+        self.__retired = []
+        self.__positions = None
+        self.refresh()
+
+    @property
+    def stale(self):
+        """Whether a newer generation was published since."""
+        return self.__latest() != self.generation
+
+    def fields(self):
+        """Return the names of the columns."""
+        return [field for field in self.__arrays
+                if field not in ("offsets", "ids")]
+
+    def column(self, field):
+        """
+        Return a column, as a view of the shared memory.
+
+        Args_:
+            field (str): The name of the field.
+
+        Returns_:
+            numpy.ndarray: A read-only array, or a read-only typed
+            memoryview if NumPy is not installed, of one number per place.
+
+        Raises_:
+            KeyError: If the field is not a column.
+        """
+        if field not in self.fields():
+            raise KeyError(field)
+
+        return self.__view(field)
+
+    def ids(self):
+        """Return the ids of the places, in the order of the columns."""
+        offsets = self.__view("offsets", numpy=False)
+        blob = bytes(self.__view("ids", numpy=False))
+
+        return [blob[offsets[i]:offsets[i + 1]].decode()
+                for i in range(self.count)]
+
+    def position(self, obj_id):
+        """
+        Return the position of a place in the columns.
+
+        Args_:
+            obj_id (str): The id of the place.
+
+        Returns_:
+            int: Its position, or None if it is not in this generation.
+        """
+        if self.__positions is None:
+            self.__positions = {obj_id: i for i, obj_id in
+                                enumerate(self.ids())}
+
+        return self.__positions.get(obj_id)
+
+    def refresh(self):
+        """
+        Attach to the newest generation, if one was published since.
+
+        Returns_:
+            bool: Whether a newer generation was attached to.
+
+        Raises_:
+            ValueError: If the control block is not a publisher's.
+        """
+        self.__release()
+        for _ in range(ATTACH_RETRIES):
+            generation = self.__latest()
+            if generation == self.generation:
+                return False
+            try:
+                block = _attach(f"{self.segment}.{generation}")
+            except FileNotFoundError:
+                continue  # superseded while attaching: read the next one
+            break
+        else:
+            return False
+
+        length, = struct.unpack_from("<Q", block.buf)
+        header = json.loads(bytes(block.buf[8:8 + length]))
+        start = _align(8 + length)
+        self.__retired.append(self.__block)
+        self.__release()
+        self.__block = block
+        self.__arrays = {field: (typecode, start + offset, count)
+                         for field, (typecode, offset, count)
+                         in header["arrays"].items()}
+        self.__positions = None
+        self.generation = generation
+        self.count = header["count"]
+        self.published = header["time"]
+
+        return True
+
+    def close(self):
+        """
+        Detach from the shared memory.
+
+        Raises_:
+            BufferError: If views of the columns are still referenced.
+        """
+        self.__retired.append(self.__block)
+        self.__block = None
+        self.__arrays = {}
+        self.__release()
+        if self.__retired:
+            raise BufferError("views of the columns are still referenced")
+        self.__control.close()
+
+    def __latest(self):
+        """Return the generation last published."""
+        magic, generation = CONTROL.unpack_from(self.__control.buf)
+        if magic != MAGIC:
+            raise ValueError(f"{self.segment} is not a column segment")
+
+        return generation
+
+    def __view(self, field, numpy=True):
+        """Return a read-only view of an array of the current block."""
+        typecode, offset, count = self.__arrays[field]
+        size = array(typecode).itemsize
+        raw = self.__block.buf[offset:offset + count * size]
+
+        if numpy:
+            try:
+                import numpy
+            except ModuleNotFoundError:
+                pass
+            else:
+                view = numpy.frombuffer(raw, dtype=typecode, count=count)
+                view.flags.writeable = False
+                return view
+
+        return raw.toreadonly().cast(typecode)
+
+    def __release(self):
+        """Close the blocks replaced, once no view of them is left."""
+        for block in list(self.__retired):
+            if block is not None:
+                try:
+                    block.close()
+                except BufferError:
+                    continue
+            self.__retired.remove(block)
+
+
+def main():
+    """Summarize the columns last published."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--segment", default=SEGMENT,
+                        help=f"name of the control block (default: {SEGMENT})")
+    args = parser.parse_args()
+
+    try:
+        reader = ColumnReader(args.segment)
+    except FileNotFoundError:
+        parser.error(f"nothing was published as {args.segment}")
+
+    published = "never" if reader.published is None else time.strftime(
+        "%Y-%m-%dT%H:%M:%S", time.localtime(reader.published))
+    print(f"generation {reader.generation}: {reader.count} places, "
+          f"published {published}")
+    for field in reader.fields():
+        values = [value for value in reader.column(field) if value == value]
+        if values:
+            print(f"{field:<18} min {min(values):>12g} "
+                  f"mean {sum(values) / len(values):>12g} "
+                  f"max {max(values):>12g}")
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,25 @@ FileStorage module for object serialization and deserialization.
 
 This module provides the FileStorage class for saving objects to a file in
 JSON format and reloading them when needed. It supports basic CRUD operations
-and lazy loading of classes.
+and lazy loading of classes, and keeps the secondary indexes registered with
+it (see models.engine.indexes) up to date. The modules of the indexes every
+storage keeps are only imported when the indexes are first needed, so that
+importing models stays cheap.
 """
 __author__ = "Albert Mwanza"
 __license__ = "MIT"
 __date__ = "2025-01-03"
 __version__ = "1.1"
 
+import atexit
 import os
 import json
+import time
+from models.engine.keys import key_of, make_key, split_key
+from models.engine.object_map import ObjectMap
+from models.engine.query import select
+from models.engine.registry import classes
+from models.engine.replica import ChangelogTail, apply_event
 
 
 class FileStorage:
@@ -21,66 +31,1055 @@ class FileStorage:
     Handles serialization and deserialization of objects to/from a JSON file.
     """
     __file_path = "file.json"
-    __objects: dict = {}
+    # The secondary indexes notified of every change to __objects
+    __listeners: list = []
+    __objects: ObjectMap = ObjectMap(listeners=__listeners)
+    # Whether the indexes every storage keeps are registered yet
+    __defaults = False
+    # key -> serialized forms of the object last stored under that key
+    __serialized: dict = {}
+    # Whether the file has been read yet, and its (inode, size, mtime)
+    # when it was last read or written
+    __loaded = False
+    __signature = None
+    # The (inode, size, mtime) of the file the sidecars were last written
+    # with, and whether objects changed since the file was last written
+    __indexed = None
+    __unsaved = False
+    # The changelog tailed in follower mode, None on a primary
+    __follower = None
+    # Whether `save` writes the file from a forked child (see `bgsave`)
+    background = False
+    # Whether this process is the only writer of the file, which then never
+    # needs to be checked for changes made by others
+    exclusive = False
+    # Whether `save` is refused, as in the workers of models.engine.prefork
+    read_only = False
+    # The pid of the running background save and the pipe it reports on
+    __bgsave_pid = None
+    __bgsave_fd = None
+    # Whether changes were saved while a background save was running
+    __pending = False
+    __last_bgsave: dict = {}
+    # Whether the exit handler waiting for background saves is registered
+    __finishing = False
 
-    def all(self):
-        """Retrieve all objects from storage.
+    def all(self, cls=None):
+        """Retrieve all objects from storage, optionally of a single class.
+
+        Args_:
+            cls (type or str, optional): Only return objects of this class,
+            given as the class itself or its name.
 
         Returns_:
             dict: A dictionary of all objects in storage, re-instantiated to
             their original types.
         """
-        self.reload()  # Ensure the latest objects are loaded
+        self.refresh()  # Ensure the latest objects are loaded
 
         return_dict = {}
+        objects = FileStorage.__objects
+        names = objects.classes() if cls is None else [self.__name_of(cls)]
 
-        # Lazy imports to avoid circular dependencies
-        from models.base_model import BaseModel
-        from models.user import User
-        from models.place import Place
-        from models.state import State
-        from models.city import City
-        from models.amenity import Amenity
-        from models.review import Review
-
-        class_models = {
-            'BaseModel': BaseModel,
-            'User': User,
-            'Place': Place,
-            'State': State,
-            'City': City,
-            'Amenity': Amenity,
-            'Review': Review
-        }
-
-        # Convert stored dictionary representations back into objects
-        for key, value in FileStorage.__objects.copy().items():
-            cls, _ = key.split(".")
-            return_dict[key] = class_models[cls](**value)
+        # Convert stored dictionary representations back into objects,
+        # walking the class index instead of splitting every key
+        for name in names:
+            for key in list(objects.keys_of(name)):
+                return_dict[key] = classes[name](**objects[key])
 
         return return_dict
 
+    def get(self, cls, obj_id):
+        """Retrieve a single object by class and id.
+
+        Args_:
+            cls (type or str): The class of the object, or its name.
+            obj_id (str): The id of the object.
+
+        Returns_:
+            BaseModel or subclass: The re-instantiated object, or None if it
+            is not in storage.
+        """
+        self.refresh()
+
+        name = self.__name_of(cls)
+        value = FileStorage.__objects.get(make_key(name, obj_id))
+
+        if value is None:
+            return None
+
+        return classes[name](**value)
+
+    def items(self, cls=None):
+        """Iterate over the stored dictionaries, optionally of one class.
+
+        Args_:
+            cls (type or str, optional): Only yield objects of this class.
+
+        Yields_:
+            tuple: ("<class name>.<id>", dictionary representation) pairs.
+        """
+        self.refresh()
+
+        objects = FileStorage.__objects
+        if cls is None:
+            yield from list(objects.items())
+        else:
+            for key in list(objects.keys_of(self.__name_of(cls))):
+                yield key, objects[key]
+
+    def keys(self, cls=None):
+        """Return the keys of the stored objects, without their values.
+
+        Args_:
+            cls (type or str, optional): Only return the keys of this class.
+
+        Returns_:
+            list: The "<class name>.<id>" keys.
+        """
+        self.refresh()
+
+        objects = FileStorage.__objects
+        if cls is None:
+            return list(objects.keys())
+
+        return list(objects.keys_of(self.__name_of(cls)))
+
+    def count(self, cls=None):
+        """Count the objects in storage, optionally of a single class.
+
+        Args_:
+            cls (type or str, optional): The class to count, or its name.
+
+        Returns_:
+            int: The number of stored objects.
+        """
+        self.refresh()
+
+        return FileStorage.__objects.count(
+            None if cls is None else self.__name_of(cls))
+
+    def listing(self, cls, obj_id, page=0):
+        """Return one page of the places of a City or State, sorted by name.
+
+        Args_:
+            cls (type or str): City or State, or its name.
+            obj_id (str): The id of the City or State.
+            page (int): The page number, starting at 0.
+
+        Returns_:
+            tuple: (list of the Place objects on the page, number of pages).
+        """
+        self.refresh()
+
+        place_ids, pages = FileStorage.index("listings").page(
+            self.__name_of(cls), obj_id, page)
+
+        return [self.get("Place", place_id) for place_id in place_ids], pages
+
+    def reviews_of(self, place_id, limit=None):
+        """Return the review count and the latest reviews of a place.
+
+        Args_:
+            place_id (str): The id of the Place.
+            limit (int, optional): The most reviews returned, LATEST of
+                models.engine.reviews by default.
+
+        Returns_:
+            tuple: (number of reviews, list of the latest Review objects,
+            newest first).
+        """
+        self.refresh()
+
+        stats = FileStorage.index("reviews")
+        if limit is None:
+            from models.engine.reviews import LATEST
+            limit = LATEST
+
+        return stats.count(place_id), [
+            self.get("Review", split_key(key)[1])
+            for key in stats.latest(place_id, limit)]
+
+    def user_review_count(self, user_id):
+        """Return the number of reviews a user wrote.
+
+        Args_:
+            user_id (str): The id of the User.
+
+        Returns_:
+            int: The number of reviews.
+        """
+        self.refresh()
+
+        return FileStorage.index("reviews").user_count(user_id)
+
+    def search(self, cls, query, limit=10):
+        """Rank the objects of a class by relevance to a full-text query.
+
+        Args_:
+            cls (type or str): Place, Review or Amenity, or its name.
+            query (str): The search terms.
+            limit (int): The most results returned.
+
+        Returns_:
+            list: ("<class name>.<id>", score) pairs, best first.
+
+        Raises_:
+            ValueError: If the class has no indexed text fields.
+        """
+        self.refresh()
+
+        return FileStorage.index("search").search(
+            self.__name_of(cls), query, limit)
+
+    def autocomplete(self, prefix, limit=None, cls=None):
+        """Complete the name of a State or City being typed.
+
+        Names are matched from the start of any of their words, ignoring
+        case and accents (see models.engine.autocomplete).
+
+        Args_:
+            prefix (str): The start of the name.
+            limit (int, optional): The most locations returned, LIMIT of
+                models.engine.autocomplete by default.
+            cls (type or str, optional): Only State or only City.
+
+        Returns_:
+            list: Dictionaries of the "__class__", "id" and "name" of the
+            locations, plus the "state_id" and "state" name of Cities, the
+            names starting with the prefix first.
+        """
+        self.refresh()
+
+        index = FileStorage.index("autocomplete")
+        if limit is None:
+            from models.engine.autocomplete import LIMIT
+            limit = LIMIT
+
+        return index.complete(
+            prefix, limit, None if cls is None else self.__name_of(cls))
+
+    def changed_since(self, ts, cls=None):
+        """Iterate over the objects updated after a given time.
+
+        Objects are read one at a time, so a consumer can stop early or sync
+        a large change set without holding it in memory.
+
+        Args_:
+            ts (datetime or str): The time, or its ISO 8601 form.
+            cls (type or str, optional): Only objects of this class.
+
+        Yields_:
+            BaseModel or subclass: The objects, least recently updated first.
+
+        Raises_:
+            ValueError: If `ts` is not an ISO 8601 time.
+        """
+        self.refresh()
+
+        keys = FileStorage.index("timeline").between(
+            "updated_at", ts, cls_name=None if cls is None
+            else self.__name_of(cls))
+        for key in keys:
+            obj = self.get(*split_key(key))
+            if obj is not None:
+                yield obj
+
+    def destroyed_since(self, ts):
+        """Return the keys of the objects destroyed after a given time.
+
+        They are read from the timeline, which only knows the objects
+        destroyed since it was last rebuilt from the objects rather than
+        restored from its sidecar.
+
+        Args_:
+            ts (datetime or str): The time, or its ISO 8601 form.
+
+        Returns_:
+            list: The keys of the objects destroyed since, and not created
+            again, or None if the timeline may have missed some of them.
+
+        Raises_:
+            ValueError: If `ts` is not an ISO 8601 time.
+        """
+        self.refresh()
+
+        return FileStorage.index("timeline").destroyed_since(ts)
+
+    def resolve(self, cls, prefix):
+        """Return the full id of an object from its id or an abbreviation.
+
+        As with git commit hashes, any prefix of an id of at least
+        PREFIX_MIN characters that no other id of the class starts with
+        stands for it.
+
+        Args_:
+            cls (type or str): The class of the object, or its name.
+            prefix (str): The id, or the start of it.
+
+        Returns_:
+            str: The id.
+
+        Raises_:
+            KeyError: If no object of the class has such an id.
+            ValueError: If several objects have ids starting with it, or if
+                it is shorter than PREFIX_MIN characters and no id.
+        """
+        from models.engine.ids import PREFIX_MIN, IdIndex
+
+        self.refresh()
+
+        name = self.__name_of(cls)
+        # Read from the id index alone, whatever the engine keeps resident:
+        # an id sorts first among the ids it starts
+        ids = FileStorage.index(IdIndex).matching(name, prefix, limit=2)
+        if ids and ids[0] == prefix:
+            return prefix
+        if len(prefix) < PREFIX_MIN:
+            raise ValueError(f"{name} id prefix {prefix!r} is too short: "
+                             f"{PREFIX_MIN} characters at least")
+
+        if not ids:
+            raise KeyError(prefix)
+        if len(ids) > 1:
+            count = FileStorage.index(IdIndex).count(name, prefix)
+            raise ValueError(f"{name} id prefix {prefix!r} is ambiguous: "
+                             f"{count} instances match")
+
+        return ids[0]
+
+    def ids(self, cls, prefix="", limit=None):
+        """Return the ids of a class starting with a prefix, sorted.
+
+        Only the id index is read, so that this is fast enough to complete
+        ids as they are typed.
+
+        Args_:
+            cls (type or str): The class of the objects, or its name.
+            prefix (str): The start of the ids.
+            limit (int, optional): The most ids returned. When more ids
+                match, the last one returned is the greatest of them, so
+                that the ids returned share no more than every match does.
+
+        Returns_:
+            list: The ids.
+        """
+        from models.engine.ids import IdIndex
+
+        self.refresh()
+
+        name = self.__name_of(cls)
+        index = FileStorage.index(IdIndex)
+        ids = index.matching(name, prefix, limit)
+        if ids and len(ids) == limit and index.count(name, prefix) > limit:
+            ids[-1] = index.last(name, prefix)
+
+        return ids
+
+    def minimal_unique_prefix(self, cls=None):
+        """Report how many leading characters tell the ids of a class apart.
+
+        Args_:
+            cls (type or str, optional): Only report this class.
+
+        Returns_:
+            dict: Class name -> the shortest length of an id prefix that
+            is unique within the class and that `resolve` accepts, for the
+            classes with objects.
+        """
+        from models.engine.ids import PREFIX_MIN, IdIndex
+
+        self.refresh()
+
+        ids = FileStorage.index(IdIndex)
+        names = ids.classes() if cls is None else [self.__name_of(cls)]
+
+        lengths = {name: ids.minimal_unique_prefix(name) for name in names}
+
+        return {name: max(length, PREFIX_MIN)
+                for name, length in lengths.items() if length}
+
+    def get_by(self, cls, **fields):
+        """Retrieve the object of a class whose fields have given values.
+
+        A field with a unique index, such as User.email, is looked up in the
+        index, case insensitively; otherwise every object of the class is
+        compared.
+
+        Args_:
+            cls (type or str): The class of the object, or its name.
+            **fields: The values of the fields, e.g. ``email="a@b.com"``.
+
+        Returns_:
+            BaseModel or subclass: The object, or None if no object matches.
+
+        Raises_:
+            ValueError: If no field is given.
+        """
+        from models.engine.unique import UniqueIndex, normalize
+
+        if not fields:
+            raise ValueError("no field to look up")
+
+        self.refresh()
+
+        name = self.__name_of(cls)
+        unique = {index.field: index for index in FileStorage.indexes()
+                  if isinstance(index, UniqueIndex)
+                  and index.cls_name == name}
+        # Compared as the unique indexes compare them
+        expected = {field: normalize(value) if field in unique else value
+                    for field, value in fields.items()}
+
+        indexed = unique.keys() & fields.keys()
+        if indexed:
+            field = min(indexed)
+            obj_id = unique[field].lookup(fields[field])
+            obj = None if obj_id is None else self.get(name, obj_id)
+            candidates = [] if obj is None else [obj.to_dict()]
+        else:
+            candidates = (value for _, value in self.items(name))
+
+        for value in candidates:
+            actual = {field: normalize(value[field]) if field in unique
+                      else value[field] for field in fields if field in value}
+            if actual == expected:
+                return classes[name](**value)
+
+        return None
+
+    def scan(self, cls, query, workers=None):
+        """Return the objects of a class matching a query, scanned in parallel.
+
+        The stored dictionaries are split into chunks evaluated by a pool of
+        processes (see models.engine.query), and only the matching ones are
+        instantiated.
+
+        Args_:
+            cls (type or str): The class of the objects, or its name.
+            query (Query): A predicate over stored dictionaries.
+            workers (int, optional): The number of processes, one per CPU by
+                default.
+
+        Returns_:
+            list: The matching objects, in storage order.
+        """
+        name = self.__name_of(cls)
+        values = [value for _, value in self.items(name)]
+
+        return [classes[name](**values[position])
+                for position in select(values, query, workers)]
+
+    @staticmethod
+    def register_index(index):
+        """Register a secondary index to be kept up to date with storage.
+
+        Indexes are shared by every storage instance and are meant to be
+        registered at import time, before the file is first read.
+
+        Args_:
+            index (StorageIndex): The index to register.
+
+        Returns_:
+            StorageIndex: The index.
+        """
+        FileStorage.__register_defaults()
+        FileStorage.__listeners.append(index)
+        if FileStorage.__loaded and index.replays:
+            for key, value in FileStorage.__objects.items():
+                index.on_set(key, None, value)
+
+        return index
+
+    def follow(self, changelog):
+        """Turn this process into a read-only follower of a primary.
+
+        The snapshot is loaded once, on next access, and then kept up to date
+        by applying the events the primary appends to its changelog (see
+        models.engine.replica) before every read, instead of being re-read
+        whenever it changes.
+
+        Args_:
+            changelog (str): The path of the primary's changelog.
+        """
+        FileStorage.__follower = ChangelogTail(changelog)
+        FileStorage.__loaded = False
+
+    def replication(self):
+        """Report how far behind its primary this follower is.
+
+        Returns_:
+            dict: The sequence number of the last event applied, the lag in
+            seconds between the primary recording it and this process
+            applying it, the changelog bytes not read yet and how changes
+            are detected; None if this process is not a follower.
+        """
+        follower = FileStorage.__follower
+        if follower is None:
+            return None
+
+        self.refresh()
+
+        return {"sequence": follower.sequence, "lag": follower.lag,
+                "pending": follower.pending(), "mode": follower.mode}
+
+    @staticmethod
+    def subscribe(subscriber):
+        """Deliver the events of the storage mutations to a subscriber.
+
+        See models.engine.changes for the events and the subscribers
+        provided.
+
+        Args_:
+            subscriber (callable): Called with each batch of events.
+
+        Returns_:
+            callable: The subscriber.
+        """
+        return FileStorage.index("changes").subscribe(subscriber)
+
+    @staticmethod
+    def unsubscribe(subscriber):
+        """Stop delivering events to a subscriber.
+
+        Args_:
+            subscriber (callable): A subscriber passed to `subscribe`.
+        """
+        FileStorage.index("changes").unsubscribe(subscriber)
+
+    @staticmethod
+    def unregister_index(index):
+        """Stop keeping a registered index up to date.
+
+        Args_:
+            index (StorageIndex): The index to unregister.
+        """
+        FileStorage.__register_defaults()
+        if index in FileStorage.__listeners:
+            FileStorage.__listeners.remove(index)
+
+    @staticmethod
+    def indexes():
+        """Return every registered index.
+
+        Returns_:
+            tuple: The StorageIndex objects, in registration order.
+        """
+        FileStorage.__register_defaults()
+
+        return tuple(FileStorage.__listeners)
+
+    @staticmethod
+    def index(name):
+        """Return the registered index of that name, or of that type.
+
+        Args_:
+            name (str or type): The name of the index, or its class for
+                indexes that are not persistent.
+
+        Returns_:
+            StorageIndex: The index, the first one registered of a type.
+
+        Raises_:
+            KeyError: If no such index is registered.
+        """
+        FileStorage.__register_defaults()
+        for index in FileStorage.__listeners:
+            if index.name == name or (isinstance(name, type) and
+                                      isinstance(index, name)):
+                return index
+
+        raise KeyError(name)
+
+    @staticmethod
+    def __register_defaults():
+        """Register the indexes every storage keeps, on first use.
+
+        This is done before any other index is registered and before the
+        file is first read, as if at import time, but importing models does
+        not import their modules.
+        """
+        if FileStorage.__defaults:
+            return
+        FileStorage.__defaults = True
+
+        from models.engine.autocomplete import Autocomplete
+        from models.engine.changes import ChangeFeed
+        from models.engine.ids import IdIndex
+        from models.engine.listings import Listings
+        from models.engine.reviews import ReviewStats
+        from models.engine.search import SearchIndex
+        from models.engine.surrogates import Surrogates
+        from models.engine.timeline import Timeline
+        from models.engine.unique import UniqueIndex
+
+        surrogates = Surrogates()
+        for index in (surrogates, Listings(), ReviewStats(),
+                      SearchIndex(surrogates), Timeline(), ChangeFeed(),
+                      UniqueIndex("User", "email"), IdIndex(),
+                      Autocomplete()):
+            FileStorage.register_index(index)
+
+    @staticmethod
+    def __name_of(cls):
+        """Return the class name of a class given as a type or a string."""
+        return cls if isinstance(cls, str) else cls.__name__
+
     def new(self, obj):
         """Add a new object to the storage.
 
+        The constraints of the indexes are only checked when it is saved.
+        A process that may not write the file stores nothing: the objects
+        created or changed in it are refused when saved.
+
         Args_:
             obj (BaseModel or subclass): The object to add to storage.
         """
-        FileStorage.__objects[f"{type(obj).__name__}.{obj.id}"] = obj.to_dict()
+        if self.read_only or FileStorage.__follower is not None:
+            return
+
+        self.__store(obj, check=False)
+
+    def __store(self, obj, check=True):
+        """Store the dictionary representation of an object.
+
+        The object's cached serialized forms are remembered so that `save`
+        can reuse its JSON text for as long as the stored dictionary is the
+        one the cache was built from. Storing an object unchanged does
+        nothing.
+
+        Args_:
+            obj (BaseModel or subclass): The object to store.
+            check (bool): Let the indexes refuse the change, and refuse it
+                if this process may not write the file.
+
+        Raises_:
+            ValueError: If an index refuses the change, such as a unique
+                field already held by another object.
+            PermissionError: If this process is a follower, or read-only.
+        """
+        if check:
+            self.__check_writable()
+
+        if not FileStorage.__loaded:
+            self.refresh()
+
+        key = key_of(obj)
+        forms = obj._serialized()
+
+        # Every read instantiates, and so stores, the objects it returns:
+        # an unchanged dictionary is left in place without waking the
+        # indexes
+        old = FileStorage.__objects.get(key)
+        if old == forms[0]:
+            return
+
+        if check:
+            for index in FileStorage.__listeners:
+                index.check(key, old, forms[0])
+
+        FileStorage.__objects[key] = forms[0]
+        FileStorage.__serialized[key] = forms
+        FileStorage.__unsaved = True
+
+    def delete(self, obj=None):
+        """Remove an object from storage; `save` persists the removal.
+
+        Args_:
+            obj (BaseModel or subclass, optional): The object to remove.
+
+        Raises_:
+            PermissionError: If this process is a follower, or read-only.
+        """
+        if obj is not None:
+            self.__check_writable()
+        if obj is not None and FileStorage.__objects.pop(
+                key_of(obj), None) is not None:
+            FileStorage.__unsaved = True
 
     def save(self):
-        """Serialize the __objects dictionary to the JSON file."""
-        with open(FileStorage.__file_path, 'w') as outfile:
-            json.dump(FileStorage.__objects, outfile)
+        """Serialize the __objects dictionary to the JSON file.
+
+        The output is identical to ``json.dump(__objects)``, but the JSON text
+        of objects that have not changed since they were last stored is taken
+        from their cache instead of being re-encoded.
+
+        In background mode the file is written by `bgsave` instead. While a
+        background save is running, the changes are kept in memory and
+        written by the next one.
+
+        The sidecars of the persistent indexes are not written: see
+        `checkpoint`.
+
+        Raises_:
+            PermissionError: If this process is a follower, or read-only.
+        """
+        self.__check_writable()
+
+        if not FileStorage.__loaded:
+            self.reload()
+
+        if self.__reap():
+            FileStorage.__pending = True
+        elif self.background:
+            self.bgsave()
+        else:
+            self.__write()
+
+    def bgsave(self):
+        """Write the JSON file from a forked child, without blocking.
+
+        The child serializes its copy-on-write view of the objects to a
+        temporary file and renames it over the JSON file, along with the
+        sidecars of the persistent indexes, while this process carries on.
+        See `info` for the outcome.
+
+        Returns_:
+            bool: False if a background save was already running.
+
+        Raises_:
+            PermissionError: If this process is a follower, or read-only.
+        """
+        self.__check_writable()
+
+        if not FileStorage.__loaded:
+            self.reload()
+
+        if self.__reap():
+            return False
+
+        FileStorage.__pending = False
+        if not hasattr(os, "fork"):
+            start = time.monotonic()
+            self.__write(indexes=True)
+            FileStorage.__last_bgsave = {
+                "status": "ok", "duration": time.monotonic() - start,
+                "cow_bytes": 0, "time": time.time()}
+            return True
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            start = time.monotonic()
+            try:
+                report = {"status": "ok", "signature": self.__write(
+                    atomic=True, indexes=True)}
+            except Exception as error:
+                report = {"status": f"err: {error}"}
+            report["duration"] = time.monotonic() - start
+            report["cow_bytes"] = self.__private_dirty()
+            try:
+                os.write(write_fd, json.dumps(report).encode())
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        # The child writes every change made so far
+        FileStorage.__unsaved = False
+        self.__finish_at_exit()
+        FileStorage.__bgsave_pid, FileStorage.__bgsave_fd = pid, read_fd
+
+        return True
+
+    def checkpoint(self):
+        """Save, along with the sidecars of the persistent indexes.
+
+        `save` only writes the JSON file, so that saving one object does not
+        cost rewriting every index: the sidecars are written by `bgsave`,
+        by this method, and at exit if nothing changed since the last save.
+        An index whose sidecar was not written with the file on disk is
+        rebuilt from the objects when the file is read.
+
+        Raises_:
+            PermissionError: If this process is a follower, or read-only.
+        """
+        self.__check_writable()
+
+        if not FileStorage.__loaded:
+            self.reload()
+
+        # A running background save would rename its file over this one
+        while self.__reap(wait=True):
+            pass
+        FileStorage.__pending = False
+        self.__write(indexes=True)
+
+    def __check_writable(self):
+        """Raise PermissionError if this process may not write the file."""
+        if FileStorage.__follower is not None:
+            raise PermissionError("storage is a read-only follower")
+        if self.read_only:
+            raise PermissionError("storage is read-only")
+
+    def info(self):
+        """Report the state of the storage engine.
+
+        Returns_:
+            dict: The number of objects, whether a background save is in
+            progress, whether changes are waiting for one, and the status,
+            duration in seconds, copy-on-write memory in bytes (None if
+            unknown) and end time of the last background save.
+        """
+        self.refresh()
+        last = FileStorage.__last_bgsave
+
+        return {"objects": FileStorage.__objects.count(),
+                "background": self.background,
+                "bgsave_in_progress": FileStorage.__bgsave_pid is not None,
+                "pending_writes": FileStorage.__pending,
+                "last_bgsave_status": last.get("status"),
+                "last_bgsave_duration": last.get("duration"),
+                "last_bgsave_cow_bytes": last.get("cow_bytes"),
+                "last_bgsave_time": last.get("time")}
+
+    def __write(self, atomic=False, indexes=False):
+        """Write the JSON file, and the sidecars of the persistent indexes.
+
+        Args_:
+            atomic (bool): Write to a temporary file renamed over the JSON
+                file, so that readers never see a partial file.
+            indexes (bool): Write the sidecars too.
+
+        Returns_:
+            tuple: The (inode, size, mtime) of the file written.
+        """
+        serialized = FileStorage.__serialized
+
+        if len(serialized) > len(FileStorage.__objects):
+            # Forget the forms of objects destroyed since the last save
+            for key in serialized.keys() - FileStorage.__objects.keys():
+                del serialized[key]
+
+        path = FileStorage.__file_path
+        if atomic:
+            path = f"{path}.tmp-{os.getpid()}"
+
+        # Written object by object rather than joined, so that a forked
+        # child does not allocate a second copy of the whole file
+        with open(path, 'w') as outfile:
+            separator = "{"
+            for key, value in FileStorage.__objects.items():
+                forms = serialized.get(key)
+
+                if forms is not None and forms[0] is value:
+                    if forms[2] is None:
+                        forms[2] = json.dumps(value)
+                    text = forms[2]
+                else:
+                    serialized.pop(key, None)
+                    text = json.dumps(value)
+
+                outfile.write(f"{separator}{json.dumps(key)}: {text}")
+                separator = ", "
+            outfile.write("{}" if separator == "{" else "}")
+
+        if atomic:
+            os.replace(path, FileStorage.__file_path)
+
+        FileStorage.__signature = self.__stat()
+        FileStorage.__unsaved = False
+        if indexes:
+            self.__write_indexes()
+        else:
+            self.__finish_at_exit()
+
+        return FileStorage.__signature
+
+    def __write_indexes(self):
+        """Persist the indexes next to the snapshot they were built from."""
+        for index in FileStorage.__listeners:
+            if index.name is not None:
+                with open(self.__sidecar(index), 'w') as outfile:
+                    json.dump({"snapshot": FileStorage.__signature,
+                               "state": index.dump()}, outfile)
+        FileStorage.__indexed = FileStorage.__signature
+
+    def __reap(self, wait=False):
+        """Collect a finished background save.
+
+        Changes kept in memory while it ran are written by a new background
+        save, or by this process when waiting at exit.
+
+        Args_:
+            wait (bool): Wait for a running background save to finish.
+
+        Returns_:
+            bool: Whether a background save is still running.
+        """
+        pid = FileStorage.__bgsave_pid
+        if pid is None:
+            return False
+        if os.waitpid(pid, 0 if wait else os.WNOHANG)[0] == 0:
+            return True
+
+        chunks = []
+        while True:
+            chunk = os.read(FileStorage.__bgsave_fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        os.close(FileStorage.__bgsave_fd)
+        FileStorage.__bgsave_pid = FileStorage.__bgsave_fd = None
+
+        try:
+            report = json.loads(b"".join(chunks))
+        except ValueError:
+            report = {"status": "err: the child died"}
+        report["time"] = time.time()
+        signature = report.pop("signature", None)
+        if signature is not None:
+            # The file is now the child's, sidecars included: do not read it
+            # back
+            FileStorage.__signature = FileStorage.__indexed = tuple(
+                signature)
+        FileStorage.__last_bgsave = report
+
+        if FileStorage.__pending:
+            if wait:
+                FileStorage.__pending = False
+                self.__write()
+            else:
+                self.bgsave()
+
+        return False
+
+    def __finish_at_exit(self):
+        """Have `__finish` run when this process exits."""
+        if not FileStorage.__finishing:
+            FileStorage.__finishing = True
+            atexit.register(self.__finish)
+
+    def __finish(self):
+        """Wait for a background save at exit, write what is left, and the
+        sidecars of the indexes if the file on disk is the one they hold."""
+        if FileStorage.__follower is not None or self.read_only:
+            return
+
+        while self.__reap(wait=True):
+            pass
+
+        signature = FileStorage.__signature
+        if (not FileStorage.__unsaved and signature is not None and
+                FileStorage.__indexed != signature and
+                self.__stat() == signature):
+            self.__write_indexes()
+
+    @staticmethod
+    def __private_dirty():
+        """Return the bytes of memory this process copied on write."""
+        try:
+            with open("/proc/self/smaps_rollup") as infile:
+                return sum(int(line.split()[1]) * 1024 for line in infile
+                           if line.startswith("Private_Dirty:"))
+        except (OSError, ValueError, IndexError):
+            return None
 
     def reload(self):
         """
         Deserialize objects from the JSON file into the __objects dictionary,
         if the file exists.
+
+        Persistent indexes saved with this very snapshot are restored from
+        their sidecar files; the others are rebuilt from the objects.
         """
+        FileStorage.__register_defaults()
         try:
             if os.path.exists(FileStorage.__file_path):
                 with open(FileStorage.__file_path, 'r') as infile:
-                    FileStorage.__objects = json.load(infile)
+                    signature = self.__stat(infile.fileno())
+                    data = json.load(infile)
+                restored = self.__load_indexes(signature)
+                FileStorage.__objects.replace(data, skip=restored + [
+                    index for index in FileStorage.__listeners
+                    if not index.replays])
+                FileStorage.__serialized.clear()
+                FileStorage.__signature = signature
+                FileStorage.__indexed = signature if all(
+                    index in restored for index in FileStorage.__listeners
+                    if index.name is not None) else None
+                FileStorage.__unsaved = False
         except Exception:
             pass
+
+        FileStorage.__loaded = True
+
+    def refresh(self):
+        """
+        Load the JSON file on first access, and again only if it changed on
+        disk since it was last read or written.
+
+        Unlike `reload`, which always re-reads the file, this is cheap enough
+        to call before every read: an unchanged file costs one `os.stat`, and
+        nothing at all in exclusive mode.
+
+        A follower reads the file once and then applies the new events of
+        the changelog instead.
+        """
+        follower = FileStorage.__follower
+        if follower is not None:
+            if not FileStorage.__loaded:
+                self.reload()
+                # Carry on after the last event the snapshot holds
+                follower.sequence = FileStorage.index("changes").sequence
+            events = follower.poll()
+            for event in events:
+                apply_event(FileStorage.__objects, event)
+            follower.applied(events)
+            return
+
+        if not FileStorage.__loaded:
+            self.reload()
+            return
+
+        if self.__reap() or self.exclusive:
+            return  # the file is being rewritten from this very process
+
+        signature = self.__stat()
+        if signature is not None and signature != FileStorage.__signature:
+            self.reload()
+
+    def __load_indexes(self, signature):
+        """Restore the persistent indexes saved with a snapshot.
+
+        Args_:
+            signature (tuple): The (inode, size, mtime) of the snapshot.
+
+        Returns_:
+            list: The indexes that were restored.
+        """
+        restored = []
+        loaded = set()
+
+        for index in FileStorage.__listeners:
+            if index.name is None:
+                continue
+            try:
+                with open(self.__sidecar(index), 'r') as infile:
+                    sidecar = json.load(infile)
+                if tuple(sidecar["snapshot"]) != signature or not all(
+                        name in loaded for name in index.requires):
+                    continue
+                index.load(sidecar["state"])
+            except Exception:
+                continue
+            restored.append(index)
+            loaded.add(index.name)
+
+        return restored
+
+    @staticmethod
+    def __sidecar(index):
+        """Return the path of the file a persistent index is saved to."""
+        return f"{FileStorage.__file_path}.{index.name}"
+
+    @staticmethod
+    def __stat(fd=None):
+        """Return the (inode, size, mtime) of the JSON file, or None."""
+        try:
+            st = os.fstat(fd) if fd is not None else os.stat(
+                FileStorage.__file_path)
+        except OSError:
+            return None
+
+        return st.st_ino, st.st_size, st.st_mtime_ns
@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Ids module: the ids of every class, sorted for prefix searches.
+
+Console users abbreviate ids the way git abbreviates commit hashes: "show
+Place 3fa8" finds the one Place whose id starts with "3fa8", as long as
+the prefix has at least PREFIX_MIN characters. The IdIndex
+keeps the ids of every class in a sorted list, so that the ids starting
+with a prefix are found with two binary searches instead of comparing
+every key of storage.
+
+Ids created since the last search wait in a short unsorted list, scanned
+by the searches and sorted into the main list once it grows past the
+square root of its size. Objects read on load are merely appended, and
+sorted once the load is over, so that no search pays for it: the index
+is cheaper to rebuild than to read back, and so is not persistent.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+from bisect import bisect_left
+from math import isqrt
+from models.engine.indexes import StorageIndex
+from models.engine.keys import split_key
+
+# Sorts after the rest of any id starting with a prefix
+_LAST = "\U0010ffff"
+# Unsorted ids scanned by the searches before they are sorted in
+PENDING_MIN = 256
+# The fewest characters of an id standing for it, as with git: shorter
+# prefixes are too easily mistyped into another object's id
+PREFIX_MIN = 4
+
+
+class IdIndex(StorageIndex):
+    """
+    The ids of every class, sorted.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.on_clear()
+
+    def on_clear(self):
+        """Drop every id."""
+        # class name -> sorted [ids]
+        self.__sorted = {}
+        # class name -> [ids] created since they were last sorted
+        self.__pending = {}
+
+    def on_set(self, key, old, new):
+        """Add the id of an object created."""
+        if old is None:
+            cls_name, obj_id = split_key(key)
+            self.__pending.setdefault(cls_name, []).append(obj_id)
+
+    def on_load(self):
+        """Sort in the ids read on load."""
+        for cls_name in list(self.__pending):
+            self.__lists(cls_name, merge=True)
+
+    def on_delete(self, key, old):
+        """Remove the id of a destroyed object."""
+        cls_name, obj_id = split_key(key)
+        ids, pending = self.__lists(cls_name)
+        if obj_id in pending:
+            pending.remove(obj_id)
+        else:
+            position = bisect_left(ids, obj_id)
+            if position < len(ids) and ids[position] == obj_id:
+                del ids[position]
+        if not ids and not pending:
+            self.__sorted.pop(cls_name, None)
+            self.__pending.pop(cls_name, None)
+
+    def count(self, cls_name, prefix=""):
+        """
+        Return the number of ids of a class starting with a prefix.
+
+        Args_:
+            cls_name (str): The name of the class.
+            prefix (str): The start of the ids.
+
+        Returns_:
+            int: The number of ids.
+        """
+        ids, pending = self.__lists(cls_name)
+        low, high = self.__range(ids, prefix)
+
+        return high - low + sum(obj_id.startswith(prefix)
+                                for obj_id in pending)
+
+    def matching(self, cls_name, prefix="", limit=None):
+        """
+        Return the ids of a class starting with a prefix.
+
+        Args_:
+            cls_name (str): The name of the class.
+            prefix (str): The start of the ids.
+            limit (int, optional): The most ids returned.
+
+        Returns_:
+            list: The ids, sorted.
+        """
+        ids, pending = self.__lists(cls_name)
+        low, high = self.__range(ids, prefix)
+        if limit is not None:
+            high = min(high, low + limit)
+
+        found = ids[low:high]
+        recent = [obj_id for obj_id in pending if obj_id.startswith(prefix)]
+        if recent:
+            found = sorted(found + recent)[:limit]
+
+        return found
+
+    def last(self, cls_name, prefix=""):
+        """
+        Return the greatest id of a class starting with a prefix.
+
+        Args_:
+            cls_name (str): The name of the class.
+            prefix (str): The start of the id.
+
+        Returns_:
+            str: The id, or None.
+        """
+        ids, pending = self.__lists(cls_name)
+        low, high = self.__range(ids, prefix)
+        found = [obj_id for obj_id in pending if obj_id.startswith(prefix)]
+        if high > low:
+            found.append(ids[high - 1])
+
+        return max(found, default=None)
+
+    def minimal_unique_prefix(self, cls_name):
+        """
+        Return how many leading characters tell every id of a class apart.
+
+        That is one more than the longest prefix two of its ids share.
+
+        Args_:
+            cls_name (str): The name of the class.
+
+        Returns_:
+            int: The length, 0 if the class has no ids.
+        """
+        ids, _ = self.__lists(cls_name, merge=True)
+        if not ids:
+            return 0
+
+        longest = 0
+        for previous, obj_id in zip(ids, ids[1:]):
+            shared = 0
+            for a, b in zip(previous, obj_id):
+                if a != b:
+                    break
+                shared += 1
+            longest = max(longest, shared)
+
+        return longest + 1
+
+    def classes(self):
+        """
+        Return the names of the classes with ids.
+
+        Returns_:
+            list: The class names, sorted.
+        """
+        return sorted(self.__sorted.keys() | self.__pending.keys())
+
+    def __lists(self, cls_name, merge=False):
+        """Return the sorted and the pending ids of a class, sorting the
+        pending ones in if there are too many of them, or if asked to."""
+        ids = self.__sorted.get(cls_name, [])
+        pending = self.__pending.get(cls_name, [])
+        if pending and (merge or len(pending) > max(PENDING_MIN,
+                                                    isqrt(len(ids)))):
+            ids = self.__sorted.setdefault(cls_name, ids)
+            ids.extend(pending)
+            ids.sort()
+            pending.clear()
+
+        return ids, pending
+
+    @staticmethod
+    def __range(ids, prefix):
+        """Return the bounds of the sorted ids starting with a prefix."""
+        return (bisect_left(ids, prefix),
+                bisect_left(ids, prefix + _LAST))
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Base class of the secondary indexes maintained by the storage engine.
+
+An index is registered with FileStorage and notified of every change made to
+the stored dictionaries: objects being set (created or updated), deleted, and
+the whole map being cleared, and the objects read on load having all been
+passed on. Before saving an object, FileStorage also asks
+every index to `check` the change, which an index refuses by raising. An
+index with a `name` is also persistent: its state is written next to the
+snapshot as "<file>.<name>" (see FileStorage.checkpoint) and restored on
+reload instead of being rebuilt from every object, as long as the snapshot
+has not changed since. An index whose state refers to another persistent
+index, such as the numbers of the objects (see models.engine.surrogates),
+names it in `requires`, and is only restored along with it. An index that
+sets `replays` to False only follows the changes made in this process, not
+the objects read on load.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+
+class StorageIndex:
+    """
+    Receives the changes made to the storage engine's object map.
+
+    Attributes_:
+        name (str): The sidecar suffix of a persistent index, or None for an
+            index rebuilt from the objects on every load.
+        requires (tuple): The names of the persistent indexes, registered
+            before this one, without which its state cannot be restored.
+        replays (bool): Whether the objects read on load are passed to
+            `on_set`, as if they had just been created.
+    """
+
+    name = None
+    requires = ()
+    replays = True
+
+    def check(self, key, old, new):
+        """
+        Refuse an object about to be saved by raising, as a constraint.
+
+        Args_:
+            key (str): The "<class name>.<id>" key of the object.
+            old (dict): The stored dictionary, None on creation.
+            new (dict): The dictionary about to be saved.
+
+        Raises_:
+            ValueError: If the change is refused.
+        """
+
+    def on_set(self, key, old, new):
+        """
+        Handle an object being created or updated.
+
+        Args_:
+            key (str): The "<class name>.<id>" key of the object.
+            old (dict): The previous stored dictionary, None on creation.
+            new (dict): The new stored dictionary.
+        """
+
+    def on_delete(self, key, old):
+        """
+        Handle an object being deleted.
+
+        Args_:
+            key (str): The "<class name>.<id>" key of the object.
+            old (dict): The stored dictionary being removed.
+        """
+
+    def on_clear(self):
+        """Handle every object being removed at once."""
+
+    def on_load(self):
+        """Handle the end of a load, every object read having been set."""
+
+    def dump(self):
+        """Return the JSON-serializable state of a persistent index."""
+        raise NotImplementedError
+
+    def load(self, state):
+        """Restore the state returned by `dump`."""
+        raise NotImplementedError
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Key and id helpers for the storage engine.
+
+Objects are stored under "<class name>.<id>" keys. This module builds and
+splits those keys, and provides a batched UUID4 generator drawing its
+randomness from `os.urandom` in blocks instead of one system call per id.
+
+Keys built here are plain strings: most only serve one lookup. The ObjectMap
+interns a key once, when it is first stored, so that every index holding it
+shares a single string object.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import os
+import sys
+
+# Number of ids drawn from os.urandom in one call
+BLOCK_SIZE = 256
+
+# Version 4 / RFC 4122 variant bits, as applied by uuid.UUID(version=4)
+_CLEAR_MASK = ~((0xc000 << 48) | (0xf000 << 64))
+_SET_BITS = (0x8000 << 48) | (4 << 76)
+
+_id_buffer: list = []
+
+
+def make_key(cls_name, obj_id):
+    """Build the storage key of an object.
+
+    Args_:
+        cls_name (str): The class name of the object.
+        obj_id (str): The id of the object.
+
+    Returns_:
+        str: The "<cls_name>.<obj_id>" key.
+    """
+    return f"{cls_name}.{obj_id}"
+
+
+def key_of(obj):
+    """Build the storage key of a model instance.
+
+    Args_:
+        obj (BaseModel or subclass): The instance.
+
+    Returns_:
+        str: The "<class name>.<id>" key.
+    """
+    return f"{type(obj).__name__}.{obj.id}"
+
+
+def split_key(key):
+    """Split a storage key into its class name and id.
+
+    Args_:
+        key (str): A "<class name>.<id>" key.
+
+    Returns_:
+        tuple: The (class name, id) pair; the id is empty when the key has
+        no dot.
+    """
+    cls_name, _, obj_id = key.partition(".")
+    return sys.intern(cls_name), obj_id
+
+
+def uuid4_batch(count):
+    """Generate random UUID4 strings from a single os.urandom call.
+
+    Args_:
+        count (int): The number of ids to generate.
+
+    Returns_:
+        list: `count` canonical 36-character UUID4 strings.
+    """
+    raw = os.urandom(16 * count)
+    ids = []
+
+    for offset in range(0, 16 * count, 16):
+        value = int.from_bytes(raw[offset:offset + 16], "big")
+        h = "%032x" % ((value & _CLEAR_MASK) | _SET_BITS)
+        ids.append(f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+
+    return ids
+
+
+def new_id():
+    """Return a fresh UUID4 string, refilling the id buffer in blocks.
+
+    Returns_:
+        str: A canonical 36-character UUID4 string.
+    """
+    try:
+        return _id_buffer.pop()
+    except IndexError:
+        _id_buffer.extend(uuid4_batch(BLOCK_SIZE))
+        return _id_buffer.pop()
+
+
+if hasattr(os, "register_at_fork"):
+    # A forked child must never hand out ids already buffered by its parent
+    os.register_at_fork(after_in_child=_id_buffer.clear)
@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Listings module: materialized, paginated Place listings per City and State.
+
+Listing the places of a location used to mean joining every Place's city_id
+to its City's state_id across the whole storage. The Listings index keeps,
+for every City and every State, the ids of its places sorted by name, and
+maintains them as Places and Cities are saved and destroyed. Reading page K
+of a listing is a slice of size `page_size`.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+from bisect import bisect_left, insort
+from models.engine.indexes import StorageIndex
+
+PAGE_SIZE = 20
+
+
+class Listings(StorageIndex):
+    """
+    Sorted Place listings per City and per State.
+
+    Attributes_:
+        page_size (int): The number of places on a page.
+    """
+
+    name = "listings"
+
+    def __init__(self, page_size=PAGE_SIZE):
+        """
+        Initialize empty listings.
+
+        Args_:
+            page_size (int): The number of places on a page.
+        """
+        self.page_size = page_size
+        self.on_clear()
+
+    def on_clear(self):
+        """Drop every listing."""
+        # place id -> (city id, sort key)
+        self.__places = {}
+        # city id -> state id
+        self.__cities = {}
+        # "City"/"State" -> {location id: sorted [(sort key, place id)]}
+        self.__lists = {"City": {}, "State": {}}
+
+    def on_set(self, key, old, new):
+        """Move a Place between listings, or a City between States."""
+        cls_name = new.get("__class__")
+
+        if cls_name == "Place":
+            self.__remove_place(new.get("id"))
+            self.__add_place(new.get("id"), new.get("city_id"),
+                             str(new.get("name", "")))
+
+        elif cls_name == "City":
+            city_id = new.get("id")
+            old_state = self.__cities.get(city_id)
+            new_state = new.get("state_id")
+            self.__cities[city_id] = new_state
+            if old_state != new_state:
+                entries = self.__lists["City"].get(city_id, [])
+                for entry in entries:
+                    self.__discard("State", old_state, entry)
+                    self.__insert("State", new_state, entry)
+
+    def on_delete(self, key, old):
+        """Remove a Place from its listings, or a City from its State."""
+        cls_name = old.get("__class__")
+
+        if cls_name == "Place":
+            self.__remove_place(old.get("id"))
+
+        elif cls_name == "City":
+            city_id = old.get("id")
+            state_id = self.__cities.pop(city_id, None)
+            for entry in self.__lists["City"].get(city_id, []):
+                self.__discard("State", state_id, entry)
+
+    def page(self, cls_name, obj_id, number=0):
+        """
+        Return one page of the places of a City or State.
+
+        Args_:
+            cls_name (str): "City" or "State".
+            obj_id (str): The id of the City or State.
+            number (int): The page number, starting at 0.
+
+        Returns_:
+            tuple: (list of place ids on the page, total number of pages).
+
+        Raises_:
+            ValueError: If `cls_name` is neither "City" nor "State".
+        """
+        if cls_name not in self.__lists:
+            raise ValueError(f"no listings for class {cls_name}")
+
+        entries = self.__lists[cls_name].get(obj_id, [])
+        pages = -(-len(entries) // self.page_size)
+        start = number * self.page_size
+
+        return ([place_id for _, place_id in
+                 entries[start:start + self.page_size]] if number >= 0
+                else []), pages
+
+    def members(self, cls_name, obj_id):
+        """
+        Return the ids of every place of a City or State, sorted by name.
+
+        Args_:
+            cls_name (str): "City" or "State".
+            obj_id (str): The id of the City or State.
+
+        Returns_:
+            list: The place ids.
+        """
+        if cls_name not in self.__lists:
+            raise ValueError(f"no listings for class {cls_name}")
+
+        return [place_id for _, place_id in
+                self.__lists[cls_name].get(obj_id, [])]
+
+    def dump(self):
+        """Return the listings as JSON-serializable data."""
+        return {"places": self.__places, "cities": self.__cities,
+                "lists": self.__lists}
+
+    def load(self, state):
+        """Restore listings returned by `dump`."""
+        self.__places = {place_id: tuple(entry)
+                         for place_id, entry in state["places"].items()}
+        self.__cities = state["cities"]
+        self.__lists = {cls_name: {
+            obj_id: [tuple(entry) for entry in entries]
+            for obj_id, entries in lists.items()}
+            for cls_name, lists in state["lists"].items()}
+
+    def __add_place(self, place_id, city_id, name):
+        """Insert a place into the listings of its City and State."""
+        entry = (name, place_id)
+        self.__places[place_id] = (city_id, name)
+        self.__insert("City", city_id, entry)
+        self.__insert("State", self.__cities.get(city_id), entry)
+
+    def __remove_place(self, place_id):
+        """Remove a place from the listings it is in, if any."""
+        if place_id not in self.__places:
+            return
+
+        city_id, name = self.__places.pop(place_id)
+        entry = (name, place_id)
+        self.__discard("City", city_id, entry)
+        self.__discard("State", self.__cities.get(city_id), entry)
+
+    def __insert(self, cls_name, obj_id, entry):
+        """Insert an entry into a sorted listing."""
+        if obj_id:
+            insort(self.__lists[cls_name].setdefault(obj_id, []), entry)
+
+    def __discard(self, cls_name, obj_id, entry):
+        """Remove an entry from a sorted listing if it is there."""
+        entries = self.__lists[cls_name].get(obj_id)
+        if not entries:
+            return
+
+        index = bisect_left(entries, entry)
+        if index < len(entries) and entries[index] == entry:
+            del entries[index]
+            if not entries:
+                del self.__lists[cls_name][obj_id]
@@ -0,0 +1,635 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+LRUFileStorage module for datasets that do not fit in memory.
+
+LRUFileStorage keeps only an index of "<class name>.<id>" keys to the byte
+location of their JSON value on disk resident, and holds materialized model
+instances in a bounded least-recently-used cache. Objects are faulted in from
+disk on access; dirty objects evicted from the cache are written back to an
+append-only spill file next to the snapshot (`file.json.spill`), which
+`compact` folds back into the snapshot.
+
+The snapshot keeps the exact format FileStorage writes, so a compacted file
+can be read by either engine. The indexes registered with FileStorage are
+kept up to date here too; they are rebuilt while the snapshot is scanned
+rather than restored from their sidecar files.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import codecs
+import json
+import os
+from collections import OrderedDict
+from models.engine.file_storage import FileStorage
+from models.engine.keys import key_of, make_key
+from models.engine.object_map import ObjectMap
+from models.engine.registry import classes
+
+# Sources a location can point into
+SNAPSHOT = 0
+SPILL = 1
+
+# Bytes read at a time while scanning the snapshot
+CHUNK_SIZE = 1 << 20
+
+
+def scan(path, chunk_size=CHUNK_SIZE):
+    """
+    Stream the entries of a JSON object file without loading it whole.
+
+    Only a window of the file is held in memory at a time; the window grows
+    past `chunk_size` only when a single value is larger than that.
+
+    Args_:
+        path (str): The path of a file holding one JSON object.
+        chunk_size (int): The number of bytes to read at a time.
+
+    Yields_:
+        tuple: (key, value, byte offset of the value, byte length of the
+        value) for every top-level member, in file order.
+
+    Raises_:
+        ValueError: If the file is not a JSON object.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    with open(path, "rb") as infile:
+        buf = ""
+        base = 0  # byte offset of buf[0]
+        pos = 0
+        eof = False
+
+        def fill():
+            """Drop the consumed prefix of the window and read a chunk."""
+            nonlocal buf, base, pos, eof
+            consumed = buf[:pos]
+            base += len(consumed) if consumed.isascii() else len(
+                consumed.encode("utf-8"))
+            data = infile.read(chunk_size)
+            eof = not data
+            buf = buf[pos:] + utf8.decode(data, final=eof)
+            pos = 0
+            return not eof
+
+        def skip():
+            """Skip whitespace, reading more when the window runs out."""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\n\r":
+                    pos += 1
+                if pos < len(buf) or not fill():
+                    return
+
+        def decode():
+            """Decode the next complete JSON value in the window."""
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if not fill():
+                        raise
+                    continue
+                # A value touching the end of the window may be truncated
+                # (e.g. a number), so only trust it once something follows
+                if end < len(buf) or eof:
+                    start, pos = pos, end
+                    return value, start, end
+                fill()
+
+        def byte_offset(index):
+            """Convert a window index into an absolute byte offset."""
+            head = buf[:index]
+            return base + (len(head) if head.isascii() else len(
+                head.encode("utf-8")))
+
+        skip()
+        if buf[pos:pos + 1] != "{":
+            raise ValueError(f"{path} does not hold a JSON object")
+        pos += 1
+
+        while True:
+            skip()
+            if buf[pos:pos + 1] == "}":
+                return
+            key, _, _ = decode()
+            skip()
+            if buf[pos:pos + 1] != ":":
+                raise ValueError(f"{path}: ':' expected after {key!r}")
+            pos += 1
+            skip()
+            value, start, end = decode()
+            offset = byte_offset(start)
+            yield key, value, offset, byte_offset(end) - offset
+            skip()
+            if buf[pos:pos + 1] == ",":
+                pos += 1
+
+
+class LRUFileStorage(FileStorage):
+    """
+    A FileStorage that keeps at most a bounded number of objects in memory.
+
+    Attributes_:
+        max_objects (int): The most instances held in the cache, or None.
+        max_bytes (int): The most bytes held in the cache, or None. The size
+            of an instance is taken to be the length of its JSON text.
+        compact_ratio (float): `save` compacts once the spill file grows
+            past this fraction of the snapshot size.
+    """
+
+    def __init__(self, file_path="file.json", max_objects=10000,
+                 max_bytes=None, compact_ratio=0.5):
+        """
+        Initialize the engine; nothing is read until first access.
+
+        Args_:
+            file_path (str): The path of the JSON snapshot.
+            max_objects (int, optional): The object budget of the cache.
+            max_bytes (int, optional): The byte budget of the cache.
+            compact_ratio (float): See the class attributes.
+        """
+        self.max_objects = max_objects
+        self.max_bytes = max_bytes
+        self.compact_ratio = compact_ratio
+        self.__paths = (file_path, file_path + ".spill")
+        self.__files = {}
+        self.__index = ObjectMap()
+        self.__cache = OrderedDict()
+        self.__sizes = {}
+        self.__cache_bytes = 0
+        self.__dirty = set()
+        self.__deleted = set()
+        # key -> dict last passed to the indexes, for keys not on disk yet
+        self.__last = {}
+        self.__loaded = False
+        self.__loading = False
+        self.__signature = None
+        self.__stats = {"hits": 0, "misses": 0, "evictions": 0,
+                        "writebacks": 0}
+
+    def cache_info(self):
+        """Return the cache counters and current occupancy.
+
+        Returns_:
+            dict: hits, misses, evictions, writebacks, the number of cached
+            objects and their size in bytes, and the number of indexed keys.
+        """
+        self.refresh()
+
+        return dict(self.__stats, objects=len(self.__cache),
+                    bytes=self.__cache_bytes, keys=len(self.__index))
+
+    def all(self, cls=None):
+        """Retrieve all objects, optionally of a single class.
+
+        Every object is faulted in through the cache, so on a dataset larger
+        than the cache budget prefer `get` or `items`.
+
+        Args_:
+            cls (type or str, optional): Only return objects of this class.
+
+        Returns_:
+            dict: The objects keyed by "<class name>.<id>".
+        """
+        self.refresh()
+        names = self.__index.classes() if cls is None else [
+            cls if isinstance(cls, str) else cls.__name__]
+
+        return {key: self.__fetch(key)
+                for name in names for key in list(self.__index.keys_of(name))}
+
+    def items(self, cls=None):
+        """Iterate over the stored dictionaries without caching them.
+
+        Args_:
+            cls (type or str, optional): Only yield objects of this class.
+
+        Yields_:
+            tuple: ("<class name>.<id>", dictionary representation) pairs.
+        """
+        self.refresh()
+        names = self.__index.classes() if cls is None else [
+            cls if isinstance(cls, str) else cls.__name__]
+
+        for name in names:
+            for key in list(self.__index.keys_of(name)):
+                obj = self.__cache.get(key)
+                yield key, obj.to_dict() if obj is not None else self.__read(
+                    self.__index[key])
+
+    def get(self, cls, obj_id):
+        """Retrieve a single object, faulting it in from disk if needed.
+
+        Args_:
+            cls (type or str): The class of the object, or its name.
+            obj_id (str): The id of the object.
+
+        Returns_:
+            BaseModel or subclass: The cached instance, or None.
+        """
+        self.refresh()
+        key = make_key(cls if isinstance(cls, str) else cls.__name__, obj_id)
+
+        if key not in self.__index:
+            return None
+
+        return self.__fetch(key)
+
+    def keys(self, cls=None):
+        """Return the indexed keys, without reading any value."""
+        self.refresh()
+        if cls is None:
+            return list(self.__index.keys())
+
+        return list(self.__index.keys_of(
+            cls if isinstance(cls, str) else cls.__name__))
+
+    def count(self, cls=None):
+        """Count the indexed objects, optionally of a single class."""
+        self.refresh()
+
+        return self.__index.count(
+            None if cls is None else
+            cls if isinstance(cls, str) else cls.__name__)
+
+    def new(self, obj):
+        """Add an object to the cache as dirty.
+
+        The constraints of the indexes are only checked when it is saved.
+
+        Args_:
+            obj (BaseModel or subclass): The object to add.
+        """
+        self.__store(obj, check=False)
+
+    def __store(self, obj, check=True):
+        """Add an object to the cache as dirty.
+
+        Args_:
+            obj (BaseModel or subclass): The object to add.
+            check (bool): Let the indexes refuse the change.
+
+        Raises_:
+            ValueError: If an index refuses the change, such as a unique
+                field already held by another object.
+        """
+        if self.__loading:
+            return  # an instance being faulted in is not a change
+
+        if not self.__loaded:
+            self.reload()
+
+        key = key_of(obj)
+        indexes = self.indexes()
+        if indexes:
+            old, value = self.__previous(key), obj.to_dict()
+            if check:
+                try:
+                    for index in indexes:
+                        index.check(key, old, value)
+                except ValueError:
+                    self.__restore(key, old)
+                    raise
+            for index in indexes:
+                index.on_set(key, old, value)
+            self.__last[key] = value
+
+        self.__deleted.discard(key)
+        if key not in self.__index:
+            self.__index[key] = None  # no location until it is written
+        self.__dirty.add(key)
+        self.__admit(key, obj)
+
+    # BaseModel.save() stores objects through FileStorage's private hook
+    _FileStorage__store = __store
+
+    def delete(self, obj=None):
+        """Remove an object; the removal is persisted by the next `save`.
+
+        Args_:
+            obj (BaseModel or subclass, optional): The object to remove.
+        """
+        if obj is None:
+            return
+
+        self.refresh()
+        key = key_of(obj)
+        if key not in self.__index:
+            return
+
+        indexes = self.indexes()
+        if indexes:
+            old = self.__previous(key)
+            for index in indexes:
+                index.on_delete(key, old)
+            self.__last.pop(key, None)
+        del self.__index[key]
+
+        self.__dirty.discard(key)
+        self.__deleted.add(key)
+        if key in self.__cache:
+            del self.__cache[key]
+            self.__cache_bytes -= self.__sizes.pop(key)
+
+    def save(self):
+        """Append every pending change to the spill file.
+
+        This costs O(changes) rather than O(dataset). The spill file is
+        folded into the snapshot once it outgrows `compact_ratio` of it.
+        """
+        if not self.__loaded:
+            self.reload()
+
+        self.__flush()
+
+        snapshot, spill = (self.__size(path) for path in self.__paths)
+        if spill and spill > self.compact_ratio * max(snapshot, 1):
+            self.compact()
+
+    def bgsave(self):
+        """Save in this process rather than from a forked child.
+
+        `save` only appends the changes to the spill file, which costs no
+        more than forking would; a child of this process would moreover
+        write the objects of FileStorage, which are not kept here.
+
+        Returns_:
+            bool: True, the changes being saved.
+        """
+        self.save()
+
+        return True
+
+    def info(self):
+        """Report the state of the storage engine.
+
+        Returns_:
+            dict: As FileStorage.info, with the number of indexed objects.
+        """
+        return dict(super().info(), objects=self.count())
+
+    def checkpoint(self):
+        """Compact, and write the sidecars of the persistent indexes.
+
+        The indexes are rebuilt while the snapshot is scanned in this mode,
+        but FileStorage restores them from the sidecars written here when it
+        reads the compacted snapshot.
+        """
+        if not self.__loaded:
+            self.reload()
+
+        self.compact()
+        for index in self.indexes():
+            if index.name is not None:
+                with open(f"{self.__paths[SNAPSHOT]}.{index.name}",
+                          "w") as outfile:
+                    json.dump({"snapshot": self.__signature,
+                               "state": index.dump()}, outfile)
+
+    def compact(self):
+        """Rewrite the snapshot with every change and empty the spill file.
+
+        Unchanged values are copied byte for byte from their current
+        location; nothing but dirty objects is re-encoded.
+        """
+        self.__flush()
+
+        path, spill_path = self.__paths
+        tmp_path = path + ".tmp"
+        locations = {}
+
+        with open(tmp_path, "wb") as outfile:
+            outfile.write(b"{")
+            position = 1
+            for number, (key, location) in enumerate(self.__index.items()):
+                head = ("" if not number else ", ") + json.dumps(key) + ": "
+                raw = self.__read_raw(location)
+                outfile.write(head.encode() + raw)
+                locations[key] = (SNAPSHOT, position + len(head), len(raw))
+                position += len(head) + len(raw)
+            outfile.write(b"}")
+
+        self.__close_files()
+        os.replace(tmp_path, path)
+        open(spill_path, "wb").close()
+        for key, location in locations.items():
+            self.__index[key] = location
+        self.__signature = self.__stat()
+
+    def reload(self):
+        """Rebuild the key index from the snapshot and the spill file.
+
+        The cache is emptied and no values are kept: each one is decoded
+        only to validate it and then dropped.
+        """
+        path, spill_path = self.__paths
+        self.__close_files()
+        self.__index = ObjectMap()
+        self.__cache.clear()
+        self.__sizes.clear()
+        self.__cache_bytes = 0
+        self.__dirty.clear()
+        self.__deleted.clear()
+        self.__last.clear()
+        indexes = [index for index in self.indexes() if index.replays]
+        for index in indexes:
+            index.on_clear()
+
+        if os.path.exists(path):
+            self.__signature = self.__stat()
+            for key, value, offset, length in scan(path):
+                self.__index[key] = (SNAPSHOT, offset, length)
+                for index in indexes:
+                    index.on_set(key, None, value)
+
+        if os.path.exists(spill_path):
+            with open(spill_path, "rb") as spill:
+                position = 0
+                for line in spill:
+                    record = json.loads(line)
+                    key = record["key"]
+                    if indexes:
+                        self.__replay(indexes, record)
+                    if record.get("deleted"):
+                        self.__index.pop(key, None)
+                    else:
+                        head = len(self.__spill_head(key))
+                        self.__index[key] = (SPILL, position + head,
+                                             len(line.rstrip(b"\n")) -
+                                             head - 1)
+                    position += len(line)
+
+        for index in indexes:
+            index.on_load()
+        self.__loaded = True
+
+    def refresh(self):
+        """Load on first access, and again if another writer compacted."""
+        if not self.__loaded:
+            self.reload()
+        elif self.__stat() not in (None, self.__signature):
+            self.reload()
+
+    def __previous(self, key):
+        """Return the dict last passed to the indexes for a key, or None."""
+        if key in self.__last:
+            return self.__last[key]
+
+        location = self.__index.get(key)
+        return self.__read(location) if location is not None else None
+
+    def __replay(self, indexes, record):
+        """Pass a spill record read on reload on to the indexes."""
+        key = record["key"]
+        old = self.__previous(key)
+
+        for index in indexes:
+            if record.get("deleted"):
+                if old is not None:
+                    index.on_delete(key, old)
+            else:
+                index.on_set(key, old, record["value"])
+
+    def __fetch(self, key):
+        """Return the instance of a key, from the cache or from disk."""
+        obj = self.__cache.get(key)
+        if obj is not None:
+            self.__stats["hits"] += 1
+            self.__cache.move_to_end(key)
+            return obj
+
+        self.__stats["misses"] += 1
+        value = self.__read(self.__index[key])
+        self.__loading = True
+        try:
+            obj = classes[value["__class__"]](**value)
+        finally:
+            self.__loading = False
+        self.__admit(key, obj)
+
+        return obj
+
+    def __restore(self, key, old):
+        """Undo in the cache a change the indexes refused.
+
+        The refused instance may be the cached one, changed in place, which
+        would otherwise be written with the next dirty objects or on
+        eviction: it is replaced by an instance of the value last accepted,
+        or dropped from the cache if that value is on disk.
+        """
+        if key not in self.__cache:
+            return
+
+        if key in self.__dirty and old is not None:
+            self.__loading = True
+            try:
+                obj = classes[old["__class__"]](**old)
+            finally:
+                self.__loading = False
+            self.__admit(key, obj)
+        else:
+            del self.__cache[key]
+            self.__cache_bytes -= self.__sizes.pop(key)
+
+    def __admit(self, key, obj):
+        """Put an instance in the cache and evict down to the budget."""
+        if key in self.__cache:
+            self.__cache_bytes -= self.__sizes[key]
+        self.__cache[key] = obj
+        self.__cache.move_to_end(key)
+        self.__sizes[key] = len(obj.to_json())
+        self.__cache_bytes += self.__sizes[key]
+
+        while len(self.__cache) > 1 and (
+                (self.max_objects is not None and
+                 len(self.__cache) > self.max_objects) or
+                (self.max_bytes is not None and
+                 self.__cache_bytes > self.max_bytes)):
+            old_key, old_obj = self.__cache.popitem(last=False)
+            self.__cache_bytes -= self.__sizes.pop(old_key)
+            self.__stats["evictions"] += 1
+            if old_key in self.__dirty:
+                self.__write_back(old_key, old_obj)
+                self.__stats["writebacks"] += 1
+
+    def __flush(self):
+        """Write every dirty object and pending removal to the spill file."""
+        for key in list(self.__dirty):
+            self.__write_back(key, self.__cache[key])
+        for key in self.__deleted:
+            self.__append({"key": key, "deleted": True})
+        self.__deleted.clear()
+
+    def __write_back(self, key, obj):
+        """Append a dirty object to the spill file and index its value."""
+        head = self.__spill_head(key)
+        text = obj.to_json()
+        position = self.__append(None, head + text + "}")
+        self.__index[key] = (SPILL, position + len(head), len(text))
+        self.__dirty.discard(key)
+        self.__last.pop(key, None)
+
+    def __append(self, record, line=None):
+        """Append one JSON line to the spill file; return its offset."""
+        spill = self.__file(SPILL, "ab")
+        position = spill.tell()
+        spill.write((line if line is not None else json.dumps(record))
+                    .encode() + b"\n")
+        spill.flush()
+
+        return position
+
+    def __read_raw(self, location):
+        """Return the raw JSON bytes stored at a location."""
+        source, offset, length = location
+        infile = self.__file(source, "rb")
+        infile.seek(offset)
+
+        return infile.read(length)
+
+    def __read(self, location):
+        """Return the dictionary stored at a location."""
+        return json.loads(self.__read_raw(location))
+
+    def __file(self, source, mode):
+        """Return the open handle of a source, opening it if needed."""
+        handle = self.__files.get((source, mode))
+        if handle is None:
+            handle = open(self.__paths[source], mode)
+            self.__files[(source, mode)] = handle
+
+        return handle
+
+    def __close_files(self):
+        """Close every open handle."""
+        for handle in self.__files.values():
+            handle.close()
+        self.__files.clear()
+
+    def __stat(self):
+        """Return the (inode, size, mtime) of the snapshot, or None."""
+        try:
+            st = os.stat(self.__paths[SNAPSHOT])
+        except OSError:
+            return None
+
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    @staticmethod
+    def __spill_head(key):
+        """Return the text preceding the value in a spill line."""
+        return '{"key": ' + json.dumps(key) + ', "value": '
+
+    @staticmethod
+    def __size(path):
+        """Return the size of a file, 0 if it does not exist."""
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
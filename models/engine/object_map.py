@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+ObjectMap module for the storage engine's key map.
+
+ObjectMap is the dictionary FileStorage keeps its objects in. It behaves like
+the plain "<class name>.<id>" -> dict mapping it replaces, and additionally
+maintains a two-level {class name: {id: key}} index so that filtering by class
+never has to split keys again. A key is interned once, when it is first
+stored, so that the keys rebuilt by the indexes share its string. Every change
+is also passed on to the secondary indexes (see models.engine.indexes)
+listening to the map.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import sys
+from models.engine.keys import split_key
+
+
+class ObjectMap(dict):
+    """
+    A "<class name>.<id>" keyed dict that also groups its keys by class.
+
+    Every mutating dict method is routed through `__setitem__` and
+    `__delitem__` so that the class index and the listeners can never drift
+    from the keys.
+
+    Attributes_:
+        listeners (list): The StorageIndex objects notified of changes.
+    """
+
+    def __init__(self, *args, listeners=None, **kwargs):
+        """
+        Initialize the map, optionally from a mapping or iterable of pairs.
+
+        Args_:
+            *args: Same as for `dict`.
+            listeners (list, optional): The indexes to notify of changes.
+            **kwargs: Same as for `dict`.
+        """
+        super().__init__()
+        self.__classes = {}
+        self.listeners = listeners if listeners is not None else []
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        """Store a value and index its key under its class."""
+        old = dict.get(self, key)
+        if old is None and not dict.__contains__(self, key):
+            key = sys.intern(key)
+            cls_name, obj_id = split_key(key)
+            self.__classes.setdefault(cls_name, {})[obj_id] = key
+
+        dict.__setitem__(self, key, value)
+
+        for listener in self.listeners:
+            listener.on_set(key, old, value)
+
+    def __delitem__(self, key):
+        """Remove a key and drop it from the class index."""
+        old = dict.__getitem__(self, key)
+        dict.__delitem__(self, key)
+
+        cls_name, obj_id = split_key(key)
+        ids = self.__classes[cls_name]
+        del ids[obj_id]
+        if not ids:
+            del self.__classes[cls_name]
+
+        for listener in self.listeners:
+            listener.on_delete(key, old)
+
+    def pop(self, key, *default):
+        """Remove a key and return its value, like `dict.pop`."""
+        if dict.__contains__(self, key):
+            value = dict.__getitem__(self, key)
+            del self[key]
+            return value
+
+        if default:
+            return default[0]
+
+        raise KeyError(key)
+
+    def popitem(self):
+        """Remove and return the last inserted pair, like `dict.popitem`."""
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        """Return a key's value, storing `default` first if it is missing."""
+        if not dict.__contains__(self, key):
+            self[key] = default
+
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        """Store every pair of a mapping or iterable, like `dict.update`."""
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        """Remove every key."""
+        dict.clear(self)
+        self.__classes.clear()
+
+        for listener in self.listeners:
+            listener.on_clear()
+
+    def replace(self, data, skip=()):
+        """Replace the whole content of the map in place.
+
+        The listeners notified are told with `on_load` once every pair is
+        stored.
+
+        Args_:
+            data (dict): The new content.
+            skip (iterable): Listeners left out of the notifications, such as
+                persistent indexes already restored for this content.
+        """
+        listeners = self.listeners
+        self.listeners = [listener for listener in listeners
+                          if listener not in skip]
+        try:
+            self.clear()
+            self.update(data)
+            for listener in self.listeners:
+                listener.on_load()
+        finally:
+            self.listeners = listeners
+
+    def classes(self):
+        """Return the names of the classes that currently have objects.
+
+        Returns_:
+            list: The class names, in first-insertion order.
+        """
+        return list(self.__classes)
+
+    def ids_of(self, cls_name):
+        """Return the id -> key mapping of one class.
+
+        Args_:
+            cls_name (str): The class name.
+
+        Returns_:
+            dict: The {id: key} mapping of that class, empty if it has no
+            objects. Callers must not mutate it.
+        """
+        return self.__classes.get(cls_name, {})
+
+    def keys_of(self, cls_name):
+        """Return the keys of one class without parsing any key.
+
+        Args_:
+            cls_name (str): The class name.
+
+        Returns_:
+            dict_values: The keys of every object of that class.
+        """
+        return self.ids_of(cls_name).values()
+
+    def count(self, cls_name=None):
+        """Return the number of objects, optionally of a single class.
+
+        Args_:
+            cls_name (str, optional): The class name to count.
+
+        Returns_:
+            int: The number of stored objects.
+        """
+        if cls_name is None:
+            return len(self)
+
+        return len(self.ids_of(cls_name))
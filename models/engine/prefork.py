@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Prefork module: worker processes sharing one loaded copy of storage.
+
+The master process loads storage once, moves every object it holds out of
+the garbage collector's reach with `gc.freeze()`, and forks the workers.
+The workers start serving at once, reading the objects they inherited
+instead of parsing the file again, and the pages holding them stay shared
+with the master until written to. A full collection in a worker would
+otherwise write to the header of every container it visits, and so copy
+their pages; the stored dictionaries, holding only strings and numbers,
+are not tracked by the collector anyway, but the indexes' containers are.
+
+Reading an object still updates its reference count, so pages are copied
+as the workers touch them; `memory` tells how much of each process is
+still shared. Workers are read-only: they see the writes of a primary
+through the file, or incrementally through its changelog if the master
+follows one (see FileStorage.follow).
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import gc
+import os
+import signal
+import sys
+import time
+import traceback
+
+# A worker dying sooner than this after it started is restarted only after
+# this many seconds, so that a broken worker does not fork in a loop
+RESPAWN_DELAY = 1.0
+
+
+def memory(pid="self"):
+    """
+    Return the memory of a process, split into shared and private bytes.
+
+    Args_:
+        pid (int or str): The process, this one by default.
+
+    Returns_:
+        dict: The "rss", "pss" (resident memory with shared pages divided
+        among the processes sharing them), "shared" and "private" bytes;
+        None if unknown, as outside Linux.
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as infile:
+            for line in infile:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        return None
+
+    return {"rss": fields.get("Rss", 0), "pss": fields.get("Pss", 0),
+            "shared": (fields.get("Shared_Clean", 0) +
+                       fields.get("Shared_Dirty", 0)),
+            "private": (fields.get("Private_Clean", 0) +
+                        fields.get("Private_Dirty", 0))}
+
+
+class Prefork:
+    """
+    A master process forking workers off a loaded storage.
+
+    Attributes_:
+        serve (callable): Run by every worker; the worker exits when it
+            returns.
+        workers (int): The number of workers.
+        storage: The storage engine, `models.storage` by default.
+        pids (list): The pids of the running workers.
+    """
+
+    def __init__(self, serve, workers=None, storage=None):
+        """
+        Prepare a master; nothing is loaded or forked until `start`.
+
+        Args_:
+            serve (callable): The function each worker runs.
+            workers (int, optional): The number of workers, one per CPU by
+                default.
+            storage (optional): The storage engine to share.
+        """
+        if storage is None:
+            from models import storage
+
+        self.serve = serve
+        self.workers = workers or os.cpu_count() or 1
+        self.storage = storage
+        self.pids = []
+        self.__started = {}
+
+    def start(self):
+        """Load storage, freeze it and fork the workers."""
+        self.storage.refresh()
+        gc.collect()
+        gc.freeze()
+        for _ in range(self.workers):
+            self.__spawn()
+
+    def run(self):
+        """
+        Start the workers and restart any that dies, until SIGINT or
+        SIGTERM; SIGUSR1 prints the memory report.
+        """
+        handlers = {signal.SIGTERM: signal.signal(signal.SIGTERM,
+                                                  self.__terminate),
+                    signal.SIGUSR1: signal.signal(signal.SIGUSR1,
+                                                  self.__print_report)}
+        try:
+            self.start()
+            while self.pids:
+                pid, _ = os.wait()
+                if pid not in self.pids:
+                    continue
+                self.pids.remove(pid)
+                lifetime = time.monotonic() - self.__started.pop(pid)
+                if lifetime < RESPAWN_DELAY:
+                    time.sleep(RESPAWN_DELAY)
+                self.__spawn()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+    def stop(self):
+        """Terminate the workers and wait for them."""
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in self.pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.pids = []
+        self.__started.clear()
+        gc.unfreeze()
+
+    def report(self):
+        """
+        Report the memory of the master and of every worker.
+
+        Returns_:
+            list: One dictionary per process, the master first, with its
+            "pid" and "role" and the fields of `memory`.
+        """
+        processes = [(os.getpid(), "master")] + [
+            (pid, "worker") for pid in self.pids]
+
+        return [dict(pid=pid, role=role, **(memory(pid) or {}))
+                for pid, role in processes]
+
+    def __spawn(self):
+        """Fork one worker."""
+        pid = os.fork()
+        if pid != 0:
+            self.pids.append(pid)
+            self.__started[pid] = time.monotonic()
+            return
+
+        status = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            self.storage.read_only = True
+            self.serve()
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # The exit handlers are the master's
+            os._exit(status)
+
+    def __terminate(self, signum, frame):
+        """Stop the master on SIGTERM."""
+        raise KeyboardInterrupt
+
+    def __print_report(self, signum, frame):
+        """Print the memory report on SIGUSR1."""
+        print_report(self.report())
+
+
+def print_report(report):
+    """
+    Print a memory report as a table.
+
+    Args_:
+        report (list): As returned by Prefork.report.
+    """
+    print(f"{'pid':>8} {'role':<7} {'rss':>10} {'shared':>10} "
+          f"{'private':>10} {'pss':>10}")
+    for process in report:
+        if "rss" not in process:
+            print(f"{process['pid']:>8} {process['role']:<7} unknown")
+            continue
+        print(f"{process['pid']:>8} {process['role']:<7}" + "".join(
+            f" {process[field] / 2 ** 20:8.1f}MB"
+            for field in ("rss", "shared", "private", "pss")))
+    sys.stdout.flush()
@@ -0,0 +1,290 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Query module: picklable predicates and a parallel scan executor.
+
+A query is a predicate over the stored dictionaries of objects, built from
+plain objects rather than lambdas so that it can be sent to other
+processes:
+
+    Where("text", "contains", "quiet")
+    Where("price_by_night", "<", 100) & Where("city_id", "in", city_ids)
+    ~Where("name", "==", "")
+
+`select` evaluates a query over a list of dictionaries, split into chunks
+evaluated by a pool of processes, and returns the positions of the
+matching ones: only those are sent back, and only those become objects
+(see FileStorage.scan). Where processes are forked, the workers inherit the
+list from the parent and only receive the bounds of their chunks; elsewhere
+the chunks are pickled to them. The modules running the pool are only
+imported by the first scan that needs one.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import operator
+import os
+
+# Scans of fewer dictionaries than this are not worth a pool of processes
+PARALLEL_MIN = 20000
+# Chunks per worker, so that a slow chunk does not hold the others up
+CHUNKS_PER_WORKER = 4
+
+
+def _in(field, values):
+    """Tell whether a field is one of the values."""
+    return field in values
+
+
+def _contains(field, value):
+    """Tell whether a field holds a value, case insensitively for text."""
+    if isinstance(field, str):
+        field = field.casefold()
+    return value in field
+
+
+# Module-level functions, so that queries holding them pickle
+_COMPARISONS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt,
+                "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+                "in": _in, "contains": _contains}
+
+
+class Query:
+    """
+    A predicate over stored dictionaries, combined with &, | and ~.
+    """
+
+    def __call__(self, value):
+        """
+        Tell whether a stored dictionary matches.
+
+        Args_:
+            value (dict): The stored dictionary of an object.
+
+        Returns_:
+            bool: Whether it matches.
+        """
+        raise NotImplementedError
+
+    def __and__(self, other):
+        """Match what both queries match."""
+        return All(self, other)
+
+    def __or__(self, other):
+        """Match what either query matches."""
+        return Any(self, other)
+
+    def __invert__(self):
+        """Match what this query does not."""
+        return Not(self)
+
+    def __eq__(self, other):
+        """Compare queries by type and attributes."""
+        return type(self) is type(other) and vars(self) == vars(other)
+
+    def __repr__(self):
+        """Return the query as it would be built."""
+        return f"{type(self).__name__}({', '.join(map(repr, self._args()))})"
+
+    def _args(self):
+        """Return the arguments the query was built with."""
+        return tuple(vars(self).values())
+
+
+class Where(Query):
+    """
+    Compares a field of the dictionary to a value.
+
+    A missing field, or a value of a type that cannot be compared, does not
+    match.
+
+    Attributes_:
+        field (str): The name of the field.
+        op (str): "==", "!=", "<", "<=", ">", ">=", "in" (the field is one
+            of the values) or "contains" (the field holds the value, case
+            insensitively for text).
+        value: The value compared to.
+    """
+
+    def __init__(self, field, op, value):
+        """
+        Build a comparison.
+
+        Args_:
+            field (str): The name of the field.
+            op (str): The comparison.
+            value: The value compared to; a collection for "in".
+
+        Raises_:
+            ValueError: If the comparison is unknown.
+        """
+        if op not in _COMPARISONS:
+            raise ValueError(f"unknown comparison: {op}")
+
+        self.field = field
+        self.op = op
+        if op == "in":
+            value = frozenset(value)
+        elif op == "contains" and isinstance(value, str):
+            value = value.casefold()
+        self.value = value
+        self.compare = _COMPARISONS[op]
+
+    def __call__(self, value):
+        """Tell whether the field of a stored dictionary compares."""
+        try:
+            return self.compare(value[self.field], self.value)
+        except (KeyError, TypeError):
+            return False
+
+    def _args(self):
+        """Return the field, the comparison and the value."""
+        return self.field, self.op, self.value
+
+
+class All(Query):
+    """
+    Matches what every one of its queries matches.
+
+    Attributes_:
+        queries (tuple): The queries.
+    """
+
+    def __init__(self, *queries):
+        """
+        Combine queries.
+
+        Args_:
+            *queries (Query): The queries.
+        """
+        self.queries = queries
+
+    def __call__(self, value):
+        """Tell whether every query matches."""
+        for query in self.queries:
+            if not query(value):
+                return False
+        return True
+
+    def _args(self):
+        """Return the queries."""
+        return self.queries
+
+
+class Any(Query):
+    """
+    Matches what any of its queries matches.
+
+    Attributes_:
+        queries (tuple): The queries.
+    """
+
+    def __init__(self, *queries):
+        """
+        Combine queries.
+
+        Args_:
+            *queries (Query): The queries.
+        """
+        self.queries = queries
+
+    def __call__(self, value):
+        """Tell whether any query matches."""
+        for query in self.queries:
+            if query(value):
+                return True
+        return False
+
+    def _args(self):
+        """Return the queries."""
+        return self.queries
+
+
+class Not(Query):
+    """
+    Matches what its query does not.
+
+    Attributes_:
+        query (Query): The query.
+    """
+
+    def __init__(self, query):
+        """
+        Negate a query.
+
+        Args_:
+            query (Query): The query.
+        """
+        self.query = query
+
+    def __call__(self, value):
+        """Tell whether the query does not match."""
+        return not self.query(value)
+
+
+# The dictionaries a forked worker inherited from the scan that forked it
+_shared = None
+
+
+def _share(values):
+    """Keep the dictionaries inherited by a forked worker."""
+    global _shared
+    _shared = values
+
+
+def _select_shared(query, start, stop):
+    """Return the positions matching a query in a chunk inherited."""
+    return [position for position in range(start, stop)
+            if query(_shared[position])]
+
+
+def _select_chunk(query, start, values):
+    """Return the positions matching a query in a chunk received."""
+    return [start + offset for offset, value in enumerate(values)
+            if query(value)]
+
+
+def select(values, query, workers=None, chunk_size=None):
+    """
+    Return the positions of the dictionaries matching a query.
+
+    Args_:
+        values (list): The stored dictionaries.
+        query (Query): The query; it must be picklable.
+        workers (int, optional): The number of processes, one per CPU by
+            default; scans with a single worker, or of fewer than
+            PARALLEL_MIN dictionaries, run in this process.
+        chunk_size (int, optional): The dictionaries per chunk.
+
+    Returns_:
+        list: The positions of the matching dictionaries, in order.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(values) < PARALLEL_MIN:
+        return _select_chunk(query, 0, values)
+
+    chunk_size = chunk_size or -(-len(values) // (workers *
+                                                  CHUNKS_PER_WORKER))
+    starts = range(0, len(values), chunk_size)
+    stops = [min(start + chunk_size, len(values)) for start in starts]
+
+    # Imported here, as they take longer to import than the rest of models
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Forked workers inherit the dictionaries instead of unpickling them
+        with ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("fork"),
+                initializer=_share, initargs=(values,)) as pool:
+            chunks = list(pool.map(_select_shared, [query] * len(starts),
+                                   starts, stops))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            chunks = list(pool.map(_select_chunk, [query] * len(starts),
+                                   starts, [values[start:stop] for start,
+                                            stop in zip(starts, stops)]))
+
+    return [position for chunk in chunks for position in chunk]
@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Registry module mapping class names to model classes.
+
+Every subclass of BaseModel registers itself here when its class statement
+runs (see `BaseModel.__init_subclass__`). Lookups of a class that has not been
+imported yet import its module on demand, following the repository's naming
+convention of one model per module: `Place` lives in `models.place`,
+`BaseModel` in `models.base_model`. Nothing is imported until it is needed.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import importlib
+import re
+from collections.abc import Mapping
+
+_CLASS_NAME = re.compile(r"[A-Z][A-Za-z0-9]*")
+_WORD_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+class ClassRegistry(Mapping):
+    """
+    A read-only mapping of class names to model classes, filled lazily.
+
+    Membership tests and lookups behave like the plain dictionary of classes
+    they replace, so `name in classes` and `classes[name]` keep working.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.__classes = {}
+        self.__complete = False
+
+    def register(self, cls):
+        """Register a model class under its name.
+
+        Args_:
+            cls (type): The model class.
+
+        Returns_:
+            type: The class, so that this can be used as a decorator.
+        """
+        self.__classes[cls.__name__] = cls
+        return cls
+
+    def get(self, name, default=None):
+        """Return a model class by name, importing its module if needed.
+
+        Args_:
+            name (str): The class name.
+            default: Returned when there is no such model class.
+
+        Returns_:
+            type: The model class, or `default`.
+        """
+        cls = self.__classes.get(name)
+        if cls is not None or self.__complete:
+            return cls if cls is not None else default
+
+        if not isinstance(name, str) or not _CLASS_NAME.fullmatch(name):
+            return default
+
+        module = "models." + _WORD_BOUNDARY.sub("_", name).lower()
+        try:
+            importlib.import_module(module)
+        except ModuleNotFoundError as error:
+            if error.name != module:
+                raise
+            return default
+
+        return self.__classes.get(name, default)
+
+    def __getitem__(self, name):
+        """Return a model class by name, raising KeyError if unknown."""
+        cls = self.get(name)
+        if cls is None:
+            raise KeyError(name)
+
+        return cls
+
+    def __contains__(self, name):
+        """Tell whether a model class of that name exists."""
+        return self.get(name) is not None
+
+    def __iter__(self):
+        """Iterate over the names of every model class."""
+        return iter(self.names())
+
+    def __len__(self):
+        """Return the number of model classes."""
+        return len(self.names())
+
+    def names(self):
+        """Return the names of every model class, importing all models.
+
+        Returns_:
+            list: The class names, sorted.
+        """
+        if not self.__complete:
+            # Only listing every model needs to walk the package
+            import pkgutil
+            import models
+
+            for module in pkgutil.iter_modules(models.__path__):
+                if not module.ispkg:
+                    importlib.import_module(f"models.{module.name}")
+            self.__complete = True
+
+        return sorted(self.__classes)
+
+
+classes = ClassRegistry()
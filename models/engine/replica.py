@@ -0,0 +1,285 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Replica module: tailing a primary's changelog from a follower process.
+
+A follower loads the snapshot once and then keeps up with the primary by
+applying the events the primary appends to its changelog (see
+models.engine.changes), instead of re-reading the whole snapshot. The
+ChangelogTail reads only the lines appended since it last looked, so the
+work is proportional to the changes, not to the dataset.
+
+On Linux the changelog is watched with inotify, so checking for changes
+costs one non-blocking read on the inotify descriptor; elsewhere, or if
+inotify is unavailable, it costs one `os.stat`.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import json
+import os
+import select
+import time
+from models.engine.keys import make_key
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+# Seconds between checks when waiting without inotify
+POLL_INTERVAL = 0.01
+
+
+def _inotify_watch(path):
+    """
+    Watch a file for changes with inotify.
+
+    Args_:
+        path (str): The path of the file.
+
+    Returns_:
+        int: A non-blocking inotify descriptor, or None if inotify is not
+        available or the file cannot be watched.
+    """
+    # Imported here, as ctypes.util imports subprocess: only followers
+    # pay for it
+    import ctypes
+    import ctypes.util
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError, TypeError):
+        return None
+
+    fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    if add_watch(fd, os.fsencode(path), IN_MODIFY | IN_ATTRIB |
+                 IN_MOVE_SELF | IN_DELETE_SELF) < 0:
+        os.close(fd)
+        return None
+
+    return fd
+
+
+def apply_event(objects, event):
+    """
+    Apply a changelog event to a map of stored dictionaries.
+
+    Args_:
+        objects (dict): The "<class name>.<id>" -> dict map to update.
+        event (dict): The event, as recorded by ChangeFeed.
+    """
+    key = make_key(event["class"], event["id"])
+
+    if event["op"] == "destroy":
+        objects.pop(key, None)
+        return
+
+    value = dict(objects.get(key) or {})
+    value.update(event["changes"])
+    for field in event["removed"]:
+        value.pop(field, None)
+    objects[key] = value
+
+
+class ChangelogTail:
+    """
+    Reads the events appended to a changelog since it was last read.
+
+    Attributes_:
+        path (str): The path of the changelog.
+        sequence (int): The sequence number of the last event returned, or
+            None until the follower sets the one its snapshot was saved at.
+        lag (float): Seconds between the primary recording the last event
+            applied and this follower applying it (see `applied`), not
+            counting the time it waited while this follower read nothing.
+        mode (str): "inotify" or "stat", how changes are detected.
+    """
+
+    def __init__(self, path):
+        """
+        Prepare to tail a changelog; nothing is read until `poll`.
+
+        Args_:
+            path (str): The path of the changelog.
+        """
+        self.path = path
+        self.sequence = None
+        self.lag = 0.0
+        self.__file = None
+        self.__inode = None
+        self.__partial = b""
+        self.__rotated = False
+        self.__watch = None
+        # The time the changelog was last written, when it was last read
+        self.__written = None
+        self.mode = "stat"
+
+    def poll(self):
+        """
+        Return the complete events appended since the last call.
+
+        Events at or before `sequence` are skipped, so that a changelog
+        started before the snapshot, or rotated, is never applied twice.
+
+        Returns_:
+            list: The new events, oldest first.
+        """
+        if not self.__changed():
+            return []
+
+        lines = self.__read_lines()
+        if self.__rotated:
+            self.__rotated = False
+            self.close()
+            if self.__open():
+                lines += self.__read_lines()
+
+        events = []
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if self.sequence is not None and event["seq"] <= self.sequence:
+                continue
+            events.append(event)
+
+        if events:
+            self.sequence = events[-1]["seq"]
+
+        return events
+
+    def applied(self, events):
+        """
+        Measure the lag from the last of the events just applied.
+
+        An event appended to the changelog long before it was polled, while
+        this follower was idle, is taken to be applied when it was written.
+
+        Args_:
+            events (list): The events returned by `poll`, once applied.
+        """
+        if events:
+            applied = time.time()
+            if self.__written is not None:
+                applied = min(applied, self.__written)
+            self.lag = max(0.0, applied - events[-1]["time"])
+
+    def wait(self, timeout=None):
+        """
+        Block until the changelog may have changed.
+
+        Args_:
+            timeout (float, optional): The most seconds to wait.
+
+        Returns_:
+            bool: False if the timeout expired first.
+        """
+        if self.__watch is not None:
+            ready, _, _ = select.select([self.__watch], [], [], timeout)
+            return bool(ready)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        position = self.__position()
+        while self.__stat() == position:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(POLL_INTERVAL)
+
+        return True
+
+    def pending(self):
+        """
+        Return the number of changelog bytes not applied yet.
+
+        Returns_:
+            int: The bytes of the lines not returned by `poll` yet.
+        """
+        stat = self.__stat()
+        if stat is None or stat[0] != self.__inode:
+            return stat[1] if stat is not None else 0
+
+        return max(0, stat[1] - self.__position()[1]) + len(self.__partial)
+
+    def close(self):
+        """Close the changelog and the inotify descriptor."""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+        if self.__watch is not None:
+            os.close(self.__watch)
+            self.__watch = None
+
+    def __changed(self):
+        """Tell cheaply whether the changelog may have new lines."""
+        if self.__file is None:
+            return self.__open()
+
+        if self.__watch is not None:
+            changed = False
+            try:
+                while os.read(self.__watch, 4096):
+                    changed = True
+            except BlockingIOError:
+                pass
+            if not changed:
+                return False
+
+        stat, position = self.__stat(), self.__position()
+        if stat == position:
+            return False
+
+        # Replaced, removed or truncated: read what is left, then start
+        # over from the file now at that path
+        self.__rotated = (stat is None or stat[0] != position[0] or
+                          stat[1] < position[1])
+        return True
+
+    def __open(self):
+        """Open the changelog from its start; return whether it exists."""
+        try:
+            self.__file = open(self.path, "rb")
+        except OSError:
+            return False
+
+        self.__inode = os.fstat(self.__file.fileno()).st_ino
+        self.__partial = b""
+        self.__watch = _inotify_watch(self.path)
+        self.mode = "stat" if self.__watch is None else "inotify"
+
+        return True
+
+    def __read_lines(self):
+        """Return the complete lines appended since the last read."""
+        if self.__file is None:
+            return []
+
+        data = self.__partial + self.__file.read()
+        self.__written = os.fstat(self.__file.fileno()).st_mtime
+        lines = data.split(b"\n")
+        # The last piece is a line still being written, or empty
+        self.__partial = lines.pop()
+
+        return lines
+
+    def __position(self):
+        """Return the (inode, size) the changelog had when last read."""
+        if self.__file is None:
+            return None
+
+        return self.__inode, self.__file.tell()
+
+    def __stat(self):
+        """Return the current (inode, size) of the changelog, or None."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+
+        return stat.st_ino, stat.st_size
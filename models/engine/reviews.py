@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Reviews module: review aggregates per Place and per User.
+
+Every place card shows its reviews, and finding them used to mean scanning
+every Review. The ReviewStats index keeps, for every Place, its reviews
+ordered by `created_at`, and for every User the number of reviews they
+wrote, as Reviews are saved and destroyed. A place's review count and its
+latest reviews are then read without looking at any other Review.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+from bisect import bisect_left, insort
+from models.engine.indexes import StorageIndex
+from models.engine.keys import make_key
+
+LATEST = 5
+
+
+class ReviewStats(StorageIndex):
+    """
+    Review counts and latest reviews per Place, review counts per User.
+    """
+
+    name = "reviews"
+
+    def __init__(self):
+        """Initialize empty aggregates."""
+        self.on_clear()
+
+    def on_clear(self):
+        """Drop every aggregate."""
+        # review id -> (place id, user id, created_at)
+        self.__reviews = {}
+        # place id -> sorted [(created_at, review id)]
+        self.__places = {}
+        # user id -> number of reviews
+        self.__users = {}
+
+    def on_set(self, key, old, new):
+        """Count a review created, or move one whose fields changed."""
+        if new.get("__class__") != "Review":
+            return
+
+        review_id = new.get("id")
+        entry = (new.get("place_id") or "", new.get("user_id") or "",
+                 str(new.get("created_at", "")))
+        if self.__reviews.get(review_id) != entry:
+            self.__remove(review_id)
+            self.__add(review_id, entry)
+
+    def on_delete(self, key, old):
+        """Forget a destroyed review."""
+        if old.get("__class__") == "Review":
+            self.__remove(old.get("id"))
+
+    def count(self, place_id):
+        """
+        Return the number of reviews of a place.
+
+        Args_:
+            place_id (str): The id of the Place.
+
+        Returns_:
+            int: The number of reviews.
+        """
+        return len(self.__places.get(place_id, ()))
+
+    def latest(self, place_id, limit=LATEST):
+        """
+        Return the keys of the most recent reviews of a place.
+
+        Args_:
+            place_id (str): The id of the Place.
+            limit (int): The most keys returned.
+
+        Returns_:
+            list: "Review.<id>" keys, newest first.
+        """
+        entries = self.__places.get(place_id, [])
+        if limit <= 0:
+            return []
+
+        return [make_key("Review", review_id)
+                for _, review_id in reversed(entries[-limit:])]
+
+    def user_count(self, user_id):
+        """
+        Return the number of reviews a user wrote.
+
+        Args_:
+            user_id (str): The id of the User.
+
+        Returns_:
+            int: The number of reviews.
+        """
+        return self.__users.get(user_id, 0)
+
+    def dump(self):
+        """Return the aggregates as JSON-serializable data."""
+        return {"reviews": self.__reviews, "users": self.__users}
+
+    def load(self, state):
+        """Restore aggregates returned by `dump`."""
+        self.on_clear()
+        self.__users = dict(state["users"])
+        for review_id, entry in state["reviews"].items():
+            self.__reviews[review_id] = entry = tuple(entry)
+            self.__places.setdefault(entry[0], []).append(
+                (entry[2], review_id))
+        for entries in self.__places.values():
+            entries.sort()
+
+    def __add(self, review_id, entry):
+        """Count a review."""
+        place_id, user_id, created_at = entry
+        self.__reviews[review_id] = entry
+        insort(self.__places.setdefault(place_id, []),
+               (created_at, review_id))
+        self.__users[user_id] = self.__users.get(user_id, 0) + 1
+
+    def __remove(self, review_id):
+        """Stop counting a review, if it is counted."""
+        entry = self.__reviews.pop(review_id, None)
+        if entry is None:
+            return
+
+        place_id, user_id, created_at = entry
+        entries = self.__places[place_id]
+        del entries[bisect_left(entries, (created_at, review_id))]
+        if not entries:
+            del self.__places[place_id]
+
+        self.__users[user_id] -= 1
+        if not self.__users[user_id]:
+            del self.__users[user_id]
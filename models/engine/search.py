@@ -0,0 +1,271 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Search module: a full-text inverted index over the free-text fields.
+
+SearchIndex tokenizes Place names and descriptions, Review texts and Amenity
+names as they are saved, and keeps one posting list per class and term
+of the objects holding the term, along with the number of times it occurs
+in each. Queries are ranked with Okapi BM25.
+
+Objects are referred to by their numbers (see models.engine.surrogates): a
+posting list is a pair of `array('i')`, the sorted numbers of the objects
+and their term frequencies, eight bytes a posting instead of a dictionary
+entry and, once read back from the sidecar, a copy of the id.
+
+Posting lists of the rarest query terms are walked first. Once the terms
+left could not lift an object outside the best results found so far into
+them, even if it held every one of those terms (the MaxScore strategy), the
+common terms are only looked up for those candidates instead of having their
+long posting lists walked. Results are the same as scoring every posting.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import heapq
+import math
+import re
+import sys
+import unicodedata
+from array import array
+from bisect import bisect_left
+from models.engine.indexes import StorageIndex
+from models.engine.keys import split_key
+from models.engine.surrogates import Surrogates
+
+# The text fields indexed for each class
+FIELDS = {
+    "Place": ("name", "description"),
+    "Review": ("text",),
+    "Amenity": ("name",),
+}
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have i in is it its of on or so
+that the this to was were will with
+""".split())
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Split a text into search terms.
+
+    Terms are case-folded, stripped of accents and stop words.
+
+    Args_:
+        text (str): The text.
+
+    Returns_:
+        list: The terms, in order, repeated as often as they occur.
+    """
+    text = unicodedata.normalize("NFKD", str(text).casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+
+    return [word for word in _WORD.findall(text) if word not in STOP_WORDS]
+
+
+class SearchIndex(StorageIndex):
+    """
+    BM25-ranked full-text search over the fields listed in FIELDS.
+
+    Attributes_:
+        requires (tuple): "surrogates" when the numbers of the objects are
+            those of the Surrogates index registered with storage.
+    """
+
+    name = "search"
+
+    def __init__(self, surrogates=None):
+        """
+        Initialize an empty index.
+
+        Args_:
+            surrogates (Surrogates, optional): The numbers of the objects,
+                registered with storage before this index; by default the
+                index numbers the objects itself, and saves the numbers
+                along with its postings.
+        """
+        self.__owned = surrogates is None
+        self.__surrogates = Surrogates() if self.__owned else surrogates
+        self.requires = () if self.__owned else (surrogates.name,)
+        self.on_clear()
+
+    def on_clear(self):
+        """Drop every posting."""
+        # class name -> term -> (sorted numbers, term frequencies)
+        self.__postings = {name: {} for name in FIELDS}
+        # class name -> {number: (document length, distinct terms)}
+        self.__docs = {name: {} for name in FIELDS}
+        # class name -> sum of the document lengths
+        self.__lengths = dict.fromkeys(FIELDS, 0)
+        if self.__owned:
+            self.__surrogates.on_clear()
+
+    def on_set(self, key, old, new):
+        """Re-index an object whose text fields may have changed."""
+        cls_name, _ = split_key(key)
+        if cls_name not in FIELDS:
+            return
+
+        number = self.__surrogates.assign(key)
+        self.__remove(cls_name, number)
+        self.__add(cls_name, number, tokenize(" ".join(
+            str(new.get(field) or "") for field in FIELDS[cls_name])))
+
+    def on_delete(self, key, old):
+        """Remove a destroyed object from the index."""
+        cls_name, _ = split_key(key)
+        if cls_name in FIELDS:
+            self.__remove(cls_name, self.__surrogates.lookup(key))
+        if self.__owned:
+            self.__surrogates.on_delete(key, old)
+
+    def search(self, cls_name, query, limit=10):
+        """
+        Rank the objects of a class matching any of the query terms.
+
+        Args_:
+            cls_name (str): The class searched.
+            query (str): The search terms.
+            limit (int): The most results returned.
+
+        Returns_:
+            list: ("<class name>.<id>", score) pairs, best first.
+
+        Raises_:
+            ValueError: If the class has no indexed fields.
+        """
+        if cls_name not in FIELDS:
+            raise ValueError(f"class {cls_name} is not searchable")
+
+        postings = self.__postings[cls_name]
+        docs = self.__docs[cls_name]
+        if not docs:
+            return []
+
+        count = len(docs)
+        base, slope = K1 * (1 - B), K1 * B * count / self.__lengths[cls_name]
+        terms = sorted({term for term in tokenize(query) if term in postings},
+                       key=lambda term: len(postings[term][0]))
+        # A term adds less than its weight to any score, whatever the
+        # frequency and document length
+        weights = [(K1 + 1) * math.log(
+            1 + (count - len(postings[term][0]) + 0.5) /
+            (len(postings[term][0]) + 0.5)) for term in terms]
+        scores = {}
+        get = scores.get
+
+        for position, term in enumerate(terms):
+            posting = postings[term]
+            weight = weights[position]
+            remaining = sum(weights[position:])
+            threshold = (heapq.nlargest(limit, scores.values())[-1]
+                         if limit and len(scores) >= limit else None)
+
+            if threshold is not None and remaining < threshold:
+                # No object outside the candidates can make the results
+                # anymore, nor can candidates too far behind
+                for number in [number for number, score in scores.items()
+                               if score + remaining < threshold]:
+                    del scores[number]
+                numbers, frequencies = posting
+                pairs = []
+                for number in scores:
+                    found = bisect_left(numbers, number)
+                    if found < len(numbers) and numbers[found] == number:
+                        pairs.append((number, frequencies[found]))
+            else:
+                pairs = zip(*posting)
+
+            for number, frequency in pairs:
+                scores[number] = get(number, 0.0) + weight * frequency / (
+                    frequency + base + slope * docs[number][0])
+
+        key = self.__surrogates.key
+        best = heapq.nlargest(limit, scores.items(),
+                              key=lambda item: (item[1], key(item[0])))
+        return [(key(number), score) for number, score in best]
+
+    def dump(self):
+        """Return the posting lists as JSON-serializable data."""
+        state = {name: {"numbers": list(self.__docs[name]),
+                        "lengths": [doc[0] for doc
+                                    in self.__docs[name].values()],
+                        "postings": {term: [numbers.tolist(),
+                                            frequencies.tolist()]
+                                     for term, (numbers, frequencies)
+                                     in self.__postings[name].items()}}
+                 for name in FIELDS}
+        if self.__owned:
+            state["surrogates"] = self.__surrogates.dump()
+
+        return state
+
+    def load(self, state):
+        """Restore posting lists returned by `dump`."""
+        self.on_clear()
+        if self.__owned:
+            self.__surrogates.load(state["surrogates"])
+
+        for name in FIELDS:
+            postings = self.__postings[name]
+            terms = {}
+            for term, (numbers, frequencies) in state[name][
+                    "postings"].items():
+                postings[term] = (array("i", numbers),
+                                  array("i", frequencies))
+                for number in numbers:
+                    terms.setdefault(number, []).append(term)
+            self.__docs[name] = {
+                number: (length, tuple(terms.get(number, ())))
+                for number, length in zip(state[name]["numbers"],
+                                          state[name]["lengths"])}
+            self.__lengths[name] = sum(state[name]["lengths"])
+
+    def __add(self, cls_name, number, terms):
+        """Index the terms of an object."""
+        postings = self.__postings[cls_name]
+        frequencies = {}
+        # Interned, so that the terms of every object share the strings
+        for term in map(sys.intern, terms):
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        for term, frequency in frequencies.items():
+            posting = postings.get(term)
+            if posting is None:
+                posting = postings[term] = (array("i"), array("i"))
+            numbers, counts = posting
+            if not numbers or numbers[-1] < number:
+                numbers.append(number)
+                counts.append(frequency)
+            else:
+                # The number of a destroyed object, handed out again
+                position = bisect_left(numbers, number)
+                numbers.insert(position, number)
+                counts.insert(position, frequency)
+        self.__docs[cls_name][number] = (len(terms), tuple(frequencies))
+        self.__lengths[cls_name] += len(terms)
+
+    def __remove(self, cls_name, number):
+        """Remove an object from the index, if it is indexed."""
+        doc = self.__docs[cls_name].pop(number, None)
+        if doc is None:
+            return
+
+        postings = self.__postings[cls_name]
+        for term in doc[1]:
+            numbers, frequencies = postings[term]
+            position = bisect_left(numbers, number)
+            del numbers[position]
+            del frequencies[position]
+            if not numbers:
+                del postings[term]
+        self.__lengths[cls_name] -= doc[0]
@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Surrogates module: dense integer numbers for the stored objects.
+
+Indexes referring to objects by their "<class name>.<id>" keys hold a
+pointer per reference, plus a copy of every key they read back from a
+sidecar, and cannot pack their references into arrays. The Surrogates index
+numbers every stored object instead, from 0 up: an index refers to an
+object by its number, packed four bytes each into an `array('i')` or a
+NumPy array, and translates the numbers back into keys only for the
+objects it returns. The public API of storage never shows the numbers.
+
+The number of a destroyed object is handed out again to a later object, so
+that the numbers stay dense. It is only released on the next change,
+though: the indexes notified of the deletion after this one can still look
+it up. The numbers are persistent, and so are the indexes built on them;
+those name "surrogates" in their `requires`, so as to be restored only
+along with the very numbers they were saved with.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import sys
+from models.engine.indexes import StorageIndex
+
+
+class Surrogates(StorageIndex):
+    """
+    The number of every stored object, and the key of every number.
+    """
+
+    name = "surrogates"
+
+    def __init__(self):
+        """Initialize an empty numbering."""
+        self.on_clear()
+
+    def __len__(self):
+        """Return the number of objects numbered."""
+        return len(self.__numbers)
+
+    def on_clear(self):
+        """Forget every number."""
+        # number -> key, None for the numbers free
+        self.__keys = []
+        # key -> number
+        self.__numbers = {}
+        # the free numbers, and the keys destroyed but not released yet
+        self.__free = []
+        self.__destroyed = []
+
+    def on_set(self, key, old, new):
+        """Number an object created."""
+        if old is None:
+            self.assign(key)
+
+    def on_delete(self, key, old):
+        """Release the number of a destroyed object on the next change."""
+        self.__release()
+        self.__destroyed.append(key)
+
+    def assign(self, key):
+        """
+        Return the number of an object, numbering it if it has none yet.
+
+        Indexes call it for the objects they are notified of, whether or not
+        this index was notified first.
+
+        Args_:
+            key (str): The "<class name>.<id>" key of the object.
+
+        Returns_:
+            int: The number.
+        """
+        self.__release()
+        number = self.__numbers.get(key)
+        if number is not None:
+            return number
+
+        key = sys.intern(key)
+        if self.__free:
+            number = self.__free.pop()
+            self.__keys[number] = key
+        else:
+            number = len(self.__keys)
+            self.__keys.append(key)
+        self.__numbers[key] = number
+
+        return number
+
+    def lookup(self, key):
+        """
+        Return the number of an object.
+
+        Args_:
+            key (str): The "<class name>.<id>" key of the object.
+
+        Returns_:
+            int: The number, or None if the object has none.
+        """
+        return self.__numbers.get(key)
+
+    def key(self, number):
+        """
+        Return the key of the object with a number.
+
+        Args_:
+            number (int): The number.
+
+        Returns_:
+            str: The "<class name>.<id>" key.
+
+        Raises_:
+            KeyError: If no object has that number.
+        """
+        key = self.__keys[number] if 0 <= number < len(self.__keys) else None
+        if key is None:
+            raise KeyError(number)
+
+        return key
+
+    def dump(self):
+        """Return the key of every number as JSON-serializable data."""
+        self.__release()
+        return self.__keys
+
+    def load(self, state):
+        """Restore the numbers returned by `dump`."""
+        self.on_clear()
+        self.__keys = [None if key is None else sys.intern(key)
+                       for key in state]
+        self.__numbers = {key: number for number, key
+                          in enumerate(self.__keys) if key is not None}
+        self.__free = [number for number, key in enumerate(self.__keys)
+                       if key is None]
+        self.__free.reverse()
+
+    def __release(self):
+        """Free the numbers of the objects destroyed before this change."""
+        for key in self.__destroyed:
+            number = self.__numbers.pop(key, None)
+            if number is not None:
+                self.__keys[number] = None
+                self.__free.append(number)
+        self.__destroyed.clear()
@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Timeline module: objects ordered by `created_at` and `updated_at`.
+
+Finding what changed since a given time used to mean scanning every object.
+The Timeline index keeps, for every class, the ids of its objects sorted by
+each timestamp, as objects are saved and destroyed, so that a time range is
+found with two binary searches and read in order.
+
+The timeline also remembers when objects were destroyed, so that a backup
+finds the objects destroyed since the last one without comparing every
+key (see models.engine.backup). It only knows of the objects destroyed
+since it was last rebuilt from the objects, rather than restored from its
+sidecar; asked about an earlier time, it cannot tell.
+
+Timestamps are compared as the ISO 8601 strings objects are stored with,
+which sort in time order.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from heapq import merge
+from models.engine.indexes import StorageIndex
+from models.engine.keys import make_key, split_key
+
+FIELDS = ("created_at", "updated_at")
+
+
+def timestamp(value):
+    """
+    Return a timestamp in the form objects store it in.
+
+    Args_:
+        value (datetime or str): The time, or its ISO 8601 form.
+
+    Returns_:
+        str: The ISO 8601 form of the time.
+
+    Raises_:
+        ValueError: If a string is not an ISO 8601 time.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+
+    return value.isoformat()
+
+
+class Timeline(StorageIndex):
+    """
+    Object ids sorted by `created_at` and by `updated_at`, per class.
+    """
+
+    name = "timeline"
+
+    def __init__(self):
+        """Initialize an empty timeline."""
+        self.on_clear()
+
+    def on_clear(self):
+        """Drop every entry."""
+        # key -> (created_at, updated_at)
+        self.__times = {}
+        # field -> class name -> sorted [(timestamp, id)]
+        self.__lists = {field: {} for field in FIELDS}
+        # [(time, key)] of the objects destroyed, oldest first, and the
+        # time since which none is missing
+        self.__destroyed = []
+        self.__complete = timestamp(datetime.now())
+
+    def on_set(self, key, old, new):
+        """Move an object whose timestamps changed."""
+        times = tuple(str(new.get(field, "")) for field in FIELDS)
+        if self.__times.get(key) != times:
+            self.__remove(key)
+            self.__add(key, times)
+
+    def on_delete(self, key, old):
+        """Forget a destroyed object, remembering when it was destroyed."""
+        self.__remove(key)
+        self.__destroyed.append((timestamp(datetime.now()), key))
+
+    def between(self, field, start=None, end=None, cls_name=None):
+        """
+        Iterate over the keys of the objects stamped within a time range.
+
+        Args_:
+            field (str): "created_at" or "updated_at".
+            start (datetime or str, optional): Only objects stamped after
+                this time.
+            end (datetime or str, optional): Only objects stamped at or
+                before this time.
+            cls_name (str, optional): Only objects of this class.
+
+        Yields_:
+            str: "<class name>.<id>" keys, oldest first.
+
+        Raises_:
+            ValueError: If the field is not a timestamp.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"{field} is not a timestamp")
+
+        lists = self.__lists[field]
+        names = list(lists) if cls_name is None else [cls_name]
+        start = None if start is None else timestamp(start)
+        end = None if end is None else timestamp(end)
+
+        yield from (key for _, key in merge(*(
+            self.__range(name, lists.get(name, []), start, end)
+            for name in names)))
+
+    def destroyed_since(self, start):
+        """
+        Return the keys of the objects destroyed after a given time.
+
+        Args_:
+            start (datetime or str): The time.
+
+        Returns_:
+            list: The keys of the objects destroyed since, and not created
+            again, or None if some may be missing, the timeline not being
+            complete since then.
+        """
+        start = timestamp(start)
+        if start < self.__complete:
+            return None
+
+        low = bisect_right(self.__destroyed, (start, "\uffff"))
+        keys = dict.fromkeys(key for _, key in self.__destroyed[low:]
+                             if key not in self.__times)
+
+        return list(keys)
+
+    def forget_destroyed(self, end):
+        """
+        Forget the objects destroyed at or before a given time.
+
+        Args_:
+            end (datetime or str): The time, such as that of a backup.
+        """
+        end = timestamp(end)
+        del self.__destroyed[:bisect_right(self.__destroyed,
+                                           (end, "\uffff"))]
+        self.__complete = max(self.__complete, end)
+
+    def dump(self):
+        """Return the timestamps as JSON-serializable data."""
+        return {"times": self.__times, "destroyed": self.__destroyed,
+                "complete": self.__complete}
+
+    def load(self, state):
+        """Restore timestamps returned by `dump`."""
+        self.on_clear()
+        self.__destroyed = [tuple(entry) for entry in state["destroyed"]]
+        self.__complete = state["complete"]
+        for key, times in state["times"].items():
+            self.__times[key] = times = tuple(times)
+            cls_name, obj_id = split_key(key)
+            for field, stamp in zip(FIELDS, times):
+                self.__lists[field].setdefault(cls_name, []).append(
+                    (stamp, obj_id))
+        for lists in self.__lists.values():
+            for entries in lists.values():
+                entries.sort()
+
+    @staticmethod
+    def __range(cls_name, entries, start, end):
+        """Yield (timestamp, key) pairs of one class within a range."""
+        # (time, "\uffff") sorts after every entry stamped at that time
+        low = 0 if start is None else bisect_right(entries,
+                                                   (start, "\uffff"))
+        high = len(entries) if end is None else bisect_right(
+            entries, (end, "\uffff"))
+
+        # Copied, as the objects read may be saved again while iterating
+        for stamp, obj_id in entries[low:high]:
+            yield stamp, make_key(cls_name, obj_id)
+
+    def __add(self, key, times):
+        """Insert an object."""
+        cls_name, obj_id = split_key(key)
+        self.__times[key] = times
+        for field, stamp in zip(FIELDS, times):
+            insort(self.__lists[field].setdefault(cls_name, []),
+                   (stamp, obj_id))
+
+    def __remove(self, key):
+        """Remove an object, if it is indexed."""
+        times = self.__times.pop(key, None)
+        if times is None:
+            return
+
+        cls_name, obj_id = split_key(key)
+        for field, stamp in zip(FIELDS, times):
+            entries = self.__lists[field][cls_name]
+            del entries[bisect_left(entries, (stamp, obj_id))]
+            if not entries:
+                del self.__lists[field][cls_name]
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unique module: hash indexes enforcing unique fields.
+
+Logging a user in means finding the User with a given email, which used to
+take a scan of every object. A UniqueIndex maps the normalized value of one
+field of one class (stripped and case-folded, so that " Bob@Mail.com" and
+"bob@mail.com" are the same email) to the id of the object holding it, and
+refuses to save a second object with a value already held: FileStorage
+calls `check` before every object it saves. Empty values are not indexed,
+and so never conflict.
+
+Objects may still share a value when they are created with it but not
+saved yet, or were written to the file by an older version of the storage
+engine. All of them are indexed, and the first one keeps the value: the
+lookup returns it, and none of the others can be saved with that value.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+from models.engine.indexes import StorageIndex
+from models.engine.keys import make_key
+
+
+def normalize(value):
+    """
+    Return the form of a value unique indexes compare.
+
+    Args_:
+        value: The value of the field.
+
+    Returns_:
+        str: The stripped, case-folded text, or None for values that are not
+        indexed (empty text and other types).
+    """
+    if not isinstance(value, str):
+        return None
+
+    return value.strip().casefold() or None
+
+
+class UniqueIndex(StorageIndex):
+    """
+    The objects of a class by the normalized value of a unique field.
+
+    Attributes_:
+        cls_name (str): The name of the class.
+        field (str): The name of the unique field.
+    """
+
+    def __init__(self, cls_name, field):
+        """
+        Initialize an empty index.
+
+        Args_:
+            cls_name (str): The name of the class.
+            field (str): The name of the unique field.
+        """
+        self.cls_name = cls_name
+        self.field = field
+        self.name = f"unique.{cls_name}.{field}"
+        self.on_clear()
+
+    def on_clear(self):
+        """Drop every value."""
+        # normalized value -> [ids], the first one holding the value
+        self.__ids = {}
+
+    def check(self, key, old, new):
+        """Refuse to store a value another object already holds."""
+        if new.get("__class__") != self.cls_name:
+            return
+
+        value = new.get(self.field)
+        owner = self.lookup(value)
+        if owner is not None and owner != new.get("id"):
+            raise ValueError(
+                f"{self.cls_name} {self.field} {value!r} is already used "
+                f"by {make_key(self.cls_name, owner)}")
+
+    def on_set(self, key, old, new):
+        """Index the value of an object created, or move a changed one."""
+        if new.get("__class__") != self.cls_name:
+            return
+
+        before = None if old is None else normalize(old.get(self.field))
+        after = normalize(new.get(self.field))
+        if before != after:
+            self.__remove(before, new.get("id"))
+            self.__add(after, new.get("id"))
+
+    def on_delete(self, key, old):
+        """Forget the value of a destroyed object."""
+        if old.get("__class__") == self.cls_name:
+            self.__remove(normalize(old.get(self.field)), old.get("id"))
+
+    def lookup(self, value):
+        """
+        Return the id of the object holding a value.
+
+        Args_:
+            value (str): The value, in any case.
+
+        Returns_:
+            str: The id of the object, or None.
+        """
+        ids = self.__ids.get(normalize(value))
+
+        return ids[0] if ids else None
+
+    def dump(self):
+        """Return the values and their ids as JSON-serializable data."""
+        return self.__ids
+
+    def load(self, state):
+        """Restore the values returned by `dump`."""
+        self.__ids = {value: list(ids) for value, ids in state.items()}
+
+    def __add(self, value, obj_id):
+        """Index the value of an object, unless it is not indexed."""
+        if value is not None:
+            self.__ids.setdefault(value, []).append(obj_id)
+
+    def __remove(self, value, obj_id):
+        """Stop indexing the value of an object, if it is indexed."""
+        ids = self.__ids.get(value)
+        if ids is None or obj_id not in ids:
+            return
+
+        ids.remove(obj_id)
+        if not ids:
+            del self.__ids[value]
@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the read API.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import glob
+import gzip
+import http.client
+import json
+import os
+import threading
+import unittest
+from api.v1.app import ApiServer, _plural
+from models import storage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+class TestApi(unittest.TestCase):
+    """Test cases for the API server."""
+
+    def setUp(self):
+        """Store a state, a city with two places, and start a server."""
+        self.file_path = "file.json"
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+        self.state = State(name="California")
+        self.state.save()
+        self.city = City(name="San Francisco", state_id=self.state.id)
+        self.city.save()
+        self.places = [Place(name=name, city_id=self.city.id)
+                       for name in ("Loft", "Attic")]
+        for place in self.places:
+            place.save()
+
+        self.server = ApiServer(("127.0.0.1", 0), storage, quiet=True)
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        self.connection = http.client.HTTPConnection(
+            "127.0.0.1", self.server.server_address[1])
+
+    def tearDown(self):
+        """Stop the server and remove the test files."""
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def request(self, path, method="GET", headers=None):
+        """Send a request over the kept-alive connection."""
+        self.connection.request(method, path, headers=headers or {})
+        response = self.connection.getresponse()
+
+        return response, response.read()
+
+    def test_status_and_stats(self):
+        """Test the status and stats endpoints."""
+        response, body = self.request("/api/v1/status")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(body), {"status": "OK"})
+
+        _, body = self.request("/api/v1/stats")
+        stats = json.loads(body)
+        self.assertEqual((stats["Place"], stats["City"], stats["User"]),
+                         (2, 1, 0))
+
+    def test_collection_and_object(self):
+        """Test listing a class, by class or resource name, and one object."""
+        _, body = self.request("/api/v1/Place")
+        self.assertEqual(sorted(value["name"] for value in json.loads(body)),
+                         ["Attic", "Loft"])
+        _, plural = self.request("/api/v1/places/")
+        self.assertEqual(body, plural)
+
+        response, body = self.request(f"/api/v1/cities/{self.city.id}")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(body), self.city.to_dict())
+        self.assertEqual(response.getheader("Content-Type"),
+                         "application/json")
+
+    def test_places_of_city_and_filters(self):
+        """Test the places of a city, sorted by name, and field filters."""
+        for query in (f"city_id={self.city.id}",
+                      f"state_id={self.state.id}"):
+            _, body = self.request(f"/api/v1/places?{query}")
+            self.assertEqual([value["name"] for value in json.loads(body)],
+                             ["Attic", "Loft"])
+
+        _, body = self.request("/api/v1/places?name=Loft")
+        self.assertEqual([value["id"] for value in json.loads(body)],
+                         [self.places[0].id])
+
+    def test_private_fields(self):
+        """Test that passwords are never served, nor filtered on."""
+        user = User(email="bob@mail.com", password="hunter2")
+        user.save()
+
+        for path in ("/api/v1/users", f"/api/v1/users/{user.id}",
+                     "/api/v1/users?email=bob@mail.com"):
+            _, body = self.request(path)
+            self.assertNotIn(b"hunter2", body)
+            self.assertIn(b"bob@mail.com", body)
+
+        _, body = self.request("/api/v1/users?password=hunter2")
+        self.assertEqual(json.loads(body), [])
+
+    def test_not_found_and_read_only(self):
+        """Test unknown paths and refused writes."""
+        for path in ("/api/v1/Nope", "/api/v1/places/nope", "/other",
+                     "/api/v1/places/a/b"):
+            response, body = self.request(path)
+            self.assertEqual(response.status, 404)
+            self.assertEqual(json.loads(body), {"error": "Not Found"})
+
+        self.connection.request("POST", "/api/v1/places", body=b"{}")
+        response = self.connection.getresponse()
+        response.read()
+        self.assertEqual(response.status, 405)
+        self.assertEqual(response.getheader("Allow"), "GET, HEAD")
+        self.assertEqual(self.request("/api/v1/status")[0].status, 200)
+
+    def test_etag_and_not_modified(self):
+        """Test conditional requests and ETags following updated_at."""
+        path = f"/api/v1/places/{self.places[0].id}"
+        response, _ = self.request(path)
+        etag = response.getheader("ETag")
+
+        response, body = self.request(path, headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+
+        self.places[0].save()
+        response, _ = self.request(path, headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.getheader("ETag"), etag)
+
+    def test_cache_invalidated_on_write(self):
+        """Test that a write drops the cached responses of its class."""
+        self.request("/api/v1/places")
+        self.request("/api/v1/states")
+        self.assertEqual(len(self.server.cache), 2)
+
+        Place(name="Barn", city_id=self.city.id).save()
+        self.assertEqual(len(self.server.cache), 1)
+        _, body = self.request("/api/v1/places")
+        self.assertEqual(len(json.loads(body)), 3)
+
+    def test_autocomplete(self):
+        """Test the completions of location names, with their State."""
+        _, body = self.request("/api/v1/autocomplete?q=FRAN")
+        self.assertEqual(json.loads(body), [
+            {"__class__": "City", "id": self.city.id,
+             "name": "San Francisco", "state_id": self.state.id,
+             "state": "California"}])
+
+        _, body = self.request("/api/v1/autocomplete?q=c&class=State&limit=1")
+        self.assertEqual([found["name"] for found in json.loads(body)],
+                         ["California"])
+
+        self.state.name = "Golden State"
+        self.state.save()
+        _, body = self.request("/api/v1/autocomplete?q=FRAN")
+        self.assertEqual(json.loads(body)[0]["state"], "Golden State")
+
+        for query in ("", "q=", "q=a&limit=0", "q=a&limit=x",
+                      "q=a&class=Place", "q=a&other=1"):
+            response, _ = self.request(f"/api/v1/autocomplete?{query}")
+            self.assertEqual(response.status, 400)
+
+    def test_gzip(self):
+        """Test that large bodies are compressed for clients accepting it."""
+        for number in range(10):
+            Place(name=f"Place {number}", city_id=self.city.id).save()
+
+        identity, plain = self.request("/api/v1/places")
+        response, body = self.request(
+            "/api/v1/places", headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(gzip.decompress(body), plain)
+        self.assertLess(len(body), len(plain))
+
+        etag = response.getheader("ETag")
+        self.assertEqual(etag, identity.getheader("ETag")[:-1] + '-gzip"')
+        response, _ = self.request("/api/v1/places", headers={
+            "Accept-Encoding": "gzip", "If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        response, _ = self.request("/api/v1/places",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+
+        response, body = self.request("/api/v1/places", method="HEAD")
+        self.assertEqual(body, b"")
+        self.assertEqual(response.getheader("Content-Length"),
+                         str(len(plain)))
+
+    def test_plural(self):
+        """Test the resource names of classes."""
+        self.assertEqual(_plural("City"), "cities")
+        self.assertEqual(_plural("Place"), "places")
+        self.assertEqual(_plural("BaseModel"), "base_models")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,12 +8,18 @@ __license__ = "MIT"
 __date__ = "2025-01-03"
 __version__ = "1.1"
 
+import glob
 import os
+import re
 from io import StringIO
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from console import HBNBCommand
 from models import storage
+from models.engine.file_storage import FileStorage
+from models.city import City
+from models.place import Place
+from models.state import State
 
 classes = ["BaseModel", "User",
            "State", "City", "Amenity",
@@ -511,5 +517,577 @@ class TestConsoleShowUpdateDict(unittest.TestCase):
                                      "** no instance found **")
 
 
+class TestConsoleProfile(unittest.TestCase):
+    """Test cases for the profile command."""
+
+    def setUp(self):
+        """Set up the test environment by removing the test files."""
+        self.file_path = "file.json"
+        self.prof_path = "test_console.prof"
+
+        for path in (self.file_path, self.prof_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def tearDown(self):
+        """Clean up after each test by removing the test files."""
+        for path in (self.file_path, self.prof_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_profile_runs_wrapped_command(self):
+        """Test that the wrapped command runs and reports are printed."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("profile -n 3 create User")
+            value = output.getvalue()
+
+        self.assertRegex(value, r'[0-9a-f-]{36}')
+        self.assertIn("cProfile: top 3 by cumulative time", value)
+        self.assertIn("tracemalloc: peak", value)
+
+    def test_profile_dump(self):
+        """Test that -o writes a loadable pstats file."""
+        import pstats
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd(f"profile -o {self.prof_path} all")
+            self.assertIn(self.prof_path, output.getvalue())
+
+        self.assertTrue(os.path.exists(self.prof_path))
+        pstats.Stats(self.prof_path)
+
+    def test_profile_dump_error(self):
+        """Test that an unwritable -o path is reported, not raised."""
+        path = os.path.join("nonexistent", "x.prof")
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd(f"profile -o {path} all")
+            self.assertEqual(output.getvalue().strip().splitlines()[-1],
+                             f"** cannot write {path}: No such file or "
+                             "directory **")
+
+    def test_profile_keeps_quotes(self):
+        """Test that quoted arguments reach the wrapped command intact."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("create Place")
+            place_id = output.getvalue().strip()
+
+        with patch('sys.stdout', new=StringIO()):
+            HBNBCommand().onecmd(
+                f'profile update Place {place_id} name "Two words"')
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd(f"show Place {place_id}")
+            self.assertIn("'name': 'Two words'", output.getvalue())
+
+    def test_profile_missing_command(self):
+        """Test profile without a command."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("profile -n 5")
+            self.assertEqual(output.getvalue().strip(),
+                             "** command missing **")
+
+    def test_profile_invalid_count(self):
+        """Test profile with an invalid -n value."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("profile -n x all")
+            self.assertEqual(output.getvalue().strip(),
+                             "** invalid number of entries **")
+
+
+class TestConsoleListing(unittest.TestCase):
+    """Test cases for the listing command."""
+
+    def setUp(self):
+        """Set up a city with three places."""
+        self.file_path = "file.json"
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("create City")
+            self.city_id = output.getvalue().strip()
+        for name in ("Loft", "Barn", "Attic"):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd("create Place")
+                place_id = output.getvalue().strip()
+                HBNBCommand().onecmd(
+                    f'update Place {place_id} city_id "{self.city_id}"')
+                HBNBCommand().onecmd(
+                    f'update Place {place_id} name "{name}"')
+
+    def tearDown(self):
+        """Clean up after each test by removing the test files."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_listing(self):
+        """Test that places are listed by name, one page at a time."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd(f"listing City {self.city_id}")
+            lines = output.getvalue().strip().splitlines()
+
+        self.assertEqual(lines[-1], "page 1 of 1")
+        self.assertLess(lines[0].index("Attic"), lines[0].index("Barn"))
+        self.assertLess(lines[0].index("Barn"), lines[0].index("Loft"))
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd(f"listing City {self.city_id} 2")
+            self.assertEqual(output.getvalue(), "[]\npage 2 of 1\n")
+
+    def test_listing_errors(self):
+        """Test the listing command error messages."""
+        for line, message in (
+                ("listing", "** class name missing **"),
+                ("listing Fake 1", "** class doesn't exist **"),
+                ("listing Place 1", "** listings exist only for City and "
+                 "State **"),
+                ("listing City", "** instance id missing **"),
+                ("listing City 1", "** no instance found **"),
+                (f"listing City {self.city_id} 0",
+                 "** invalid page number **"),
+                (f"listing City {self.city_id} x",
+                 "** invalid page number **")):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().strip(), message)
+
+
+class TestConsoleSearch(unittest.TestCase):
+    """Test cases for the search command."""
+
+    def setUp(self):
+        """Set up two reviews."""
+        self.file_path = "file.json"
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+        self.ids = []
+        for text in ("Quiet and clean", "Clean but noisy"):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd("create Review")
+                review_id = output.getvalue().strip()
+                HBNBCommand().onecmd(
+                    f'update Review {review_id} text "{text}"')
+            self.ids.append(review_id)
+
+    def tearDown(self):
+        """Clean up after each test by removing the test files."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_search(self):
+        """Test that matching keys are printed, best first."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd('search Review "quiet clean"')
+            self.assertEqual(output.getvalue().strip(), str(
+                [f"Review.{self.ids[0]}", f"Review.{self.ids[1]}"]))
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd('search Review "clean noisy" 1')
+            self.assertEqual(output.getvalue().strip(),
+                             str([f"Review.{self.ids[1]}"]))
+
+    def test_search_errors(self):
+        """Test the search command error messages."""
+        for line, message in (
+                ("search", "** class name missing **"),
+                ('search Fake "x"', "** class doesn't exist **"),
+                ('search User "x"', "** class is not searchable **"),
+                ("search Review", "** search terms missing **"),
+                ('search Review "x" 0', "** invalid number of results **"),
+                ('search Review "x" y', "** invalid number of results **")):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().strip(), message)
+
+
+class TestConsoleAutocomplete(unittest.TestCase):
+    """Test cases for the autocomplete command."""
+
+    def setUp(self):
+        """Set up a state and one of its cities."""
+        self.file_path = "file.json"
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+        self.state = State(name="California")
+        self.state.save()
+        self.city = City(name="San Francisco", state_id=self.state.id)
+        self.city.save()
+
+    def tearDown(self):
+        """Clean up after each test by removing the test files."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_autocomplete(self):
+        """Test that matching locations are displayed with their State."""
+        city = f"[City] ({self.city.id}) San Francisco, California"
+        state = f"[State] ({self.state.id}) California"
+        for line, lines in (
+                ("autocomplete fran", [city]),
+                ('autocomplete "SAN F"', [city]),
+                ("autocomplete ca", [state]),
+                ("autocomplete City ca", []),
+                ("autocomplete a 1", [])):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().splitlines(), lines)
+
+    def test_autocomplete_errors(self):
+        """Test the autocomplete command error messages."""
+        for line, message in (
+                ("autocomplete", "** prefix missing **"),
+                ("autocomplete City", "** prefix missing **"),
+                ('autocomplete "  "', "** prefix missing **"),
+                ("autocomplete ca 0", "** invalid number of results **"),
+                ("autocomplete ca x", "** invalid number of results **")):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().strip(), message)
+
+
+class TestConsoleSince(unittest.TestCase):
+    """Test cases for the since command."""
+
+    def setUp(self):
+        """Set up a state created before a city."""
+        self.file_path = "file.json"
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("create State")
+            self.state_id = output.getvalue().strip()
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("create City")
+            self.city_id = output.getvalue().strip()
+        self.start = storage.get("State", self.state_id).updated_at
+
+    def tearDown(self):
+        """Clean up after each test by removing the test files."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_since(self):
+        """Test that instances updated after the time are displayed."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd(f"since {self.start.isoformat()}")
+            value = output.getvalue()
+        self.assertIn(self.city_id, value)
+        self.assertNotIn(self.state_id, value)
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd(f"since {self.start.isoformat()} State")
+            self.assertEqual(output.getvalue().strip(), "[]")
+
+    def test_replication_on_primary(self):
+        """Test that a primary has no replication status."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("replication")
+            self.assertEqual(output.getvalue().strip(),
+                             "** storage is not a follower **")
+
+    def test_info(self):
+        """Test that the storage state is displayed."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("info")
+            value = output.getvalue()
+
+        self.assertIn("objects: 2\n", value)
+        self.assertIn("bgsave_in_progress: ", value)
+        self.assertIn("last_bgsave_cow_bytes: ", value)
+
+    def test_backup_errors(self):
+        """Test the backup and restore command error messages."""
+        for line, message in (
+                ("backup everything", "** usage: backup [full] **"),
+                ("restore", "** time missing **"),
+                ("restore yesterday", "** invalid time **"),
+                ("restore 1970-01-01", "** no backup before that time **")):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().strip(), message)
+
+    def test_since_errors(self):
+        """Test the since command error messages."""
+        for line, message in (
+                ("since", "** time missing **"),
+                ("since 2017-01-01 Fake", "** class doesn't exist **"),
+                ("since yesterday", "** invalid time **")):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().strip(), message)
+
+
+class TestConsoleFindBy(unittest.TestCase):
+    """Test cases for the find_by_<field> method and unique emails."""
+
+    def setUp(self):
+        """Set up a user with an email."""
+        self.file_path = "file.json"
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("create User")
+            self.user_id = output.getvalue().strip()
+            HBNBCommand().onecmd(
+                f'update User {self.user_id} email "Bob@Mail.com"')
+
+    def tearDown(self):
+        """Clean up after each test by removing the test files."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_find_by_email(self):
+        """Test that a user is displayed by email, in any case."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd('User.find_by_email("bob@mail.com")')
+            self.assertIn(self.user_id, output.getvalue())
+
+        for line, message in (
+                ('User.find_by_email("eve@mail.com")',
+                 "** no instance found **"),
+                ("User.find_by_email()", "** value missing **"),
+                ('Fake.find_by_email("bob@mail.com")',
+                 "** class doesn't exist **")):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().strip(), message)
+
+    def test_duplicate_email(self):
+        """Test that updating to a used email prints an error."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("create User")
+            other_id = output.getvalue().strip()
+        for line, email in (
+                (f'update User {other_id} email "BOB@mail.com"',
+                 "BOB@mail.com"),
+                (f'User.update("{other_id}", "email", "Bob@mail.com")',
+                 "Bob@mail.com"),
+                (f'User.update("{other_id}", {{"email": "bob@MAIL.com"}})',
+                 "bob@MAIL.com")):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(
+                    output.getvalue().strip(), f"** User email {email!r} "
+                    f"is already used by User.{self.user_id} **")
+        self.assertEqual(storage.get("User", other_id).email, "")
+
+
+class TestConsolePrefixes(unittest.TestCase):
+    """Test cases for abbreviated ids and the prefixes command."""
+
+    def setUp(self):
+        """Set up places with known ids."""
+        self.file_path = "file.json"
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+        for obj_id in ("3fa8c1", "3fa9aa", "b00000"):
+            Place(id=obj_id).save()
+
+    def tearDown(self):
+        """Clean up after each test by removing the test files."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_show_prefix(self):
+        """Test that a unique prefix stands for the id."""
+        for line in ("show Place 3fa8", 'Place.show("3fa8")'):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertIn("(3fa8c1)", output.getvalue())
+
+    def test_update_and_destroy_prefix(self):
+        """Test that updates and destructions resolve prefixes."""
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd('update Place 3fa9 name "Loft"')
+            HBNBCommand().onecmd('Place.update("b000", "name", "Hut")')
+            HBNBCommand().onecmd('Place.update("3fa8", {"max_guest": 4})')
+            self.assertEqual(output.getvalue(), "")
+        self.assertEqual(storage.get("Place", "3fa9aa").name, "Loft")
+        self.assertEqual(storage.get("Place", "b00000").name, "Hut")
+        self.assertEqual(storage.get("Place", "3fa8c1").max_guest, 4)
+
+        with patch('sys.stdout', new=StringIO()) as output:
+            HBNBCommand().onecmd("destroy Place 3fa8")
+            HBNBCommand().onecmd('Place.destroy("b000")')
+            self.assertEqual(output.getvalue(), "")
+        self.assertEqual(storage.count("Place"), 1)
+
+    def test_ambiguous_prefix(self):
+        """Test that ambiguous, short and unknown prefixes are reported."""
+        Place(id="3fa8ff").save()
+        for line, message in (
+                ("show Place 3fa8", "** Place id prefix '3fa8' is "
+                 "ambiguous: 2 instances match **"),
+                ('Place.destroy("3fa8")', "** Place id prefix '3fa8' is "
+                 "ambiguous: 2 instances match **"),
+                ('destroy Place ""', "** Place id prefix '' is too short: "
+                 "4 characters at least **"),
+                ('Place.update("3f", "name", "Hut")', "** Place id prefix "
+                 "'3f' is too short: 4 characters at least **"),
+                ("show Place c000", "** no instance found **"),
+                ("show City 3fa9", "** no instance found **")):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().strip(), message)
+        self.assertEqual(storage.count("Place"), 4)
+
+    def test_prefixes(self):
+        """Test the report of the shortest unique prefixes."""
+        for line, message in (("prefixes", "Place: 4"),
+                              ("prefixes Place", "Place: 4"),
+                              ("prefixes City", ""),
+                              ("prefixes Fake", "** class doesn't exist **")):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().strip(), message)
+
+
+class TestConsoleCompletion(unittest.TestCase):
+    """Test cases for the completion of commands and their arguments."""
+
+    def setUp(self):
+        """Set up places with known ids."""
+        self.file_path = "file.json"
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+        for obj_id in ("3fa8c1-1234", "3fa8c1-1299", "b00000"):
+            Place(id=obj_id)
+        self.console = HBNBCommand()
+
+    def tearDown(self):
+        """Clean up after each test by removing the test files."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def complete(self, line):
+        """Complete the end of a line as readline would, splitting words
+        on its default delimiters."""
+        text = re.search(r"[^\s\"'(,{-]*$", line).group()
+        begidx = len(line) - len(text)
+        if not line[:begidx].strip():
+            return self.console.completenames(text, line, begidx, len(line))
+        command = self.console.parseline(line)[0]
+        complete = getattr(self.console, f"complete_{command}",
+                           self.console.completedefault)
+        return complete(text, line, begidx, len(line))
+
+    def test_names(self):
+        """Test the completion of commands, classes and their methods."""
+        self.assertEqual(self.complete("sh"), ["show"])
+        self.assertEqual(self.complete("Pl"), ["Place."])
+        self.assertEqual(self.complete("Place.s"), ["Place.show("])
+        self.assertIn("User.find_by_email(", self.complete("User.find"))
+        self.assertEqual(self.complete("Fake."), [])
+
+    def test_class_names(self):
+        """Test the completion of class names."""
+        self.assertEqual(self.complete("create Pl"), ["Place"])
+        self.assertEqual(self.complete("all "), sorted(classes))
+        self.assertEqual(self.complete("listing "), ["City", "State"])
+        self.assertEqual(self.complete("search R"), ["Review"])
+        self.assertEqual(self.complete("since 2017-01-01 C"), ["City"])
+        self.assertEqual(self.complete("create Place "), [])
+
+    def test_ids(self):
+        """Test the completion of ids, split on "-" as by readline."""
+        self.assertEqual(self.complete("show Place "),
+                         ["3fa8c1-1234", "3fa8c1-1299", "b00000"])
+        self.assertEqual(self.complete("destroy Place 3"),
+                         ["3fa8c1-1234", "3fa8c1-1299"])
+        self.assertEqual(self.complete("show Place 3fa8c1-12"),
+                         ["1234", "1299"])
+        self.assertEqual(self.complete('Place.show("3fa8c1-129'), ["1299"])
+        self.assertEqual(self.complete("show Fake 3"), [])
+        self.assertEqual(self.complete("show City 3"), [])
+
+    def test_attributes(self):
+        """Test the completion of attribute names from annotations."""
+        self.assertEqual(self.complete("update Place b00000 price"),
+                         ["price_by_night"])
+        self.assertEqual(self.complete('Place.update("b00000", "ci'),
+                         ["city_id"])
+        self.assertEqual(self.complete("update City b00000 "),
+                         ["name", "state_id"])
+        self.assertEqual(self.complete('Place.show("b00000", "ci'), [])
+
+    def test_ids_no_instances(self):
+        """Test that completing ids does not instantiate objects."""
+        with patch("models.place.Place.__init__") as init:
+            self.assertEqual(len(self.complete("show Place ")), 3)
+        init.assert_not_called()
+
+    def test_many_ids(self):
+        """Test that many matches keep their common prefix."""
+        with patch("console.COMPLETIONS", 2):
+            self.assertEqual(self.complete("show Place "),
+                             ["3fa8c1-1234", "b00000"])
+
+
+class TestConsoleFollower(unittest.TestCase):
+    """Test cases for the write commands of a follower."""
+
+    def setUp(self):
+        """Store a state, then turn storage into a follower."""
+        self.file_path = "file.json"
+        self.state = State(name="Kenya")
+        self.state.save()
+        self.follower = patch.object(FileStorage, "_FileStorage__follower",
+                                     MagicMock(poll=lambda: []))
+        self.follower.start()
+
+    def tearDown(self):
+        """Turn storage back into a primary and clean up."""
+        self.follower.stop()
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_writes_refused(self):
+        """Test that writes are refused, leaving storage unchanged."""
+        state_id = self.state.id
+        for line in ("create State", f'update State {state_id} name "X"',
+                     f'State.update("{state_id}", "name", "X")',
+                     f"destroy State {state_id}",
+                     f'State.destroy("{state_id}")', "bgsave"):
+            with patch('sys.stdout', new=StringIO()) as output:
+                HBNBCommand().onecmd(line)
+                self.assertEqual(output.getvalue().strip(),
+                                 "** storage is a read-only follower **")
+
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(storage.get(State, state_id).name, "Kenya")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the console server and its client.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import asyncio
+import glob
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from console_client import ConsoleClient
+from console_server import ConsoleServer
+from models import storage
+from models.engine.file_storage import FileStorage
+
+
+class TestConsoleServer(unittest.TestCase):
+    """Test cases for ConsoleServer and ConsoleClient."""
+
+    def setUp(self):
+        """Start a server on a temporary Unix socket."""
+        self.file_path = FileStorage._FileStorage__file_path
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "hbnb.sock")
+        self.server = ConsoleServer()
+        self.loop = asyncio.new_event_loop()
+        self.task = self.loop.create_task(self.server.serve(self.path))
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+        self.thread.start()
+        while not os.path.exists(self.path):
+            time.sleep(0.01)
+        self.client = ConsoleClient(self.path)
+
+    def tearDown(self):
+        """Stop the server and clean up."""
+        self.client.close()
+        self.loop.call_soon_threadsafe(self.task.cancel)
+        self.thread.join()
+        self.loop.close()
+        storage.background = False
+        storage.exclusive = False
+        storage.refresh()
+        shutil.rmtree(self.directory)
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def __run(self):
+        """Run the server loop until its task is cancelled."""
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+
+    def test_execute(self):
+        """Test that a command's output is captured."""
+        output, done = self.server.execute("create State")
+        self.assertIn(f"State.{output.decode().strip()}", storage.all())
+        self.assertFalse(done)
+        self.assertEqual(self.server.execute("quit"), (b"", True))
+
+    def test_execute_error(self):
+        """Test that a failing command is reported, not raised."""
+        with patch.object(
+                storage, "items", side_effect=RuntimeError("boom")):
+            output, done = self.server.execute("all")
+        self.assertEqual(output, b"** RuntimeError: boom **\n")
+        self.assertFalse(done)
+
+    def test_profile_output_refused(self):
+        """Test that clients cannot have profiles written to files."""
+        output, _ = self.server.execute("profile -o served.prof all")
+        self.assertEqual(output, b"** profile files are not written here **\n")
+        self.assertFalse(os.path.exists("served.prof"))
+        self.assertIn(b"cProfile", self.server.execute("profile all")[0])
+
+    def test_round_trip(self):
+        """Test that a client gets the output of its command."""
+        state_id = self.client.execute("create State").strip()
+        self.client.execute(f'update State {state_id} name "Nairobi"')
+        output = self.client.execute(f"show State {state_id}")
+        self.assertIn(f"[State] ({state_id})", output)
+        self.assertIn("'name': 'Nairobi'", output)
+
+    def test_pipeline(self):
+        """Test that pipelined commands are answered in order."""
+        outputs = self.client.pipeline(
+            ["create City", "City.count()", "show Nope 1", ""])
+        self.assertEqual(outputs[1], "1\n")
+        self.assertEqual(outputs[2], "** class doesn't exist **\n")
+        self.assertEqual(outputs[3], "")
+
+    def test_shared_storage(self):
+        """Test that every client sees the writes of the others."""
+        other = ConsoleClient(self.path)
+        try:
+            other.execute("create Amenity")
+            self.assertEqual(self.client.execute("Amenity.count()"), "1\n")
+        finally:
+            other.close()
+
+    def test_quit(self):
+        """Test that quit closes the connection."""
+        self.assertEqual(self.client.execute("quit"), "")
+        with self.assertRaises(ConnectionError):
+            self.client.execute("all")
+
+
+if __name__ == "__main__":
+    unittest.main()
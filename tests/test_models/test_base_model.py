@@ -8,6 +8,7 @@ __license__ = "MIT"
 __date__ = "2025-01-03"
 __version__ = "1.1"
 
+import glob
 import os
 import json
 import time
@@ -40,6 +41,10 @@ class TestBaseModelAttributes(unittest.TestCase):
         if os.path.exists(self.file_path):
             os.remove(self.file_path)
 
+        # Sidecar files of the persistent indexes
+        for path in glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
         del self.model
 
         storage._FileStorage__objects.clear()
@@ -217,6 +222,10 @@ class TestBaseModelFileSaving(unittest.TestCase):
         if os.path.exists(self.file_path):
             os.remove(self.file_path)
 
+        # Sidecar files of the persistent indexes
+        for path in glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
         storage._FileStorage__objects.clear()
 
     def test_save_to_file(self):
@@ -322,5 +331,66 @@ class TestBaseModelToDict(unittest.TestCase):
         self.assertNotIn("name", obj.__dict__)
 
 
+class TestBaseModelSerializedCache(unittest.TestCase):
+    """Test cases for the cached dict/str/JSON forms of BaseModel."""
+
+    def tearDown(self):
+        """Clean up after tests by removing file.json if it exists."""
+        if os.path.exists("file.json"):
+            os.remove("file.json")
+
+        # Sidecar files of the persistent indexes
+        for path in glob.glob("file.json" + ".*"):
+            os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_forms_are_reused(self):
+        """Test that unchanged instances reuse their serialized forms."""
+        obj = BaseModel()
+        self.assertIs(obj._serialized(), obj._serialized())
+        self.assertIs(str(obj), str(obj))
+        self.assertIs(obj.to_json(), obj.to_json())
+
+    def test_setattr_invalidates(self):
+        """Test that setting an attribute refreshes every form."""
+        obj = BaseModel()
+        old_str, old_json = str(obj), obj.to_json()
+        obj.name = "Changed"
+
+        self.assertEqual(obj.to_dict()["name"], "Changed")
+        self.assertNotEqual(str(obj), old_str)
+        self.assertNotEqual(obj.to_json(), old_json)
+        self.assertEqual(json.loads(obj.to_json()), obj.to_dict())
+
+    def test_delattr_invalidates(self):
+        """Test that deleting an attribute refreshes every form."""
+        obj = BaseModel()
+        obj.name = "Gone"
+        self.assertIn("name", obj.to_dict())
+        del obj.name
+        self.assertNotIn("name", obj.to_dict())
+        self.assertNotIn("name", str(obj))
+
+    def test_cache_not_in_dict(self):
+        """Test that the cache never leaks into __dict__."""
+        obj = BaseModel()
+        obj.to_json()
+        self.assertEqual(set(obj.__dict__),
+                         {"id", "created_at", "updated_at"})
+
+    def test_save_writes_current_state(self):
+        """Test that storage.save never writes stale cached JSON."""
+        obj = BaseModel()
+        obj.save()
+        obj.name = "Unsaved"
+        obj.save()
+
+        with open("file.json", "r") as file:
+            data = json.load(file)
+
+        self.assertEqual(data[f"BaseModel.{obj.id}"]["name"], "Unsaved")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,6 +9,7 @@ __date__ = "2025-01-03"
 __version__ = "1.1"
 
 import unittest
+import glob
 import os
 import json
 import time
@@ -38,6 +39,10 @@ class TestCity(unittest.TestCase):
         if os.path.exists(self.file_path):
             os.remove(self.file_path)
 
+        # Sidecar files of the persistent indexes
+        for path in glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
         del self.city
 
         storage._FileStorage__objects.clear()
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the Autocomplete index.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import glob
+import json
+import os
+import unittest
+from models import storage
+from models.city import City
+from models.engine.autocomplete import Autocomplete, fold
+from models.engine.file_storage import FileStorage
+from models.engine.object_map import ObjectMap
+from models.state import State
+
+
+def location(cls_name, obj_id, name, state_id=None):
+    """Return the stored dictionary of a State or City."""
+    value = {"__class__": cls_name, "id": obj_id, "name": name}
+    if state_id is not None:
+        value["state_id"] = state_id
+    return value
+
+
+def names(locations):
+    """Return the names of completed locations."""
+    return [found["name"] for found in locations]
+
+
+class TestAutocomplete(unittest.TestCase):
+    """Test cases for the Autocomplete index."""
+
+    def setUp(self):
+        """Create a map of locations listened to by Autocomplete."""
+        self.index = Autocomplete()
+        self.objects = ObjectMap(listeners=[self.index])
+        self.objects.update({
+            "State.ny": location("State", "ny", "New York"),
+            "State.sp": location("State", "sp", "São Paulo"),
+            "City.nyc": location("City", "nyc", "New York City", "ny"),
+            "City.yk": location("City", "yk", "York", "pa"),
+            "City.nw": location("City", "nw", "Newark", "nj"),
+            "City.sp": location("City", "sp", "Sao  Paulo", "sp"),
+            "Place.p1": {"__class__": "Place", "id": "p1", "name": "New"},
+        })
+
+    def test_fold(self):
+        """Test that case, accents and extra spaces are ignored."""
+        self.assertEqual(fold("  São   PAULO "), "sao paulo")
+        self.assertEqual(fold("Straße"), "strasse")
+
+    def test_complete(self):
+        """Test names starting with the prefix first, then words."""
+        self.assertEqual(names(self.index.complete("new")),
+                         ["New York", "New York City", "Newark"])
+        self.assertEqual(names(self.index.complete("york")),
+                         ["York", "New York", "New York City"])
+        self.assertEqual(names(self.index.complete("new ")),
+                         ["New York", "New York City"])
+        self.assertEqual(names(self.index.complete("new", limit=2)),
+                         ["New York", "New York City"])
+        self.assertEqual(names(self.index.complete("SÃO p")),
+                         ["Sao  Paulo", "São Paulo"])
+        self.assertEqual(self.index.complete("zzz"), [])
+
+    def test_state_linkage(self):
+        """Test that Cities come with their State."""
+        self.assertEqual(self.index.complete("new york c"), [
+            {"__class__": "City", "id": "nyc", "name": "New York City",
+             "state_id": "ny", "state": "New York"}])
+        self.assertEqual(self.index.complete("york")[0]["state"], None)
+        self.assertEqual(self.index.complete("new york", 1), [
+            {"__class__": "State", "id": "ny", "name": "New York"}])
+
+        self.objects["State.ny"] = location("State", "ny", "Empire")
+        self.assertEqual(self.index.complete("new york")[0]["state"],
+                         "Empire")
+
+    def test_class_filter(self):
+        """Test completing only States or only Cities."""
+        self.assertEqual(names(self.index.complete("new", cls_name="City")),
+                         ["New York City", "Newark"])
+        self.assertEqual(names(self.index.complete("york",
+                                                   cls_name="State")),
+                         ["New York"])
+
+    def test_rename_and_delete(self):
+        """Test that renamed and destroyed locations move or go."""
+        self.objects["City.nw"] = location("City", "nw", "Jersey City", "nj")
+        self.assertEqual(names(self.index.complete("newark")), [])
+        self.assertEqual(names(self.index.complete("city")),
+                         ["Jersey City", "New York City"])
+
+        del self.objects["City.nyc"]
+        self.assertEqual(names(self.index.complete("new")), ["New York"])
+
+        self.objects.clear()
+        self.assertEqual(self.index.complete(""), [])
+
+    def test_dump_and_load(self):
+        """Test that the names survive a JSON round trip."""
+        restored = Autocomplete()
+        restored.load(json.loads(json.dumps(self.index.dump())))
+        for prefix in ("new", "york", "sao"):
+            self.assertEqual(restored.complete(prefix),
+                             self.index.complete(prefix))
+
+        objects = ObjectMap(listeners=[restored])
+        objects.replace(self.objects, skip=[restored])
+        del objects["State.ny"]
+        self.assertEqual(names(restored.complete("york")),
+                         ["York", "New York City"])
+
+
+class TestStorageAutocomplete(unittest.TestCase):
+    """Test cases for FileStorage.autocomplete."""
+
+    def setUp(self):
+        """Create a state and a city."""
+        self.file_path = FileStorage._FileStorage__file_path
+        self.state = State(name="California")
+        self.state.save()
+        self.city = City(name="San Francisco", state_id=self.state.id)
+        self.city.save()
+
+    def tearDown(self):
+        """Clean up."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_autocomplete(self):
+        """Test completions maintained on save and destroy."""
+        self.assertEqual(storage.autocomplete("fran"), [
+            {"__class__": "City", "id": self.city.id,
+             "name": "San Francisco", "state_id": self.state.id,
+             "state": "California"}])
+        self.assertEqual(names(storage.autocomplete("ca", cls=State)),
+                         ["California"])
+
+        storage.delete(self.city)
+        storage.save()
+        self.assertEqual(storage.autocomplete("san"), [])
+
+    def test_reloaded(self):
+        """Test that the index is restored from its sidecar on reload."""
+        storage.checkpoint()
+        self.assertTrue(os.path.exists(self.file_path + ".autocomplete"))
+        storage._FileStorage__objects.clear()
+        storage.reload()
+        self.assertEqual(names(storage.autocomplete("cal")), ["California"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the backup module.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from models import storage
+from models.engine import backup
+from models.state import State
+
+
+class TestBackup(unittest.TestCase):
+    """Test cases for backups and point-in-time restores."""
+
+    def setUp(self):
+        """Create a temporary backup directory and an empty storage."""
+        self.directory = tempfile.mkdtemp()
+        for path in glob.glob("file.json*"):
+            os.remove(path)
+        storage._FileStorage__objects.clear()
+
+    def tearDown(self):
+        """Remove the backup directory and the test files."""
+        shutil.rmtree(self.directory)
+        for path in glob.glob("file.json*"):
+            os.remove(path)
+        storage._FileStorage__objects.clear()
+
+    def names(self):
+        """Return the names of the stored states, sorted."""
+        return sorted(state.name for state in storage.all(State).values())
+
+    def test_chain_and_restore(self):
+        """Test snapshots, deltas and restores between them."""
+        kenya, uganda = State(name="Kenya"), State(name="Uganda")
+        kenya.save()
+        uganda.save()
+        first = backup.backup(storage, self.directory)
+        self.assertEqual((first["kind"], first["objects"]), ("snapshot", 2))
+        after_first = datetime.now()
+
+        kenya.name = "Kenya 2"
+        kenya.save()
+        middle = datetime.now()
+        storage.delete(uganda)
+        State(name="Rwanda").save()
+        second = backup.backup(storage, self.directory)
+        self.assertEqual((second["kind"], second["objects"],
+                          second["deleted"]), ("delta", 2, 1))
+
+        self.assertEqual(sorted(value.get("name") for value in
+                                backup.state_at(after_first,
+                                                self.directory).values()),
+                         ["Kenya", "Uganda"])
+        # Kenya's rename is known, Uganda is only destroyed by the backup
+        self.assertEqual(sorted(value.get("name") for value in
+                                backup.state_at(middle,
+                                                self.directory).values()),
+                         ["Kenya 2", "Uganda"])
+
+        self.assertEqual(backup.restore(storage, after_first,
+                                        self.directory), 2)
+        self.assertEqual(self.names(), ["Kenya", "Uganda"])
+        storage.reload()
+        self.assertEqual(self.names(), ["Kenya", "Uganda"])
+
+        backup.restore(storage, second["until"], self.directory)
+        self.assertEqual(self.names(), ["Kenya 2", "Rwanda"])
+
+    def test_delta_reads_no_value(self):
+        """Test that deltas find destroyed objects without reading values,
+        whether the timeline knows of them or not."""
+        kenya, uganda = State(name="Kenya"), State(name="Uganda")
+        kenya.save()
+        uganda.save()
+        backup.backup(storage, self.directory)
+        keys = os.path.join(self.directory, backup.KEYS)
+        written = os.stat(keys).st_mtime_ns
+
+        # Tiny snapshots would otherwise be retaken on every backup
+        with patch.object(backup, "CHAIN_RATIO", 100), \
+                patch.object(storage, "items", side_effect=AssertionError):
+            storage.delete(uganda)
+            rwanda = State(name="Rwanda")
+            rwanda.save()
+            self.assertEqual(backup.backup(storage, self.directory)[
+                "deleted"], 1)
+
+            storage.delete(rwanda)
+            storage.save()
+            with patch.object(storage, "destroyed_since", return_value=None):
+                self.assertEqual(backup.backup(storage, self.directory)[
+                    "deleted"], 1)
+        self.assertEqual(os.stat(keys).st_mtime_ns, written)
+
+        self.assertEqual([value["name"] for value in backup.state_at(
+            datetime.now(), self.directory).values()], ["Kenya"])
+
+    def test_new_snapshot(self):
+        """Test that a snapshot is taken on request or for long chains."""
+        State(name="Kenya").save()
+        backup.backup(storage, self.directory)
+        self.assertEqual(backup.backup(storage, self.directory,
+                                       full=True)["kind"], "snapshot")
+        with patch.object(backup, "CHAIN_RATIO", 0):
+            backup.backup(storage, self.directory)
+            State(name="Uganda").save()
+            self.assertEqual(backup.backup(storage, self.directory)["kind"],
+                             "snapshot")
+        self.assertEqual([entry["kind"] for entry in
+                          backup.read_manifest(self.directory)],
+                         ["snapshot", "snapshot", "delta", "snapshot"])
+
+    def test_backup_after_restore(self):
+        """Test that objects brought back by a restore are backed up."""
+        state = State(name="v1")
+        state.save()
+        backup.backup(storage, self.directory)
+        first = datetime.now()
+
+        state.name = "v2"
+        state.save()
+        self.assertEqual(backup.backup(storage, self.directory)["kind"],
+                         "delta")
+        backup.restore(storage, first, self.directory)
+        self.assertEqual(self.names(), ["v1"])
+
+        entry = backup.backup(storage, self.directory)
+        self.assertEqual((entry["kind"], entry["objects"]), ("snapshot", 1))
+        self.assertEqual([value["name"] for value in backup.state_at(
+            datetime.now(), self.directory).values()], ["v1"])
+        self.assertEqual(backup.backup(storage, self.directory)["kind"],
+                         "delta")
+
+    def test_restore_before_first_snapshot(self):
+        """Test that times before the first snapshot are rejected."""
+        before = datetime.now()
+        backup.backup(storage, self.directory)
+        with self.assertRaises(ValueError):
+            backup.state_at(before, self.directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
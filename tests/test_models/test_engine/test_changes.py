@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the ChangeFeed index and its subscribers.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import json
+import os
+import socket
+import tempfile
+import unittest
+from unittest.mock import patch
+from models.engine.changes import (ChangeFeed, ChangelogWriter,
+                                   SocketPublisher, last_sequence)
+from models.engine.object_map import ObjectMap
+
+
+class TestChangeFeed(unittest.TestCase):
+    """Test cases for the ChangeFeed index."""
+
+    def setUp(self):
+        """Create a map listened to by a subscribed feed."""
+        self.feed = ChangeFeed()
+        self.objects = ObjectMap(listeners=[self.feed])
+        self.batches = []
+        self.feed.subscribe(self.batches.append)
+
+    def events(self):
+        """Return every event delivered so far."""
+        self.feed.flush()
+        return [event for batch in self.batches for event in batch]
+
+    def test_events(self):
+        """Test that creations, updates and destructions emit events."""
+        self.objects["Place.p1"] = {"id": "p1", "name": "Loft", "rooms": 2}
+        self.objects["Place.p1"] = {"id": "p1", "name": "Barn"}
+        self.objects["Place.p1"] = {"id": "p1", "name": "Barn"}
+        del self.objects["Place.p1"]
+        self.objects.clear()
+
+        events = self.events()
+        self.assertEqual([(event["seq"], event["op"]) for event in events],
+                         [(1, "new"), (2, "update"), (3, "destroy")])
+        self.assertEqual(events[0]["changes"],
+                         {"id": "p1", "name": "Loft", "rooms": 2})
+        self.assertEqual((events[1]["changes"], events[1]["removed"]),
+                         ({"name": "Barn"}, ["rooms"]))
+        self.assertEqual((events[2]["class"], events[2]["id"]),
+                         ("Place", "p1"))
+
+    def test_replace_is_not_a_change(self):
+        """Test that loading objects through replace emits no event."""
+        self.objects.replace({"City.c1": {"id": "c1"}}, skip=[self.feed])
+        self.assertEqual(self.events(), [])
+
+    def test_failing_subscriber(self):
+        """Test that a failing subscriber is dropped, not the others."""
+        def fail(batch):
+            raise RuntimeError("down")
+
+        self.feed.subscribe(fail)
+        with patch("sys.stderr"):
+            self.objects["City.c1"] = {"id": "c1"}
+            self.objects["City.c2"] = {"id": "c2"}
+            self.assertEqual(len(self.events()), 2)
+            self.objects["City.c3"] = {"id": "c3"}
+            self.assertEqual(len(self.events()), 3)
+
+    def test_dump_and_load(self):
+        """Test that the sequence number never goes back."""
+        self.objects["City.c1"] = {"id": "c1"}
+        restored = ChangeFeed()
+        restored.load(json.loads(json.dumps(self.feed.dump())))
+        self.assertEqual(restored.sequence, 1)
+
+
+class TestSubscribers(unittest.TestCase):
+    """Test cases for the changelog and socket subscribers."""
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        for name in os.listdir(self.tmp):
+            os.remove(os.path.join(self.tmp, name))
+        os.rmdir(self.tmp)
+
+    def test_changelog(self):
+        """Test that a changelog is appended to and resumed."""
+        path = os.path.join(self.tmp, "changes.jsonl")
+        self.assertEqual(last_sequence(path), 0)
+
+        writer = ChangelogWriter(path)
+        writer([{"seq": 1}, {"seq": 2}])
+        writer.close()
+        self.assertEqual(last_sequence(path), 2)
+
+        feed = ChangeFeed()
+        writer = feed.subscribe(ChangelogWriter(path))
+        ObjectMap(listeners=[feed])["City.c1"] = {"id": "c1"}
+        feed.flush()
+        writer.close()
+
+        with open(path) as infile:
+            self.assertEqual([json.loads(line)["seq"] for line in infile],
+                             [1, 2, 3])
+
+    def test_socket(self):
+        """Test that events are streamed to socket clients."""
+        path = os.path.join(self.tmp, "changes.sock")
+        publisher = SocketPublisher(path)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(path)
+        client.settimeout(0.05)
+        try:
+            # Publish until the client has been accepted
+            for _ in range(100):
+                publisher([{"seq": 0}])
+                try:
+                    if client.recv(4096):
+                        break
+                except socket.timeout:
+                    continue
+            client.settimeout(5)
+            publisher([{"seq": 7}])
+            data = b""
+            while b'"seq": 7' not in data:
+                data += client.recv(4096)
+        finally:
+            client.close()
+            publisher.close()
+
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the shared memory columns of places.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import glob
+import math
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.engine.columns import ColumnPublisher, ColumnReader, columns_of
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+try:
+    import numpy
+except ModuleNotFoundError:
+    numpy = None
+
+READER = """
+import sys
+from models.engine.columns import ColumnReader
+
+reader = ColumnReader(sys.argv[1])
+print(reader.generation, sum(reader.column("price_by_night")))
+"""
+
+
+class TestColumns(unittest.TestCase):
+    """Test cases for ColumnPublisher and ColumnReader."""
+
+    def setUp(self):
+        """Create a few places and a publisher."""
+        self.file_path = FileStorage._FileStorage__file_path
+        self.segment = f"hbnb-test-{os.getpid()}"
+        self.places = [Place(name=f"Place {i}", price_by_night=100 + i,
+                             latitude=1.5 * i) for i in range(3)]
+        for place in self.places:
+            place.save()
+        self.publisher = ColumnPublisher(self.segment)
+        self.readers = []
+
+    def tearDown(self):
+        """Release the shared memory and clean up."""
+        for reader in self.readers:
+            reader.close()
+        self.publisher.close()
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def reader(self):
+        """Attach a reader closed on tearDown."""
+        reader = ColumnReader(self.segment)
+        self.readers.append(reader)
+        return reader
+
+    def test_columns_of(self):
+        """Test that the numeric fields of Place are the columns."""
+        self.assertEqual(columns_of(Place), {
+            "number_rooms": "q", "number_bathrooms": "q", "max_guest": "q",
+            "price_by_night": "q", "latitude": "d", "longitude": "d"})
+
+    def test_publish(self):
+        """Test that a reader sees every place's numbers and id."""
+        self.assertTrue(self.publisher.publish())
+        reader = self.reader()
+        self.assertEqual(reader.generation, 1)
+        self.assertEqual(reader.count, 3)
+        self.assertEqual(reader.fields(), list(columns_of(Place)))
+        ids = reader.ids()
+        self.assertEqual(sorted(ids), sorted(p.id for p in self.places))
+        prices = reader.column("price_by_night")
+        latitudes = reader.column("latitude")
+        for place in self.places:
+            position = reader.position(place.id)
+            self.assertEqual(ids[position], place.id)
+            self.assertEqual(prices[position], place.price_by_night)
+            self.assertEqual(latitudes[position], place.latitude)
+        self.assertIsNone(reader.position("nope"))
+        with self.assertRaises(KeyError):
+            reader.column("name")
+        del prices, latitudes
+
+    def test_missing_numbers(self):
+        """Test that non-numbers are 0 in int columns, NaN in floats."""
+        place = self.places[0]
+        place.max_guest = "many"
+        place.longitude = None
+        place.number_rooms = "3"
+        place.price_by_night = 2 ** 70
+        place.save()
+        self.publisher.publish()
+        reader = self.reader()
+        position = reader.position(place.id)
+        self.assertEqual(reader.column("max_guest")[position], 0)
+        self.assertTrue(math.isnan(reader.column("longitude")[position]))
+        self.assertEqual(reader.column("number_rooms")[position], 3)
+        self.assertEqual(reader.column("price_by_night")[position], 0)
+
+    def test_publish_if_changed(self):
+        """Test that a generation is only published when places change."""
+        self.publisher.publish()
+        self.assertFalse(self.publisher.publish())
+        Place(name="New").save()
+        self.assertTrue(self.publisher.publish())
+        self.assertTrue(self.publisher.publish(force=True))
+        self.assertEqual(self.publisher.generation, 3)
+
+    def test_generation_swap(self):
+        """Test that readers keep their generation until they refresh."""
+        self.publisher.publish()
+        reader = self.reader()
+        self.places[0].price_by_night = 1000
+        self.places[0].save()
+        self.publisher.publish()
+
+        # The first generation is unlinked, but still readable
+        self.assertTrue(reader.stale)
+        position = reader.position(self.places[0].id)
+        self.assertEqual(reader.column("price_by_night")[position], 100)
+
+        self.assertTrue(reader.refresh())
+        self.assertFalse(reader.stale)
+        self.assertFalse(reader.refresh())
+        self.assertEqual(reader.generation, 2)
+        position = reader.position(self.places[0].id)
+        self.assertEqual(reader.column("price_by_night")[position], 1000)
+
+    def test_nothing_published(self):
+        """Test readers of a segment with no generation yet, or none."""
+        reader = self.reader()
+        self.assertEqual((reader.generation, reader.count), (0, 0))
+        self.assertEqual(reader.fields(), [])
+        with self.assertRaises(FileNotFoundError):
+            ColumnReader(f"{self.segment}-missing")
+
+    def test_close_with_views(self):
+        """Test that a reader is not closed under a live view."""
+        self.publisher.publish()
+        reader = ColumnReader(self.segment)
+        prices = reader.column("price_by_night")
+        with self.assertRaises(BufferError):
+            reader.close()
+        del prices
+        reader.close()
+
+    def test_memoryview_without_numpy(self):
+        """Test that columns are typed memoryviews without NumPy."""
+        self.publisher.publish()
+        reader = self.reader()
+        with patch.dict(sys.modules, {"numpy": None}):
+            prices = reader.column("price_by_night")
+        self.assertIsInstance(prices, memoryview)
+        self.assertTrue(prices.readonly)
+        self.assertEqual(sorted(prices), [100, 101, 102])
+        prices.release()
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy(self):
+        """Test that columns are read-only NumPy arrays over shared memory."""
+        self.publisher.publish()
+        reader = self.reader()
+        prices = reader.column("price_by_night")
+        self.assertIsInstance(prices, numpy.ndarray)
+        self.assertEqual(prices.dtype, numpy.int64)
+        self.assertFalse(prices.flags.writeable)
+        self.assertFalse(prices.flags.owndata)
+        self.assertEqual(prices.sum(), 303)
+        del prices
+
+    def test_other_process(self):
+        """Test that another process reads the columns."""
+        self.publisher.publish()
+        result = subprocess.run(
+            [sys.executable, "-c", READER, self.segment],
+            capture_output=True, text=True, check=True,
+            env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)))
+        self.assertEqual(result.stdout.split(), ["1", "303"])
+        self.assertEqual(result.stderr, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,11 +8,21 @@ __license__ = "MIT"
 __date__ = "2025-01-03"
 __version__ = "1.1"
 
+import glob
 import unittest
 import os
 import json
+import subprocess
+import sys
+import time
+from unittest.mock import patch
 from models.engine.file_storage import FileStorage
 from models.base_model import BaseModel
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
 
 
 class TestFileStorage(unittest.TestCase):
@@ -34,6 +44,10 @@ class TestFileStorage(unittest.TestCase):
 
         self.storage._FileStorage__objects.clear()
 
+        # Sidecar files of the persistent indexes
+        for path in glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
     def test_new(self):
         """Test adding a new object to storage."""
         obj = BaseModel()
@@ -109,6 +123,283 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(
             self.storage._FileStorage__objects["BaseModel.123"], obj.to_dict())
 
+    def test_save_matches_json_dump(self):
+        """Test that save writes exactly what json.dump would."""
+        for number in range(3):
+            obj = BaseModel()
+            obj.number = number
+            obj.save()
+        FileStorage._FileStorage__objects["BaseModel.raw"] = {"id": "raw"}
+        self.storage.save()
+
+        with open(self.file_path, "r") as file:
+            text = file.read()
+
+        self.assertEqual(
+            text, json.dumps(FileStorage._FileStorage__objects))
+
+    def test_save_ignores_stale_forms(self):
+        """Test that a replaced stored dict is re-encoded on save."""
+        obj = BaseModel()
+        key = f"BaseModel.{obj.id}"
+        obj.to_json()
+        FileStorage._FileStorage__objects[key] = {"id": obj.id, "x": 1}
+        self.storage.save()
+
+        with open(self.file_path, "r") as file:
+            self.assertEqual(json.load(file)[key], {"id": obj.id, "x": 1})
+
+    def test_all_by_class(self):
+        """Test that all(cls) only returns objects of that class."""
+        user = User()
+        base = BaseModel()
+
+        self.assertEqual(list(self.storage.all(User)), [f"User.{user.id}"])
+        self.assertEqual(list(self.storage.all("BaseModel")),
+                         [f"BaseModel.{base.id}"])
+        self.assertEqual(self.storage.all("Place"), {})
+
+    def test_get_and_count(self):
+        """Test get and count by class."""
+        user = User()
+        BaseModel()
+
+        self.assertEqual(self.storage.get(User, user.id).id, user.id)
+        self.assertIsInstance(self.storage.get("User", user.id), User)
+        self.assertIsNone(self.storage.get(User, "missing"))
+        self.assertEqual(self.storage.count(), 2)
+        self.assertEqual(self.storage.count(User), 1)
+        self.assertEqual(self.storage.count("Place"), 0)
+
+    def test_refresh_skips_unchanged_file(self):
+        """Test that refresh only re-reads a file that changed on disk."""
+        obj = BaseModel()
+        obj.save()
+        objects = FileStorage._FileStorage__objects
+
+        self.storage.refresh()
+        self.assertIs(FileStorage._FileStorage__objects, objects)
+
+        with open(self.file_path, "w") as file:
+            json.dump({"BaseModel.x": {"id": "x",
+                                       "__class__": "BaseModel"}}, file)
+        self.storage.refresh()
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["BaseModel.x"])
+
+    def test_listing(self):
+        """Test that listings follow Place and City saves and destroys."""
+        state = State()
+        state.save()
+        city = City(state_id=state.id)
+        city.save()
+        places = [Place(city_id=city.id, name=name) for name in "cab"]
+        for place in places:
+            place.save()
+
+        page, pages = self.storage.listing(City, city.id, 0)
+        self.assertEqual([place.name for place in page], ["a", "b", "c"])
+        self.assertEqual(pages, 1)
+
+        self.storage.delete(places[1])
+        self.storage.save()
+        page, _ = self.storage.listing("State", state.id, 0)
+        self.assertEqual([place.id for place in page],
+                         [places[2].id, places[0].id])
+
+    def test_listing_restored_from_sidecar(self):
+        """Test that reload restores listings saved with the snapshot."""
+        city = City(state_id="s")
+        city.save()
+        place = Place(city_id=city.id, name="a")
+        place.save()
+        self.storage.checkpoint()
+        listings = FileStorage.index("listings")
+
+        with patch.object(listings, "on_set") as on_set:
+            self.storage.reload()
+        on_set.assert_not_called()
+        self.assertEqual(listings.page("City", city.id), ([place.id], 1))
+
+        with open(self.file_path, "w") as file:
+            json.dump({}, file)
+        self.storage.reload()
+        self.assertEqual(listings.page("City", city.id), ([], 0))
+
+    def test_sidecars_written_lazily(self):
+        """Test that save leaves the sidecars to checkpoint and exit."""
+        state = State(name="Kenya")
+        state.save()
+        sidecar = self.file_path + ".listings"
+        self.assertFalse(os.path.exists(sidecar))
+
+        self.storage.checkpoint()
+        with open(sidecar) as file:
+            written = json.load(file)["snapshot"]
+        self.assertEqual(tuple(written), self.storage._FileStorage__stat())
+
+        # Not at exit while changes are not saved
+        City(name="Kampala").save()
+        self.storage.delete(state)
+        self.storage._FileStorage__finish()
+        with open(sidecar) as file:
+            self.assertEqual(json.load(file)["snapshot"], written)
+
+        self.storage.save()
+        self.storage._FileStorage__finish()
+        with open(sidecar) as file:
+            self.assertEqual(tuple(json.load(file)["snapshot"]),
+                             self.storage._FileStorage__stat())
+
+    def test_reviews_of(self):
+        """Test review aggregates of places and users, across reloads."""
+        reviews = [Review(place_id="p", user_id=user_id, text=str(number))
+                   for number, user_id in enumerate("aab")]
+        for review in reviews:
+            review.save()
+        Review(place_id="q", user_id="a").save()
+
+        count, latest = self.storage.reviews_of("p", limit=2)
+        self.assertEqual(count, 3)
+        self.assertEqual([review.text for review in latest], ["2", "1"])
+        self.assertEqual(self.storage.user_review_count("a"), 3)
+
+        self.storage.delete(reviews[2])
+        self.storage.checkpoint()
+        stats = FileStorage.index("reviews")
+        with patch.object(stats, "on_set") as on_set:
+            self.storage.reload()
+        on_set.assert_not_called()
+
+        count, latest = self.storage.reviews_of("p")
+        self.assertEqual(count, 2)
+        self.assertEqual([review.text for review in latest], ["1", "0"])
+        self.assertEqual(self.storage.user_review_count("b"), 0)
+
+    def test_search(self):
+        """Test ranked full-text search, across reloads."""
+        loft = Place(name="Loft", description="Sunny loft near the river")
+        barn = Place(name="Barn", description="Old barn by the river")
+        loft.save()
+        barn.save()
+
+        self.assertEqual([key for key, _ in
+                          self.storage.search(Place, "sunny river")],
+                         [f"Place.{loft.id}", f"Place.{barn.id}"])
+
+        self.storage.delete(loft)
+        self.storage.checkpoint()
+        search = FileStorage.index("search")
+        with patch.object(search, "on_set") as on_set:
+            self.storage.reload()
+        on_set.assert_not_called()
+
+        self.assertEqual([key for key, _ in
+                          self.storage.search("Place", "sunny river")],
+                         [f"Place.{barn.id}"])
+        with self.assertRaises(ValueError):
+            self.storage.search("User", "river")
+
+    def test_search_requires_surrogates(self):
+        """Test that search is rebuilt without the numbers it was saved
+        with."""
+        loft = Place(name="Loft", description="Sunny loft")
+        loft.save()
+        self.storage.checkpoint()
+        os.remove(self.file_path + ".surrogates")
+
+        search = FileStorage.index("search")
+        with patch.object(search, "on_set") as on_set:
+            self.storage.reload()
+        on_set.assert_called_once()
+
+        self.storage.reload()
+        self.assertEqual([key for key, _ in
+                          self.storage.search(Place, "sunny")],
+                         [f"Place.{loft.id}"])
+
+    def test_changed_since(self):
+        """Test that objects updated after a time are read in order."""
+        old = State(name="Old")
+        old.save()
+        start = old.updated_at
+        city = City(name="New")
+        city.save()
+        state = State(name="Newer")
+        state.save()
+
+        self.assertEqual([obj.id for obj in self.storage.changed_since(
+            start)], [city.id, state.id])
+        self.assertEqual([obj.id for obj in self.storage.changed_since(
+            start.isoformat(), State)], [state.id])
+
+        old.save()
+        self.storage.delete(city)
+        self.assertEqual([obj.id for obj in self.storage.changed_since(
+            start)], [state.id, old.id])
+        with self.assertRaises(ValueError):
+            list(self.storage.changed_since("yesterday"))
+
+    def test_bgsave(self):
+        """Test that a forked child writes the file, changes included."""
+        kenya = State(name="Kenya")
+        self.storage.new(kenya)
+        self.assertTrue(self.storage.bgsave())
+        # Saved while the child may still run: kept for the next save
+        State(name="Uganda").save()
+
+        deadline = time.monotonic() + 10
+        while self.storage.info()["bgsave_in_progress"]:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+        info = self.storage.info()
+        self.assertEqual(info["last_bgsave_status"], "ok")
+        self.assertGreaterEqual(info["last_bgsave_duration"], 0)
+        self.assertFalse(info["pending_writes"])
+        with open(self.file_path) as infile:
+            names = sorted(value.get("name")
+                           for value in json.load(infile).values())
+        self.assertEqual(names, ["Kenya", "Uganda"])
+
+        self.storage.reload()
+        self.assertIsNotNone(self.storage.get(State, kenya.id))
+
+    def test_subscribe(self):
+        """Test that saves and destroys are published, reloads are not."""
+        batches = []
+        self.storage.subscribe(batches.append)
+        self.addCleanup(self.storage.unsubscribe, batches.append)
+
+        state = State(name="Kenya")
+        state.save()
+        state.name = "Uganda"
+        state.save()
+        self.storage.delete(state)
+        self.storage.save()
+        self.storage.reload()
+        FileStorage.index("changes").flush()
+
+        events = [event for batch in batches for event in batch]
+        # Instantiating stores the object, saving stamps it
+        self.assertEqual([event["op"] for event in events],
+                         ["new", "update", "update", "destroy"])
+        self.assertEqual(set(events[2]["changes"]), {"name", "updated_at"})
+        self.assertEqual(events[3]["seq"], events[0]["seq"] + 3)
+
+    def test_import_defers_indexes(self):
+        """Test that importing models leaves the index modules unloaded."""
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__)))))
+        loaded = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, models; print(' '.join(sys.modules))"],
+            cwd=root, check=True, capture_output=True, text=True
+        ).stdout.split()
+        for name in ("models.engine.search", "models.engine.changes",
+                     "models.engine.timeline", "pkgutil"):
+            self.assertNotIn(name, loaded)
+
 
 if __name__ == "__main__":
     unittest.main()
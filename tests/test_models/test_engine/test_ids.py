@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the IdIndex index and abbreviated ids in storage.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import glob
+import os
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.engine import ids as ids_module
+from models.engine.file_storage import FileStorage
+from models.engine.ids import IdIndex
+from models.engine.object_map import ObjectMap
+from models.place import Place
+
+IDS = ["3fa8c1", "3fa9aa", "3fb000", "a00000", "a00001", "b"]
+
+
+class TestIdIndex(unittest.TestCase):
+    """Test cases for the IdIndex index."""
+
+    def setUp(self):
+        """Create a map of places listened to by IdIndex."""
+        self.index = IdIndex()
+        self.objects = ObjectMap(listeners=[self.index])
+        self.objects.update({f"Place.{obj_id}": {"id": obj_id}
+                             for obj_id in reversed(IDS)})
+        self.objects["City.c1"] = {"id": "c1"}
+
+    def test_matching(self):
+        """Test that ids are found by prefix, sorted."""
+        self.assertEqual(self.index.matching("Place", "3fa"),
+                         ["3fa8c1", "3fa9aa"])
+        self.assertEqual(self.index.matching("Place", "3f", limit=2),
+                         ["3fa8c1", "3fa9aa"])
+        self.assertEqual(self.index.matching("Place"), IDS)
+        self.assertEqual(self.index.matching("Place", "c"), [])
+        self.assertEqual(self.index.matching("City", "c"), ["c1"])
+        self.assertEqual(self.index.matching("Fake", "c"), [])
+        self.assertEqual(self.index.count("Place", "a0"), 2)
+        self.assertEqual(self.index.count("Place"), 6)
+        self.assertEqual(self.index.classes(), ["City", "Place"])
+
+    def test_last(self):
+        """Test that the greatest id with a prefix is found."""
+        self.assertEqual(self.index.last("Place", "3f"), "3fb000")
+        self.assertEqual(self.index.last("Place"), "b")
+        self.assertIsNone(self.index.last("Place", "c"))
+        self.objects["Place.3fc"] = {"id": "3fc"}
+        self.assertEqual(self.index.last("Place", "3f"), "3fc")
+
+    def test_pending(self):
+        """Test that ids created after a search are found until sorted."""
+        self.index.matching("Place")
+        with patch.object(ids_module, "PENDING_MIN", 2):
+            self.objects["Place.3fa0"] = {"id": "3fa0"}
+            self.objects["Place.3fa81"] = {"id": "3fa81"}
+            self.assertEqual(self.index.matching("Place", "3fa8"),
+                             ["3fa81", "3fa8c1"])
+            self.assertEqual(self.index.count("Place", "3fa"), 4)
+            self.objects["Place.b0"] = {"id": "b0"}
+            self.assertEqual(self.index.matching("Place", "b"), ["b", "b0"])
+            del self.objects["Place.3fa0"]
+        self.assertEqual(self.index.matching("Place", "3fa", limit=1),
+                         ["3fa81"])
+
+    def test_sorted_on_load(self):
+        """Test that the ids read on load are sorted before any search."""
+        self.objects.replace({f"Place.{obj_id}": {"id": obj_id}
+                              for obj_id in reversed(IDS)})
+        self.assertEqual(self.index._IdIndex__sorted, {"Place": IDS})
+        self.assertFalse(any(self.index._IdIndex__pending.values()))
+
+    def test_update_and_delete(self):
+        """Test that updates change nothing and deletions are forgotten."""
+        self.objects["Place.b"] = {"id": "b", "name": "Loft"}
+        self.assertEqual(self.index.count("Place", "b"), 1)
+
+        del self.objects["Place.3fa8c1"]
+        self.objects.pop("City.c1")
+        self.assertEqual(self.index.matching("Place", "3fa"), ["3fa9aa"])
+        self.assertEqual(self.index.classes(), ["Place"])
+
+        self.objects.clear()
+        self.assertEqual(self.index.classes(), [])
+
+    def test_minimal_unique_prefix(self):
+        """Test the length telling every id of a class apart."""
+        self.assertEqual(self.index.minimal_unique_prefix("Place"), 6)
+        del self.objects["Place.a00000"]
+        self.assertEqual(self.index.minimal_unique_prefix("Place"), 4)
+        self.assertEqual(self.index.minimal_unique_prefix("City"), 1)
+        self.assertEqual(self.index.minimal_unique_prefix("Fake"), 0)
+
+
+class TestResolve(unittest.TestCase):
+    """Test cases for abbreviated ids in storage."""
+
+    def setUp(self):
+        """Create places with known ids."""
+        self.file_path = FileStorage._FileStorage__file_path
+        for obj_id in IDS:
+            Place(id=obj_id)
+
+    def tearDown(self):
+        """Clean up."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_resolve(self):
+        """Test that unique prefixes and full ids resolve."""
+        self.assertEqual(storage.resolve(Place, "3fa8"), "3fa8c1")
+        self.assertEqual(storage.resolve("Place", "b"), "b")
+        self.assertEqual(storage.resolve(Place, "a00001"), "a00001")
+
+        with self.assertRaisesRegex(ValueError, "2 instances match"):
+            storage.resolve(Place, "a000")
+        with self.assertRaises(KeyError):
+            storage.resolve(Place, "c000")
+        for prefix in ("", "3", "3fb"):
+            with self.assertRaisesRegex(ValueError, "too short"):
+                storage.resolve(Place, prefix)
+        with self.assertRaises(KeyError):
+            storage.resolve("City", "3fa8")
+
+    def test_exact_id_wins(self):
+        """Test that an id is not ambiguous with the ids it starts."""
+        Place(id="b0")
+        self.assertEqual(storage.resolve(Place, "b"), "b")
+        self.assertEqual(storage.resolve(Place, "b0"), "b0")
+
+    def test_ids(self):
+        """Test that ids are listed by prefix, spanning every match."""
+        self.assertEqual(storage.ids(Place, "3f"),
+                         ["3fa8c1", "3fa9aa", "3fb000"])
+        self.assertEqual(storage.ids("Place", "3f", limit=2),
+                         ["3fa8c1", "3fb000"])
+        self.assertEqual(storage.ids(Place, "3fa9", limit=2), ["3fa9aa"])
+        self.assertEqual(storage.ids(Place, limit=3), ["3fa8c1", "3fa9aa",
+                                                       "b"])
+        self.assertEqual(storage.ids("City"), [])
+
+    def test_minimal_unique_prefix(self):
+        """Test the report over every class, or one."""
+        self.assertEqual(storage.minimal_unique_prefix(), {"Place": 6})
+        self.assertEqual(storage.minimal_unique_prefix(Place), {"Place": 6})
+        self.assertEqual(storage.minimal_unique_prefix("City"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the storage key and id helpers.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import unittest
+import uuid
+from models.engine import keys
+from models.base_model import BaseModel
+
+
+class TestKeys(unittest.TestCase):
+    """Test cases for key building and splitting."""
+
+    def test_make_key(self):
+        """Test that make_key builds the class-prefixed key."""
+        obj_id = str(uuid.uuid4())
+        self.assertEqual(keys.make_key("Place", obj_id), f"Place.{obj_id}")
+
+    def test_key_of(self):
+        """Test that key_of matches the class-prefixed key."""
+        obj = BaseModel()
+        self.assertEqual(keys.key_of(obj), f"BaseModel.{obj.id}")
+
+    def test_split_key(self):
+        """Test that split_key reverses make_key."""
+        self.assertEqual(keys.split_key("City.1234"), ("City", "1234"))
+        self.assertEqual(keys.split_key("City"), ("City", ""))
+
+
+class TestNewId(unittest.TestCase):
+    """Test cases for the batched UUID4 generator."""
+
+    def test_ids_are_uuid4(self):
+        """Test that generated ids are canonical version 4 UUIDs."""
+        for obj_id in keys.uuid4_batch(500):
+            parsed = uuid.UUID(obj_id)
+            self.assertEqual(str(parsed), obj_id)
+            self.assertEqual(parsed.version, 4)
+            self.assertEqual(parsed.variant, uuid.RFC_4122)
+
+    def test_new_id_unique_across_blocks(self):
+        """Test that ids stay unique across several buffer refills."""
+        ids = {keys.new_id() for _ in range(keys.BLOCK_SIZE * 3 + 7)}
+        self.assertEqual(len(ids), keys.BLOCK_SIZE * 3 + 7)
+
+    def test_batch_size(self):
+        """Test that uuid4_batch returns the requested number of ids."""
+        self.assertEqual(len(keys.uuid4_batch(3)), 3)
+        self.assertEqual(keys.uuid4_batch(0), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
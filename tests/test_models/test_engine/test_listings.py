@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the Listings index.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import json
+import unittest
+from models.engine.listings import Listings
+from models.engine.object_map import ObjectMap
+
+
+def city(city_id, state_id):
+    """Return the stored dictionary of a City."""
+    return {"__class__": "City", "id": city_id, "state_id": state_id}
+
+
+def place(place_id, city_id, name):
+    """Return the stored dictionary of a Place."""
+    return {"__class__": "Place", "id": place_id, "city_id": city_id,
+            "name": name}
+
+
+class TestListings(unittest.TestCase):
+    """Test cases for the Listings index."""
+
+    def setUp(self):
+        """Create a map of two cities of one state listened to by Listings."""
+        self.listings = Listings(page_size=2)
+        self.objects = ObjectMap(listeners=[self.listings])
+        self.objects.update({
+            "City.c1": city("c1", "s1"),
+            "City.c2": city("c2", "s1"),
+            "Place.p1": place("p1", "c1", "Cabin"),
+            "Place.p2": place("p2", "c1", "Attic"),
+            "Place.p3": place("p3", "c1", "Barn"),
+            "Place.p4": place("p4", "c2", "Loft"),
+        })
+
+    def test_pages_sorted_by_name(self):
+        """Test that listings are sorted by name and split into pages."""
+        page = self.listings.page
+        self.assertEqual(page("City", "c1", 0), (["p2", "p3"], 2))
+        self.assertEqual(page("City", "c1", 1), (["p1"], 2))
+        self.assertEqual(page("City", "c1", 2), ([], 2))
+        self.assertEqual(page("State", "s1", 1), (["p1", "p4"], 2))
+        self.assertEqual(page("City", "nope", 0), ([], 0))
+
+    def test_place_renamed_and_moved(self):
+        """Test that updating a place moves it within and across listings."""
+        self.objects["Place.p1"] = place("p1", "c2", "Aardvark")
+
+        page = self.listings.page
+        self.assertEqual(page("City", "c1", 0), (["p2", "p3"], 1))
+        self.assertEqual(page("City", "c2", 0), (["p1", "p4"], 1))
+        self.assertEqual(page("State", "s1", 0)[0], ["p1", "p2"])
+
+    def test_place_before_its_city(self):
+        """Test that a city stored after its places joins its state."""
+        self.objects["Place.p5"] = place("p5", "c3", "Dome")
+        self.assertEqual(self.listings.page("State", "s2", 0), ([], 0))
+
+        self.objects["City.c3"] = city("c3", "s2")
+        self.assertEqual(self.listings.page("State", "s2", 0), (["p5"], 1))
+
+    def test_city_moved_and_deleted(self):
+        """Test that city changes carry their places between states."""
+        self.objects["City.c2"] = city("c2", "s2")
+        self.assertEqual(self.listings.page("State", "s2", 0), (["p4"], 1))
+        self.assertEqual(self.listings.page("State", "s1", 1)[1], 2)
+
+        del self.objects["City.c2"]
+        self.assertEqual(self.listings.page("State", "s2", 0), ([], 0))
+
+    def test_delete_and_clear(self):
+        """Test that deleted places leave their listings."""
+        self.objects.pop("Place.p2")
+        self.assertEqual(self.listings.page("City", "c1", 0),
+                         (["p3", "p1"], 1))
+
+        self.objects.clear()
+        self.assertEqual(self.listings.page("State", "s1", 0), ([], 0))
+
+    def test_dump_and_load(self):
+        """Test that the state survives a JSON round trip."""
+        restored = Listings(page_size=2)
+        restored.load(json.loads(json.dumps(self.listings.dump())))
+        objects = ObjectMap(listeners=[restored])
+        objects.replace(self.objects, skip=[restored])
+        self.assertEqual(restored.page("State", "s1", 0), (["p2", "p3"], 2))
+
+        objects["Place.p2"] = place("p2", "c2", "Attic")
+        self.assertEqual(restored.page("City", "c1", 0), (["p3", "p1"], 1))
+        self.assertEqual(restored.page("State", "s1", 0)[0], ["p2", "p3"])
+
+    def test_unknown_class(self):
+        """Test that only City and State have listings."""
+        with self.assertRaises(ValueError):
+            self.listings.page("Place", "p1", 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
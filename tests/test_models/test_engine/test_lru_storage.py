@@ -0,0 +1,273 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the LRUFileStorage class.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from models.engine.lru_storage import LRUFileStorage, scan
+from models.user import User
+from models.place import Place
+
+
+class TestScan(unittest.TestCase):
+    """Test cases for the streaming snapshot scanner."""
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.tmp)
+
+    def test_offsets_point_at_values(self):
+        """Test that every location slices out its exact JSON value."""
+        data = {f"Place.{i}": {"id": str(i), "name": "café " * i,
+                               "n": i * 10}
+                for i in range(50)}
+        with open(self.path, "w") as file:
+            json.dump(data, file, ensure_ascii=False, indent=1)
+
+        with open(self.path, "rb") as file:
+            raw = file.read()
+
+        entries = list(scan(self.path, chunk_size=7))
+        self.assertEqual([key for key, *_ in entries], list(data))
+        for key, value, offset, length in entries:
+            self.assertEqual(value, data[key])
+            self.assertEqual(json.loads(raw[offset:offset + length]),
+                             data[key])
+
+    def test_empty_and_invalid(self):
+        """Test an empty object and a non-object file."""
+        with open(self.path, "w") as file:
+            file.write(" {} ")
+        self.assertEqual(list(scan(self.path)), [])
+
+        with open(self.path, "w") as file:
+            file.write("[]")
+        with self.assertRaises(ValueError):
+            list(scan(self.path))
+
+
+class TestLRUFileStorage(unittest.TestCase):
+    """Test cases for the LRU storage mode."""
+
+    def setUp(self):
+        """Seed a snapshot and point BaseModel at an LRU storage."""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "file.json")
+        self.storage = LRUFileStorage(self.path, max_objects=3)
+        self.patcher = patch("models.base_model.storage", self.storage)
+        self.patcher.start()
+
+        self.places = [Place(name=f"place {i}") for i in range(5)]
+        self.storage.compact()
+
+    def tearDown(self):
+        """Restore the default storage and remove the temporary files."""
+        self.patcher.stop()
+        shutil.rmtree(self.tmp)
+
+    def reopen(self):
+        """Return a fresh engine over the same files."""
+        storage = LRUFileStorage(self.path, max_objects=3)
+        self.patcher.stop()
+        self.patcher = patch("models.base_model.storage", storage)
+        self.patcher.start()
+        return storage
+
+    def test_snapshot_is_plain_json(self):
+        """Test that a compacted snapshot is a regular storage file."""
+        with open(self.path) as file:
+            data = json.load(file)
+
+        self.assertEqual(len(data), 5)
+        self.assertEqual(data[f"Place.{self.places[0].id}"]["name"],
+                         "place 0")
+
+    def test_cache_is_bounded(self):
+        """Test that the cache never holds more than its budget."""
+        storage = self.reopen()
+
+        for place in self.places:
+            self.assertEqual(storage.get(Place, place.id).name, place.name)
+
+        info = storage.cache_info()
+        self.assertEqual(info["objects"], 3)
+        self.assertEqual(info["keys"], 5)
+        self.assertEqual(info["misses"], 5)
+        self.assertEqual(info["evictions"], 2)
+
+        storage.get(Place, self.places[-1].id)
+        self.assertEqual(storage.cache_info()["hits"], 1)
+
+    def test_byte_budget(self):
+        """Test that the byte budget evicts as well."""
+        storage = self.reopen()
+        storage.max_objects = None
+        storage.max_bytes = len(self.places[0].to_json()) * 2 + 10
+
+        for place in self.places:
+            storage.get(Place, place.id)
+
+        self.assertEqual(storage.cache_info()["objects"], 2)
+
+    def test_evicted_dirty_objects_are_written_back(self):
+        """Test that evicted changes survive and are readable again."""
+        storage = self.reopen()
+        place = storage.get(Place, self.places[0].id)
+        place.name = "renamed"
+        storage.new(place)
+
+        for other in self.places[1:]:
+            storage.get(Place, other.id)
+
+        self.assertEqual(storage.cache_info()["writebacks"], 1)
+        self.assertEqual(storage.get(Place, place.id).name, "renamed")
+
+    def test_save_survives_restart(self):
+        """Test that saved changes and removals are reloaded from disk."""
+        storage = self.reopen()
+        place = storage.get(Place, self.places[0].id)
+        place.name = "saved"
+        place.save()
+        storage.delete(storage.get(Place, self.places[1].id))
+        user = User(email="a@b.c")
+        storage.save()
+
+        storage = self.reopen()
+        self.assertEqual(storage.get(Place, place.id).name, "saved")
+        self.assertIsNone(storage.get(Place, self.places[1].id))
+        self.assertEqual(storage.get(User, user.id).email, "a@b.c")
+        self.assertEqual(storage.count(), 5)
+        self.assertEqual(storage.count(Place), 4)
+
+    def test_refused_change_not_flushed(self):
+        """Test that a refused change is not written by a later save."""
+        User(email="bob@mail.com").save()
+        eve = User()
+        eve.email = "BOB@mail.com"
+        with self.assertRaises(ValueError):
+            eve.save()
+        self.storage.save()
+
+        storage = self.reopen()
+        self.assertEqual(sorted(user.email for user in
+                                storage.all(User).values()),
+                         ["", "bob@mail.com"])
+
+        eve = storage.get(User, eve.id)
+        eve.email = "bob@MAIL.com"
+        with self.assertRaises(ValueError):
+            eve.save()
+        self.assertEqual(storage.get(User, eve.id).email, "")
+        eve.email = "eve@mail.com"
+        eve.save()
+        self.assertEqual(self.reopen().get(User, eve.id).email,
+                         "eve@mail.com")
+
+    def test_checkpoint(self):
+        """Test that checkpoint compacts, and writes the sidecars with it."""
+        for place in self.places[:3]:
+            place.name = "saved"
+            place.save()
+        self.storage.checkpoint()
+
+        with open(self.path) as file:
+            self.assertEqual(len(json.load(file)), 5)
+        self.assertEqual(os.path.getsize(self.path + ".spill"), 0)
+        with open(self.path + ".surrogates") as file:
+            st = os.stat(self.path)
+            self.assertEqual(json.load(file)["snapshot"],
+                             [st.st_ino, st.st_size, st.st_mtime_ns])
+
+        storage = self.reopen()
+        self.assertEqual(storage.count(Place), 5)
+        self.assertEqual(storage.get(Place, self.places[0].id).name, "saved")
+
+    def test_resolve(self):
+        """Test that ids and their prefixes resolve in this mode."""
+        obj_id = self.places[0].id
+        self.assertEqual(self.storage.resolve(Place, obj_id), obj_id)
+        self.assertEqual(self.storage.resolve(Place, obj_id[:12]), obj_id)
+        with self.assertRaises(KeyError):
+            self.storage.resolve(User, obj_id)
+
+        # Short ids, and ids other ids start with, are ids all the same
+        Place(id="b").save()
+        Place(id="b0").save()
+        self.assertEqual(self.storage.resolve(Place, "b"), "b")
+        self.assertEqual(self.storage.resolve(Place, "b0"), "b0")
+
+    def test_bgsave_and_info(self):
+        """Test that bgsave keeps every object and info counts them."""
+        self.places[0].name = "renamed"
+        self.places[0].save()
+        self.assertTrue(self.storage.bgsave())
+        self.assertEqual(self.storage.info()["objects"], 5)
+
+        restarted = LRUFileStorage(self.path)
+        self.assertEqual(restarted.count(Place), 5)
+        self.assertEqual(restarted.get(Place, self.places[0].id).name,
+                         "renamed")
+
+    def test_unique_email(self):
+        """Test that emails are kept unique, and looked up by get_by."""
+        bob = User(email="bob@mail.com")
+        bob.save()
+        eve = User(email="eve@mail.com")
+        eve.save()
+        eve.email = "BOB@mail.com"
+        with self.assertRaisesRegex(ValueError, f"User.{bob.id}"):
+            eve.save()
+        self.storage.save()
+        storage = self.reopen()
+        self.assertEqual(storage.get(User, eve.id).email, "eve@mail.com")
+
+        for _ in range(2):
+            self.assertEqual(storage.get_by(User, email=" Bob@mail.com").id,
+                             bob.id)
+            storage.compact()
+            storage.reload()
+        self.assertIsNone(storage.get_by(User, email="ann@mail.com"))
+
+    def test_compact_folds_spill(self):
+        """Test that compaction empties the spill file."""
+        storage = self.reopen()
+        place = storage.get(Place, self.places[2].id)
+        place.name = "compacted"
+        place.save()
+        storage.compact()
+
+        self.assertEqual(os.path.getsize(self.path + ".spill"), 0)
+        with open(self.path) as file:
+            self.assertEqual(json.load(file)[f"Place.{place.id}"]["name"],
+                             "compacted")
+
+        storage = self.reopen()
+        self.assertEqual(storage.get(Place, place.id).name, "compacted")
+
+    def test_items_and_all(self):
+        """Test listing through items and all."""
+        storage = self.reopen()
+
+        self.assertEqual(len(dict(storage.items(Place))), 5)
+        self.assertEqual(storage.cache_info()["objects"], 0)
+        self.assertEqual(len(storage.all(Place)), 5)
+        self.assertEqual(storage.all(User), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the ObjectMap class.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import sys
+import unittest
+from models.engine.indexes import StorageIndex
+from models.engine.object_map import ObjectMap
+
+
+class TestObjectMap(unittest.TestCase):
+    """Test cases for the ObjectMap class."""
+
+    def setUp(self):
+        """Create a map with objects of two classes."""
+        self.objects = ObjectMap({
+            "User.1": {"id": "1"},
+            "User.2": {"id": "2"},
+            "Place.3": {"id": "3"},
+        })
+
+    def test_behaves_like_dict(self):
+        """Test that the map compares and serializes like a plain dict."""
+        self.assertEqual(self.objects, {
+            "User.1": {"id": "1"},
+            "User.2": {"id": "2"},
+            "Place.3": {"id": "3"},
+        })
+        self.assertEqual(ObjectMap(), {})
+
+    def test_class_index(self):
+        """Test that keys are grouped by class."""
+        self.assertEqual(self.objects.classes(), ["User", "Place"])
+        self.assertEqual(sorted(self.objects.keys_of("User")),
+                         ["User.1", "User.2"])
+        self.assertEqual(self.objects.ids_of("Place"), {"3": "Place.3"})
+        self.assertEqual(list(self.objects.keys_of("City")), [])
+
+    def test_keys_interned_when_stored(self):
+        """Test that a new key is stored as its interned string."""
+        key = "".join(["City.", "4"])
+        self.objects[key] = {"id": "4"}
+        self.assertIs(next(reversed(self.objects)), sys.intern("City.4"))
+        self.assertIs(next(iter(self.objects.keys_of("City"))),
+                      sys.intern("City.4"))
+
+    def test_count(self):
+        """Test counting all objects and objects of one class."""
+        self.assertEqual(self.objects.count(), 3)
+        self.assertEqual(self.objects.count("User"), 2)
+        self.assertEqual(self.objects.count("City"), 0)
+
+    def test_overwrite_keeps_single_entry(self):
+        """Test that re-setting a key does not duplicate it."""
+        self.objects["User.1"] = {"id": "1", "name": "x"}
+        self.assertEqual(self.objects.count("User"), 2)
+
+    def test_delete_and_pop(self):
+        """Test that every removal path updates the class index."""
+        del self.objects["User.1"]
+        self.assertEqual(self.objects.pop("User.2"), {"id": "2"})
+        self.assertEqual(self.objects.pop("User.9", None), None)
+        self.assertNotIn("User", self.objects.classes())
+
+        self.assertEqual(self.objects.popitem(), ("Place.3", {"id": "3"}))
+        self.assertEqual(self.objects.classes(), [])
+        with self.assertRaises(KeyError):
+            self.objects.popitem()
+
+    def test_clear_and_update(self):
+        """Test clear and update keep the class index in sync."""
+        self.objects.clear()
+        self.assertEqual(self.objects.classes(), [])
+
+        self.objects.update({"City.5": {}}, **{"State.6": {}})
+        self.objects.setdefault("City.7", {})
+        self.assertEqual(self.objects.count("City"), 2)
+        self.assertEqual(self.objects.count("State"), 1)
+
+    def test_listeners(self):
+        """Test that listeners see every change, except skipped ones."""
+        events = []
+
+        class Recorder(StorageIndex):
+            def on_set(self, key, old, new):
+                events.append(("set", key, old, new))
+
+            def on_delete(self, key, old):
+                events.append(("delete", key, old))
+
+            def on_clear(self):
+                events.append(("clear",))
+
+        recorder = Recorder()
+        objects = ObjectMap({"User.1": {"id": "1"}}, listeners=[recorder])
+        objects["User.1"] = {"id": "1", "name": "x"}
+        objects.pop("User.1")
+        objects.replace({"City.2": {}}, skip=[recorder])
+        objects.replace({"City.3": {}})
+
+        self.assertEqual(events, [
+            ("set", "User.1", None, {"id": "1"}),
+            ("set", "User.1", {"id": "1"}, {"id": "1", "name": "x"}),
+            ("delete", "User.1", {"id": "1", "name": "x"}),
+            ("clear",),
+            ("set", "City.3", None, {}),
+        ])
+        self.assertEqual(objects.listeners, [recorder])
+        self.assertEqual(objects, {"City.3": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
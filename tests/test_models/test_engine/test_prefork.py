@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the prefork module and read-only storage.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import gc
+import glob
+import json
+import os
+import time
+import unittest
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.engine.prefork import Prefork, memory
+from models.state import State
+
+
+class TestMemory(unittest.TestCase):
+    """Test cases for memory."""
+
+    @unittest.skipUnless(os.path.exists("/proc/self/smaps_rollup"),
+                         "smaps_rollup is Linux-only")
+    def test_memory(self):
+        """Test that resident memory is split into shared and private."""
+        usage = memory()
+        self.assertGreater(usage["rss"], 0)
+        self.assertEqual(usage["shared"] + usage["private"], usage["rss"])
+        self.assertEqual(memory(os.getpid()).keys(), usage.keys())
+
+    def test_memory_unknown(self):
+        """Test that the memory of a missing process is unknown."""
+        self.assertIsNone(memory("no-such-process"))
+
+
+class TestPrefork(unittest.TestCase):
+    """Test cases for Prefork."""
+
+    def setUp(self):
+        """Save a few objects and open the pipe workers report on."""
+        self.file_path = FileStorage._FileStorage__file_path
+        self.states = [State(name=f"State {i}") for i in range(5)]
+        storage.save()
+        self.read_fd, self.write_fd = os.pipe()
+
+    def tearDown(self):
+        """Close the pipe and clean up."""
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+        storage.read_only = False
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def serve(self):
+        """Report what a worker sees, then wait to be terminated."""
+        reloads = []
+        # Patched in the worker only: the file must not be parsed again
+        FileStorage.reload = lambda self: reloads.append(self)
+        try:
+            storage.save()
+            saved = True
+        except PermissionError:
+            saved = False
+        report = {"count": storage.count("State"), "reloads": len(reloads),
+                  "saved": saved, "frozen": gc.get_freeze_count() > 0}
+        os.write(self.write_fd, json.dumps(report).encode() + b"\n")
+        time.sleep(60)
+
+    def reports(self, number):
+        """Read the reports of a number of workers."""
+        with os.fdopen(os.dup(self.read_fd), "rb", buffering=0) as infile:
+            lines = []
+            while len(lines) < number:
+                lines.append(json.loads(infile.readline()))
+
+        return lines
+
+    def test_workers(self):
+        """Test that workers serve the inherited objects, read-only."""
+        master = Prefork(self.serve, workers=2)
+        master.start()
+        try:
+            self.assertEqual(len(master.pids), 2)
+            for report in self.reports(2):
+                self.assertEqual(report, {"count": 5, "reloads": 0,
+                                          "saved": False, "frozen": True})
+            if memory() is not None:
+                processes = master.report()
+                self.assertEqual([process["role"] for process in processes],
+                                 ["master", "worker", "worker"])
+                self.assertGreater(processes[1]["shared"], 0)
+        finally:
+            master.stop()
+
+        self.assertEqual(master.pids, [])
+        self.assertEqual(gc.get_freeze_count(), 0)
+        self.assertFalse(storage.read_only)
+
+    def test_read_only(self):
+        """Test that read-only storage refuses to save."""
+        storage.read_only = True
+        with self.assertRaises(PermissionError):
+            storage.save()
+        with self.assertRaises(PermissionError):
+            storage.bgsave()
+
+    def test_read_only_refused_before_changes(self):
+        """Test that read-only storage is left as it was by refused writes."""
+        storage.read_only = True
+        with self.assertRaises(PermissionError):
+            State(name="New").save()
+        self.assertEqual(storage.count("State"), 5)
+
+        state = storage.get(State, self.states[0].id)
+        state.name = "Renamed"
+        with self.assertRaises(PermissionError):
+            state.save()
+        self.assertEqual(storage.get(State, state.id).name, "State 0")
+
+        with self.assertRaises(PermissionError):
+            storage.delete(state)
+        self.assertEqual(storage.count("State"), 5)
+        storage.delete(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the query module and parallel scans of storage.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import glob
+import os
+import pickle
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.engine import query
+from models.engine.file_storage import FileStorage
+from models.engine.query import All, Any, Not, Where, select
+from models.place import Place
+from models.review import Review
+
+VALUES = [{"name": "Loft", "price_by_night": 80, "city_id": "a",
+           "text": "A Quiet loft"},
+          {"name": "Villa", "price_by_night": 300, "city_id": "b"},
+          {"name": "Hut", "price_by_night": "cheap", "city_id": "c"},
+          {"name": "Cabin", "price_by_night": 50, "city_id": "b",
+           "text": "quietly nice"}]
+
+
+def matching(q):
+    """Return the names of the values matching a query."""
+    return [value["name"] for value in VALUES if q(value)]
+
+
+class TestQuery(unittest.TestCase):
+    """Test cases for the query objects."""
+
+    def test_comparisons(self):
+        """Test every comparison."""
+        self.assertEqual(matching(Where("name", "==", "Hut")), ["Hut"])
+        self.assertEqual(matching(Where("name", "!=", "Hut")),
+                         ["Loft", "Villa", "Cabin"])
+        self.assertEqual(matching(Where("price_by_night", "<", 80)),
+                         ["Cabin"])
+        self.assertEqual(matching(Where("price_by_night", "<=", 80)),
+                         ["Loft", "Cabin"])
+        self.assertEqual(matching(Where("price_by_night", ">", 80)),
+                         ["Villa"])
+        self.assertEqual(matching(Where("price_by_night", ">=", 80)),
+                         ["Loft", "Villa"])
+        self.assertEqual(matching(Where("city_id", "in", ["a", "c"])),
+                         ["Loft", "Hut"])
+        self.assertEqual(matching(Where("text", "contains", "QUIET")),
+                         ["Loft", "Cabin"])
+
+    def test_unknown_comparison(self):
+        """Test that an unknown comparison is refused."""
+        with self.assertRaises(ValueError):
+            Where("name", "~", "x")
+
+    def test_missing_or_incomparable(self):
+        """Test that missing fields and other types do not match."""
+        self.assertEqual(matching(Where("nope", "==", None)), [])
+        self.assertNotIn("Hut", matching(Where("price_by_night", "<", 1e9)))
+
+    def test_combinators(self):
+        """Test &, | and ~."""
+        cheap, b = Where("price_by_night", "<", 100), Where("city_id", "==",
+                                                            "b")
+        self.assertEqual(matching(cheap & b), ["Cabin"])
+        self.assertEqual(matching(cheap | b), ["Loft", "Villa", "Cabin"])
+        self.assertEqual(matching(~b), ["Loft", "Hut"])
+        self.assertEqual(cheap & b, All(cheap, b))
+        self.assertEqual(cheap | b, Any(cheap, b))
+        self.assertEqual(~b, Not(b))
+
+    def test_pickle(self):
+        """Test that queries survive pickling."""
+        q = (Where("price_by_night", "<", 100) &
+             Where("city_id", "in", ["a", "b"])) | ~Where("name", "==", "x")
+        self.assertEqual(pickle.loads(pickle.dumps(q)), q)
+        self.assertEqual(repr(Not(Where("name", "==", "x"))),
+                         "Not(Where('name', '==', 'x'))")
+
+
+class TestSelect(unittest.TestCase):
+    """Test cases for select."""
+
+    def setUp(self):
+        """Build enough values for a parallel scan."""
+        self.values = [{"n": n, "text": f"item {n}"} for n in range(5000)]
+        self.query = Where("n", "<", 100) | Where("text", "contains", "99")
+        self.expected = [n for n in range(5000)
+                         if n < 100 or "99" in str(n)]
+
+    @patch.object(query, "PARALLEL_MIN", 1000)
+    def test_parallel(self):
+        """Test that forked workers find what a serial scan finds."""
+        self.assertEqual(select(self.values, self.query, workers=2),
+                         self.expected)
+        self.assertEqual(select(self.values, self.query, workers=3,
+                                chunk_size=7), self.expected)
+
+    @patch.object(query, "PARALLEL_MIN", 1000)
+    def test_pickled_chunks(self):
+        """Test the scan where processes cannot be forked."""
+        with patch("multiprocessing.get_all_start_methods",
+                   return_value=["spawn"]):
+            self.assertEqual(select(self.values, self.query, workers=2),
+                             self.expected)
+
+    def test_serial(self):
+        """Test that small scans and single workers stay in-process."""
+        with patch("concurrent.futures.ProcessPoolExecutor") as pool:
+            self.assertEqual(select(self.values, self.query),
+                             self.expected)
+            self.assertEqual(select(self.values, self.query, workers=1),
+                             self.expected)
+            self.assertEqual(select([], self.query, workers=4), [])
+        pool.assert_not_called()
+
+    def test_pool_imported_lazily(self):
+        """Test that importing models does not import the process pool."""
+        code = ("import sys, models; print(sorted({'multiprocessing', "
+                "'concurrent.futures'} & sys.modules.keys()))")
+        output = subprocess.run([sys.executable, "-c", code], check=True,
+                                capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+
+class TestScan(unittest.TestCase):
+    """Test cases for FileStorage.scan."""
+
+    def setUp(self):
+        """Create a few places and reviews."""
+        self.file_path = FileStorage._FileStorage__file_path
+        self.places = [Place(name=f"Place {i}", price_by_night=i * 10,
+                             city_id=f"city{i % 3}") for i in range(30)]
+        self.review = Review(text="So quiet at night")
+        Review(text="Noisy")
+
+    def tearDown(self):
+        """Clean up."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    @patch.object(query, "PARALLEL_MIN", 10)
+    def test_scan(self):
+        """Test that the matching objects are returned, instantiated."""
+        found = storage.scan(Place, Where("price_by_night", "<", 100) &
+                             Where("city_id", "in", ["city0", "city1"]),
+                             workers=2)
+        self.assertEqual(sorted(place.id for place in found), sorted(
+            p.id for p in self.places
+            if p.price_by_night < 100 and p.city_id != "city2"))
+        self.assertTrue(all(isinstance(place, Place) for place in found))
+
+    def test_scan_text(self):
+        """Test a text scan by class name."""
+        found = storage.scan("Review", Where("text", "contains", "quiet"))
+        self.assertEqual([review.id for review in found], [self.review.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
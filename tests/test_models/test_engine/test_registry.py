@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the model class registry.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import os
+import subprocess
+import sys
+import unittest
+from models.engine.registry import classes
+from models.base_model import BaseModel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))))
+
+
+class TestClassRegistry(unittest.TestCase):
+    """Test cases for the ClassRegistry mapping."""
+
+    def test_lookup_imports_on_demand(self):
+        """Test that every model class resolves by name."""
+        for name in ("BaseModel", "User", "Place", "State", "City",
+                     "Amenity", "Review"):
+            self.assertIn(name, classes)
+            self.assertEqual(classes[name].__name__, name)
+            self.assertTrue(issubclass(classes[name], BaseModel))
+
+    def test_unknown_names(self):
+        """Test that unknown or malformed names are rejected."""
+        for name in ("FakeClass", "Engine", "user", "os.path", "", 42):
+            self.assertNotIn(name, classes)
+            self.assertIsNone(classes.get(name))
+        with self.assertRaises(KeyError):
+            classes["FakeClass"]
+
+    def test_subclasses_register_themselves(self):
+        """Test that defining a subclass registers it."""
+        class Gadget(BaseModel):
+            pass
+
+        self.assertIs(classes["Gadget"], Gadget)
+
+    def test_names(self):
+        """Test that names lists every model class."""
+        names = classes.names()
+        for name in ("BaseModel", "User", "Place", "State", "City",
+                     "Amenity", "Review"):
+            self.assertIn(name, names)
+        self.assertEqual(list(classes), names)
+        self.assertEqual(len(classes), len(names))
+
+
+class TestLazyStartup(unittest.TestCase):
+    """Test that importing models neither loads data nor model classes."""
+
+    def test_import_is_lazy(self):
+        """Test that `import models` defers the file and model imports."""
+        code = ("import sys, models; "
+                "print('models.place' in sys.modules, "
+                "models.storage._FileStorage__loaded)")
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+            text=True, check=True).stdout
+
+        self.assertEqual(output.split(), ["False", "False"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the replica module and the follower mode of storage.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from models import storage
+from models.engine.changes import ChangelogWriter
+from models.engine.replica import ChangelogTail, apply_event
+from models.state import State
+
+FOLLOWER = """
+import sys, time
+from models import storage
+
+print(storage.count("State"), flush=True)
+sys.stdin.readline()
+deadline = time.monotonic() + 10
+while storage.get("State", sys.argv[1]) is None:
+    if time.monotonic() > deadline:
+        sys.exit("timed out")
+    time.sleep(0.01)
+print(storage.get("State", sys.argv[1]).name, storage.replication())
+"""
+
+
+def event(seq, op, obj_id, changes=None, removed=()):
+    """Return a changelog event."""
+    return {"seq": seq, "op": op, "class": "City", "id": obj_id,
+            "changes": changes or {}, "removed": list(removed),
+            "time": time.time()}
+
+
+class TestChangelogTail(unittest.TestCase):
+    """Test cases for ChangelogTail and apply_event."""
+
+    def setUp(self):
+        """Create a temporary changelog path."""
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "changes.jsonl")
+        self.tail = ChangelogTail(self.path)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tail.close()
+        for name in os.listdir(self.tmp):
+            os.remove(os.path.join(self.tmp, name))
+        os.rmdir(self.tmp)
+
+    def append(self, text):
+        """Append raw text to the changelog."""
+        with open(self.path, "a") as outfile:
+            outfile.write(text)
+
+    def test_poll(self):
+        """Test that only new, complete lines are returned."""
+        self.assertEqual(self.tail.poll(), [])
+        self.append(json.dumps(event(1, "new", "c1")) + "\n")
+        self.assertEqual([e["seq"] for e in self.tail.poll()], [1])
+        self.assertEqual(self.tail.poll(), [])
+
+        line = json.dumps(event(2, "new", "c2"))
+        self.append(line[:10])
+        self.assertEqual(self.tail.poll(), [])
+        self.assertGreater(self.tail.pending(), 0)
+        self.append(line[10:] + "\n")
+        self.assertEqual([e["seq"] for e in self.tail.poll()], [2])
+        self.assertEqual(self.tail.sequence, 2)
+        self.assertIn(self.tail.mode, ("inotify", "stat"))
+
+    def test_lag(self):
+        """Test that the lag does not count the time the follower idled."""
+        self.tail.poll()
+        late = event(1, "new", "c1")
+        late["time"] -= 5
+        self.append(json.dumps(late) + "\n")
+        self.tail.applied(self.tail.poll())
+        self.assertGreaterEqual(self.tail.lag, 4.5)
+
+        self.append(json.dumps(event(2, "new", "c2")) + "\n")
+        time.sleep(0.5)
+        self.tail.applied(self.tail.poll())
+        self.assertLess(self.tail.lag, 0.4)
+
+    def test_skip_and_rotate(self):
+        """Test that events already applied are skipped after a rotation."""
+        self.tail.sequence = 1
+        self.append("".join(json.dumps(event(seq, "new", f"c{seq}")) + "\n"
+                            for seq in (1, 2)))
+        self.assertEqual([e["seq"] for e in self.tail.poll()], [2])
+
+        os.remove(self.path)
+        self.append("".join(json.dumps(event(seq, "new", f"c{seq}")) + "\n"
+                            for seq in (2, 3)))
+        self.assertEqual([e["seq"] for e in self.tail.poll()], [3])
+
+    def test_wait(self):
+        """Test that wait times out on an unchanged changelog."""
+        self.append(json.dumps(event(1, "new", "c1")) + "\n")
+        self.tail.poll()
+        self.assertFalse(self.tail.wait(0.05))
+        self.append(json.dumps(event(2, "new", "c2")) + "\n")
+        self.assertTrue(self.tail.wait(1))
+
+    def test_apply_event(self):
+        """Test that events patch the stored dictionaries."""
+        objects = {}
+        apply_event(objects, event(1, "new", "c1", {"id": "c1", "a": 1}))
+        apply_event(objects, event(2, "update", "c1", {"b": 2}, ["a"]))
+        self.assertEqual(objects, {"City.c1": {"id": "c1", "b": 2}})
+        apply_event(objects, event(3, "destroy", "c1"))
+        self.assertEqual(objects, {})
+
+
+class TestFollower(unittest.TestCase):
+    """Test cases for a follower process tailing this process."""
+
+    def setUp(self):
+        """Log the changes of this process to a changelog."""
+        self.changelog = "file.json.log"
+        self.writer = storage.subscribe(ChangelogWriter(self.changelog))
+
+    def tearDown(self):
+        """Stop logging and remove the test files."""
+        storage.unsubscribe(self.writer)
+        self.writer.close()
+        for path in glob.glob("file.json*"):
+            os.remove(path)
+        storage._FileStorage__objects.clear()
+
+    def test_follower(self):
+        """Test that a follower sees the changes saved after it loaded."""
+        State(name="Kenya").save()
+        state = State(name="Uganda")
+        state.save()
+        follower = subprocess.Popen(
+            [sys.executable, "-c", FOLLOWER, state.id],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+            env=dict(os.environ, HBNB_STORAGE_MODE="follower",
+                     HBNB_CHANGELOG=self.changelog))
+        self.assertEqual(follower.stdout.readline().strip(), "2")
+
+        state.name = "Tanzania"
+        state.save()
+        storage.index("changes").flush()
+        output, _ = follower.communicate("go\n", timeout=20)
+
+        self.assertEqual(follower.returncode, 0)
+        self.assertTrue(output.startswith("Tanzania {'sequence': "))
+
+
+if __name__ == "__main__":
+    unittest.main()
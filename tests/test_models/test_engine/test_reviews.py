@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the ReviewStats index.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import json
+import unittest
+from models.engine.object_map import ObjectMap
+from models.engine.reviews import ReviewStats
+
+
+def review(review_id, place_id, user_id, day):
+    """Return the stored dictionary of a Review."""
+    return {"__class__": "Review", "id": review_id, "place_id": place_id,
+            "user_id": user_id, "created_at": f"2017-01-{day:02d}T10:00:00"}
+
+
+class TestReviewStats(unittest.TestCase):
+    """Test cases for the ReviewStats index."""
+
+    def setUp(self):
+        """Create a map of reviews listened to by ReviewStats."""
+        self.stats = ReviewStats()
+        self.objects = ObjectMap(listeners=[self.stats])
+        self.objects.update({
+            "Review.r1": review("r1", "p1", "u1", 3),
+            "Review.r2": review("r2", "p1", "u2", 1),
+            "Review.r3": review("r3", "p1", "u1", 2),
+            "Review.r4": review("r4", "p2", "u1", 9),
+            "Place.p1": {"__class__": "Place", "id": "p1"},
+        })
+
+    def test_aggregates(self):
+        """Test counts and latest reviews, newest first."""
+        self.assertEqual(self.stats.count("p1"), 3)
+        self.assertEqual(self.stats.count("p9"), 0)
+        self.assertEqual(self.stats.latest("p1", 2), ["Review.r1",
+                                                      "Review.r3"])
+        self.assertEqual(self.stats.latest("p1", 0), [])
+        self.assertEqual(self.stats.user_count("u1"), 3)
+        self.assertEqual(self.stats.user_count("u9"), 0)
+
+    def test_update_and_delete(self):
+        """Test that moved and destroyed reviews update the aggregates."""
+        self.objects["Review.r1"] = review("r1", "p2", "u2", 3)
+        self.assertEqual(self.stats.latest("p1"), ["Review.r3", "Review.r2"])
+        self.assertEqual(self.stats.latest("p2"), ["Review.r4", "Review.r1"])
+        self.assertEqual(self.stats.user_count("u2"), 2)
+
+        del self.objects["Review.r4"]
+        self.objects.pop("Place.p1")
+        self.assertEqual(self.stats.count("p2"), 1)
+        self.assertEqual(self.stats.user_count("u1"), 1)
+
+        self.objects.clear()
+        self.assertEqual(self.stats.count("p1"), 0)
+
+    def test_dump_and_load(self):
+        """Test that the aggregates survive a JSON round trip."""
+        restored = ReviewStats()
+        restored.load(json.loads(json.dumps(self.stats.dump())))
+
+        self.assertEqual(restored.latest("p1"), self.stats.latest("p1"))
+        self.assertEqual(restored.user_count("u1"), 3)
+
+        objects = ObjectMap(listeners=[restored])
+        objects.replace(self.objects, skip=[restored])
+        del objects["Review.r3"]
+        self.assertEqual(restored.latest("p1"), ["Review.r1", "Review.r2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
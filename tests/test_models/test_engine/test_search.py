@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the SearchIndex full-text index.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import json
+import unittest
+from models.engine.object_map import ObjectMap
+from models.engine.search import SearchIndex, tokenize
+from models.engine.surrogates import Surrogates
+
+
+class TestTokenize(unittest.TestCase):
+    """Test cases for the tokenizer."""
+
+    def test_tokenize(self):
+        """Test case folding, accents and stop words."""
+        self.assertEqual(tokenize("The CAFÉ is by the Sea, the sea!"),
+                         ["cafe", "sea", "sea"])
+        self.assertEqual(tokenize(None), ["none"])
+        self.assertEqual(tokenize(""), [])
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for the SearchIndex index."""
+
+    def setUp(self):
+        """Create a map of places and reviews listened to by SearchIndex."""
+        self.index = SearchIndex()
+        self.objects = ObjectMap(listeners=[self.index])
+        self.objects.update({
+            "Place.p1": {"__class__": "Place", "id": "p1",
+                         "name": "Beach house",
+                         "description": "A quiet house by the beach"},
+            "Place.p2": {"__class__": "Place", "id": "p2",
+                         "name": "City loft", "description": "Quiet loft"},
+            "Review.r1": {"__class__": "Review", "id": "r1",
+                          "text": "Great beach, great host"},
+            "Review.r2": {"__class__": "Review", "id": "r2",
+                          "text": "Noisy street"},
+            "User.u1": {"__class__": "User", "id": "u1",
+                        "first_name": "Beach"},
+        })
+
+    def test_search(self):
+        """Test that matches are ranked and limited per class."""
+        self.assertEqual([key for key, _ in
+                          self.index.search("Place", "quiet beach")],
+                         ["Place.p1", "Place.p2"])
+        self.assertEqual([key for key, _ in
+                          self.index.search("Place", "quiet beach", 1)],
+                         ["Place.p1"])
+        self.assertEqual([key for key, _ in
+                          self.index.search("Review", "BEACH")],
+                         ["Review.r1"])
+        self.assertEqual(self.index.search("Review", "the unknown"), [])
+        self.assertEqual(self.index.search("Amenity", "wifi"), [])
+        with self.assertRaises(ValueError):
+            self.index.search("User", "beach")
+
+    def test_update_and_delete(self):
+        """Test that edited and destroyed objects update the postings."""
+        self.objects["Review.r2"] = {"__class__": "Review", "id": "r2",
+                                     "text": "Beach beach beach"}
+        self.assertEqual([key for key, _ in
+                          self.index.search("Review", "beach")],
+                         ["Review.r2", "Review.r1"])
+        self.assertEqual(self.index.search("Review", "noisy"), [])
+
+        del self.objects["Review.r2"]
+        self.assertEqual([key for key, _ in
+                          self.index.search("Review", "beach")],
+                         ["Review.r1"])
+
+        self.objects.clear()
+        self.assertEqual(self.index.search("Place", "quiet"), [])
+
+    def test_dump_and_load(self):
+        """Test that the postings survive a JSON round trip."""
+        restored = SearchIndex()
+        restored.load(json.loads(json.dumps(self.index.dump())))
+
+        self.assertEqual(restored.search("Place", "quiet beach"),
+                         self.index.search("Place", "quiet beach"))
+
+        objects = ObjectMap(listeners=[restored])
+        objects.replace(self.objects, skip=[restored])
+        del objects["Place.p1"]
+        self.assertEqual([key for key, _ in
+                          restored.search("Place", "quiet beach")],
+                         ["Place.p2"])
+
+    def test_shared_surrogates(self):
+        """Test postings on numbers handed out again by shared Surrogates."""
+        surrogates = Surrogates()
+        index = SearchIndex(surrogates)
+        objects = ObjectMap(listeners=[surrogates, index])
+        for name in ("r1", "r2", "r3"):
+            objects[f"Review.{name}"] = {"__class__": "Review", "id": name,
+                                         "text": f"Beach {name}"}
+        self.assertEqual(index.requires, ("surrogates",))
+        self.assertNotIn("surrogates", index.dump())
+
+        del objects["Review.r1"]
+        objects["Review.r4"] = {"__class__": "Review", "id": "r4",
+                                "text": "Beach beach"}
+        self.assertEqual(surrogates.lookup("Review.r4"), 0)
+        self.assertEqual([key for key, _ in index.search("Review", "beach")],
+                         ["Review.r4", "Review.r3", "Review.r2"])
+
+        del objects["Review.r3"]
+        self.assertEqual([key for key, _ in index.search("Review", "beach")],
+                         ["Review.r4", "Review.r2"])
+        self.assertEqual(index.search("Review", "r3"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the Surrogates index.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import json
+import unittest
+from models.engine.object_map import ObjectMap
+from models.engine.surrogates import Surrogates
+
+
+class TestSurrogates(unittest.TestCase):
+    """Test cases for the Surrogates index."""
+
+    def setUp(self):
+        """Create a map of objects numbered by Surrogates."""
+        self.surrogates = Surrogates()
+        self.objects = ObjectMap(listeners=[self.surrogates])
+        self.objects.update({f"Place.p{number}": {"id": f"p{number}"}
+                             for number in range(3)})
+
+    def test_assign(self):
+        """Test that objects are numbered densely, once each."""
+        self.assertEqual([self.surrogates.lookup(f"Place.p{number}")
+                          for number in range(3)], [0, 1, 2])
+        self.assertEqual(self.surrogates.key(1), "Place.p1")
+        self.assertEqual(len(self.surrogates), 3)
+
+        self.objects["Place.p1"] = {"id": "p1", "name": "Loft"}
+        self.assertEqual(self.surrogates.assign("Place.p1"), 1)
+        self.assertEqual(self.surrogates.assign("Review.r0"), 3)
+        self.assertIsNone(self.surrogates.lookup("Review.r1"))
+        for number in (-1, 4):
+            with self.assertRaises(KeyError):
+                self.surrogates.key(number)
+
+    def test_release(self):
+        """Test that numbers are released on the next change, and reused."""
+        del self.objects["Place.p1"]
+        self.assertEqual(self.surrogates.lookup("Place.p1"), 1)
+        self.assertEqual(self.surrogates.key(1), "Place.p1")
+
+        self.objects["Place.p3"] = {"id": "p3"}
+        self.assertIsNone(self.surrogates.lookup("Place.p1"))
+        self.assertEqual(self.surrogates.lookup("Place.p3"), 1)
+
+        del self.objects["Place.p0"]
+        self.objects["Place.p0"] = {"id": "p0"}
+        self.assertEqual(self.surrogates.lookup("Place.p0"), 0)
+        self.assertEqual(len(self.surrogates), 3)
+
+        self.objects.clear()
+        self.assertEqual(len(self.surrogates), 0)
+        self.assertEqual(self.surrogates.assign("Place.p2"), 0)
+
+    def test_dump_and_load(self):
+        """Test that the numbers survive a JSON round trip."""
+        del self.objects["Place.p1"]
+        del self.objects["Place.p0"]
+        restored = Surrogates()
+        restored.load(json.loads(json.dumps(self.surrogates.dump())))
+
+        self.assertEqual(restored.lookup("Place.p2"), 2)
+        self.assertIsNone(restored.lookup("Place.p1"))
+        self.assertEqual([restored.assign("Place.p3"),
+                          restored.assign("Place.p4"),
+                          restored.assign("Place.p5")], [0, 1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
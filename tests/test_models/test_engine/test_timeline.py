@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the Timeline index.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import json
+import unittest
+from datetime import datetime
+from models.engine.object_map import ObjectMap
+from models.engine.timeline import Timeline, timestamp
+
+
+def stamped(cls_name, obj_id, created, updated):
+    """Return the stored dictionary of an object stamped on two days."""
+    return {"__class__": cls_name, "id": obj_id,
+            "created_at": f"2017-01-{created:02d}T10:00:00.000001",
+            "updated_at": f"2017-01-{updated:02d}T10:00:00.000001"}
+
+
+class TestTimeline(unittest.TestCase):
+    """Test cases for the Timeline index."""
+
+    def setUp(self):
+        """Create a map of objects listened to by Timeline."""
+        self.timeline = Timeline()
+        self.objects = ObjectMap(listeners=[self.timeline])
+        self.objects.update({
+            "Place.p1": stamped("Place", "p1", 1, 5),
+            "Place.p2": stamped("Place", "p2", 2, 3),
+            "City.c1": stamped("City", "c1", 3, 4),
+            "User.u1": stamped("User", "u1", 4, 6),
+        })
+
+    def test_timestamp(self):
+        """Test that times are normalized to their stored form."""
+        self.assertEqual(timestamp(datetime(2017, 1, 2)),
+                         "2017-01-02T00:00:00")
+        self.assertEqual(timestamp("2017-01-02"), "2017-01-02T00:00:00")
+        with self.assertRaises(ValueError):
+            timestamp("yesterday")
+
+    def test_between(self):
+        """Test time ranges, across and within classes."""
+        self.assertEqual(list(self.timeline.between("updated_at")),
+                         ["Place.p2", "City.c1", "Place.p1", "User.u1"])
+        self.assertEqual(list(self.timeline.between(
+            "updated_at", "2017-01-04T10:00:00.000001")),
+            ["Place.p1", "User.u1"])
+        self.assertEqual(list(self.timeline.between(
+            "created_at", datetime(2017, 1, 2), "2017-01-03T10:00:00.000001")),
+            ["Place.p2", "City.c1"])
+        self.assertEqual(list(self.timeline.between(
+            "updated_at", cls_name="Place")), ["Place.p2", "Place.p1"])
+        self.assertEqual(list(self.timeline.between(
+            "updated_at", cls_name="Review")), [])
+        with self.assertRaises(ValueError):
+            list(self.timeline.between("id"))
+
+    def test_update_and_delete(self):
+        """Test that saved and destroyed objects move in the timeline."""
+        self.objects["Place.p2"] = stamped("Place", "p2", 2, 9)
+        self.assertEqual(list(self.timeline.between(
+            "updated_at", "2017-01-05")), ["Place.p1", "User.u1",
+                                           "Place.p2"])
+
+        del self.objects["Place.p1"]
+        self.assertEqual(list(self.timeline.between(
+            "updated_at", cls_name="Place")), ["Place.p2"])
+
+        self.objects.clear()
+        self.assertEqual(list(self.timeline.between("updated_at")), [])
+
+    def test_destroyed_since(self):
+        """Test that destroyed objects are known since the last rebuild."""
+        start = datetime.now()
+        self.assertIsNone(self.timeline.destroyed_since("2017-01-01"))
+        self.assertEqual(self.timeline.destroyed_since(start), [])
+
+        del self.objects["Place.p1"]
+        del self.objects["City.c1"]
+        self.assertEqual(self.timeline.destroyed_since(start),
+                         ["Place.p1", "City.c1"])
+        self.objects["City.c1"] = stamped("City", "c1", 3, 4)
+        self.assertEqual(self.timeline.destroyed_since(start), ["Place.p1"])
+
+        restored = Timeline()
+        restored.load(json.loads(json.dumps(self.timeline.dump())))
+        self.assertEqual(restored.destroyed_since(start), ["Place.p1"])
+
+        end = datetime.now()
+        self.timeline.forget_destroyed(end)
+        self.assertIsNone(self.timeline.destroyed_since(start))
+        self.assertEqual(self.timeline.destroyed_since(end), [])
+
+    def test_dump_and_load(self):
+        """Test that the timeline survives a JSON round trip."""
+        restored = Timeline()
+        restored.load(json.loads(json.dumps(self.timeline.dump())))
+
+        self.assertEqual(list(restored.between("created_at")),
+                         list(self.timeline.between("created_at")))
+
+        objects = ObjectMap(listeners=[restored])
+        objects.replace(self.objects, skip=[restored])
+        del objects["City.c1"]
+        self.assertEqual(list(restored.between("updated_at", "2017-01-03")),
+                         ["Place.p2", "Place.p1", "User.u1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
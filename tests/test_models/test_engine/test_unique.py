@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the unique indexes and FileStorage.get_by.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import glob
+import json
+import os
+import unittest
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.engine.object_map import ObjectMap
+from models.engine.unique import UniqueIndex, normalize
+from models.state import State
+from models.user import User
+
+
+def user(user_id, email):
+    """Return the stored dictionary of a User."""
+    return {"__class__": "User", "id": user_id, "email": email}
+
+
+class TestUniqueIndex(unittest.TestCase):
+    """Test cases for the UniqueIndex index."""
+
+    def setUp(self):
+        """Create a map of users listened to by a unique index."""
+        self.index = UniqueIndex("User", "email")
+        self.objects = ObjectMap(listeners=[self.index])
+        self.objects.update({
+            "User.u1": user("u1", "Bob@Mail.com"),
+            "User.u2": user("u2", ""),
+            "User.u3": user("u3", ""),
+            "State.s1": {"__class__": "State", "id": "s1",
+                         "email": "bob@mail.com"},
+        })
+
+    def test_normalize(self):
+        """Test that values are stripped and case-folded."""
+        self.assertEqual(normalize(" Bob@Mail.COM "), "bob@mail.com")
+        self.assertIsNone(normalize("  "))
+        self.assertIsNone(normalize(None))
+        self.assertIsNone(normalize(42))
+
+    def test_lookup(self):
+        """Test that values are found in any case, empty ones never."""
+        self.assertEqual(self.index.lookup("bob@mail.com"), "u1")
+        self.assertEqual(self.index.lookup(" BOB@mail.com"), "u1")
+        self.assertIsNone(self.index.lookup(""))
+        self.assertIsNone(self.index.lookup("nobody@mail.com"))
+
+    def test_check(self):
+        """Test that only values held by another object are refused."""
+        with self.assertRaisesRegex(ValueError, "already used by User.u1"):
+            self.index.check("User.u2", user("u2", ""),
+                             user("u2", "BOB@mail.com "))
+        self.index.check("User.u1", None, user("u1", "bob@mail.com"))
+        self.index.check("User.u3", None, user("u3", ""))
+        self.index.check("State.s2", None, {"__class__": "State",
+                                            "id": "s2",
+                                            "email": "bob@mail.com"})
+
+    def test_update_and_delete(self):
+        """Test that changed and destroyed objects release their value."""
+        self.objects["User.u1"] = user("u1", "robert@mail.com")
+        self.assertIsNone(self.index.lookup("bob@mail.com"))
+        self.assertEqual(self.index.lookup("robert@mail.com"), "u1")
+
+        del self.objects["User.u1"]
+        self.assertIsNone(self.index.lookup("robert@mail.com"))
+
+        self.objects["User.u1"] = user("u1", "bob@mail.com")
+        self.objects.clear()
+        self.assertIsNone(self.index.lookup("bob@mail.com"))
+
+    def test_shared_values(self):
+        """Test that the first object sharing a value keeps it."""
+        self.objects["User.u4"] = user("u4", "bob@mail.com")
+        self.assertEqual(self.index.lookup("bob@mail.com"), "u1")
+        self.index.check("User.u1", None, user("u1", "bob@mail.com"))
+        with self.assertRaises(ValueError):
+            self.index.check("User.u4", None, user("u4", "bob@mail.com"))
+
+        del self.objects["User.u1"]
+        self.assertEqual(self.index.lookup("bob@mail.com"), "u4")
+        self.index.check("User.u4", None, user("u4", "bob@mail.com"))
+
+    def test_dump_and_load(self):
+        """Test that the values survive a JSON round trip."""
+        restored = UniqueIndex("User", "email")
+        restored.load(json.loads(json.dumps(self.index.dump())))
+        self.assertEqual(restored.lookup("bob@mail.com"), "u1")
+
+        objects = ObjectMap(listeners=[restored])
+        objects.replace(self.objects, skip=[restored])
+        del objects["User.u1"]
+        self.assertIsNone(restored.lookup("bob@mail.com"))
+
+
+class TestGetBy(unittest.TestCase):
+    """Test cases for the unique email of users in storage."""
+
+    def setUp(self):
+        """Create two users."""
+        self.file_path = FileStorage._FileStorage__file_path
+        self.bob = User(email="Bob@Mail.com", first_name="Bob")
+        self.bob.save()
+        self.ann = User(email="ann@mail.com", first_name="Ann")
+        self.ann.save()
+
+    def tearDown(self):
+        """Clean up."""
+        for path in [self.file_path] + glob.glob(self.file_path + ".*"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        storage._FileStorage__objects.clear()
+
+    def test_get_by_email(self):
+        """Test that users are found by email, in any case."""
+        self.assertEqual(storage.get_by(User, email="bob@mail.com").id,
+                         self.bob.id)
+        self.assertEqual(storage.get_by("User", email=" ANN@mail.com").id,
+                         self.ann.id)
+        self.assertIsNone(storage.get_by(User, email="eve@mail.com"))
+        self.assertIsNone(storage.get_by(User, email=""))
+
+    def test_get_by_other_fields(self):
+        """Test that other fields are compared, with or without index."""
+        self.assertEqual(storage.get_by(User, email="bob@mail.com",
+                                        first_name="Bob").id, self.bob.id)
+        self.assertIsNone(storage.get_by(User, email="bob@mail.com",
+                                         first_name="Ann"))
+        self.assertEqual(storage.get_by(User, first_name="Ann").id,
+                         self.ann.id)
+        self.assertIsNone(storage.get_by(User, first_name="ann"))
+        self.assertIsNone(storage.get_by(State, email="bob@mail.com"))
+        with self.assertRaises(ValueError):
+            storage.get_by(User)
+
+    def test_duplicate_refused(self):
+        """Test that a duplicate email is refused and not stored."""
+        eve = User(first_name="Eve")
+        eve.save()
+        eve.email = "BOB@mail.com"
+        with self.assertRaisesRegex(ValueError, f"User.{self.bob.id}"):
+            eve.save()
+        self.assertEqual(storage.get(User, eve.id).email, "")
+        self.assertEqual(storage.get_by(User, email="bob@mail.com").id,
+                         self.bob.id)
+
+        # Users without an email, and changes of case, are fine
+        User().save()
+        self.bob.email = "bob@mail.com"
+        self.bob.save()
+
+    def test_duplicate_created(self):
+        """Test that a user created with a used email cannot be saved."""
+        eve = User(email="bob@MAIL.com")
+        with self.assertRaises(ValueError):
+            eve.save()
+        self.bob.save()
+
+    def test_index_reloaded(self):
+        """Test that the index is restored from its sidecar on reload."""
+        storage.checkpoint()
+        self.assertTrue(os.path.exists(self.file_path +
+                                       ".unique.User.email"))
+        storage._FileStorage__objects.clear()
+        storage.reload()
+        self.assertEqual(storage.get_by(User, email="ann@mail.com").id,
+                         self.ann.id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,7 @@ __license__ = "MIT"
 __date__ = "2025-01-03"
 __version__ = "1.1"
 
+import glob
 import os
 import time
 import unittest
@@ -33,6 +34,10 @@ class TestReview(unittest.TestCase):
         if os.path.exists(self.file_path):
             os.remove(self.file_path)
 
+        # Sidecar files of the persistent indexes
+        for path in glob.glob(self.file_path + ".*"):
+            os.remove(path)
+
         del self.review
 
         storage._FileStorage__objects.clear()
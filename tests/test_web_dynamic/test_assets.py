@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the asset pipeline.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from web_dynamic.assets import MANIFEST, AssetPipeline, minify, strip_png
+
+PNG = b"\x89PNG\r\n\x1a\n"
+
+
+def chunk(kind, data):
+    """Return a PNG chunk; the CRC is not checked by the pipeline."""
+    return len(data).to_bytes(4, "big") + kind + data + b"\0\0\0\0"
+
+
+class TestAssetPipeline(unittest.TestCase):
+    """Test cases for bundling a directory of pages."""
+
+    def setUp(self):
+        """Create two pages sharing stylesheets, a small and a large icon."""
+        self.src = tempfile.mkdtemp()
+        self.out = os.path.join(self.src, "dist")
+        os.makedirs(os.path.join(self.src, "styles"))
+        os.makedirs(os.path.join(self.src, "images"))
+
+        self.write("images/small.png", PNG + chunk(b"IHDR", b"x" * 13))
+        self.write("images/large.png", PNG + chunk(b"IHDR", b"x" * 13) +
+                   chunk(b"tEXt", b"comment") + chunk(b"IDAT", b"y" * 100))
+        self.write("styles/a.css", "/* common */\nbody {\n\tmargin: 0;\n}\n")
+        self.write("styles/b.css", '.icon {\n\tbackground-image: '
+                   'url("../images/small.png");\n}\n#logo { background: '
+                   "url(../images/large.png) ; font-family: 'Open  Sans' }\n")
+        page = ('<html>\n\t<head>\n'
+                '\t\t<link rel="shortcut icon" href="images/small.png" >\n'
+                '\t\t<link rel="stylesheet" href="styles/a.css"/>\n'
+                '\t\t<link rel="stylesheet" href="styles/b.css"/>\n'
+                '\t\t<link rel="stylesheet" href="https://cdn/x.css"/>\n'
+                '\t</head>\n</html>\n')
+        self.write("1-index.html", page)
+        self.write("2-index.html", page)
+        self.write("plain.html", "<html></html>\n")
+
+    def tearDown(self):
+        """Remove the source and output directories."""
+        shutil.rmtree(self.src)
+
+    def write(self, name, data):
+        """Write a source file."""
+        mode = "wb" if isinstance(data, bytes) else "w"
+        with open(os.path.join(self.src, name), mode) as outfile:
+            outfile.write(data)
+
+    def read(self, name):
+        """Read an output file."""
+        with open(os.path.join(self.out, name)) as infile:
+            return infile.read()
+
+    def test_build(self):
+        """Test that each page links one hashed, minified bundle."""
+        report = AssetPipeline(self.src, self.out, inline_limit=64).build()
+
+        page = self.read("1-index.html")
+        links = re.findall(r'rel="stylesheet" href="([^"]+)"', page)
+        self.assertEqual(len(links), 2)
+        self.assertRegex(links[0], r"^styles/bundle\.[0-9a-f]{12}\.css$")
+        self.assertEqual(links[1], "https://cdn/x.css")
+        self.assertIn('href="images/small.', page)
+        self.assertEqual(page, self.read("2-index.html"))
+        self.assertEqual(self.read("plain.html"), "<html></html>\n")
+
+        css = self.read(links[0])
+        self.assertTrue(css.startswith("body{margin:0}.icon{"))
+        self.assertIn("url(data:image/png;base64,", css)
+        self.assertRegex(css, r"url\(\.\./images/large\.[0-9a-f]{12}\.png\)")
+        self.assertIn("'Open  Sans'", css)
+
+        large = [name for name in os.listdir(os.path.join(self.out, "images"))
+                 if name.startswith("large.")]
+        with open(os.path.join(self.out, "images", large[0]), "rb") as image:
+            self.assertNotIn(b"tEXt", image.read())
+
+        stats = report["1-index.html"]
+        self.assertEqual(stats["requests_before"], 4)
+        self.assertEqual(stats["requests_after"], 2)
+        self.assertLess(stats["bytes_after"], stats["bytes_before"])
+        self.assertEqual(report["plain.html"]["requests_before"], 0)
+        self.assertNotIn(os.path.join("dist", "1-index.html"), report)
+
+    def test_rebuild_removes_stale_bundles(self):
+        """Test that a changed stylesheet replaces its old bundle."""
+        AssetPipeline(self.src, self.out).build()
+        before = os.listdir(os.path.join(self.out, "styles"))
+
+        self.write("styles/a.css", "body { margin: 1px; }\n")
+        AssetPipeline(self.src, self.out).build()
+        after = os.listdir(os.path.join(self.out, "styles"))
+
+        self.assertEqual(len(after), 1)
+        self.assertNotEqual(before, after)
+        self.assertIn(after[0], self.read("1-index.html"))
+
+    def test_rebuild_keeps_other_files(self):
+        """Test that a rebuild only removes files an earlier build wrote."""
+        AssetPipeline(self.src, self.out).build()
+        kept = os.path.join(self.out, "styles", "custom.css")
+        with open(kept, "w") as outfile:
+            outfile.write("body {}\n")
+
+        self.write("styles/a.css", "body { margin: 1px; }\n")
+        AssetPipeline(self.src, self.out).build()
+
+        self.assertTrue(os.path.isfile(kept))
+        self.assertEqual(len(os.listdir(os.path.join(self.out, "styles"))),
+                         2)
+
+    def test_output_is_source(self):
+        """Test that the source directory is never used as the output."""
+        with self.assertRaises(ValueError):
+            AssetPipeline(self.src, self.src).build()
+        self.assertFalse(os.path.exists(os.path.join(self.src, MANIFEST)))
+
+
+class TestMinify(unittest.TestCase):
+    """Test cases for the helpers."""
+
+    def test_minify(self):
+        """Test that whitespace and comments go but strings stay."""
+        self.assertEqual(minify('a > b , c { x: 1 ; y: "  ;  " ; }\n'
+                                '/* note */ @media (max-width: 9px) {}'),
+                         'a>b,c{x:1;y:"  ;  "}@media (max-width:9px){}')
+
+    def test_strip_png(self):
+        """Test that only metadata chunks are dropped from PNGs."""
+        image = PNG + chunk(b"IHDR", b"h") + chunk(b"iTXt", b"xmp")
+        self.assertEqual(strip_png(image), PNG + chunk(b"IHDR", b"h"))
+        self.assertEqual(strip_png(b"GIF89a"), b"GIF89a")
+        self.assertEqual(strip_png(image[:-3]), image[:-3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Unittest suite for the static site generator.
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import os
+import shutil
+import tempfile
+import unittest
+from web_dynamic.generator import SiteGenerator, Templates, _long_date
+
+
+class DictStorage:
+    """A minimal storage engine serving stored dictionaries."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.objects = {}
+
+    def put(self, cls_name, obj_id, **fields):
+        """Store a dictionary under "<cls_name>.<obj_id>"."""
+        value = {"__class__": cls_name, "id": obj_id,
+                 "created_at": "2017-01-27T10:00:00",
+                 "updated_at": "2017-01-27T10:00:00"}
+        value.update(fields)
+        self.objects[f"{cls_name}.{obj_id}"] = value
+
+    def items(self, cls=None):
+        """Yield the stored dictionaries of a class."""
+        for key, value in list(self.objects.items()):
+            if cls is None or key.startswith(f"{cls}."):
+                yield key, value
+
+
+class TestSiteGenerator(unittest.TestCase):
+    """Test cases for rendering and incremental rebuilds."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Compile the templates once for every test."""
+        cls.templates = Templates()
+
+    def setUp(self):
+        """Create a small dataset and an output directory."""
+        self.out = tempfile.mkdtemp()
+        self.storage = DictStorage()
+        put = self.storage.put
+        put("State", "s1", name="California")
+        put("State", "s2", name="Arizona")
+        put("City", "c1", name="San Francisco", state_id="s1")
+        put("City", "c2", name="Page", state_id="s2")
+        put("Amenity", "a1", name="Wifi")
+        put("Amenity", "a2", name="TV")
+        put("User", "u1", first_name="John", last_name="Lennon")
+        put("User", "u2", first_name="Bob", last_name="Dylan")
+        put("Place", "p1", name="My home", city_id="c1", user_id="u1",
+            price_by_night=80, max_guest=2, number_rooms=1,
+            number_bathrooms=1, description="Cosy <b>home</b>",
+            amenity_ids=["a1", "a2"])
+        put("Place", "p2", name="Tiny house", city_id="c2", user_id="u1",
+            price_by_night=65, max_guest=4, number_rooms=2,
+            number_bathrooms=1, description="", amenity_ids=[])
+        put("Review", "r1", place_id="p1", user_id="u2",
+            text="Wow, what can I say?!")
+        self.generator = SiteGenerator(self.out, self.storage,
+                                       templates=self.templates)
+
+    def tearDown(self):
+        """Remove the output directory."""
+        shutil.rmtree(self.out)
+
+    def read(self, page):
+        """Return the text of a generated page."""
+        with open(os.path.join(self.out, page)) as file:
+            return file.read()
+
+    def test_full_build(self):
+        """Test that the first build renders every page from storage."""
+        report = self.generator.build()
+
+        self.assertEqual(sorted(report["pages"]), [
+            os.path.join("cities", "c1.html"),
+            os.path.join("cities", "c2.html"), "index.html"])
+        index = self.read("index.html")
+        self.assertIn("<h2>Arizona</h2>", index)
+        self.assertIn("<h4>San Francisco</h4>", index)
+        self.assertIn("<h4>Arizona, California</h4>", index)
+        self.assertIn('<div class="price_by_night">$80</div>', index)
+        self.assertIn("<p>4 Guests</p>", index)
+        self.assertIn('<div class="wifi_icon"></div>Wifi', index)
+        self.assertIn("<b>Owner</b>: John Lennon", index)
+        self.assertIn("From Bob Dylan the 27th January 2017", index)
+        self.assertIn("Cosy &lt;b&gt;home&lt;/b&gt;", index)
+        self.assertIn('href="../styles/100-places.css"', index)
+
+        city = self.read(os.path.join("cities", "c2.html"))
+        self.assertIn("Tiny house", city)
+        self.assertNotIn("My home", city)
+        self.assertIn('href="../../styles/100-places.css"', city)
+
+    def test_noop_rebuild(self):
+        """Test that an unchanged dataset rewrites nothing."""
+        self.generator.build()
+        report = self.generator.build()
+
+        self.assertEqual(report, {"fragments": [], "pages": [],
+                                  "removed": []})
+
+    def test_review_update_is_incremental(self):
+        """Test that a new review only touches its place's pages."""
+        self.generator.build()
+        self.storage.put("Review", "r2", place_id="p2", user_id="u2",
+                         text="Lovely")
+        report = self.generator.build()
+
+        self.assertEqual(report["fragments"], ["place-p2"])
+        self.assertEqual(sorted(report["pages"]), [
+            os.path.join("cities", "c2.html"), "index.html"])
+        self.assertIn("Lovely", self.read(os.path.join("cities",
+                                                       "c2.html")))
+
+    def test_place_move_updates_both_cities(self):
+        """Test that moving a place rewrites the old and new city."""
+        self.generator.build()
+        self.storage.objects["Place.p2"]["city_id"] = "c1"
+        report = self.generator.build()
+
+        self.assertEqual(report["fragments"], ["place-p2"])
+        self.assertEqual(sorted(report["pages"]), [
+            os.path.join("cities", "c1.html"),
+            os.path.join("cities", "c2.html"), "index.html"])
+        self.assertNotIn("Tiny house",
+                         self.read(os.path.join("cities", "c2.html")))
+
+    def test_owner_rename_and_city_removal(self):
+        """Test user dependencies and removal of obsolete pages."""
+        self.generator.build()
+        self.storage.objects["User.u1"]["first_name"] = "Paul"
+        del self.storage.objects["City.c2"]
+        report = self.generator.build()
+
+        self.assertIn("place-p1", report["fragments"])
+        self.assertIn("locations", report["fragments"])
+        self.assertEqual(report["removed"],
+                         [os.path.join("cities", "c2.html")])
+        self.assertIn("Paul Lennon", self.read("index.html"))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.out, "cities", "c2.html")))
+
+    def test_long_date(self):
+        """Test the review date format."""
+        self.assertEqual(_long_date("2013-09-16T00:00:00"),
+                         "16th September 2013")
+        self.assertEqual(_long_date("2008-08-01T00:00:00"),
+                         "1st August 2008")
+        self.assertEqual(_long_date("2008-08-12T00:00:00"),
+                         "12th August 2008")
+        self.assertEqual(_long_date(None), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
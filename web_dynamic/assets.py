@@ -0,0 +1,385 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Asset pipeline bundling the stylesheets and icons of the static pages.
+
+Every page of web_static links five or more stylesheets, which in turn load
+one image per icon. For each page, the pipeline concatenates its stylesheets
+in link order into a single minified bundle, inlines the images below
+`inline_limit` bytes as data URIs and copies the larger ones, stripped of
+their PNG metadata. Every output file is named after a digest of its
+content, so it can be cached forever, and the page is rewritten to link the
+one bundle. Pages sharing the same stylesheets share the same bundle.
+
+Nothing but the standard library is used, and the source files are never
+modified: pages, bundles and images are written to the output directory,
+which must not be the source directory. The files written are listed in a
+manifest there, so that a rebuild removes those no page needs anymore and
+never touches any other file.
+
+usage:
+------
+python3 -m web_dynamic.assets [-s <source directory>] [-o <output directory>]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import base64
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+
+SOURCE_DIR = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "web_static"))
+OUTPUT_DIR = os.path.join(SOURCE_DIR, "dist")
+STYLE_DIR = "styles"
+IMAGE_DIR = "images"
+# Lists, relative to the output directory, the files the last build wrote
+MANIFEST = ".assets.json"
+
+# Images up to this size are inlined into the bundle as data URIs
+INLINE_LIMIT = 2048
+
+_STYLESHEET = re.compile(
+    r"""[ \t]*<link\s+rel=["']stylesheet["']\s+href=["']([^"']+)["']"""
+    r"""\s*/?>[ \t]*\n?""", re.IGNORECASE)
+_ICON = re.compile(r"""(<link\s+rel=["'][^"']*icon["']\s+href=["'])"""
+                   r"""([^"']+)(["'])""", re.IGNORECASE)
+_URL = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""")
+_STRING = re.compile(r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'""")
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_SPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_METADATA = {b"tEXt", b"zTXt", b"iTXt", b"tIME"}
+
+
+class AssetPipeline:
+    """
+    Bundles the stylesheets of a directory of pages.
+
+    Attributes_:
+        src_dir (str): The directory holding the pages and their assets.
+        out_dir (str): The directory the optimized site is written to.
+        inline_limit (int): The largest image, in bytes, inlined as a data
+            URI; larger ones are copied under a content-hashed name.
+    """
+
+    def __init__(self, src_dir=SOURCE_DIR, out_dir=OUTPUT_DIR,
+                 inline_limit=INLINE_LIMIT):
+        """
+        Initialize the pipeline.
+
+        Args_:
+            src_dir (str): See the class attributes.
+            out_dir (str): See the class attributes.
+            inline_limit (int): See the class attributes.
+        """
+        self.src_dir = src_dir
+        self.out_dir = out_dir
+        self.inline_limit = inline_limit
+        self.__written = set()
+        self.__images = {}
+        self.__bundles = {}
+
+    def build(self):
+        """
+        Bundle the assets of every page and write the optimized site.
+
+        Returns_:
+            dict: For every page, relative to `src_dir`, the bytes and
+            requests its stylesheets and their images cost before and after.
+
+        Raises_:
+            ValueError: If `out_dir` is `src_dir`, whose pages would be
+                overwritten.
+        """
+        if os.path.realpath(self.out_dir) == os.path.realpath(self.src_dir):
+            raise ValueError("the output directory must not be the source "
+                             f"directory: {self.out_dir}")
+
+        self.__written = set()
+        self.__images = {}
+        self.__bundles = {}
+        report = {}
+
+        for page in self.__pages():
+            report[page] = self.__build_page(page)
+
+        # Forget the files of the last build no page refers to anymore
+        written = sorted(os.path.relpath(path, self.out_dir)
+                         for path in self.__written)
+        for name in set(self.__manifest()).difference(written):
+            try:
+                os.remove(os.path.join(self.out_dir, name))
+            except OSError:
+                pass
+        self.__write(os.path.join(self.out_dir, MANIFEST),
+                     json.dumps(written, indent=1).encode())
+
+        return report
+
+    def __manifest(self):
+        """Return the files of the last build, relative to `out_dir`."""
+        try:
+            with open(os.path.join(self.out_dir, MANIFEST)) as infile:
+                names = json.load(infile)
+        except (OSError, ValueError):
+            return []
+
+        # Only ever remove files below the output directory
+        return [name for name in names if isinstance(name, str) and
+                not os.path.isabs(name) and
+                os.path.normpath(name).split(os.sep)[0] != os.pardir]
+
+    def __pages(self):
+        """Return the pages of the source directory, sorted."""
+        out_dir = os.path.abspath(self.out_dir)
+        pages = []
+
+        for root, dirs, files in os.walk(self.src_dir):
+            dirs[:] = sorted(name for name in dirs if os.path.abspath(
+                os.path.join(root, name)) != out_dir)
+            pages.extend(os.path.relpath(os.path.join(root, name),
+                                         self.src_dir)
+                         for name in files if name.endswith(".html"))
+
+        return sorted(pages)
+
+    def __build_page(self, page):
+        """Rewrite one page to link a single bundle; return its savings."""
+        src = os.path.join(self.src_dir, page)
+        base = os.path.dirname(src)
+        out = os.path.join(self.out_dir, page)
+        with open(src) as infile:
+            text = infile.read()
+
+        stylesheets = [os.path.normpath(os.path.join(base, href))
+                       for href in _STYLESHEET.findall(text)
+                       if not _external(href)]
+        stylesheets = [path for path in stylesheets if os.path.isfile(path)]
+        stats = {"bytes_before": 0, "bytes_after": 0,
+                 "requests_before": 0, "requests_after": 0}
+        if not stylesheets:
+            self.__write(out, text.encode())
+            return stats
+
+        bundle, images = self.__bundle(tuple(stylesheets))
+        before = set(stylesheets) | images["all"]
+        stats["bytes_before"] = sum(os.path.getsize(path) for path in before)
+        stats["requests_before"] = len(before)
+        stats["bytes_after"] = os.path.getsize(bundle) + sum(
+            os.path.getsize(path) for path in images["copied"])
+        stats["requests_after"] = 1 + len(images["copied"])
+
+        href = _href(bundle, os.path.dirname(out))
+        links = iter([f'\t\t<link rel="stylesheet" href="{href}"/>\n'])
+        text = _STYLESHEET.sub(
+            lambda match: match.group(0) if _external(match.group(1)) or
+            os.path.normpath(os.path.join(base, match.group(1)))
+            not in stylesheets else next(links, ""), text)
+        text = _ICON.sub(lambda match: match.group(1) + self.__icon(
+            match.group(2), base, os.path.dirname(out)) + match.group(3),
+            text)
+        self.__write(out, text.encode())
+
+        return stats
+
+    def __bundle(self, stylesheets):
+        """Write the minified bundle of a list of stylesheets, once."""
+        if stylesheets in self.__bundles:
+            return self.__bundles[stylesheets]
+
+        images = {"all": set(), "copied": set()}
+        style_dir = os.path.join(self.out_dir, STYLE_DIR)
+        parts = []
+
+        for path in stylesheets:
+            with open(path) as infile:
+                css = infile.read()
+            parts.append(_URL.sub(lambda match: "url(" + self.__image(
+                match.group(2), os.path.dirname(path), style_dir,
+                images) + ")", css))
+
+        data = minify("\n".join(parts)).encode()
+        bundle = self.__write(os.path.join(
+            style_dir, f"bundle.{_digest(data)}.css"), data)
+        self.__bundles[stylesheets] = bundle, images
+
+        return bundle, images
+
+    def __image(self, url, base, target_dir, images):
+        """Return what an url() of a stylesheet becomes in the bundle."""
+        path = os.path.normpath(os.path.join(base, url))
+        if _external(url) or not os.path.isfile(path):
+            return url
+
+        images["all"].add(path)
+        with open(path, "rb") as infile:
+            data = strip_png(infile.read())
+
+        if len(data) <= self.inline_limit:
+            mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+        copy = self.__copy(path, data)
+        images["copied"].add(copy)
+        return _href(copy, target_dir)
+
+    def __icon(self, href, base, target_dir):
+        """Return the href of a page's favicon, copied under its digest."""
+        path = os.path.normpath(os.path.join(base, href))
+        if _external(href) or not os.path.isfile(path):
+            return href
+
+        with open(path, "rb") as infile:
+            return _href(self.__copy(path, strip_png(infile.read())),
+                         target_dir)
+
+    def __copy(self, path, data):
+        """Copy an image to the output under a content-hashed name."""
+        if path not in self.__images:
+            stem, ext = os.path.splitext(os.path.basename(path))
+            self.__images[path] = self.__write(os.path.join(
+                self.out_dir, IMAGE_DIR, f"{stem}.{_digest(data)}{ext}"),
+                data)
+
+        return self.__images[path]
+
+    def __write(self, path, data):
+        """Write a file unless it already holds the same bytes."""
+        self.__written.add(path)
+        try:
+            with open(path, "rb") as infile:
+                if infile.read() == data:
+                    return path
+        except OSError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path + ".tmp", "wb") as outfile:
+            outfile.write(data)
+        os.replace(path + ".tmp", path)
+
+        return path
+
+
+def minify(css):
+    """
+    Minify a stylesheet.
+
+    Comments and redundant whitespace are dropped, as is the semicolon
+    closing each block. Quoted strings are left untouched.
+
+    Args_:
+        css (str): The stylesheet.
+
+    Returns_:
+        str: The minified stylesheet.
+    """
+    css = _COMMENT.sub("", css)
+    parts = []
+    position = 0
+
+    for match in _STRING.finditer(css):
+        parts.append(_minify_code(css[position:match.start()]))
+        parts.append(match.group(0))
+        position = match.end()
+    parts.append(_minify_code(css[position:]))
+
+    return "".join(parts).strip()
+
+
+def strip_png(data):
+    """
+    Drop the text and timestamp chunks of a PNG image.
+
+    Editors store comments, XMP metadata and modification times in these
+    chunks; none of them affects how the image is displayed.
+
+    Args_:
+        data (bytes): The image, which may not be a PNG at all.
+
+    Returns_:
+        bytes: The image without its metadata, or `data` unchanged if it is
+        not a well-formed PNG.
+    """
+    if not data.startswith(_PNG_SIGNATURE):
+        return data
+
+    chunks = [_PNG_SIGNATURE]
+    position = len(_PNG_SIGNATURE)
+    while position < len(data):
+        if position + 12 > len(data):
+            return data
+        length = int.from_bytes(data[position:position + 4], "big")
+        end = position + 12 + length
+        if end > len(data):
+            return data
+        if data[position + 4:position + 8] not in _PNG_METADATA:
+            chunks.append(data[position:end])
+        position = end
+
+    return b"".join(chunks)
+
+
+def _minify_code(css):
+    """Minify stylesheet code holding no quoted strings."""
+    css = _SPACE.sub(" ", css)
+    css = _PUNCTUATION.sub(r"\1", css)
+    css = css.replace(": ", ":").replace(";}", "}")
+
+    return css
+
+
+def _digest(data):
+    """Return the short content digest used in output file names."""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _external(href):
+    """Tell whether a reference points outside the site."""
+    return bool(re.match(r"[a-z][a-z0-9+.-]*:|//|#", href, re.IGNORECASE))
+
+
+def _href(path, from_dir):
+    """Return the URL of a file relative to a directory."""
+    return posixpath.join(*os.path.relpath(path, from_dir).split(os.sep))
+
+
+def main():
+    """Bundle the assets of web_static and report the savings."""
+    parser = argparse.ArgumentParser(
+        description="Bundle the stylesheets and icons of the HBNB pages.")
+    parser.add_argument("-s", "--src", default=SOURCE_DIR,
+                        help="source directory (default: web_static)")
+    parser.add_argument("-o", "--out", default=OUTPUT_DIR,
+                        help="output directory (default: web_static/dist)")
+    parser.add_argument("--inline-limit", type=int, default=INLINE_LIMIT,
+                        help="largest image inlined, in bytes")
+    args = parser.parse_args()
+
+    try:
+        report = AssetPipeline(args.src, args.out, args.inline_limit).build()
+    except ValueError as err:
+        parser.error(str(err))
+    total_before = total_after = 0
+    for page, stats in report.items():
+        if not stats["requests_before"]:
+            continue
+        total_before += stats["bytes_before"]
+        total_after += stats["bytes_after"]
+        print(f"{page}: {stats['bytes_before']} -> {stats['bytes_after']} "
+              f"bytes, {stats['requests_before']} -> "
+              f"{stats['requests_after']} requests")
+    print(f"total: {total_before} -> {total_after} bytes "
+          f"({total_before - total_after} saved)")
+
+
+if __name__ == "__main__":
+    main()
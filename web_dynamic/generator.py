@@ -0,0 +1,423 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+"""
+Static site generator rendering the web_static mockup from storage.
+
+The pages of web_static/103-index.html are rendered from the objects in
+storage: the States/Cities popover, the Amenities filter and one <article>
+card per Place with its owner, amenities and reviews. The site has an index
+page listing every place and one page per City.
+
+Templates are compiled once. Every fragment (the two filters and each place
+card) is rendered to its own file and remembers the tokens it was built from;
+pages are then streamed to disk by concatenating fragment files. A manifest
+keeps a digest of every object, so the next build re-renders only the
+fragments whose objects changed and rewrites only the pages holding them.
+
+usage:
+------
+python3 -m web_dynamic.generator [-o <output directory>] [--full]
+"""
+__author__ = "Albert Mwanza"
+__license__ = "MIT"
+__date__ = "2025-01-03"
+__version__ = "1.1"
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from string import Template
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "templates")
+OUTPUT_DIR = os.path.normpath(os.path.join(
+    os.path.dirname(TEMPLATE_DIR), os.pardir, "web_static", "site"))
+MANIFEST = ".manifest.json"
+FRAGMENT_DIR = ".fragments"
+
+# Fields linking an object to the fragments and pages of another one
+LINKS = {
+    "Place": ("city_id",),
+    "City": ("state_id",),
+    "Review": ("place_id",),
+}
+
+# Icon class of the amenities the stylesheets have an icon for
+ICONS = {
+    "tv": "tv_icon",
+    "wifi": "wifi_icon",
+    "pet friendly": "pet_icon",
+}
+
+_SLOT = re.compile(r"\$\{@(\w+)\}\n?")
+
+
+class Templates:
+    """
+    The site templates, read and compiled once.
+
+    Attributes_:
+        digest (str): A digest of every template, so that editing one
+            invalidates everything rendered with the old ones.
+        page (list): The page template, as compiled static parts and the
+            names of the slots fragments are streamed into.
+    """
+
+    def __init__(self, directory=TEMPLATE_DIR):
+        """
+        Read and compile every template of a directory.
+
+        Args_:
+            directory (str): The directory holding the *.html templates.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".html"):
+                continue
+            with open(os.path.join(directory, name)) as infile:
+                text = infile.read()
+            digest.update(name.encode() + b"\0" + text.encode())
+
+            if name == "page.html":
+                parts = _SLOT.split(text)
+                # Odd parts are slot names, even parts static templates
+                self.page = [part if index % 2 else Template(part)
+                             for index, part in enumerate(parts)]
+            else:
+                setattr(self, name[:-len(".html")], Template(text))
+
+        self.digest = digest.hexdigest()
+
+
+class SiteGenerator:
+    """
+    Render and incrementally rebuild the site from a storage engine.
+
+    Attributes_:
+        out_dir (str): The directory pages are written to.
+        storage: The storage engine objects are read from.
+        static_prefix (str): The path from `out_dir` to the web_static
+            styles and images.
+    """
+
+    def __init__(self, out_dir=OUTPUT_DIR, storage=None, static_prefix="../",
+                 templates=None):
+        """
+        Initialize the generator.
+
+        Args_:
+            out_dir (str): The output directory.
+            storage (optional): The storage engine, `models.storage` if
+                omitted.
+            static_prefix (str): See the class attributes.
+            templates (Templates, optional): Compiled templates to reuse.
+        """
+        if storage is None:
+            from models import storage
+
+        self.out_dir = out_dir
+        self.storage = storage
+        self.static_prefix = static_prefix
+        self.templates = templates if templates is not None else Templates()
+
+    def build(self, full=False):
+        """
+        Bring the site up to date with storage.
+
+        Args_:
+            full (bool): Re-render everything instead of only what changed.
+
+        Returns_:
+            dict: The fragments rendered, the pages written and the pages
+            removed by this build.
+        """
+        data = {name: {value.get("id"): value
+                       for _, value in self.storage.items(name)}
+                for name in ("State", "City", "Amenity", "Place", "Review",
+                             "User")}
+        manifest = self.__load_manifest()
+        full = full or manifest.get("templates") != self.templates.digest
+
+        objects = {}
+        changed = set()
+        old_objects = manifest.get("objects", {})
+        for name, values in data.items():
+            for obj_id, value in values.items():
+                key = f"{name}.{obj_id}"
+                links = {field: value.get(field)
+                         for field in LINKS.get(name, ())}
+                objects[key] = [self.__digest(value), links]
+                if old_objects.get(key) != objects[key]:
+                    changed |= self.__tokens(key, links)
+                    if key in old_objects:
+                        changed |= self.__tokens(key, old_objects[key][1])
+        for key in old_objects.keys() - objects.keys():
+            changed |= self.__tokens(key, old_objects[key][1])
+
+        reviews = {}
+        for review in data["Review"].values():
+            reviews.setdefault(review.get("place_id"), []).append(review)
+
+        fragments = {"locations": None, "amenities": None}
+        fragments.update(
+            (f"place-{place_id}", place_id) for place_id in sorted(
+                data["Place"],
+                key=lambda i: (str(data["Place"][i].get("name")), i)))
+
+        old_deps = manifest.get("fragments", {})
+        deps = {}
+        rendered = []
+        for name, place_id in fragments.items():
+            tokens = old_deps.get(name)
+            if (full or tokens is None or changed.intersection(tokens) or
+                    not os.path.exists(self.__fragment_path(name))):
+                if place_id is None:
+                    text, tokens = getattr(self, f"_render_{name}")(data)
+                else:
+                    text, tokens = self._render_place(
+                        data, data["Place"][place_id],
+                        reviews.get(place_id, []))
+                self.__write(self.__fragment_path(name), text)
+                rendered.append(name)
+            deps[name] = sorted(tokens)
+
+        # One pass groups the places, already sorted by name, per city
+        listings = {}
+        for name, place_id in fragments.items():
+            if place_id is not None:
+                listings.setdefault(
+                    data["Place"][place_id].get("city_id"), []).append(name)
+
+        pages = {"index.html": ("Places", "Place", [
+            name for name in fragments if name.startswith("place-")])}
+        for city_id, city in data["City"].items():
+            pages[os.path.join("cities", f"{city_id}.html")] = (
+                f"Places in {city.get('name', '')}",
+                f"Place@city_id={city_id}",
+                listings.get(city_id, []))
+
+        old_pages = manifest.get("pages", {})
+        written = []
+        fresh = set(rendered)
+        for page, (heading, membership, places) in pages.items():
+            members = ["locations", "amenities"] + places
+            if (full or old_pages.get(page) != members or
+                    membership in changed or fresh.intersection(members) or
+                    not os.path.exists(os.path.join(self.out_dir, page))):
+                self.__write_page(page, heading, places)
+                written.append(page)
+
+        removed = []
+        for page in old_pages.keys() - pages.keys():
+            self.__remove(os.path.join(self.out_dir, page))
+            removed.append(page)
+        for name in old_deps.keys() - fragments.keys():
+            self.__remove(self.__fragment_path(name))
+
+        self.__write(os.path.join(self.out_dir, MANIFEST), json.dumps({
+            "templates": self.templates.digest,
+            "objects": objects,
+            "fragments": deps,
+            "pages": {page: ["locations", "amenities"] + places
+                      for page, (_, _, places) in pages.items()},
+        }))
+
+        return {"fragments": rendered, "pages": written, "removed": removed}
+
+    def _render_locations(self, data):
+        """Render the States/Cities popover."""
+        t = self.templates
+        cities = {}
+        for city in data["City"].values():
+            cities.setdefault(city.get("state_id"), []).append(city)
+
+        states = sorted(data["State"].values(),
+                        key=lambda s: str(s.get("name", "")))
+        items = []
+        for state in states:
+            items.append(t.state.substitute(
+                name=_escape(state.get("name", "")),
+                cities="".join(t.city.substitute(name=_escape(c.get("name")))
+                               for c in sorted(cities.get(state.get("id"), []),
+                                               key=_by_name)).rstrip("\n")))
+
+        text = t.locations.substitute(
+            summary=_summary(s.get("name", "") for s in states),
+            states="".join(items).rstrip("\n"))
+
+        return text, {"State", "City"}
+
+    def _render_amenities(self, data):
+        """Render the Amenities filter."""
+        t = self.templates
+        amenities = sorted(data["Amenity"].values(), key=_by_name)
+
+        text = t.amenities.substitute(
+            summary=_summary(a.get("name", "") for a in amenities),
+            amenities="".join(t.amenity.substitute(
+                name=_escape(a.get("name"))) for a in amenities).rstrip("\n"))
+
+        return text, {"Amenity"}
+
+    def _render_place(self, data, place, reviews):
+        """Render the <article> card of one Place with its reviews."""
+        t = self.templates
+        tokens = {f"Place.{place['id']}",
+                  f"Review@place_id={place['id']}",
+                  f"User.{place.get('user_id')}"}
+
+        amenities = []
+        for amenity_id in place.get("amenity_ids") or []:
+            tokens.add(f"Amenity.{amenity_id}")
+            amenity = data["Amenity"].get(amenity_id)
+            if amenity is not None:
+                name = str(amenity.get("name", ""))
+                amenities.append(t.place_amenity.substitute(
+                    icon=ICONS.get(name.lower(), ""), name=_escape(name)))
+
+        items = []
+        for review in sorted(reviews, key=lambda r: r.get("created_at", "")):
+            tokens.add(f"User.{review.get('user_id')}")
+            items.append(t.review.substitute(
+                author=_escape(_full_name(
+                    data["User"].get(review.get("user_id")))),
+                date=_long_date(review.get("created_at")),
+                text=_escape(review.get("text", ""))))
+
+        text = t.place.substitute(
+            name=_escape(place.get("name", "")),
+            price_by_night=_escape(place.get("price_by_night", 0)),
+            max_guest=_escape(place.get("max_guest", 0)),
+            number_rooms=_escape(place.get("number_rooms", 0)),
+            number_bathrooms=_escape(place.get("number_bathrooms", 0)),
+            owner=_escape(_full_name(data["User"].get(place.get("user_id")))),
+            description=_escape(place.get("description", "")),
+            amenities="".join(amenities).rstrip("\n"),
+            reviews="".join(items).rstrip("\n"))
+
+        return text, tokens
+
+    def __write_page(self, page, heading, places):
+        """Stream a page to disk from its template and fragment files."""
+        path = os.path.join(self.out_dir, page)
+        depth = page.count(os.sep)
+        values = {"title": "AirBnB clone", "heading": _escape(heading),
+                  "static": "../" * depth + self.static_prefix}
+        slots = {"filters": ["locations", "amenities"], "places": places}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as outfile:
+            for index, part in enumerate(self.templates.page):
+                if not index % 2:
+                    outfile.write(part.substitute(values))
+                    continue
+                for name in slots[part]:
+                    with open(self.__fragment_path(name)) as fragment:
+                        shutil.copyfileobj(fragment, outfile)
+        os.replace(path + ".tmp", path)
+
+    def __fragment_path(self, name):
+        """Return the path a fragment is cached at."""
+        return os.path.join(self.out_dir, FRAGMENT_DIR, f"{name}.html")
+
+    def __load_manifest(self):
+        """Return the manifest of the previous build, or an empty one."""
+        try:
+            with open(os.path.join(self.out_dir, MANIFEST)) as infile:
+                return json.load(infile)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def __tokens(key, links):
+        """Return the tokens a change to an object invalidates."""
+        cls_name = key.partition(".")[0]
+
+        return {key, cls_name} | {f"{cls_name}@{field}={value}"
+                                  for field, value in links.items()}
+
+    @staticmethod
+    def __digest(value):
+        """Return a digest of the stored dictionary of an object."""
+        return hashlib.blake2b(json.dumps(value, sort_keys=True).encode(),
+                               digest_size=12).hexdigest()
+
+    @staticmethod
+    def __write(path, text):
+        """Atomically write a text file, creating its directory."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as outfile:
+            outfile.write(text)
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def __remove(path):
+        """Remove a file if it exists."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _escape(value):
+    """Escape a value for HTML text and attributes."""
+    return html.escape(str(value if value is not None else ""))
+
+
+def _by_name(value):
+    """Sort key ordering stored dictionaries by name."""
+    return str(value.get("name", "")), value.get("id", "")
+
+
+def _summary(names, count=2):
+    """Return the "California, Arizona..." summary of a list of names."""
+    names = [str(name) for name in names]
+    text = ", ".join(names[:count])
+
+    return _escape(text + ("..." if len(names) > count else ""))
+
+
+def _full_name(user):
+    """Return the display name of a stored User dictionary."""
+    if not user:
+        return "Unknown"
+
+    name = f"{user.get('first_name', '')} {user.get('last_name', '')}"
+    return name.strip() or user.get("email") or "Unknown"
+
+
+def _long_date(value):
+    """Format an ISO timestamp as "27th January 2017"."""
+    try:
+        date = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return ""
+
+    suffix = "th" if 11 <= date.day % 100 <= 13 else {
+        1: "st", 2: "nd", 3: "rd"}.get(date.day % 10, "th")
+    return f"{date.day}{suffix} {date:%B %Y}"
+
+
+def main():
+    """Build the site from `models.storage`."""
+    parser = argparse.ArgumentParser(description="Render the HBNB site.")
+    parser.add_argument("-o", "--out", default=OUTPUT_DIR,
+                        help="output directory (default: web_static/site)")
+    parser.add_argument("--full", action="store_true",
+                        help="re-render every fragment and page")
+    args = parser.parse_args()
+
+    report = SiteGenerator(args.out).build(full=args.full)
+    print(f"{len(report['fragments'])} fragments rendered, "
+          f"{len(report['pages'])} pages written, "
+          f"{len(report['removed'])} pages removed")
+
+
+if __name__ == "__main__":
+    main()